@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.business.models import Business, BusinessLocation
+from apps.wallets.models import UserTransaction
+from apps.wallets.models.wallet import BusinessLocationWallet
+from apps.wallets.services import LedgerService, ReconciliationService
+
+User = get_user_model()
+
+
+class LocationWithdrawalTest(TestCase):
+    """Test cases for the withdrawal of funds from a business location wallet."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass', email='o@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.owner, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.owner, name='Test Hotel',
+            city='Douala', region='Littoral', business_location_type='hotel'
+        )
+        self.wallet = BusinessLocationWallet.objects.get(business_location=self.location)
+        LedgerService.post([
+            LedgerService.debit(None, 5000, 'DEPOSIT'),
+            LedgerService.credit(self.wallet, 5000, 'DEPOSIT'),
+        ])
+        self.client.force_login(self.owner)
+
+    def withdraw(self, amount, password='pass'):
+        return self.client.post(reverse('business:financial_dashboard'), {
+            'withdraw': '1', 'location_id': self.location.pk, 'amount': amount, 'password': password,
+        })
+
+    def test_withdrawal_is_posted_to_the_ledger(self):
+        self.withdraw('2000')
+
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('3000.00'))
+        withdrawal = UserTransaction.objects.get(transaction_type='WITHDRAWAL', direction='DEBIT')
+        self.assertEqual((withdrawal.wallet_object_id, withdrawal.amount), (self.wallet.pk, Decimal('2000.00')))
+        self.assertIsNotNone(withdrawal.journal_entry_id)
+        self.assertEqual(ReconciliationService.reconcile(), [])
+
+    def test_wrong_password_withdraws_nothing(self):
+        self.withdraw('2000', password='wrong')
+
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('5000.00'))
+        self.assertFalse(UserTransaction.objects.filter(transaction_type='WITHDRAWAL').exists())
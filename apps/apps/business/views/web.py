@@ -14,9 +14,10 @@ from django.core.files.storage import default_storage
 from django.conf import settings
 import os
 from django.utils import timezone
-from django.contrib.contenttypes.models import ContentType
+from apps.core.utils import ContentTypeRegistry
 from apps.wallets.models.transaction import UserTransaction
-import uuid
+from apps.wallets.models.wallet import BusinessLocationWallet
+from apps.wallets.services import FinancialReportService, LedgerService, TransactionService
 from decimal import Decimal
 import json
 from dateutil.relativedelta import relativedelta
@@ -1428,8 +1429,12 @@ def business_location_dashboard(request, pk):
         from apps.orders.models.menu_item import MenuItem
         from apps.orders.models.order import RestaurantOrder, OrderItem
         from apps.orders.forms import CustomRestaurantOrderForm, OrderCustomerForm
-        menu_items = MenuItem.objects.filter(business_location=location)
-        menu_items_in_stock = menu_items.filter(is_available=True, stock_quantity__gt=0)
+        from apps.orders.services import MenuCacheService
+        menu_items = MenuCacheService.get_snapshot(location.pk)['items']
+        menu_items_in_stock = [
+            item for item in menu_items
+            if item['is_available'] and item['stock_quantity'] > 0
+        ]
         if request.method == 'POST':
             print("=== DEBUG: POST request received ===")
             print("POST data:", dict(request.POST))
@@ -1464,79 +1469,18 @@ def business_location_dashboard(request, pk):
                             phone_number=phone,
                             username=email or phone or f'user_{User.objects.count()+1}'
                         )
-                    # Créer la commande principale
-                    print("=== DEBUG: Creating main order ===")
-                    order = order_form.save(commit=False)
-                    order.customer = customer
-                    order.business_location = location
-                    order.status = 'READY'
-                    order.payment_status = 'PAID'
-                    order.payment_method = 'CASH'
-                    
-                    # Générer l'order_number
-                    from django.utils.crypto import get_random_string
-                    while True:
-                        order_number = f"ORD{get_random_string(8).upper()}"
-                        if not RestaurantOrder.objects.filter(order_number=order_number).exists():
-                            break
-                    order.order_number = order_number
-                    
-                    print(f"Order before save: customer={order.customer}, location={order.business_location}, order_number={order.order_number}")
-                    # Calcule le sous-total avant de sauvegarder la commande
-                    order.subtotal = sum(
-                        menu_items_in_stock.get(id=item_id).price * int(request.POST.get(f'quantity_{item_id}', 1))
-                        for item_id in request.POST.getlist('menu_items')
-                    )
-                    # Calcule le total_amount avant de sauvegarder la commande
-                    try:
-                        order.calculate_total()
-                    except Exception:
-                        # Si la méthode n'existe pas, calcule manuellement
-                        order.total_amount = order.subtotal
-                    order.save()
-
-                    # Crée la transaction espèces automatiquement
-                    from apps.wallets.services.wallet_service import WalletService
-                    wallet, _ = WalletService.get_or_create_business_wallet(location.business)
-                    from django.utils.crypto import get_random_string
-                    reference = get_random_string(16)
-                    UserTransaction.objects.create(
-                        wallet_content_type=ContentType.objects.get_for_model(wallet),
-                        wallet_object_id=wallet.id,
-                        content_type=ContentType.objects.get_for_model(order),
-                        object_id=order.id,
-                        transaction_type='CASH_PAYMENT',
-                        amount=order.total_amount,
-                        status='COMPLETED',
-                        reference=reference,
-                        description=f'Paiement espèces pour commande {order.order_number}'
+                    # Créer la commande, ses lignes et le paiement espèces à partir des plats sélectionnés
+                    from apps.orders.services import OrderService
+                    order = OrderService.create_order(
+                        location,
+                        customer,
+                        OrderService.items_from_form_data(request.POST),
+                        order=order_form.save(commit=False),
+                        status='READY',
+                        payment_method='CASH',
                     )
 
                     print(f"Order created with ID: {order.id}")
-                    # Créer les OrderItem à partir des plats sélectionnés
-                    print("=== DEBUG: Creating order items ===")
-                    menu_item_ids = request.POST.getlist('menu_items')
-                    print(f"Menu item IDs: {menu_item_ids}")
-                    for item_id in menu_item_ids:
-                        try:
-                            menu_item = menu_items_in_stock.get(id=item_id)
-                            quantity = int(request.POST.get(f'quantity_{item_id}', 1))
-                            if quantity > 0 and quantity <= menu_item.stock_quantity:
-                                OrderItem.objects.create(
-                                    restaurant_order=order,
-                                    menu_item=menu_item,
-                                    quantity=quantity,
-                                    unit_price=menu_item.price,
-                                    total_price=menu_item.price * quantity
-                                )
-                                menu_item.stock_quantity -= quantity
-                                if menu_item.stock_quantity == 0:
-                                    menu_item.is_available = False
-                                menu_item.save()
-                        except MenuItem.DoesNotExist:
-                            continue
-                    order.calculate_total()
-                    order.save()
                     print(f"=== DEBUG: Order completed successfully ===")
                     print(f"Order total: {order.total_amount}")
                     print(f"Order items count: {order.items.count()}")
@@ -1560,37 +1504,20 @@ def business_location_dashboard(request, pk):
             'customer_form': customer_form,
             'business_location': location,
             'recent_orders': RestaurantOrder.objects.filter(business_location=location).order_by('-created_at')[:5],
-            'total_menu_items': menu_items.count(),
+            'total_menu_items': len(menu_items),
             'total_orders': RestaurantOrder.objects.filter(business_location=location).count(),
         })
         # Ajout du solde réel du wallet business
         from apps.wallets.services.wallet_service import WalletService
         wallet, _ = WalletService.get_or_create_business_wallet(location.business)
-        context['wallet_balance'] = wallet.balance
+        context['wallet_balance'] = wallet.available_balance
         template_name = 'business/dashboard/restaurant_dashboard.html'
         # Nouvelle logique pour tous les types de business location
         def get_wallet_cash_totals(bookings_today):
-            total_wallet = 0
-            total_cash = 0
-            total_day = 0
-            for booking in bookings_today:
-                booking_ct = ContentType.objects.get_for_model(booking)
-                wallet_amount = UserTransaction.objects.filter(
-                    content_type=booking_ct,
-                    object_id=booking.pk,
-                    transaction_type='PAYMENT',
-                    status='COMPLETED'
-                ).aggregate(total=Sum('amount'))['total'] or 0
-                cash_amount = UserTransaction.objects.filter(
-                    content_type=booking_ct,
-                    object_id=booking.pk,
-                    transaction_type='CASH_PAYMENT',
-                    status='COMPLETED'
-                ).aggregate(total=Sum('amount'))['total'] or 0
-                total_wallet += wallet_amount
-                total_cash += cash_amount
-                total_day += wallet_amount + cash_amount
-            return total_wallet, total_cash, total_day
+            total_wallet, total_cash = TransactionService.get_object_payment_totals(
+                bookings_today.model, bookings_today.values('pk')
+            )
+            return total_wallet, total_cash, total_wallet + total_cash
         orders_today = RestaurantOrder.objects.filter(
             business_location=location,
             payment_status='PAID',
@@ -1618,50 +1545,17 @@ def business_location_dashboard(request, pk):
         template_name = 'business/dashboard/hotel_dashboard.html'
         # Nouvelle logique pour tous les types de business location
         def get_wallet_cash_totals(bookings_today):
-            total_wallet = 0
-            total_cash = 0
-            total_day = 0
-            for booking in bookings_today:
-                booking_ct = ContentType.objects.get_for_model(booking)
-                wallet_amount = UserTransaction.objects.filter(
-                    content_type=booking_ct,
-                    object_id=booking.pk,
-                    transaction_type='PAYMENT',
-                    status='COMPLETED'
-                ).aggregate(total=Sum('amount'))['total'] or 0
-                cash_amount = UserTransaction.objects.filter(
-                    content_type=booking_ct,
-                    object_id=booking.pk,
-                    transaction_type='CASH_PAYMENT',
-                    status='COMPLETED'
-                ).aggregate(total=Sum('amount'))['total'] or 0
-                print(wallet_amount, cash_amount)
-                total_wallet += wallet_amount
-                total_cash += cash_amount
-                total_day += wallet_amount + cash_amount
-            return total_wallet, total_cash, total_day
+            total_wallet, total_cash = TransactionService.get_object_payment_totals(
+                bookings_today.model, bookings_today.values('pk')
+            )
+            return total_wallet, total_cash, total_wallet + total_cash
         bookings_today = RoomBooking.objects.filter(room__business_location=location, created_at__date=today)
         total_wallet, total_cash, total_day = get_wallet_cash_totals(bookings_today)
         
         # Préparer les listes de transactions wallet et cash pour l'affichage
-        booking_transactions_wallet = []
-        booking_transactions_cash = []
-        for booking in bookings_today:
-            booking_ct = ContentType.objects.get_for_model(booking)
-            wallet_transactions = UserTransaction.objects.filter(
-                content_type=booking_ct,
-                object_id=booking.pk,
-                transaction_type='PAYMENT',
-                status='COMPLETED'
-            ).order_by('-created_at')[:5]
-            cash_transactions = UserTransaction.objects.filter(
-                content_type=booking_ct,
-                object_id=booking.pk,
-                transaction_type='CASH_PAYMENT',
-                status='COMPLETED'
-            ).order_by('-created_at')[:5]
-            booking_transactions_wallet.extend(wallet_transactions)
-            booking_transactions_cash.extend(cash_transactions)
+        booking_ids = bookings_today.values('pk')
+        booking_transactions_wallet = TransactionService.get_object_payments(bookings_today.model, booking_ids, 'PAYMENT')
+        booking_transactions_cash = TransactionService.get_object_payments(bookings_today.model, booking_ids, 'CASH_PAYMENT')
         
         context.update({
             'total_day': total_day,
@@ -1684,49 +1578,17 @@ def business_location_dashboard(request, pk):
         template_name = 'business/dashboard/vehicle_dashboard.html'
         # Nouvelle logique pour tous les types de business location
         def get_wallet_cash_totals(bookings_today):
-            total_wallet = 0
-            total_cash = 0
-            total_day = 0
-            for booking in bookings_today:
-                booking_ct = ContentType.objects.get_for_model(booking)
-                wallet_amount = UserTransaction.objects.filter(
-                    content_type=booking_ct,
-                    object_id=booking.pk,
-                    transaction_type='PAYMENT',
-                    status='COMPLETED'
-                ).aggregate(total=Sum('amount'))['total'] or 0
-                cash_amount = UserTransaction.objects.filter(
-                    content_type=booking_ct,
-                    object_id=booking.pk,
-                    transaction_type='CASH_PAYMENT',
-                    status='COMPLETED'
-                ).aggregate(total=Sum('amount'))['total'] or 0
-                total_wallet += wallet_amount
-                total_cash += cash_amount
-                total_day += wallet_amount + cash_amount
-            return total_wallet, total_cash, total_day
+            total_wallet, total_cash = TransactionService.get_object_payment_totals(
+                bookings_today.model, bookings_today.values('pk')
+            )
+            return total_wallet, total_cash, total_wallet + total_cash
         bookings_today = VehicleBooking.objects.filter(vehicle__business_location=location, created_at__date=today)
         total_wallet, total_cash, total_day = get_wallet_cash_totals(bookings_today)
         
         # Préparer les listes de transactions wallet et cash pour l'affichage
-        booking_transactions_wallet = []
-        booking_transactions_cash = []
-        for booking in bookings_today:
-            booking_ct = ContentType.objects.get_for_model(booking)
-            wallet_transactions = UserTransaction.objects.filter(
-                content_type=booking_ct,
-                object_id=booking.pk,
-                transaction_type='PAYMENT',
-                status='COMPLETED'
-            ).order_by('-created_at')[:5]
-            cash_transactions = UserTransaction.objects.filter(
-                content_type=booking_ct,
-                object_id=booking.pk,
-                transaction_type='CASH_PAYMENT',
-                status='COMPLETED'
-            ).order_by('-created_at')[:5]
-            booking_transactions_wallet.extend(wallet_transactions)
-            booking_transactions_cash.extend(cash_transactions)
+        booking_ids = bookings_today.values('pk')
+        booking_transactions_wallet = TransactionService.get_object_payments(bookings_today.model, booking_ids, 'PAYMENT')
+        booking_transactions_cash = TransactionService.get_object_payments(bookings_today.model, booking_ids, 'CASH_PAYMENT')
         
         context.update({
             'total_day': total_day,
@@ -1759,49 +1621,31 @@ def business_location_dashboard(request, pk):
         reviews = TourReview.objects.filter(tour__business_location=location).select_related('tour', 'reviewer')
         # Synthèse financière du jour (transactions liées aux bookings)
         def get_wallet_cash_totals(bookings):
-            total_wallet = 0
-            total_cash = 0
-            booking_transactions_wallet = []
-            booking_transactions_cash = []
-            for booking in bookings:
-                booking_ct = ContentType.objects.get_for_model(booking)
-                wallet_transactions = UserTransaction.objects.filter(
-                    content_type=booking_ct,
-                    object_id=booking.pk,
-                    transaction_type='PAYMENT',
-                    status='COMPLETED'
-                )
-                cash_transactions = UserTransaction.objects.filter(
-                    content_type=booking_ct,
-                    object_id=booking.pk,
-                    transaction_type='CASH_PAYMENT',
-                    status='COMPLETED'
-                )
-                total_wallet += wallet_transactions.aggregate(total=Sum('amount'))['total'] or 0
-                total_cash += cash_transactions.aggregate(total=Sum('amount'))['total'] or 0
-                booking_transactions_wallet.extend(wallet_transactions)
-                booking_transactions_cash.extend(cash_transactions)
+            booking_ids = bookings.values('pk')
+            total_wallet, total_cash = TransactionService.get_object_payment_totals(bookings.model, booking_ids)
+            booking_transactions_wallet = TransactionService.get_object_payments(bookings.model, booking_ids, 'PAYMENT')
+            booking_transactions_cash = TransactionService.get_object_payments(bookings.model, booking_ids, 'CASH_PAYMENT')
             return total_wallet, total_cash, booking_transactions_wallet, booking_transactions_cash
         total_wallet, total_cash, booking_transactions_wallet, booking_transactions_cash = get_wallet_cash_totals(bookings_today)
         total_day = total_wallet + total_cash
         # Synthèse financière du business location (transactions reçues par le wallet business)
         wallet = getattr(location, 'wallet', None)
-        business_wallet_balance = wallet.balance if wallet else 0
+        business_wallet_balance = wallet.available_balance if wallet else 0
         business_wallet_transactions_today = []
         business_cash_transactions_today = []
         business_total_wallet_today = 0
         business_total_cash_today = 0
         if wallet:
-            wallet_ct = ContentType.objects.get_for_model(wallet)
+            wallet_ct = ContentTypeRegistry.id_for(wallet)
             business_wallet_transactions_today = UserTransaction.objects.filter(
-                wallet_content_type=wallet_ct,
+                wallet_content_type_id=wallet_ct,
                 wallet_object_id=wallet.id,
                 transaction_type='PAYMENT',
                 status='COMPLETED',
                 created_at__date=today
             ).order_by('-created_at')
             business_cash_transactions_today = UserTransaction.objects.filter(
-                wallet_content_type=wallet_ct,
+                wallet_content_type_id=wallet_ct,
                 wallet_object_id=wallet.id,
                 transaction_type='CASH_PAYMENT',
                 status='COMPLETED',
@@ -1837,7 +1681,7 @@ def business_location_dashboard(request, pk):
     
     # Calculer les totaux du wallet du business location (transactions reçues par l'établissement)
     wallet = getattr(location, 'wallet', None)
-    business_wallet_balance = wallet.balance if wallet else 0
+    business_wallet_balance = wallet.available_balance if wallet else 0
     
     # Transactions reçues par le business location aujourd'hui
     business_wallet_transactions_today = []
@@ -1846,11 +1690,11 @@ def business_location_dashboard(request, pk):
     business_total_cash_today = 0
     
     if wallet:
-        wallet_ct = ContentType.objects.get_for_model(wallet)
+        wallet_ct = ContentTypeRegistry.id_for(wallet)
         
         # Transactions PAYMENT reçues par le business location (paiements wallet des clients)
         business_wallet_transactions_today = UserTransaction.objects.filter(
-            wallet_content_type=wallet_ct,
+            wallet_content_type_id=wallet_ct,
             wallet_object_id=wallet.id,
             transaction_type='PAYMENT',
             status='COMPLETED',
@@ -1859,7 +1703,7 @@ def business_location_dashboard(request, pk):
         
         # Transactions CASH_PAYMENT reçues par le business location (paiements espèces des clients)
         business_cash_transactions_today = UserTransaction.objects.filter(
-            wallet_content_type=wallet_ct,
+            wallet_content_type_id=wallet_ct,
             wallet_object_id=wallet.id,
             transaction_type='CASH_PAYMENT',
             status='COMPLETED',
@@ -1884,11 +1728,11 @@ def business_location_dashboard(request, pk):
     transactions_wallet = []
     transactions_cash = []
     if wallet:
-        wallet_ct = ContentType.objects.get_for_model(wallet)
+        wallet_ct = ContentTypeRegistry.id_for(wallet)
         today = timezone.now().date()
         # Paiements wallet
         for t in UserTransaction.objects.filter(
-            wallet_content_type=wallet_ct,
+            wallet_content_type_id=wallet_ct,
             wallet_object_id=wallet.id,
             transaction_type='PAYMENT',
             status='COMPLETED',
@@ -1961,7 +1805,7 @@ def business_location_dashboard(request, pk):
             })
         # Paiements espèces
         for t in UserTransaction.objects.filter(
-            wallet_content_type=wallet_ct,
+            wallet_content_type_id=wallet_ct,
             wallet_object_id=wallet.id,
             transaction_type='CASH_PAYMENT',
             status='COMPLETED',
@@ -2044,7 +1888,7 @@ def business_location_wallet_api(request, pk):
     """API JSON pour le solde et les transactions du wallet d'une business location."""
     location = get_object_or_404(BusinessLocation, pk=pk)
     wallet = getattr(location, 'wallet', None)
-    business_wallet_balance = wallet.balance if wallet else 0
+    business_wallet_balance = wallet.available_balance if wallet else 0
     
     # Transactions du jour séparées par type
     wallet_transactions = []
@@ -2053,12 +1897,12 @@ def business_location_wallet_api(request, pk):
     total_cash_today = 0
     
     if wallet:
-        wallet_ct = ContentType.objects.get_for_model(wallet)
+        wallet_ct = ContentTypeRegistry.id_for(wallet)
         today = timezone.now().date()
         
         # Transactions PAYMENT (paiements wallet des clients)
         wallet_transactions_data = UserTransaction.objects.filter(
-            wallet_content_type=wallet_ct,
+            wallet_content_type_id=wallet_ct,
             wallet_object_id=wallet.id,
             transaction_type='PAYMENT',
             status='COMPLETED',
@@ -2076,7 +1920,7 @@ def business_location_wallet_api(request, pk):
         
         # Transactions CASH_PAYMENT (paiements espèces des clients)
         cash_transactions_data = UserTransaction.objects.filter(
-            wallet_content_type=wallet_ct,
+            wallet_content_type_id=wallet_ct,
             wallet_object_id=wallet.id,
             transaction_type='CASH_PAYMENT',
             status='COMPLETED',
@@ -2125,13 +1969,12 @@ def finalize_wallet_transaction(request):
         from apps.wallets.services.wallet_service import WalletService
         WalletService.update_wallet_balance(wallet, transaction.amount, 'add')
         # Recalculer le solde et le total du jour
-        from django.contrib.contenttypes.models import ContentType
         from django.utils import timezone
-        wallet_ct = ContentType.objects.get_for_model(wallet)
+        wallet_ct = ContentTypeRegistry.id_for(wallet)
         today = timezone.now().date()
-        solde_wallet = wallet.balance
+        solde_wallet = wallet.available_balance
         total_day = UserTransaction.objects.filter(
-            wallet_content_type=wallet_ct,
+            wallet_content_type_id=wallet_ct,
             wallet_object_id=wallet.id,
             status='COMPLETED',
             created_at__date=today
@@ -2152,8 +1995,6 @@ def create_restaurant_order_from_dashboard(request, pk):
     Traite la création d'une commande depuis la modale du dashboard restaurant.
     """
     location = get_object_or_404(BusinessLocation, pk=pk)
-    menu_items = MenuItem.objects.filter(business_location=location)
-    menu_items_in_stock = menu_items.filter(is_available=True, stock_quantity__gt=0)
 
     order_form = CustomRestaurantOrderForm(request.POST, business_location=location)
     customer_form = OrderCustomerForm(request.POST)
@@ -2175,73 +2016,18 @@ def create_restaurant_order_from_dashboard(request, pk):
                     phone_number=phone,
                     username=email or phone or f'user_{User.objects.count()+1}'
                 )
-            # Créer la commande principale
-            order = order_form.save(commit=False)
-            order.customer = customer
-            order.business_location = location
-            order.status = 'READY'
-            order.payment_status = 'PAID'
-            order.payment_method = 'CASH'
-            # Générer un numéro de commande unique
-            from django.utils.crypto import get_random_string
-            while True:
-                order_number = f"ORD{get_random_string(8).upper()}"
-                if not RestaurantOrder.objects.filter(order_number=order_number).exists():
-                    break
-            order.order_number = order_number
-            # Calcule le sous-total avant de sauvegarder la commande
-            order.subtotal = sum(
-                menu_items_in_stock.get(id=item_id).price * int(request.POST.get(f'quantity_{item_id}', 1))
-                for item_id in request.POST.getlist('menu_items')
-            )
-            # Calcule le total_amount avant de sauvegarder la commande
-            try:
-                order.calculate_total()
-            except Exception:
-                # Si la méthode n'existe pas, calcule manuellement
-                order.total_amount = order.subtotal
-            order.save()
-
-            # Crée la transaction espèces automatiquement
-            from apps.wallets.services.wallet_service import WalletService
-            wallet, _ = WalletService.get_or_create_business_wallet(location.business)
-            from django.utils.crypto import get_random_string
-            reference = get_random_string(16)
-            UserTransaction.objects.create(
-                wallet_content_type=ContentType.objects.get_for_model(wallet),
-                wallet_object_id=wallet.id,
-                content_type=ContentType.objects.get_for_model(order),
-                object_id=order.id,
-                transaction_type='CASH_PAYMENT',
-                amount=order.total_amount,
-                status='COMPLETED',
-                reference=reference,
-                description=f'Paiement espèces pour commande {order.order_number}'
+            # Créer la commande, ses lignes et le paiement espèces à partir des plats sélectionnés
+            from apps.orders.services import OrderService
+            order = OrderService.create_order(
+                location,
+                customer,
+                OrderService.items_from_form_data(request.POST),
+                order=order_form.save(commit=False),
+                status='READY',
+                payment_method='CASH',
             )
 
             print(f"Order created with ID: {order.id}")
-            # Créer les OrderItem à partir des plats sélectionnés
-            menu_item_ids = request.POST.getlist('menu_items')
-            for item_id in menu_item_ids:
-                try:
-                    menu_item = menu_items_in_stock.get(id=item_id)
-                    quantity = int(request.POST.get(f'quantity_{item_id}', 1))
-                    if quantity > 0 and quantity <= menu_item.stock_quantity:
-                        OrderItem.objects.create(
-                            restaurant_order=order,
-                            menu_item=menu_item,
-                            quantity=quantity,
-                            unit_price=menu_item.price,
-                            total_price=menu_item.price * quantity
-                        )
-                        menu_item.stock_quantity -= quantity
-                        if menu_item.stock_quantity == 0:
-                            menu_item.is_available = False
-                        menu_item.save()
-                except MenuItem.DoesNotExist:
-                    continue
-            order.calculate_total()
-            order.save()
             messages.success(request, _('Order created successfully.'))
             # Redirige vers la liste filtrée des commandes de ce restaurant
             return redirect(f"{reverse('orders:order_list')}?location={location.pk}")
@@ -2289,42 +2075,23 @@ def financial_dashboard(request):
     total_wallet_global = 0
     total_cash_global = 0
     total_global = 0
-    
+
+    # Montants lus dans les cumuls des wallets (une requête groupée)
+    wallets = [location.wallet for location in business_locations if getattr(location, 'wallet', None)]
+    wallet_ids = [wallet.pk for wallet in wallets]
+    payment_types = ('PAYMENT', 'CASH_PAYMENT')
+    wallet_totals = FinancialReportService.wallet_totals(
+        BusinessLocationWallet, wallet_ids, payment_types, start_date, end_date
+    )
+
     for location in business_locations:
         wallet = getattr(location, 'wallet', None)
         wallet_balance = wallet.balance if wallet else 0
-        
+
         # Calculer les montants par type de transaction
-        wallet_amount = 0
-        cash_amount = 0
-        
-        if wallet:
-            wallet_ct = ContentType.objects.get_for_model(wallet)
-            
-            # Filtres de date pour les transactions
-            wallet_transactions = UserTransaction.objects.filter(
-                wallet_content_type=wallet_ct,
-                wallet_object_id=wallet.id,
-                transaction_type='PAYMENT',
-                status='COMPLETED'
-            )
-            cash_transactions = UserTransaction.objects.filter(
-                wallet_content_type=wallet_ct,
-                wallet_object_id=wallet.id,
-                transaction_type='CASH_PAYMENT',
-                status='COMPLETED'
-            )
-            
-            if start_date:
-                wallet_transactions = wallet_transactions.filter(created_at__date__gte=start_date)
-                cash_transactions = cash_transactions.filter(created_at__date__gte=start_date)
-            if end_date:
-                wallet_transactions = wallet_transactions.filter(created_at__date__lte=end_date)
-                cash_transactions = cash_transactions.filter(created_at__date__lte=end_date)
-            
-            wallet_amount = wallet_transactions.aggregate(total=Sum('amount'))['total'] or 0
-            cash_amount = cash_transactions.aggregate(total=Sum('amount'))['total'] or 0
-        
+        totals = wallet_totals.get(wallet.pk, {}) if wallet else {}
+        wallet_amount = totals.get('PAYMENT', 0)
+        cash_amount = totals.get('CASH_PAYMENT', 0)
         total_amount = wallet_amount + cash_amount
         
         # Ajouter aux totaux globaux
@@ -2341,82 +2108,30 @@ def financial_dashboard(request):
             'has_high_balance': wallet_balance > 100000,  # Alerte si > 100k XAF
         })
     
-    # Données pour le graphe des tendances (12 derniers mois)
+    # Données pour les graphes des tendances (12 derniers mois), une seule requête groupée
+    monthly_totals = FinancialReportService.monthly_totals(BusinessLocationWallet, wallet_ids, payment_types)
+
     # 1. Graphe cumulatif (solde qui s'accumule mois après mois)
+    # 2. Graphe par type de transaction (wallet vs espèces)
     chart_data_cumulative = []
+    chart_data_by_type = []
     cumulative_total = 0
-    today = timezone.now().date().replace(day=1)
-    
-    for i in range(12):
-        month_start = today - relativedelta(months=11 - i)
-        next_month = (month_start + relativedelta(months=1))
-        month_total = 0
-        
-        for location in business_locations:
-            wallet = getattr(location, 'wallet', None)
-            if wallet:
-                wallet_ct = ContentType.objects.get_for_model(wallet)
-                month_transactions = UserTransaction.objects.filter(
-                    wallet_content_type=wallet_ct,
-                    wallet_object_id=wallet.id,
-                    transaction_type__in=['PAYMENT', 'CASH_PAYMENT'],
-                    status='COMPLETED',
-                    created_at__date__gte=month_start,
-                    created_at__date__lt=next_month
-                )
-                month_total += month_transactions.aggregate(total=Sum('amount'))['total'] or 0
-        
-        cumulative_total += month_total
+
+    for month_start, month_totals in monthly_totals:
+        month_wallet_total = month_totals.get('PAYMENT', 0)
+        month_cash_total = month_totals.get('CASH_PAYMENT', 0)
+        cumulative_total += month_wallet_total + month_cash_total
         chart_data_cumulative.append({
             'month': month_start.strftime('%B %Y'),
             'total': float(cumulative_total)
         })
-    
-    chart_data_cumulative.reverse()  # Du plus ancien au plus récent
-    
-    # 2. Graphe par type de transaction (wallet vs espèces)
-    chart_data_by_type = []
-    today = timezone.now().date().replace(day=1)
-    
-    for i in range(12):
-        month_start = today - relativedelta(months=11 - i)
-        next_month = (month_start + relativedelta(months=1))
-        month_wallet_total = 0
-        month_cash_total = 0
-        
-        for location in business_locations:
-            wallet = getattr(location, 'wallet', None)
-            if wallet:
-                wallet_ct = ContentType.objects.get_for_model(wallet)
-                
-                # Transactions wallet
-                wallet_transactions = UserTransaction.objects.filter(
-                    wallet_content_type=wallet_ct,
-                    wallet_object_id=wallet.id,
-                    transaction_type='PAYMENT',
-                    status='COMPLETED',
-                    created_at__date__gte=month_start,
-                    created_at__date__lt=next_month
-                )
-                month_wallet_total += wallet_transactions.aggregate(total=Sum('amount'))['total'] or 0
-                
-                # Transactions espèces
-                cash_transactions = UserTransaction.objects.filter(
-                    wallet_content_type=wallet_ct,
-                    wallet_object_id=wallet.id,
-                    transaction_type='CASH_PAYMENT',
-                    status='COMPLETED',
-                    created_at__date__gte=month_start,
-                    created_at__date__lt=next_month
-                )
-                month_cash_total += cash_transactions.aggregate(total=Sum('amount'))['total'] or 0
-        
         chart_data_by_type.append({
             'month': month_start.strftime('%B %Y'),
             'wallet': float(month_wallet_total),
             'cash': float(month_cash_total)
         })
     
+    chart_data_cumulative.reverse()  # Du plus ancien au plus récent
     chart_data_by_type.reverse()  # Du plus ancien au plus récent
     
     # Traitement du retrait de fonds
@@ -2435,27 +2150,19 @@ def financial_dashboard(request):
             # Validation du montant
             if amount <= 0:
                 messages.error(request, _("Le montant doit être positif."))
-            elif amount > location.wallet.balance:
+            elif amount > location.wallet.available_balance:
                 messages.error(request, _("Le montant dépasse le solde disponible."))
             elif not request.user.check_password(password):
                 messages.error(request, _("Mot de passe incorrect."))
             else:
-                # Effectuer le retrait
-                from apps.wallets.services.wallet_service import WalletService
-                if WalletService.update_wallet_balance(location.wallet, amount, 'subtract'):
-                    # Créer la transaction de retrait
-                    UserTransaction.objects.create(
-                        wallet_content_type=ContentType.objects.get_for_model(location.wallet),
-                        wallet_object_id=location.wallet.id,
-                        transaction_type='WITHDRAWAL',
-                        amount=amount,
-                        status='COMPLETED',
-                        reference=f"WIT-{location.id}-{uuid.uuid4().hex[:8]}",
-                        description=f"Retrait de fonds - {location.name}",
-                        created_at=timezone.now()
-                    )
+                # Effectuer le retrait : l'argent sort de la plateforme (jambe sans wallet)
+                try:
+                    LedgerService.post([
+                        LedgerService.debit(location.wallet, amount, 'WITHDRAWAL'),
+                        LedgerService.credit(None, amount, 'WITHDRAWAL'),
+                    ], description=f"Retrait de fonds - {location.name}", content_object=location.wallet)
                     messages.success(request, f"Retrait de {amount:,.0f} XAF effectué avec succès.")
-                else:
+                except ValidationError:
                     messages.error(request, _("Erreur lors du retrait."))
                     
         except (BusinessLocation.DoesNotExist, ValueError, TypeError):
@@ -2468,9 +2175,9 @@ def financial_dashboard(request):
     for location in business_locations:
         wallet = getattr(location, 'wallet', None)
         if wallet:
-            wallet_ct = ContentType.objects.get_for_model(wallet)
+            wallet_ct = ContentTypeRegistry.id_for(wallet)
             withdrawals = UserTransaction.objects.filter(
-                wallet_content_type=wallet_ct,
+                wallet_content_type_id=wallet_ct,
                 wallet_object_id=wallet.id,
                 transaction_type='WITHDRAWAL',
                 status='COMPLETED'
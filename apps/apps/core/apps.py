@@ -7,6 +7,9 @@ class CoreConfig(AppConfig):
     verbose_name = 'Core'
 
     def ready(self):
+        from django.db.models.signals import post_migrate
+        from .utils.content_types import ContentTypeRegistry
+        post_migrate.connect(ContentTypeRegistry.clear, dispatch_uid='content_type_registry_clear')
         try:
             import apps.core.signals  # noqa
         except ImportError:
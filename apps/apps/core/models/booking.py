@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import TimeStampedModel
+from apps.core.utils import new_reference, save_with_reference
 from apps.wallets.models import UserTransaction
 from django.contrib.contenttypes.fields import GenericRelation
 
@@ -17,6 +18,8 @@ class Booking(TimeStampedModel):
         ('COMPLETED', _('Completed')),
         ('NO_SHOW', _('No Show'))
     ]
+    # Prefix of the booking references, overridden per booking type
+    REFERENCE_PREFIX = 'BK'
 
     transactions = GenericRelation(
         UserTransaction,
@@ -82,17 +85,20 @@ class Booking(TimeStampedModel):
         return f"Booking {self.booking_reference}"
 
     def save(self, *args, **kwargs):
-        if not self.booking_reference:
-            self.booking_reference = self.generate_booking_reference()
-        super().save(*args, **kwargs)
+        if self.booking_reference:
+            super().save(*args, **kwargs)
+        else:
+            save_with_reference(
+                self, self.generate_booking_reference, super().save,
+                *args, field='booking_reference', **kwargs
+            )
 
     def generate_booking_reference(self):
         """
-        Generate a unique booking reference.
-        Should be overridden in child classes for specific prefixes.
+        Generate a time-ordered booking reference.
+        Child classes set REFERENCE_PREFIX for their specific prefix.
         """
-        from django.utils.crypto import get_random_string
-        return f"BK{get_random_string(8).upper()}"
+        return new_reference(self.REFERENCE_PREFIX)
 
     def is_cancellable(self):
         """Check if booking can be cancelled"""
@@ -0,0 +1,13 @@
+from .slugs import SlugAllocator, unique_slugify, save_with_unique_slug
+from .references import new_ulid, new_reference, save_with_reference
+from .content_types import ContentTypeRegistry
+
+__all__ = [
+    'SlugAllocator',
+    'unique_slugify',
+    'save_with_unique_slug',
+    'new_ulid',
+    'new_reference',
+    'save_with_reference',
+    'ContentTypeRegistry',
+]
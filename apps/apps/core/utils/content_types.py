@@ -0,0 +1,55 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+
+
+class ContentTypeRegistry:
+    """
+    Content type ids of the models used in generic wallet and ledger relations.
+
+    The ids of every registered model are resolved together with one query
+    the first time one is needed, then served from the process; queries
+    filter on ``*_content_type_id`` so they use the composite indexes
+    without a join or a lookup per row.
+    """
+
+    MODELS = (
+        'wallets.UserWallet',
+        'wallets.BusinessWallet',
+        'wallets.BusinessLocationWallet',
+        'rooms.RoomBooking',
+        'vehicles.VehicleBooking',
+        'tours.TourBooking',
+        'orders.RestaurantOrder',
+    )
+
+    _ids = {}
+
+    @classmethod
+    def load(cls):
+        """Resolve the ids of all registered models in one query."""
+        models = [apps.get_model(label) for label in cls.MODELS]
+        content_types = ContentType.objects.get_for_models(*models, for_concrete_models=False)
+        cls._ids = {model: content_type.pk for model, content_type in content_types.items()}
+        return cls._ids
+
+    @classmethod
+    def id_for(cls, model):
+        """
+        Content type id of a model class or instance.
+
+        Models outside the registry are resolved through the content type
+        cache of Django and kept as well.
+        """
+        model = model._meta.model
+        if not cls._ids:
+            cls.load()
+        content_type_id = cls._ids.get(model)
+        if content_type_id is None:
+            content_type_id = ContentType.objects.get_for_model(model, for_concrete_model=False).pk
+            cls._ids[model] = content_type_id
+        return content_type_id
+
+    @classmethod
+    def clear(cls, **kwargs):
+        """Forget the ids, e.g. after a migration or a test database flush."""
+        cls._ids = {}
@@ -0,0 +1,61 @@
+"""
+Time-ordered references for orders, bookings and transactions.
+"""
+import secrets
+import time
+
+from django.db import IntegrityError, transaction
+
+# Crockford base32, as used by ULIDs (no I, L, O or U)
+ALPHABET = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+RANDOM_BITS = 80
+
+
+def new_ulid(timestamp_ms=None):
+    """
+    Generate a ULID: 48 bits of milliseconds followed by 80 random bits.
+
+    The 26 character string sorts in creation order and collisions need two
+    references drawn in the same millisecond with the same 80 random bits,
+    so callers do not have to look for an existing row before inserting.
+
+    Args:
+        timestamp_ms: Milliseconds since the epoch (defaults to now)
+
+    Returns:
+        str: The ULID in Crockford base32
+    """
+    if timestamp_ms is None:
+        timestamp_ms = time.time_ns() // 1_000_000
+    value = (timestamp_ms << RANDOM_BITS) | secrets.randbits(RANDOM_BITS)
+    return ''.join(ALPHABET[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+
+def new_reference(prefix=''):
+    """Return ``prefix`` followed by a new ULID."""
+    return f'{prefix}{new_ulid()}'
+
+
+def save_with_reference(instance, generate, save, *args, field='reference',
+                        attempts=3, **kwargs):
+    """
+    Fill the reference of ``instance`` and save it, retrying on a collision.
+
+    The unique index is the only check: the save runs in a savepoint and a
+    fresh reference is drawn if the insert hits an IntegrityError.
+
+    Args:
+        instance: The model instance being saved
+        generate: Callable returning a new reference
+        save: The save callable (usually ``super().save``)
+        field: Name of the reference field
+        attempts: Number of references tried before giving up
+    """
+    for attempt in range(attempts):
+        setattr(instance, field, generate())
+        try:
+            with transaction.atomic():
+                return save(*args, **kwargs)
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
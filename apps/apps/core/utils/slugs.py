@@ -0,0 +1,105 @@
+"""
+Unique slug allocation shared by models with slug fields.
+"""
+from django.db import IntegrityError, transaction
+from django.utils.text import slugify
+
+# Room kept at the end of a truncated slug for a "-<n>" suffix
+SUFFIX_ROOM = 8
+
+
+class SlugAllocator:
+    """
+    Allocate unique slugs within a queryset.
+
+    Taken slugs sharing a prefix are loaded with one query the first time the
+    prefix is seen and cached afterwards, so allocating slugs for many
+    similarly named objects costs one query per distinct prefix instead of
+    one query per collision.
+    """
+
+    def __init__(self, queryset, slug_field='slug', max_length=None):
+        self.queryset = queryset
+        self.slug_field = slug_field
+        self.max_length = max_length or queryset.model._meta.get_field(slug_field).max_length
+        self._taken = {}
+        self._next = {}
+
+    def _base(self, value):
+        base = slugify(value) or self.queryset.model._meta.model_name
+        return base[:self.max_length].strip('-')
+
+    def _taken_for(self, prefix):
+        if prefix not in self._taken:
+            self._taken[prefix] = set(
+                self.queryset.filter(
+                    **{f'{self.slug_field}__startswith': prefix}
+                ).values_list(self.slug_field, flat=True)
+            )
+        return self._taken[prefix]
+
+    def allocate(self, value):
+        """Return the first free slug for ``value`` and reserve it."""
+        base = self._base(value)
+        prefix = base[:self.max_length - SUFFIX_ROOM]
+        taken = self._taken_for(prefix)
+
+        slug = base
+        counter = self._next.get(base, 1)
+        while slug in taken:
+            suffix = f'-{counter}'
+            slug = f"{base[:self.max_length - len(suffix)].rstrip('-')}{suffix}"
+            counter += 1
+        self._next[base] = counter
+
+        # Reserve the slug in every cached prefix it falls under
+        for cached_prefix, cached in self._taken.items():
+            if slug.startswith(cached_prefix):
+                cached.add(slug)
+        return slug
+
+
+def unique_slugify(instance, value, slug_field='slug', queryset=None):
+    """
+    Generate a slug for ``instance`` that is unique within ``queryset``.
+
+    Args:
+        instance: The model instance being saved
+        value: The text to slugify (usually the name)
+        slug_field: Name of the slug field
+        queryset: Scope of uniqueness (defaults to every row of the model)
+
+    Returns:
+        str: A free slug
+    """
+    if queryset is None:
+        queryset = instance.__class__._default_manager.all()
+    if instance.pk:
+        queryset = queryset.exclude(pk=instance.pk)
+    return SlugAllocator(queryset, slug_field=slug_field).allocate(value)
+
+
+def save_with_unique_slug(instance, value, save, *args, slug_field='slug',
+                          queryset=None, attempts=3, **kwargs):
+    """
+    Fill the slug of ``instance`` and save it, retrying on a slug collision.
+
+    Another request can take the same slug between allocation and insert;
+    the save then runs in a savepoint and is retried with a fresh slug.
+
+    Args:
+        instance: The model instance being saved
+        value: The text to slugify
+        save: The save callable (usually ``super().save``)
+        slug_field: Name of the slug field
+        queryset: Scope of uniqueness (defaults to every row of the model)
+        attempts: Number of allocations tried before giving up
+    """
+    for attempt in range(attempts):
+        setattr(instance, slug_field, unique_slugify(instance, value, slug_field, queryset))
+        try:
+            with transaction.atomic():
+                return save(*args, **kwargs)
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
@@ -2,7 +2,7 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
 
-from .models import GuideProfile
+from .models import GuideProfile, GuideAssignment
 
 
 @admin.register(GuideProfile)
@@ -67,4 +67,28 @@ class GuideProfileAdmin(admin.ModelAdmin):
             ),
             'classes': ('collapse',)
         })
-    ]
\ No newline at end of file
+    ]
+
+
+@admin.register(GuideAssignment)
+class GuideAssignmentAdmin(admin.ModelAdmin):
+    """Admin interface for guide assignments."""
+    list_display = [
+        'guide',
+        'tour_schedule',
+        'business_location',
+        'start_datetime',
+        'end_datetime',
+        'status'
+    ]
+    list_filter = [
+        'status',
+        'business_location',
+        'start_datetime'
+    ]
+    search_fields = [
+        'guide__user__email',
+        'guide__user__first_name',
+        'guide__user__last_name'
+    ]
+    raw_id_fields = ['guide', 'tour_schedule']
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.2 on 2026-10-19 02:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0010_businesslocationdocument'),
+        ('guides', '0001_initial'),
+        ('tours', '0007_remove_touractivityimage_activity_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GuideAssignment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when this record was created', verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when this record was last updated', verbose_name='Updated At')),
+                ('start_datetime', models.DateTimeField(verbose_name='start date and time')),
+                ('end_datetime', models.DateTimeField(verbose_name='end date and time')),
+                ('status', models.CharField(choices=[('ASSIGNED', 'Assigned'), ('CANCELLED', 'Cancelled')], default='ASSIGNED', max_length=20, verbose_name='status')),
+                ('business_location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='guide_assignments', to='business.businesslocation', verbose_name='business location')),
+                ('guide', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='assignments', to='guides.guideprofile', verbose_name='guide')),
+                ('tour_schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='guide_assignments', to='tours.tourschedule', verbose_name='tour schedule')),
+            ],
+            options={
+                'verbose_name': 'guide assignment',
+                'verbose_name_plural': 'guide assignments',
+                'db_table': 'guide_assignment',
+                'ordering': ['start_datetime'],
+                'indexes': [models.Index(fields=['business_location', 'start_datetime', 'end_datetime'], name='guide_assig_busines_d1142f_idx'), models.Index(fields=['guide', 'start_datetime', 'end_datetime'], name='guide_assig_guide_i_eccc3d_idx')],
+                'unique_together': {('guide', 'tour_schedule')},
+            },
+        ),
+    ]
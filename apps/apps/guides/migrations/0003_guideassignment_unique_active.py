@@ -0,0 +1,23 @@
+# Generated by Django 5.2.2 on 2026-10-19 03:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0010_businesslocationdocument'),
+        ('guides', '0002_guideassignment'),
+        ('tours', '0007_remove_touractivityimage_activity_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='guideassignment',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='guideassignment',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'ASSIGNED')), fields=('guide', 'tour_schedule'), name='guide_assignment_unique_active'),
+        ),
+    ]
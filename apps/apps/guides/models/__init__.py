@@ -1,7 +1,9 @@
 """Guide app models."""
 from .profile import GuideProfile
+from .assignment import GuideAssignment
 
 
 __all__ = [
     'GuideProfile',
+    'GuideAssignment',
 ]
@@ -0,0 +1,73 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.models import TimeStampedModel
+from apps.business.models import BusinessLocation
+from .profile import GuideProfile
+
+
+class GuideAssignment(TimeStampedModel):
+    """Assignment of a guide to a scheduled tour departure."""
+    STATUS_CHOICES = [
+        ('ASSIGNED', _('Assigned')),
+        ('CANCELLED', _('Cancelled')),
+    ]
+
+    guide = models.ForeignKey(
+        GuideProfile,
+        on_delete=models.CASCADE,
+        related_name='assignments',
+        verbose_name=_('guide')
+    )
+
+    tour_schedule = models.ForeignKey(
+        'tours.TourSchedule',
+        on_delete=models.CASCADE,
+        related_name='guide_assignments',
+        verbose_name=_('tour schedule')
+    )
+
+    # Denormalized from the guide and the schedule so calendar lookups are
+    # a single range query on this table.
+    business_location = models.ForeignKey(
+        BusinessLocation,
+        on_delete=models.CASCADE,
+        related_name='guide_assignments',
+        verbose_name=_('business location')
+    )
+
+    start_datetime = models.DateTimeField(
+        _('start date and time')
+    )
+
+    end_datetime = models.DateTimeField(
+        _('end date and time')
+    )
+
+    status = models.CharField(
+        _('status'),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='ASSIGNED'
+    )
+
+    class Meta:
+        verbose_name = _('guide assignment')
+        verbose_name_plural = _('guide assignments')
+        db_table = 'guide_assignment'
+        ordering = ['start_datetime']
+        # A cancelled assignment does not keep the guide from being assigned again
+        constraints = [
+            models.UniqueConstraint(
+                fields=['guide', 'tour_schedule'],
+                condition=models.Q(status='ASSIGNED'),
+                name='guide_assignment_unique_active'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['business_location', 'start_datetime', 'end_datetime']),
+            models.Index(fields=['guide', 'start_datetime', 'end_datetime']),
+        ]
+
+    def __str__(self):
+        return f'{self.guide.full_name}: {self.start_datetime} - {self.end_datetime}'
@@ -2,7 +2,7 @@
 from rest_framework import serializers
 
 from apps.users.serializers import UserSerializer
-from .models import GuideProfile
+from .models import GuideProfile, GuideAssignment
 
 
 class GuideProfileSerializer(serializers.ModelSerializer):
@@ -66,4 +66,38 @@ class GuideVerificationSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = GuideProfile
-        fields = ['verification_document'] 
\ No newline at end of file
+        fields = ['verification_document']
+
+
+class GuideAssignmentSerializer(serializers.ModelSerializer):
+    """Serializer for guide assignments."""
+    guide_name = serializers.CharField(source='guide.full_name', read_only=True)
+
+    class Meta:
+        model = GuideAssignment
+        fields = [
+            'id',
+            'guide',
+            'guide_name',
+            'tour_schedule',
+            'business_location',
+            'start_datetime',
+            'end_datetime',
+            'status',
+            'created_at'
+        ]
+        read_only_fields = [
+            'id',
+            'business_location',
+            'start_datetime',
+            'end_datetime',
+            'status',
+            'created_at'
+        ]
+
+
+class GuideWeekAssignmentSerializer(serializers.Serializer):
+    """Serializer for the weekly assignment solver parameters."""
+    business_location = serializers.IntegerField()
+    week_start = serializers.DateTimeField()
+    dry_run = serializers.BooleanField(default=False)
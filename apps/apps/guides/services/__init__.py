@@ -6,6 +6,15 @@ from .guide_services import (
     get_guide_profile,
     get_verified_guides
 )
+from .assignment_services import (
+    GuideIntervalIndex,
+    assign_guide,
+    assign_week,
+    build_interval_index,
+    cancel_schedule_assignments,
+    get_location_calendar,
+    sync_schedule_assignments
+)
 
 
 __all__ = [
@@ -13,5 +22,12 @@ __all__ = [
     'update_guide_profile',
     'verify_guide_profile',
     'get_guide_profile',
-    'get_verified_guides'
+    'get_verified_guides',
+    'GuideIntervalIndex',
+    'assign_guide',
+    'assign_week',
+    'build_interval_index',
+    'cancel_schedule_assignments',
+    'get_location_calendar',
+    'sync_schedule_assignments'
 ] 
\ No newline at end of file
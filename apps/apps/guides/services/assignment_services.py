@@ -0,0 +1,301 @@
+"""Guide assignment and availability services."""
+import logging
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from ..models import GuideAssignment, GuideProfile
+
+logger = logging.getLogger(__name__)
+
+
+class GuideIntervalIndex:
+    """In-memory index of busy intervals, kept sorted per guide.
+
+    A guide's assignments never overlap, so sorting by start also sorts by
+    end and an overlap check is a single bisection.
+    """
+
+    def __init__(self):
+        self._starts = defaultdict(list)
+        self._intervals = defaultdict(list)
+        self.busy_minutes = defaultdict(float)
+
+    def add(self, guide_id: int, start: datetime, end: datetime):
+        """Record a busy interval for a guide."""
+        index = bisect_left(self._starts[guide_id], start)
+        self._starts[guide_id].insert(index, start)
+        self._intervals[guide_id].insert(index, (start, end))
+        self.busy_minutes[guide_id] += (end - start).total_seconds() / 60
+
+    def is_free(self, guide_id: int, start: datetime, end: datetime) -> bool:
+        """Check whether a guide has no interval overlapping [start, end)."""
+        starts = self._starts[guide_id]
+        index = bisect_left(starts, end)
+        if index == 0:
+            return True
+        return self._intervals[guide_id][index - 1][1] <= start
+
+    def intervals(self, guide_id: int) -> List[Tuple[datetime, datetime]]:
+        """Get the sorted busy intervals of a guide."""
+        return list(self._intervals[guide_id])
+
+
+def get_schedule_interval(schedule) -> Tuple[datetime, datetime]:
+    """Get the [start, end) interval of a tour departure.
+
+    Departures without an explicit end last the tour duration.
+    """
+    end = schedule.end_datetime or (
+        schedule.start_datetime + timedelta(minutes=schedule.tour.duree)
+    )
+    return schedule.start_datetime, end
+
+
+def cancel_schedule_assignments(schedule_ids) -> int:
+    """Release the guides of cancelled departures.
+
+    Args:
+        schedule_ids: Primary keys of the cancelled departures
+
+    Returns:
+        The number of assignments cancelled
+    """
+    return GuideAssignment.objects.filter(
+        tour_schedule_id__in=schedule_ids,
+        status='ASSIGNED'
+    ).update(status='CANCELLED', updated_at=timezone.now())
+
+
+@transaction.atomic
+def sync_schedule_assignments(tour_schedule) -> Dict[str, int]:
+    """Bring the assignments of an edited departure in step with it.
+
+    The assignments of a cancelled departure are cancelled. Otherwise the
+    departure interval is copied onto them, and an assignment the new
+    interval makes overlap another one of its guide is cancelled, so the
+    guide is never double-booked and the departure shows as unassigned
+    to ``assign_week``.
+
+    Returns:
+        Dict with the number of ``updated`` and ``cancelled`` assignments
+    """
+    if tour_schedule.status == 'CANCELLED':
+        return {'updated': 0, 'cancelled': cancel_schedule_assignments([tour_schedule.pk])}
+
+    start, end = get_schedule_interval(tour_schedule)
+    moved = GuideAssignment.objects.filter(
+        tour_schedule=tour_schedule,
+        status='ASSIGNED'
+    ).exclude(start_datetime=start, end_datetime=end)
+    guide_ids = list(moved.values_list('guide_id', flat=True))
+    if not guide_ids:
+        return {'updated': 0, 'cancelled': 0}
+
+    # Same lock as assign_guide: the overlap check sees every committed assignment
+    list(GuideProfile.objects.select_for_update().filter(pk__in=guide_ids).order_by('pk').values_list('pk'))
+    updated = GuideAssignment.objects.filter(
+        tour_schedule=tour_schedule,
+        guide_id__in=guide_ids
+    ).update(start_datetime=start, end_datetime=end, updated_at=timezone.now())
+
+    double_booked = GuideAssignment.objects.filter(
+        guide_id__in=guide_ids,
+        status='ASSIGNED',
+        start_datetime__lt=end,
+        end_datetime__gt=start
+    ).exclude(tour_schedule=tour_schedule).values_list('guide_id', flat=True)
+    cancelled = GuideAssignment.objects.filter(
+        tour_schedule=tour_schedule,
+        guide_id__in=list(double_booked),
+        status='ASSIGNED'
+    ).update(status='CANCELLED', updated_at=timezone.now())
+    if cancelled:
+        logger.warning(
+            'Departure %s moved over other assignments: %s guide assignment(s) cancelled',
+            tour_schedule.pk, cancelled
+        )
+    return {'updated': updated, 'cancelled': cancelled}
+
+
+def build_interval_index(business_location, start: datetime,
+                         end: datetime) -> GuideIntervalIndex:
+    """Build the interval index of a location's guides from one range query.
+
+    Args:
+        business_location: The business location whose guides are indexed
+        start: Start of the range
+        end: End of the range
+
+    Returns:
+        The interval index of active assignments overlapping the range
+    """
+    index = GuideIntervalIndex()
+    rows = GuideAssignment.objects.filter(
+        business_location=business_location,
+        status='ASSIGNED',
+        start_datetime__lt=end,
+        end_datetime__gt=start
+    ).values_list('guide_id', 'start_datetime', 'end_datetime')
+    for guide_id, busy_start, busy_end in rows:
+        index.add(guide_id, busy_start, busy_end)
+    return index
+
+
+@transaction.atomic
+def assign_guide(guide: GuideProfile, tour_schedule) -> GuideAssignment:
+    """Assign a guide to a tour departure, refusing double bookings.
+
+    Args:
+        guide: The guide to assign
+        tour_schedule: The departure to assign the guide to
+
+    Returns:
+        The created assignment
+
+    Raises:
+        ValidationError: If the guide is not verified or works for another
+            location (code ``invalid``), or is already busy during the
+            departure (code ``conflict``)
+    """
+    if not guide.is_verified:
+        raise ValidationError(_('Only verified guides can be assigned.'), code='invalid')
+    if tour_schedule.tour.business_location_id != guide.business_location_id:
+        raise ValidationError(
+            _('The guide and the tour must belong to the same business location.'), code='invalid'
+        )
+
+    # Lock the guide row so concurrent assignments are checked one at a time
+    GuideProfile.objects.select_for_update().filter(pk=guide.pk).exists()
+
+    start, end = get_schedule_interval(tour_schedule)
+    conflict = GuideAssignment.objects.filter(
+        guide=guide,
+        status='ASSIGNED',
+        start_datetime__lt=end,
+        end_datetime__gt=start
+    ).exists()
+    if conflict:
+        raise ValidationError(_('This guide is already assigned during this departure.'), code='conflict')
+
+    return GuideAssignment.objects.create(
+        guide=guide,
+        tour_schedule=tour_schedule,
+        business_location=guide.business_location,
+        start_datetime=start,
+        end_datetime=end
+    )
+
+
+@transaction.atomic
+def assign_week(business_location, week_start: datetime,
+                commit: bool = True) -> Dict[str, list]:
+    """Assign guides to every unassigned departure of a location for a week.
+
+    Departures are processed by start time (interval partitioning); each one
+    goes to the free verified guide with the fewest busy minutes, which
+    spreads the load across guides.
+
+    Args:
+        business_location: The business location to plan
+        week_start: Start of the week to plan
+        commit: Whether to save the assignments
+
+    Returns:
+        Dict with ``assigned`` assignments and ``unassigned`` departures
+    """
+    from apps.tours.models import TourSchedule
+
+    week_end = week_start + timedelta(days=7)
+
+    guides = list(
+        GuideProfile.objects.select_for_update().filter(
+            business_location=business_location,
+            is_verified=True
+        ).order_by('pk')
+    )
+
+    departures = list(
+        TourSchedule.objects.filter(
+            tour__business_location=business_location,
+            status__in=['SCHEDULED', 'CONFIRMED'],
+            start_datetime__gte=week_start,
+            start_datetime__lt=week_end
+        ).exclude(
+            guide_assignments__status='ASSIGNED'
+        ).select_related('tour').order_by('start_datetime')
+    )
+
+    intervals = [get_schedule_interval(schedule) for schedule in departures]
+    range_end = max([week_end] + [interval[1] for interval in intervals])
+    index = build_interval_index(business_location, week_start, range_end)
+
+    assigned = []
+    unassigned = []
+    for schedule, (start, end) in zip(departures, intervals):
+        free_guides = [g for g in guides if index.is_free(g.pk, start, end)]
+        if not free_guides:
+            unassigned.append(schedule)
+            continue
+
+        guide = min(free_guides, key=lambda g: (index.busy_minutes[g.pk], g.pk))
+        index.add(guide.pk, start, end)
+        assigned.append(GuideAssignment(
+            guide=guide,
+            tour_schedule=schedule,
+            business_location=business_location,
+            start_datetime=start,
+            end_datetime=end
+        ))
+
+    if commit:
+        GuideAssignment.objects.bulk_create(assigned)
+
+    return {'assigned': assigned, 'unassigned': unassigned}
+
+
+def get_location_calendar(business_location, start: datetime, end: datetime,
+                          guide: Optional[GuideProfile] = None) -> List[Dict]:
+    """Get the busy intervals of every guide of a location over a range.
+
+    All intervals come from a single range query on the assignment table.
+
+    Args:
+        business_location: The business location
+        start: Start of the range
+        end: End of the range
+        guide: Optionally restrict the calendar to one guide
+
+    Returns:
+        List of guides with their busy intervals
+    """
+    assignments = GuideAssignment.objects.filter(
+        business_location=business_location,
+        status='ASSIGNED',
+        start_datetime__lt=end,
+        end_datetime__gt=start
+    ).select_related('guide__user', 'tour_schedule__tour').order_by('guide_id', 'start_datetime')
+    if guide is not None:
+        assignments = assignments.filter(guide=guide)
+
+    calendar = {}
+    for assignment in assignments:
+        entry = calendar.setdefault(assignment.guide_id, {
+            'guide_id': assignment.guide_id,
+            'guide_name': assignment.guide.full_name,
+            'busy': []
+        })
+        entry['busy'].append({
+            'assignment_id': assignment.pk,
+            'tour_schedule_id': assignment.tour_schedule_id,
+            'tour': assignment.tour_schedule.tour.nom_balade,
+            'start': assignment.start_datetime,
+            'end': assignment.end_datetime,
+        })
+    return list(calendar.values())
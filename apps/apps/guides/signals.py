@@ -1 +1,12 @@
- 
\ No newline at end of file
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.tours.models import TourSchedule
+from .services.assignment_services import sync_schedule_assignments
+
+
+@receiver(post_save, sender=TourSchedule)
+def tour_schedule_post_save(sender, instance, created, **kwargs):
+    """Keep the guide assignments in step with the edited (or cancelled) departure."""
+    if not created:
+        sync_schedule_assignments(instance)
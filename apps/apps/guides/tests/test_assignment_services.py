@@ -0,0 +1,188 @@
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.business.models import Business, BusinessLocation
+from apps.guides.models import GuideAssignment, GuideProfile
+from apps.guides.services import GuideIntervalIndex, assign_guide, assign_week, build_interval_index
+from apps.tours.models import Tour, TourSchedule
+
+User = get_user_model()
+
+
+class GuideIntervalIndexTest(SimpleTestCase):
+    """Test cases for the in-memory busy interval index."""
+
+    def setUp(self):
+        self.day = datetime(2026, 3, 2, 8, 0)
+        self.index = GuideIntervalIndex()
+        self.index.add(1, self.day + timedelta(hours=4), self.day + timedelta(hours=6))
+        self.index.add(1, self.day, self.day + timedelta(hours=2))
+
+    def at(self, start, end):
+        return self.day + timedelta(hours=start), self.day + timedelta(hours=end)
+
+    def test_intervals_are_sorted(self):
+        self.assertEqual(self.index.intervals(1), [self.at(0, 2), self.at(4, 6)])
+        self.assertEqual(self.index.busy_minutes[1], 240)
+
+    def test_overlaps_are_busy(self):
+        self.assertFalse(self.index.is_free(1, *self.at(1, 3)))
+        self.assertFalse(self.index.is_free(1, *self.at(3, 5)))
+        self.assertFalse(self.index.is_free(1, *self.at(-1, 7)))
+
+    def test_adjacent_and_gap_intervals_are_free(self):
+        self.assertTrue(self.index.is_free(1, *self.at(2, 4)))
+        self.assertTrue(self.index.is_free(1, *self.at(6, 8)))
+        self.assertTrue(self.index.is_free(1, *self.at(-2, 0)))
+        self.assertTrue(self.index.is_free(2, *self.at(0, 6)))
+
+
+class GuideAssignmentTest(TestCase):
+    """Test cases for the assignment of guides to tour departures."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass', email='o@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.owner, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = self.create_location(business, 'Kribi Tours')
+        self.tour = Tour.objects.create(
+            business_location=self.location, nom_balade='Circuit', description='d', duree=120
+        )
+        self.week_start = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=7)
+
+    def create_location(self, business, name):
+        return BusinessLocation.objects.create(
+            business=business, owner=self.owner, name=name, registration_number=f'REG-{name}',
+            city='Kribi', region='Sud', business_location_type='tour'
+        )
+
+    def create_guide(self, username, location=None, is_verified=True):
+        user = User.objects.create_user(username=username, password='pass', email=f'{username}@example.com')
+        return GuideProfile.objects.create(
+            user=user, business_location=location or self.location, is_verified=is_verified
+        )
+
+    def create_schedule(self, hours, tour=None):
+        return TourSchedule.objects.create(
+            tour=tour or self.tour, start_datetime=self.week_start + timedelta(hours=hours), available_spots=10
+        )
+
+    def test_week_solver_spreads_departures_over_free_guides(self):
+        first, second = self.create_guide('first'), self.create_guide('second')
+        self.create_guide('unverified', is_verified=False)
+        morning, overlapping, afternoon = self.create_schedule(9), self.create_schedule(10), self.create_schedule(14)
+        busy = self.create_schedule(33)
+        assign_guide(first, busy)
+
+        result = assign_week(self.location, self.week_start)
+
+        self.assertEqual(result['unassigned'], [])
+        assigned = {a.tour_schedule_id: a.guide_id for a in result['assigned']}
+        self.assertEqual(assigned[morning.pk], second.pk)
+        self.assertEqual(assigned[overlapping.pk], first.pk)
+        self.assertNotIn(busy.pk, assigned)
+        self.assertEqual(assigned[afternoon.pk], second.pk)
+        self.assertEqual(GuideAssignment.objects.filter(status='ASSIGNED').count(), 4)
+
+    def test_week_solver_reports_departures_without_free_guide(self):
+        self.create_guide('only')
+        first, second = self.create_schedule(9), self.create_schedule(10)
+
+        result = assign_week(self.location, self.week_start, commit=False)
+
+        self.assertEqual([a.tour_schedule_id for a in result['assigned']], [first.pk])
+        self.assertEqual(result['unassigned'], [second])
+        self.assertFalse(GuideAssignment.objects.exists())
+
+    def test_unverified_or_foreign_guide_is_refused(self):
+        schedule = self.create_schedule(9)
+        other_location = self.create_location(self.location.business, 'Limbe Tours')
+        for guide in (self.create_guide('unverified', is_verified=False),
+                      self.create_guide('foreign', location=other_location)):
+            with self.assertRaises(ValidationError) as context:
+                assign_guide(guide, schedule)
+            self.assertEqual(context.exception.code, 'invalid')
+        self.assertFalse(GuideAssignment.objects.exists())
+
+    def test_guide_can_be_assigned_again_after_a_cancellation(self):
+        guide, schedule = self.create_guide('guide'), self.create_schedule(9)
+        assignment = assign_guide(guide, schedule)
+        with self.assertRaises(ValidationError):
+            assign_guide(guide, schedule)
+
+        assignment.status = 'CANCELLED'
+        assignment.save()
+        self.client.force_login(self.owner)
+        response = self.client.post(
+            reverse('guides:api_assignment_create'), {'guide': guide.pk, 'tour_schedule': schedule.pk}
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(GuideAssignment.objects.filter(guide=guide, tour_schedule=schedule).count(), 2)
+
+    def test_foreign_tour_is_a_bad_request(self):
+        guide = self.create_guide('guide')
+        other_location = self.create_location(self.location.business, 'Limbe Tours')
+        other_tour = Tour.objects.create(business_location=other_location, nom_balade='Plage', description='d')
+        self.client.force_login(self.owner)
+        response = self.client.post(
+            reverse('guides:api_assignment_create'),
+            {'guide': guide.pk, 'tour_schedule': self.create_schedule(9, tour=other_tour).pk}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_schedule_edit_moves_its_assignments(self):
+        guide, schedule = self.create_guide('guide'), self.create_schedule(9)
+        assignment = assign_guide(guide, schedule)
+
+        schedule.start_datetime += timedelta(hours=3)
+        schedule.save()
+
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.start_datetime, schedule.start_datetime)
+        self.assertEqual(assignment.end_datetime, schedule.start_datetime + timedelta(minutes=120))
+
+    def test_cancelled_schedule_releases_its_guide(self):
+        guide, schedule = self.create_guide('guide'), self.create_schedule(9)
+        assignment = assign_guide(guide, schedule)
+
+        schedule.status = 'CANCELLED'
+        schedule.save()
+
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.status, 'CANCELLED')
+        index = build_interval_index(self.location, self.week_start, self.week_start + timedelta(days=1))
+        self.assertEqual(index.intervals(guide.pk), [])
+        assign_guide(guide, self.create_schedule(9))
+
+    def test_schedule_moved_over_another_assignment_is_released(self):
+        guide, kept, moved = self.create_guide('guide'), self.create_schedule(9), self.create_schedule(14)
+        assign_guide(guide, kept)
+        assignment = assign_guide(guide, moved)
+
+        moved.start_datetime = kept.start_datetime + timedelta(hours=1)
+        with self.assertLogs('apps.guides.services.assignment_services', 'WARNING'):
+            moved.save()
+
+        assignment.refresh_from_db()
+        self.assertEqual((assignment.status, assignment.start_datetime), ('CANCELLED', moved.start_datetime))
+        self.assertEqual(GuideAssignment.objects.get(tour_schedule=kept).status, 'ASSIGNED')
+        result = assign_week(self.location, self.week_start, commit=False)
+        self.assertEqual(result['unassigned'], [moved])
+
+    def test_calendar_rejects_a_non_integer_location(self):
+        self.client.force_login(self.owner)
+        params = {'start': self.week_start.isoformat(), 'end': (self.week_start + timedelta(days=7)).isoformat()}
+        response = self.client.get(reverse('guides:api_calendar'), {**params, 'business_location': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+        assign_guide(self.create_guide('guide'), self.create_schedule(9))
+        response = self.client.get(reverse('guides:api_calendar'), {**params, 'business_location': self.location.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()[0]['busy']), 1)
@@ -7,6 +7,11 @@ from .views.web import (
     GuideProfileDetailView,
     GuideProfileListView
 )
+from .views.api import (
+    GuideCalendarAPIView,
+    GuideAssignmentCreateAPIView,
+    GuideWeekAssignmentAPIView
+)
 
 app_name = 'guides'
 
@@ -17,4 +22,9 @@ urlpatterns = [
     path('profile/', GuideProfileDetailView.as_view(), name='profile_detail'),
     path('profile/<int:pk>/', GuideProfileDetailView.as_view(), name='profile_detail_by_id'),
     path('profiles/', GuideProfileListView.as_view(), name='profile_list'),
+
+    # Guide assignment API
+    path('api/calendar/', GuideCalendarAPIView.as_view(), name='api_calendar'),
+    path('api/assignments/', GuideAssignmentCreateAPIView.as_view(), name='api_assignment_create'),
+    path('api/assignments/week/', GuideWeekAssignmentAPIView.as_view(), name='api_assignment_week'),
 ] 
\ No newline at end of file
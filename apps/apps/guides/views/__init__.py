@@ -11,7 +11,10 @@ from .api import (
     GuideProfileDetailAPIView,
     GuideProfileUpdateAPIView,
     GuideProfileVerificationAPIView,
-    GuideProfileMyAPIView
+    GuideProfileMyAPIView,
+    GuideCalendarAPIView,
+    GuideAssignmentCreateAPIView,
+    GuideWeekAssignmentAPIView
 )
 
 
@@ -27,5 +30,8 @@ __all__ = [
     'GuideProfileDetailAPIView',
     'GuideProfileUpdateAPIView',
     'GuideProfileVerificationAPIView',
-    'GuideProfileMyAPIView'
+    'GuideProfileMyAPIView',
+    'GuideCalendarAPIView',
+    'GuideAssignmentCreateAPIView',
+    'GuideWeekAssignmentAPIView'
 ]
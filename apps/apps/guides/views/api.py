@@ -1,22 +1,32 @@
 """Guide app API views."""
 from rest_framework import generics, permissions, status
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from django.shortcuts import get_object_or_404
+from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy as _
 
+from apps.business.models import BusinessLocation
 from ..models import GuideProfile
 from ..serializers import (
     GuideProfileSerializer,
     GuideProfileCreateSerializer,
     GuideProfileUpdateSerializer,
-    GuideVerificationSerializer
+    GuideVerificationSerializer,
+    GuideAssignmentSerializer,
+    GuideWeekAssignmentSerializer
 )
 from ..services import (
     create_guide_profile,
     update_guide_profile,
     verify_guide_profile,
     get_guide_profile,
-    get_verified_guides
+    get_verified_guides,
+    assign_guide,
+    assign_week,
+    get_location_calendar
 )
 
 
@@ -85,4 +95,83 @@ class GuideProfileMyAPIView(generics.RetrieveAPIView):
 
     def get_object(self):
         """Get the current user's guide profile."""
-        return get_object_or_404(GuideProfile, user=self.request.user) 
\ No newline at end of file
+        return get_object_or_404(GuideProfile, user=self.request.user)
+
+
+def _get_managed_location(user, location_id):
+    """Get a business location the user owns, or raise 404."""
+    location = get_object_or_404(BusinessLocation, pk=location_id)
+    if not user.is_superuser and user not in (location.owner, location.business.owner):
+        raise PermissionDenied
+    return location
+
+
+class GuideCalendarAPIView(generics.GenericAPIView):
+    """API view returning busy intervals of all guides of a business location."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        start = parse_datetime(request.query_params.get('start', ''))
+        end = parse_datetime(request.query_params.get('end', ''))
+        if not start or not end or start >= end:
+            return Response(
+                {'error': _('Valid start and end datetimes are required.')},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            location_id = int(request.query_params.get('business_location', ''))
+        except ValueError:
+            return Response(
+                {'error': _('business_location must be an integer.')},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        location = _get_managed_location(request.user, location_id)
+        return Response(get_location_calendar(location, start, end))
+
+
+class GuideAssignmentCreateAPIView(generics.CreateAPIView):
+    """API view for assigning a guide to a tour departure."""
+    serializer_class = GuideAssignmentSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        guide = serializer.validated_data['guide']
+        _get_managed_location(request.user, guide.business_location_id)
+
+        try:
+            assignment = assign_guide(guide, serializer.validated_data['tour_schedule'])
+        except ValidationError as e:
+            return Response(
+                {'error': e.messages},
+                status=status.HTTP_409_CONFLICT if e.code == 'conflict' else status.HTTP_400_BAD_REQUEST
+            )
+
+        return Response(
+            GuideAssignmentSerializer(assignment).data,
+            status=status.HTTP_201_CREATED
+        )
+
+
+class GuideWeekAssignmentAPIView(generics.GenericAPIView):
+    """API view assigning guides to every unassigned departure of a week."""
+    serializer_class = GuideWeekAssignmentSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        location = _get_managed_location(request.user, serializer.validated_data['business_location'])
+
+        result = assign_week(
+            location,
+            serializer.validated_data['week_start'],
+            commit=not serializer.validated_data['dry_run']
+        )
+        return Response({
+            'assigned': GuideAssignmentSerializer(result['assigned'], many=True).data,
+            'unassigned': [schedule.pk for schedule in result['unassigned']],
+        })
@@ -5,7 +5,13 @@ from .models import (
     OrderItem,
     MenuItem,
     MenuItemImage,
-    FoodCategory
+    FoodCategory,
+    PreparationEstimate,
+    OrderStatusEvent,
+    DeliveryZone,
+    DeliveryBatch,
+    MenuItemSalesRollup,
+    StockHold
 )
 
 
@@ -104,3 +110,64 @@ class RestaurantOrderAdmin(admin.ModelAdmin):
     def has_add_permission(self, request):
         """Disable manual order creation in admin."""
         return False
+
+
+@admin.register(PreparationEstimate)
+class PreparationEstimateAdmin(admin.ModelAdmin):
+    """Admin interface for learned preparation times (rebuilt nightly)."""
+    list_display = ('business_location', 'menu_item', 'minutes', 'minutes_per_queued_order', 'sample_size', 'computed_at')
+    list_filter = ('business_location',)
+    raw_id_fields = ('business_location', 'menu_item')
+
+
+@admin.register(OrderStatusEvent)
+class OrderStatusEventAdmin(admin.ModelAdmin):
+    """Read-only admin interface for the order status history."""
+    list_display = ('restaurant_order', 'from_status', 'to_status', 'changed_by', 'created_at')
+    list_filter = ('to_status', 'business_location')
+    search_fields = ('restaurant_order__order_number',)
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(DeliveryZone)
+class DeliveryZoneAdmin(admin.ModelAdmin):
+    """Admin interface for delivery zones."""
+    list_display = ('name', 'business_location', 'zone_type', 'radius_km', 'fee', 'eta_minutes', 'priority', 'is_active')
+    list_filter = ('zone_type', 'is_active', 'business_location')
+    search_fields = ('name', 'business_location__name')
+    raw_id_fields = ('business_location',)
+
+
+@admin.register(DeliveryBatch)
+class DeliveryBatchAdmin(admin.ModelAdmin):
+    """Admin interface for delivery batches."""
+    list_display = ('id', 'business_location', 'status', 'bearing', 'created_at', 'dispatched_at')
+    list_filter = ('status', 'business_location')
+    raw_id_fields = ('business_location',)
+
+
+@admin.register(MenuItemSalesRollup)
+class MenuItemSalesRollupAdmin(admin.ModelAdmin):
+    """Read-only admin interface for the sales rollups."""
+    list_display = ('business_location', 'menu_item', 'date', 'hour', 'quantity', 'revenue', 'cancelled_quantity')
+    list_filter = ('business_location',)
+    date_hierarchy = 'date'
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(StockHold)
+class StockHoldAdmin(admin.ModelAdmin):
+    """Admin interface for checkout stock holds."""
+    list_display = ('menu_item', 'customer', 'quantity', 'status', 'expires_at', 'restaurant_order')
+    list_filter = ('status',)
+    raw_id_fields = ('menu_item', 'customer', 'restaurant_order')
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from apps.orders.services.preparation_service import PreparationTimeService
+
+
+class Command(BaseCommand):
+    help = 'Recalcule les temps de préparation appris à partir des commandes passées (tâche nocturne)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=PreparationTimeService.HISTORY_DAYS,
+            help=f'Nombre de jours d\'historique utilisés (défaut: {PreparationTimeService.HISTORY_DAYS})'
+        )
+        parser.add_argument(
+            '--location',
+            type=int,
+            action='append',
+            dest='locations',
+            help='Limite le calcul à cet établissement (option répétable)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Affiche les estimations sans modifier la base'
+        )
+
+    def handle(self, *args, **options):
+        rows = PreparationTimeService.rebuild(
+            days=options['days'],
+            location_ids=options['locations'],
+            dry_run=options['dry_run'],
+        )
+
+        locations = [row for row in rows if row.menu_item_id is None]
+        for row in locations:
+            self.stdout.write(
+                f"Établissement {row.business_location_id} : {row.minutes} min "
+                f"+ {row.minutes_per_queued_order} min par commande en attente "
+                f"({row.sample_size} commande(s))"
+            )
+
+        summary = f"{len(locations)} établissement(s), {len(rows) - len(locations)} plat(s) estimé(s)."
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"Simulation : {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
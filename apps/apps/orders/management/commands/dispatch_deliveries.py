@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+from apps.business.models import BusinessLocation
+from apps.orders.services.delivery_service import DeliveryDispatchService
+
+
+class Command(BaseCommand):
+    help = 'Regroupe les commandes prêtes à livrer par direction en tournées de livraison'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--location',
+            type=int,
+            action='append',
+            dest='locations',
+            help='Limite la répartition à cet établissement (option répétable)'
+        )
+        parser.add_argument(
+            '--max-batch-size',
+            type=int,
+            default=DeliveryDispatchService.MAX_BATCH_SIZE,
+            help=f'Nombre maximum de commandes par tournée (défaut: {DeliveryDispatchService.MAX_BATCH_SIZE})'
+        )
+        parser.add_argument(
+            '--spread',
+            type=float,
+            default=DeliveryDispatchService.MAX_SPREAD_DEGREES,
+            help=f'Écart maximum de direction dans une tournée, en degrés (défaut: {DeliveryDispatchService.MAX_SPREAD_DEGREES})'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Affiche les tournées sans les enregistrer'
+        )
+
+    def handle(self, *args, **options):
+        locations = BusinessLocation.objects.filter(
+            restaurant_orders_from_location__order_type='DELIVERY',
+            restaurant_orders_from_location__status='READY',
+            restaurant_orders_from_location__delivery_batch__isnull=True,
+        ).distinct()
+        if options['locations']:
+            locations = locations.filter(pk__in=options['locations'])
+
+        total = 0
+        for location in locations:
+            batches, unplaced = DeliveryDispatchService.plan(
+                location,
+                max_batch_size=options['max_batch_size'],
+                max_spread=options['spread'],
+                dry_run=options['dry_run'],
+            )
+            total += len(batches)
+            for batch, orders in batches:
+                numbers = ', '.join(order.order_number for order in orders)
+                self.stdout.write(f"{location.name} : tournée cap {batch.bearing:.0f}° -> {numbers}")
+            if unplaced:
+                self.stdout.write(self.style.WARNING(
+                    f"{location.name} : {len(unplaced)} commande(s) sans coordonnées de livraison"
+                ))
+
+        summary = f"{total} tournée(s) de livraison."
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"Simulation : {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
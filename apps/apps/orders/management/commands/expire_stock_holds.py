@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from apps.orders.services.stock_hold_service import StockHoldService
+
+
+class Command(BaseCommand):
+    help = 'Expire en masse les réservations de stock dont le délai est dépassé (tâche périodique)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Compte les réservations expirées sans les modifier'
+        )
+
+    def handle(self, *args, **options):
+        count = StockHoldService.expire(dry_run=options['dry_run'])
+        summary = f"{count} réservation(s) de stock expirée(s)."
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"Simulation : {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
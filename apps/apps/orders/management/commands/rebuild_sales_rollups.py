@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from apps.orders.services.sales_service import SalesRollupService
+
+
+class Command(BaseCommand):
+    help = 'Recalcule les agrégats de ventes par plat et par heure à partir des commandes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Ne recalcule que les N derniers jours (défaut: tout l\'historique)'
+        )
+        parser.add_argument(
+            '--location',
+            type=int,
+            action='append',
+            dest='locations',
+            help='Limite le calcul à cet établissement (option répétable)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Calcule les agrégats sans modifier la base'
+        )
+
+    def handle(self, *args, **options):
+        rows = SalesRollupService.rebuild(
+            days=options['days'],
+            location_ids=options['locations'],
+            dry_run=options['dry_run'],
+        )
+
+        summary = (
+            f"{len(rows)} agrégat(s), {sum(row.quantity for row in rows)} plat(s) vendu(s), "
+            f"{sum(row.cancelled_quantity for row in rows)} annulé(s)."
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"Simulation : {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,61 @@
+# Generated by Django 5.2.2 on 2026-10-19 02:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0010_businesslocationdocument'),
+        ('core', '0002_alter_review_is_approved'),
+        ('orders', '0003_menuitem_stock_quantity'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PreparationEstimate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minutes', models.DecimalField(decimal_places=2, help_text='Typical preparation time without queue', max_digits=6, verbose_name='Minutes')),
+                ('minutes_per_queued_order', models.DecimalField(decimal_places=2, default=0, help_text='Extra minutes per order already in preparation (location row only)', max_digits=6, verbose_name='Minutes per queued order')),
+                ('sample_size', models.PositiveIntegerField(default=0, verbose_name='Sample Size')),
+                ('computed_at', models.DateTimeField(auto_now=True, verbose_name='Computed At')),
+            ],
+            options={
+                'verbose_name': 'Preparation Estimate',
+                'verbose_name_plural': 'Preparation Estimates',
+                'db_table': 'preparation_estimate',
+            },
+        ),
+        migrations.AddField(
+            model_name='restaurantorder',
+            name='confirmed_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Confirmed At'),
+        ),
+        migrations.AddField(
+            model_name='restaurantorder',
+            name='ready_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Ready At'),
+        ),
+        migrations.AddIndex(
+            model_name='restaurantorder',
+            index=models.Index(fields=['business_location', 'status'], name='restaurant__busines_71b0f7_idx'),
+        ),
+        migrations.AddField(
+            model_name='preparationestimate',
+            name='business_location',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='preparation_estimates', to='business.businesslocation', verbose_name='Business Location'),
+        ),
+        migrations.AddField(
+            model_name='preparationestimate',
+            name='menu_item',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='preparation_estimates', to='orders.menuitem', verbose_name='Menu Item'),
+        ),
+        migrations.AddIndex(
+            model_name='preparationestimate',
+            index=models.Index(fields=['business_location', 'menu_item'], name='preparation_busines_b5b9a9_idx'),
+        ),
+    ]
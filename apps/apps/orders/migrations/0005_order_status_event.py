@@ -0,0 +1,37 @@
+# Generated by Django 5.2.2 on 2026-10-19 02:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0010_businesslocationdocument'),
+        ('orders', '0004_preparation_estimates'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrderStatusEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_status', models.CharField(blank=True, choices=[('PENDING', 'Pending'), ('CONFIRMED', 'Confirmed'), ('PREPARING', 'Preparing'), ('READY', 'Ready'), ('DELIVERED', 'Delivered'), ('CANCELLED', 'Cancelled'), ('REFUNDED', 'Refunded')], max_length=20, verbose_name='From Status')),
+                ('to_status', models.CharField(choices=[('PENDING', 'Pending'), ('CONFIRMED', 'Confirmed'), ('PREPARING', 'Preparing'), ('READY', 'Ready'), ('DELIVERED', 'Delivered'), ('CANCELLED', 'Cancelled'), ('REFUNDED', 'Refunded')], max_length=20, verbose_name='To Status')),
+                ('notes', models.TextField(blank=True, verbose_name='Notes')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('business_location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='order_status_events', to='business.businesslocation', verbose_name='Business Location')),
+                ('changed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Changed By')),
+                ('restaurant_order', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='status_events', to='orders.restaurantorder', verbose_name='Restaurant Order')),
+            ],
+            options={
+                'verbose_name': 'Order Status Event',
+                'verbose_name_plural': 'Order Status Events',
+                'db_table': 'order_status_event',
+                'ordering': ['created_at', 'id'],
+                'indexes': [models.Index(fields=['restaurant_order', 'created_at'], name='order_statu_restaur_ddb9ee_idx'), models.Index(fields=['business_location', 'created_at'], name='order_statu_busines_8f14ca_idx')],
+            },
+        ),
+    ]
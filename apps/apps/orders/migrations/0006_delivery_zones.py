@@ -0,0 +1,74 @@
+# Generated by Django 5.2.2 on 2026-10-19 02:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0010_businesslocationdocument'),
+        ('orders', '0005_order_status_event'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurantorder',
+            name='delivery_sequence',
+            field=models.PositiveSmallIntegerField(blank=True, help_text='Position of the order in its delivery batch', null=True, verbose_name='Delivery Sequence'),
+        ),
+        migrations.AddField(
+            model_name='restaurantorder',
+            name='estimated_delivery_time',
+            field=models.IntegerField(blank=True, help_text='Estimated minutes until delivery, preparation included', null=True, verbose_name='Estimated Delivery Time'),
+        ),
+        migrations.CreateModel(
+            name='DeliveryBatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('PLANNED', 'Planned'), ('OUT_FOR_DELIVERY', 'Out for delivery'), ('COMPLETED', 'Completed')], default='PLANNED', max_length=20, verbose_name='Status')),
+                ('bearing', models.FloatField(help_text='Mean direction of the batch from the location, in degrees', verbose_name='Bearing')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('dispatched_at', models.DateTimeField(blank=True, null=True, verbose_name='Dispatched At')),
+                ('business_location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='delivery_batches', to='business.businesslocation', verbose_name='Business Location')),
+            ],
+            options={
+                'verbose_name': 'Delivery Batch',
+                'verbose_name_plural': 'Delivery Batches',
+                'db_table': 'delivery_batch',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='restaurantorder',
+            name='delivery_batch',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='orders', to='orders.deliverybatch', verbose_name='Delivery Batch'),
+        ),
+        migrations.CreateModel(
+            name='DeliveryZone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Name')),
+                ('zone_type', models.CharField(choices=[('RADIUS', 'Radius'), ('POLYGON', 'Polygon')], default='RADIUS', max_length=10, verbose_name='Zone Type')),
+                ('radius_km', models.DecimalField(blank=True, decimal_places=2, help_text='Distance from the location covered by a radius zone', max_digits=6, null=True, verbose_name='Radius (km)')),
+                ('polygon', models.JSONField(blank=True, default=list, help_text='List of [latitude, longitude] vertices of a polygon zone', verbose_name='Polygon')),
+                ('fee', models.DecimalField(decimal_places=2, max_digits=10, verbose_name='Delivery Fee')),
+                ('eta_minutes', models.PositiveIntegerField(help_text='Typical minutes from pickup to delivery', verbose_name='Delivery Time')),
+                ('priority', models.PositiveIntegerField(default=0, help_text='Lower values win when zones overlap', verbose_name='Priority')),
+                ('is_active', models.BooleanField(default=True, verbose_name='Active')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('business_location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='delivery_zones', to='business.businesslocation', verbose_name='Business Location')),
+            ],
+            options={
+                'verbose_name': 'Delivery Zone',
+                'verbose_name_plural': 'Delivery Zones',
+                'db_table': 'delivery_zone',
+                'ordering': ['business_location', 'priority', 'id'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='deliverybatch',
+            index=models.Index(fields=['business_location', 'status'], name='delivery_ba_busines_2c666f_idx'),
+        ),
+    ]
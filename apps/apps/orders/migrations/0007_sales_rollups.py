@@ -0,0 +1,36 @@
+# Generated by Django 5.2.2 on 2026-10-19 02:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business', '0010_businesslocationdocument'),
+        ('orders', '0006_delivery_zones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MenuItemSalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(help_text='Local date the orders were placed', verbose_name='Date')),
+                ('hour', models.PositiveSmallIntegerField(help_text='Local hour the orders were placed (0-23)', verbose_name='Hour')),
+                ('quantity', models.IntegerField(default=0, verbose_name='Quantity Sold')),
+                ('revenue', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Revenue')),
+                ('cancelled_quantity', models.IntegerField(default=0, verbose_name='Quantity Cancelled')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('business_location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='business.businesslocation', verbose_name='Business Location')),
+                ('menu_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='orders.menuitem', verbose_name='Menu Item')),
+            ],
+            options={
+                'verbose_name': 'Menu Item Sales Rollup',
+                'verbose_name_plural': 'Menu Item Sales Rollups',
+                'db_table': 'menu_item_sales_rollup',
+                'indexes': [models.Index(fields=['business_location', 'date'], name='menu_item_s_busines_f41f0c_idx')],
+                'constraints': [models.UniqueConstraint(fields=('business_location', 'menu_item', 'date', 'hour'), name='unique_sales_rollup_slot')],
+            },
+        ),
+    ]
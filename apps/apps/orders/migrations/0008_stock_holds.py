@@ -0,0 +1,37 @@
+# Generated by Django 5.2.2 on 2026-10-19 02:56
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_sales_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockHold',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('quantity', models.PositiveIntegerField(verbose_name='Quantity')),
+                ('status', models.CharField(choices=[('ACTIVE', 'Active'), ('CONVERTED', 'Converted'), ('RELEASED', 'Released'), ('EXPIRED', 'Expired')], default='ACTIVE', max_length=20, verbose_name='Status')),
+                ('expires_at', models.DateTimeField(verbose_name='Expires At')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_holds', to=settings.AUTH_USER_MODEL, verbose_name='Customer')),
+                ('menu_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stock_holds', to='orders.menuitem', verbose_name='Menu Item')),
+                ('restaurant_order', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='stock_holds', to='orders.restaurantorder', verbose_name='Restaurant Order')),
+            ],
+            options={
+                'verbose_name': 'Stock Hold',
+                'verbose_name_plural': 'Stock Holds',
+                'db_table': 'stock_hold',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['menu_item', 'status', 'expires_at'], name='stock_hold_menu_it_a6b553_idx'), models.Index(fields=['customer', 'status'], name='stock_hold_custome_27a6e0_idx'), models.Index(fields=['status', 'expires_at'], name='stock_hold_status_e564f5_idx')],
+            },
+        ),
+    ]
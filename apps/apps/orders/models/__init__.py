@@ -2,6 +2,11 @@ from django.db import models
 from .food_category import FoodCategory
 from .menu_item import MenuItem, MenuItemImage
 from .order import RestaurantOrder, OrderItem
+from .preparation_estimate import PreparationEstimate
+from .order_status_event import OrderStatusEvent
+from .delivery import DeliveryZone, DeliveryBatch
+from .sales_rollup import MenuItemSalesRollup
+from .stock_hold import StockHold
 
 # Create your models here.
 
@@ -11,4 +16,10 @@ __all__ = [
     'MenuItemImage',
     'RestaurantOrder',
     'OrderItem',
+    'PreparationEstimate',
+    'OrderStatusEvent',
+    'DeliveryZone',
+    'DeliveryBatch',
+    'MenuItemSalesRollup',
+    'StockHold',
 ]
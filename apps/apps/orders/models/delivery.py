@@ -0,0 +1,146 @@
+from django.core.exceptions import ValidationError
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class DeliveryZone(models.Model):
+    """
+    Area served by a business location, with its delivery fee and time.
+
+    A zone is either a ring around the location (every point closer than
+    ``radius_km``) or a polygon of ``[latitude, longitude]`` vertices. When
+    zones overlap, the one with the lowest priority wins, so nested rings
+    are listed from the innermost to the outermost.
+    """
+    ZONE_TYPE_CHOICES = [
+        ('RADIUS', _('Radius')),
+        ('POLYGON', _('Polygon')),
+    ]
+
+    business_location = models.ForeignKey(
+        'business.BusinessLocation',
+        on_delete=models.CASCADE,
+        related_name='delivery_zones',
+        verbose_name=_('Business Location')
+    )
+    name = models.CharField(
+        _('Name'),
+        max_length=100
+    )
+    zone_type = models.CharField(
+        _('Zone Type'),
+        max_length=10,
+        choices=ZONE_TYPE_CHOICES,
+        default='RADIUS'
+    )
+    radius_km = models.DecimalField(
+        _('Radius (km)'),
+        max_digits=6,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text=_('Distance from the location covered by a radius zone')
+    )
+    polygon = models.JSONField(
+        _('Polygon'),
+        default=list,
+        blank=True,
+        help_text=_('List of [latitude, longitude] vertices of a polygon zone')
+    )
+    fee = models.DecimalField(
+        _('Delivery Fee'),
+        max_digits=10,
+        decimal_places=2
+    )
+    eta_minutes = models.PositiveIntegerField(
+        _('Delivery Time'),
+        help_text=_('Typical minutes from pickup to delivery')
+    )
+    priority = models.PositiveIntegerField(
+        _('Priority'),
+        default=0,
+        help_text=_('Lower values win when zones overlap')
+    )
+    is_active = models.BooleanField(
+        _('Active'),
+        default=True
+    )
+    created_at = models.DateTimeField(
+        _('Created At'),
+        auto_now_add=True
+    )
+    updated_at = models.DateTimeField(
+        _('Updated At'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('Delivery Zone')
+        verbose_name_plural = _('Delivery Zones')
+        ordering = ['business_location', 'priority', 'id']
+        db_table = 'delivery_zone'
+
+    def __str__(self):
+        return f"{self.business_location} - {self.name}"
+
+    def clean(self):
+        """Validate the geometry of the zone."""
+        if self.zone_type == 'RADIUS':
+            if not self.radius_km or self.radius_km <= 0:
+                raise ValidationError({'radius_km': _('A radius zone needs a positive radius.')})
+        else:
+            if not isinstance(self.polygon, list) or len(self.polygon) < 3:
+                raise ValidationError({'polygon': _('A polygon needs at least three vertices.')})
+            for vertex in self.polygon:
+                if (not isinstance(vertex, (list, tuple)) or len(vertex) != 2
+                        or not -90 <= float(vertex[0]) <= 90 or not -180 <= float(vertex[1]) <= 180):
+                    raise ValidationError({'polygon': _('Vertices must be [latitude, longitude] pairs.')})
+
+
+class DeliveryBatch(models.Model):
+    """
+    Group of ready delivery orders taken out together by one courier.
+    """
+    STATUS_CHOICES = [
+        ('PLANNED', _('Planned')),
+        ('OUT_FOR_DELIVERY', _('Out for delivery')),
+        ('COMPLETED', _('Completed')),
+    ]
+
+    business_location = models.ForeignKey(
+        'business.BusinessLocation',
+        on_delete=models.CASCADE,
+        related_name='delivery_batches',
+        verbose_name=_('Business Location')
+    )
+    status = models.CharField(
+        _('Status'),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='PLANNED'
+    )
+    bearing = models.FloatField(
+        _('Bearing'),
+        help_text=_('Mean direction of the batch from the location, in degrees')
+    )
+    created_at = models.DateTimeField(
+        _('Created At'),
+        auto_now_add=True
+    )
+    dispatched_at = models.DateTimeField(
+        _('Dispatched At'),
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        verbose_name = _('Delivery Batch')
+        verbose_name_plural = _('Delivery Batches')
+        ordering = ['-created_at']
+        db_table = 'delivery_batch'
+        indexes = [
+            models.Index(fields=['business_location', 'status']),
+        ]
+
+    def __str__(self):
+        return f"Batch {self.pk} - {self.business_location}"
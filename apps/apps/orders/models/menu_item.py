@@ -1,6 +1,6 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
-from django.utils.text import slugify
+from apps.core.utils import save_with_unique_slug
 from apps.business.models import BusinessLocation
 
 
@@ -117,11 +117,16 @@ class MenuItem(models.Model):
         return f"{self.name} - {self.business_location}"
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = slugify(self.name)
         if self.stock_quantity == 0:
             self.is_available = False
-        super().save(*args, **kwargs)
+        if not self.slug:
+            save_with_unique_slug(
+                self, self.name, super().save, *args,
+                queryset=MenuItem.objects.filter(business_location_id=self.business_location_id),
+                **kwargs
+            )
+        else:
+            super().save(*args, **kwargs)
 
 
 class MenuItemImage(models.Model):
@@ -1,8 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 from django.conf import settings
 from apps.business.models import BusinessLocation
 from apps.core.models import PhysicalAddress
+from apps.core.utils import new_reference, save_with_reference
 from decimal import Decimal
 
 
@@ -135,6 +136,26 @@ class RestaurantOrder(models.Model):
         blank=True,
         help_text=_('Estimated preparation time in minutes')
     )
+    estimated_delivery_time = models.IntegerField(
+        _('Estimated Delivery Time'),
+        null=True,
+        blank=True,
+        help_text=_('Estimated minutes until delivery, preparation included')
+    )
+    delivery_batch = models.ForeignKey(
+        'orders.DeliveryBatch',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='orders',
+        verbose_name=_('Delivery Batch')
+    )
+    delivery_sequence = models.PositiveSmallIntegerField(
+        _('Delivery Sequence'),
+        null=True,
+        blank=True,
+        help_text=_('Position of the order in its delivery batch')
+    )
     special_instructions = models.TextField(
         _('Special Instructions'),
         blank=True,
@@ -157,6 +178,16 @@ class RestaurantOrder(models.Model):
         null=True,
         blank=True
     )
+    confirmed_at = models.DateTimeField(
+        _('Confirmed At'),
+        null=True,
+        blank=True
+    )
+    ready_at = models.DateTimeField(
+        _('Ready At'),
+        null=True,
+        blank=True
+    )
     created_at = models.DateTimeField(
         _('Created At'),
         auto_now_add=True
@@ -171,10 +202,29 @@ class RestaurantOrder(models.Model):
         verbose_name_plural = _('Restaurant Orders')
         ordering = ['-created_at']
         db_table = 'restaurant_order'
+        indexes = [
+            models.Index(fields=['business_location', 'status']),
+        ]
 
     def __str__(self):
         return f"Order {self.order_number} - {self.business_location}"
 
+    def save(self, *args, **kwargs):
+        # The status event written by the post_save signal shares this transaction
+        with transaction.atomic():
+            if self.order_number:
+                super().save(*args, **kwargs)
+            else:
+                save_with_reference(
+                    self, self.generate_order_number, super().save,
+                    *args, field='order_number', **kwargs
+                )
+
+    @staticmethod
+    def generate_order_number():
+        """Generate a time-ordered order number."""
+        return new_reference('ORD')
+
     def calculate_total(self):
         """Calculate the total amount including tax and fees."""
         self.subtotal = sum(Decimal(item.total_price) for item in self.items.all())
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+from .order import RestaurantOrder
+
+
+class OrderStatusEvent(models.Model):
+    """
+    Append-only history of restaurant order status transitions.
+
+    One row is written in the same transaction as each status change (and
+    on creation), so the time spent in every state can be computed from the
+    table alone.
+    """
+    restaurant_order = models.ForeignKey(
+        RestaurantOrder,
+        on_delete=models.CASCADE,
+        related_name='status_events',
+        verbose_name=_('Restaurant Order')
+    )
+    # Denormalized from the order so reports filter this table alone
+    business_location = models.ForeignKey(
+        'business.BusinessLocation',
+        on_delete=models.CASCADE,
+        related_name='order_status_events',
+        verbose_name=_('Business Location')
+    )
+    from_status = models.CharField(
+        _('From Status'),
+        max_length=20,
+        choices=RestaurantOrder.STATUS_CHOICES,
+        blank=True
+    )
+    to_status = models.CharField(
+        _('To Status'),
+        max_length=20,
+        choices=RestaurantOrder.STATUS_CHOICES
+    )
+    notes = models.TextField(
+        _('Notes'),
+        blank=True
+    )
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name=_('Changed By')
+    )
+    created_at = models.DateTimeField(
+        _('Created At'),
+        auto_now_add=True
+    )
+
+    class Meta:
+        verbose_name = _('Order Status Event')
+        verbose_name_plural = _('Order Status Events')
+        ordering = ['created_at', 'id']
+        db_table = 'order_status_event'
+        indexes = [
+            models.Index(fields=['restaurant_order', 'created_at']),
+            models.Index(fields=['business_location', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.restaurant_order_id}: {self.from_status or '-'} -> {self.to_status}"
+
+    def save(self, *args, **kwargs):
+        """Events are never modified once written."""
+        if not self._state.adding:
+            raise ValueError('Order status events are append-only.')
+        super().save(*args, **kwargs)
@@ -0,0 +1,59 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class PreparationEstimate(models.Model):
+    """
+    Learned preparation time of a business location or of one of its items.
+
+    Rows are rebuilt by the nightly batch. The location row (no menu item)
+    holds the base time and the extra minutes per order already in the
+    kitchen queue; item rows hold the item's time without queue effect.
+    """
+    business_location = models.ForeignKey(
+        'business.BusinessLocation',
+        on_delete=models.CASCADE,
+        related_name='preparation_estimates',
+        verbose_name=_('Business Location')
+    )
+    menu_item = models.ForeignKey(
+        'orders.MenuItem',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='preparation_estimates',
+        verbose_name=_('Menu Item')
+    )
+    minutes = models.DecimalField(
+        _('Minutes'),
+        max_digits=6,
+        decimal_places=2,
+        help_text=_('Typical preparation time without queue')
+    )
+    minutes_per_queued_order = models.DecimalField(
+        _('Minutes per queued order'),
+        max_digits=6,
+        decimal_places=2,
+        default=0,
+        help_text=_('Extra minutes per order already in preparation (location row only)')
+    )
+    sample_size = models.PositiveIntegerField(
+        _('Sample Size'),
+        default=0
+    )
+    computed_at = models.DateTimeField(
+        _('Computed At'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('Preparation Estimate')
+        verbose_name_plural = _('Preparation Estimates')
+        db_table = 'preparation_estimate'
+        indexes = [
+            models.Index(fields=['business_location', 'menu_item']),
+        ]
+
+    def __str__(self):
+        target = self.menu_item_id or _('location')
+        return f"{self.business_location_id}/{target}: {self.minutes} min"
@@ -0,0 +1,66 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class MenuItemSalesRollup(models.Model):
+    """
+    Sales of a menu item during one local hour of one day.
+
+    Rows are adjusted incrementally when an order is completed, cancelled
+    or refunded, so sales reports never scan the order items.
+    """
+    business_location = models.ForeignKey(
+        'business.BusinessLocation',
+        on_delete=models.CASCADE,
+        related_name='sales_rollups',
+        verbose_name=_('Business Location')
+    )
+    menu_item = models.ForeignKey(
+        'orders.MenuItem',
+        on_delete=models.CASCADE,
+        related_name='sales_rollups',
+        verbose_name=_('Menu Item')
+    )
+    date = models.DateField(
+        _('Date'),
+        help_text=_('Local date the orders were placed')
+    )
+    hour = models.PositiveSmallIntegerField(
+        _('Hour'),
+        help_text=_('Local hour the orders were placed (0-23)')
+    )
+    quantity = models.IntegerField(
+        _('Quantity Sold'),
+        default=0
+    )
+    revenue = models.DecimalField(
+        _('Revenue'),
+        max_digits=12,
+        decimal_places=2,
+        default=0
+    )
+    cancelled_quantity = models.IntegerField(
+        _('Quantity Cancelled'),
+        default=0
+    )
+    updated_at = models.DateTimeField(
+        _('Updated At'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('Menu Item Sales Rollup')
+        verbose_name_plural = _('Menu Item Sales Rollups')
+        db_table = 'menu_item_sales_rollup'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['business_location', 'menu_item', 'date', 'hour'],
+                name='unique_sales_rollup_slot'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['business_location', 'date']),
+        ]
+
+    def __str__(self):
+        return f"{self.menu_item_id} {self.date} {self.hour}h: {self.quantity}"
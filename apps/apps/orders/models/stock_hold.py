@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class StockHold(models.Model):
+    """
+    Short-lived reservation of menu item stock during a checkout.
+
+    Active holds that have not expired count against the item's stock for
+    every other customer. Stock is only decremented when the hold is
+    converted by a paid order, so an abandoned checkout gives its stock
+    back as soon as the hold expires, even before the sweeper marks it.
+    """
+    STATUS_CHOICES = [
+        ('ACTIVE', _('Active')),
+        ('CONVERTED', _('Converted')),
+        ('RELEASED', _('Released')),
+        ('EXPIRED', _('Expired')),
+    ]
+
+    customer = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='stock_holds',
+        verbose_name=_('Customer')
+    )
+    menu_item = models.ForeignKey(
+        'orders.MenuItem',
+        on_delete=models.CASCADE,
+        related_name='stock_holds',
+        verbose_name=_('Menu Item')
+    )
+    quantity = models.PositiveIntegerField(
+        _('Quantity')
+    )
+    status = models.CharField(
+        _('Status'),
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='ACTIVE'
+    )
+    expires_at = models.DateTimeField(
+        _('Expires At')
+    )
+    restaurant_order = models.ForeignKey(
+        'orders.RestaurantOrder',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='stock_holds',
+        verbose_name=_('Restaurant Order')
+    )
+    created_at = models.DateTimeField(
+        _('Created At'),
+        auto_now_add=True
+    )
+    updated_at = models.DateTimeField(
+        _('Updated At'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('Stock Hold')
+        verbose_name_plural = _('Stock Holds')
+        ordering = ['-created_at']
+        db_table = 'stock_hold'
+        indexes = [
+            models.Index(fields=['menu_item', 'status', 'expires_at']),
+            models.Index(fields=['customer', 'status']),
+            models.Index(fields=['status', 'expires_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.quantity}x {self.menu_item_id} ({self.status})"
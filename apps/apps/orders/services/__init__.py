@@ -1,7 +1,25 @@
 from .order_service import OrderService
 from .menu_service import MenuService
+from .kitchen_service import KitchenService
+from .menu_cache_service import MenuCacheService
+from .preparation_service import PreparationTimeService
+from .funnel_service import OrderFunnelService
+from .cart_service import Cart
+from .delivery_service import DeliveryZoneService, DeliveryDispatchService
+from .sales_service import SalesRollupService, SalesReportService
+from .stock_hold_service import StockHoldService
 
 __all__ = [
     'OrderService',
     'MenuService',
+    'KitchenService',
+    'MenuCacheService',
+    'PreparationTimeService',
+    'OrderFunnelService',
+    'Cart',
+    'DeliveryZoneService',
+    'DeliveryDispatchService',
+    'SalesRollupService',
+    'SalesReportService',
+    'StockHoldService',
 ] 
\ No newline at end of file
@@ -0,0 +1,171 @@
+from decimal import Decimal
+
+from django.utils.translation import gettext_lazy as _
+
+from ..models import MenuItem
+
+CART_SESSION_KEY = 'cart'
+
+
+class Cart:
+    """
+    Shopping cart kept in the session as ``{menu_item_id: [quantity, price]}``.
+
+    Only the quantity and the price last shown to the customer are stored;
+    names, images and current prices are read from the menu when the cart is
+    displayed, and every line is revalidated at checkout.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self.lines = {}
+        for item_id, line in session.get(CART_SESSION_KEY, {}).items():
+            if isinstance(line, dict):
+                # Carts saved before the compact format
+                line = [line.get('quantity', 1), str(line.get('price', 0))]
+            self.lines[str(item_id)] = [int(line[0]), str(line[1])]
+
+    def __len__(self):
+        return sum(quantity for quantity, _price in self.lines.values())
+
+    def __bool__(self):
+        return bool(self.lines)
+
+    def save(self):
+        self.session[CART_SESSION_KEY] = self.lines
+        self.session.modified = True
+
+    def add(self, menu_item, quantity=1):
+        """
+        Add ``quantity`` of a menu item, capped at the available stock.
+
+        Returns:
+            bool: False if the quantity had to be capped
+        """
+        item_id = str(menu_item.pk)
+        current = self.lines.get(item_id, [0, None])[0]
+        wanted = current + quantity
+        self.lines[item_id] = [min(wanted, menu_item.stock_quantity), str(menu_item.price)]
+        self.save()
+        return wanted <= menu_item.stock_quantity
+
+    def set_quantity(self, menu_item_id, quantity):
+        item_id = str(menu_item_id)
+        if quantity < 1:
+            self.lines.pop(item_id, None)
+        elif item_id in self.lines:
+            self.lines[item_id][0] = quantity
+        self.save()
+
+    def remove(self, menu_item_id):
+        self.lines.pop(str(menu_item_id), None)
+        self.save()
+
+    def clear(self):
+        self.lines = {}
+        self.save()
+
+    def quantities(self):
+        """Quantities keyed by integer menu item id."""
+        return {int(item_id): quantity for item_id, (quantity, _price) in self.lines.items()}
+
+    def load_items(self):
+        """Load the menu items of the cart with one query."""
+        return MenuItem.objects.select_related('business_location').in_bulk(
+            [int(item_id) for item_id in self.lines]
+        )
+
+    def revalidate(self, menu_items=None, held=None):
+        """
+        Compare every line with the current menu and refresh the cart.
+
+        Lines whose item was removed or became unavailable are dropped,
+        quantities are capped at the stock and the stored prices are replaced
+        by the current ones, so that the customer confirms what they pay.
+
+        Args:
+            menu_items: Items already loaded by ``load_items``
+            held: Quantities held by other customers' checkouts, keyed by
+                menu item id, which are not available to this cart
+
+        Returns:
+            tuple: (menu_items, changes) where changes is a list of dicts
+                with menu_item_id, name, old_price, new_price, old_quantity
+                and new_quantity (0 when the line was dropped)
+        """
+        if menu_items is None:
+            menu_items = self.load_items()
+        held = held or {}
+
+        changes = []
+        for item_id, (quantity, price) in list(self.lines.items()):
+            menu_item = menu_items.get(int(item_id))
+            old_price = Decimal(price)
+            if menu_item is None or not menu_item.is_available:
+                new_price, new_quantity = old_price, 0
+            else:
+                available = max(menu_item.stock_quantity - held.get(menu_item.pk, 0), 0)
+                new_price, new_quantity = menu_item.price, min(quantity, available)
+            if new_price == old_price and new_quantity == quantity:
+                continue
+
+            changes.append({
+                'menu_item_id': int(item_id),
+                'name': menu_item.name if menu_item else None,
+                'old_price': old_price,
+                'new_price': new_price,
+                'old_quantity': quantity,
+                'new_quantity': new_quantity,
+            })
+            if new_quantity:
+                self.lines[item_id] = [new_quantity, str(new_price)]
+            else:
+                del self.lines[item_id]
+
+        if changes:
+            self.save()
+        return menu_items, changes
+
+    def detail(self, menu_items):
+        """
+        Build the lines to display with current names, images and prices.
+
+        Args:
+            menu_items: Items returned by ``revalidate``
+
+        Returns:
+            tuple: (lines, total)
+        """
+        lines = []
+        for item_id, (quantity, price) in self.lines.items():
+            menu_item = menu_items[int(item_id)]
+            lines.append({
+                'menu_item_id': menu_item.pk,
+                'name': menu_item.name,
+                'image': menu_item.main_image.url if menu_item.main_image else '',
+                'price': menu_item.price,
+                'quantity': quantity,
+                'stock_quantity': menu_item.stock_quantity,
+                'total': menu_item.price * quantity,
+            })
+        return lines, sum((line['total'] for line in lines), Decimal('0'))
+
+    @staticmethod
+    def describe_change(change):
+        """Human readable message for one revalidation change."""
+        if not change['new_quantity']:
+            if change['name'] is None:
+                return _("Un plat du panier n'existe plus et a été retiré.")
+            return _("%(name)s n'est plus disponible et a été retiré du panier.") % {
+                'name': change['name'],
+            }
+        if change['new_price'] != change['old_price']:
+            return _("Le prix de %(name)s est passé de %(old)s à %(new)s XAF.") % {
+                'name': change['name'],
+                'old': change['old_price'],
+                'new': change['new_price'],
+            }
+        return _("La quantité de %(name)s a été ramenée à %(quantity)s (stock disponible).") % {
+            'name': change['name'],
+            'quantity': change['new_quantity'],
+        }
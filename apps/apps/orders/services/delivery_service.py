@@ -0,0 +1,321 @@
+import math
+import time
+
+import numpy as np
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+from apps.business.models import BusinessLocation
+from ..models import DeliveryBatch, DeliveryZone, RestaurantOrder
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two points, in kilometers."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def bearing_degrees(lat1, lon1, lat2, lon2):
+    """Initial compass bearing from the first point to the second, in [0, 360)."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    x = math.sin(dlon) * math.cos(lat2)
+    y = math.cos(lat1) * math.sin(lat2) - math.sin(lat1) * math.cos(lat2) * math.cos(dlon)
+    return math.degrees(math.atan2(x, y)) % 360
+
+
+def point_in_polygon(lat, lon, vertices):
+    """Ray casting test of a point against ``[(lat, lon), ...]`` vertices."""
+    inside = False
+    count = len(vertices)
+    for index in range(count):
+        lat1, lon1 = vertices[index]
+        lat2, lon2 = vertices[index - 1]
+        if (lat1 > lat) != (lat2 > lat):
+            crossing = lon1 + (lat - lat1) * (lon2 - lon1) / (lat2 - lat1)
+            if lon < crossing:
+                inside = not inside
+    return inside
+
+
+class ZoneIndex:
+    """
+    Precomputed point-in-zone lookup for the zones of one location.
+
+    Zones are sorted by priority and their bounding boxes are kept in numpy
+    arrays, so a lookup filters hundreds of zones with one vectorized
+    comparison and runs the exact ring or polygon test on the few zones
+    whose box contains the point.
+    """
+
+    def __init__(self, center, zones):
+        self.center = center
+        self.zones = []
+        boxes = []
+        for zone in sorted(zones, key=lambda zone: (zone.priority, zone.pk)):
+            if zone.zone_type == 'RADIUS':
+                if center is None or not zone.radius_km:
+                    continue
+                radius = float(zone.radius_km)
+                lat_margin = math.degrees(radius / EARTH_RADIUS_KM)
+                lon_margin = lat_margin / max(math.cos(math.radians(center[0])), 1e-6)
+                box = (center[0] - lat_margin, center[0] + lat_margin,
+                       center[1] - lon_margin, center[1] + lon_margin)
+                geometry = radius
+            else:
+                vertices = [(float(lat), float(lon)) for lat, lon in zone.polygon]
+                if len(vertices) < 3:
+                    continue
+                lats = [lat for lat, _lon in vertices]
+                lons = [lon for _lat, lon in vertices]
+                box = (min(lats), max(lats), min(lons), max(lons))
+                geometry = vertices
+            self.zones.append({
+                'id': zone.pk,
+                'name': zone.name,
+                'zone_type': zone.zone_type,
+                'geometry': geometry,
+                'fee': zone.fee,
+                'eta_minutes': zone.eta_minutes,
+            })
+            boxes.append(box)
+        self.boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+
+    def __bool__(self):
+        return bool(self.zones)
+
+    def lookup(self, latitude, longitude):
+        """
+        Find the zone of a point.
+
+        Returns:
+            dict: The winning zone, or None if the point is not served
+        """
+        latitude, longitude = float(latitude), float(longitude)
+        boxes = self.boxes
+        candidates = np.flatnonzero(
+            (boxes[:, 0] <= latitude) & (latitude <= boxes[:, 1])
+            & (boxes[:, 2] <= longitude) & (longitude <= boxes[:, 3])
+        )
+        for position in candidates:
+            zone = self.zones[position]
+            if zone['zone_type'] == 'RADIUS':
+                distance = haversine_km(self.center[0], self.center[1], latitude, longitude)
+                if distance <= zone['geometry']:
+                    return zone
+            elif point_in_polygon(latitude, longitude, zone['geometry']):
+                return zone
+        return None
+
+
+class DeliveryZoneService:
+    """
+    Service class for delivery fees and times from the zones of a location.
+
+    Each process keeps the compiled ZoneIndex of the locations it served,
+    tagged with a version counter shared through the cache; saving a zone
+    or its location bumps the counter and the index is rebuilt on next use.
+    """
+
+    _indexes = {}
+
+    @staticmethod
+    def _version_key(location_id):
+        return f'delivery:version:{location_id}'
+
+    @classmethod
+    def get_version(cls, location_id):
+        key = cls._version_key(location_id)
+        version = cache.get(key)
+        if version is None:
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        return version
+
+    @classmethod
+    def invalidate(cls, location_id):
+        """Drop the compiled zones of a location once the transaction commits."""
+        def bump():
+            key = cls._version_key(location_id)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, time.time_ns(), None)
+
+        transaction.on_commit(bump)
+
+    @classmethod
+    def get_index(cls, location_id):
+        """
+        Get the compiled zone index of a location.
+
+        Returns:
+            ZoneIndex: The index, empty if the location has no active zone
+        """
+        version = cls.get_version(location_id)
+        cached = cls._indexes.get(location_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        center = BusinessLocation.objects.filter(pk=location_id).values_list(
+            'latitude', 'longitude'
+        ).first()
+        if center is not None and None in center:
+            center = None
+        elif center is not None:
+            center = (float(center[0]), float(center[1]))
+        zones = DeliveryZone.objects.filter(business_location_id=location_id, is_active=True)
+        index = ZoneIndex(center, zones)
+        cls._indexes[location_id] = (version, index)
+        return index
+
+    @classmethod
+    def quote(cls, location_id, latitude, longitude):
+        """
+        Compute the delivery fee and time to a point.
+
+        Args:
+            location_id: The business location delivering
+            latitude: Latitude of the delivery address
+            longitude: Longitude of the delivery address
+
+        Returns:
+            dict: zone_id, zone_name, fee and eta_minutes, or None if the
+                point is outside every zone of the location
+        """
+        zone = cls.get_index(location_id).lookup(latitude, longitude)
+        if zone is None:
+            return None
+        return {
+            'zone_id': zone['id'],
+            'zone_name': zone['name'],
+            'fee': zone['fee'],
+            'eta_minutes': zone['eta_minutes'],
+        }
+
+
+class DeliveryDispatchService:
+    """Service class for grouping ready delivery orders into courier batches."""
+
+    MAX_BATCH_SIZE = 4
+    MAX_SPREAD_DEGREES = 45
+
+    @staticmethod
+    def _sweep(points, max_batch_size, max_spread):
+        """
+        Split points sorted by bearing into batches of close directions.
+
+        The sweep starts after the widest angular gap, so a group of orders
+        around north is not cut in two by the 0/360 wrap.
+
+        Args:
+            points: List of (bearing, distance, order) tuples
+
+        Returns:
+            list: Lists of points
+        """
+        if not points:
+            return []
+        points = sorted(points, key=lambda point: point[0])
+        gaps = [
+            (points[(index + 1) % len(points)][0] - points[index][0]) % 360
+            for index in range(len(points))
+        ]
+        start = (gaps.index(max(gaps)) + 1) % len(points) if len(points) > 1 else 0
+        points = points[start:] + points[:start]
+
+        batches = []
+        current = []
+        for point in points:
+            if current and (
+                len(current) >= max_batch_size
+                or (point[0] - current[0][0]) % 360 > max_spread
+            ):
+                batches.append(current)
+                current = []
+            current.append(point)
+        batches.append(current)
+        return batches
+
+    @classmethod
+    def plan(cls, business_location, max_batch_size=None, max_spread=None, dry_run=False):
+        """
+        Batch the ready delivery orders of a location by direction.
+
+        Orders waiting for a courier are sorted by compass bearing from the
+        location and swept into batches whose bearings differ by at most
+        ``max_spread`` degrees. Each batch is delivered nearest first.
+
+        Args:
+            business_location: The location dispatching
+            max_batch_size: Most orders a courier takes at once
+            max_spread: Widest angle between orders of one batch, in degrees
+            dry_run: Compute the batches without saving them
+
+        Returns:
+            tuple: (batches, unplaced) where batches is a list of
+                (DeliveryBatch, [orders]) and unplaced lists the orders
+                whose address has no coordinates
+        """
+        max_batch_size = max_batch_size or cls.MAX_BATCH_SIZE
+        max_spread = cls.MAX_SPREAD_DEGREES if max_spread is None else max_spread
+        if business_location.latitude is None or business_location.longitude is None:
+            return [], []
+        origin = (float(business_location.latitude), float(business_location.longitude))
+
+        orders = RestaurantOrder.objects.filter(
+            business_location=business_location,
+            order_type='DELIVERY',
+            status='READY',
+            delivery_batch__isnull=True
+        ).select_related('delivery_address').order_by('ready_at', 'pk')
+
+        points = []
+        unplaced = []
+        for order in orders:
+            address = order.delivery_address
+            if address is None or not address.has_coordinates():
+                unplaced.append(order)
+                continue
+            target = (float(address.latitude), float(address.longitude))
+            points.append((bearing_degrees(*origin, *target), haversine_km(*origin, *target), order))
+
+        batches = []
+        for group in cls._sweep(points, max_batch_size, max_spread):
+            # Mean of the bearings as unit vectors, robust to the wrap
+            x = sum(math.sin(math.radians(bearing)) for bearing, _d, _o in group)
+            y = sum(math.cos(math.radians(bearing)) for bearing, _d, _o in group)
+            batch = DeliveryBatch(
+                business_location=business_location,
+                bearing=round(math.degrees(math.atan2(x, y)) % 360, 1)
+            )
+            batches.append((batch, [order for _b, _d, order in sorted(group, key=lambda point: point[1])]))
+
+        if dry_run or not batches:
+            return batches, unplaced
+
+        with transaction.atomic():
+            DeliveryBatch.objects.bulk_create([batch for batch, _orders in batches])
+            updated = []
+            for batch, batch_orders in batches:
+                for sequence, order in enumerate(batch_orders, start=1):
+                    order.delivery_batch = batch
+                    order.delivery_sequence = sequence
+                    updated.append(order)
+            RestaurantOrder.objects.bulk_update(updated, ['delivery_batch', 'delivery_sequence'])
+        return batches, unplaced
+
+    @staticmethod
+    def dispatch(batch):
+        """Mark a planned batch as out for delivery."""
+        batch.status = 'OUT_FOR_DELIVERY'
+        batch.dispatched_at = timezone.now()
+        batch.save(update_fields=['status', 'dispatched_at'])
+        return batch
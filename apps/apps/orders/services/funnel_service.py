@@ -0,0 +1,166 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from ..models import OrderStatusEvent, RestaurantOrder
+
+TIME_IN_STATE_SQL = """
+WITH timed AS (
+    SELECT e.business_location_id,
+           e.to_status,
+           e.created_at AS entered_at,
+           LEAD(e.created_at) OVER (
+               PARTITION BY e.restaurant_order_id ORDER BY e.created_at, e.id
+           ) AS left_at
+    FROM {events} e
+    WHERE {where}
+)
+SELECT business_location_id, to_status, COUNT(*), AVG({seconds})
+FROM timed
+WHERE left_at IS NOT NULL
+GROUP BY business_location_id, to_status
+ORDER BY business_location_id, to_status
+"""
+
+CANCELLATION_BY_HOUR_SQL = """
+WITH placed AS (
+    SELECT e.business_location_id,
+           e.created_at,
+           ROW_NUMBER() OVER (
+               PARTITION BY e.restaurant_order_id ORDER BY e.created_at, e.id
+           ) AS position,
+           MAX(CASE WHEN e.to_status = 'CANCELLED' THEN 1 ELSE 0 END) OVER (
+               PARTITION BY e.restaurant_order_id
+           ) AS cancelled
+    FROM {events} e
+    WHERE {where}
+)
+SELECT business_location_id, {hour}, COUNT(*), SUM(cancelled)
+FROM placed
+WHERE position = 1
+GROUP BY 1, 2
+ORDER BY 1, 2
+"""
+
+
+class OrderFunnelService:
+    """
+    Funnel analytics over the order status event table.
+
+    The Django ORM cannot aggregate over window functions, so the reports
+    are two SQL statements that compute the windows per order and group the
+    result per location in the database.
+    """
+
+    @staticmethod
+    def _seconds_between(start, end):
+        if connection.vendor == 'sqlite':
+            return f'(julianday({end}) - julianday({start})) * 86400.0'
+        if connection.vendor == 'postgresql':
+            return f'EXTRACT(EPOCH FROM ({end} - {start}))'
+        return f'TIMESTAMPDIFF(MICROSECOND, {start}, {end}) / 1000000.0'
+
+    @staticmethod
+    def _local_hour(column):
+        if connection.vendor == 'postgresql':
+            return f"EXTRACT(HOUR FROM {column} AT TIME ZONE '{timezone.get_current_timezone_name()}')"
+        # SQLite stores naive UTC; shift by the current offset of the site
+        # time zone (Africa/Douala has no daylight saving time)
+        offset = int(timezone.localtime().utcoffset().total_seconds())
+        if connection.vendor == 'sqlite':
+            return f"CAST(strftime('%%H', {column}, '{offset:+d} seconds') AS INTEGER)"
+        return f'HOUR(DATE_ADD({column}, INTERVAL {offset} SECOND))'
+
+    @staticmethod
+    def _where(since, until, location_ids):
+        adapt = connection.ops.adapt_datetimefield_value
+        # Orders placed in the period, with every event they went through
+        clause = (
+            f'e.restaurant_order_id IN ('
+            f'SELECT id FROM {RestaurantOrder._meta.db_table} '
+            f'WHERE created_at >= %s AND created_at < %s)'
+        )
+        params = [adapt(since), adapt(until)]
+        if location_ids:
+            clause += f" AND e.business_location_id IN ({', '.join(['%s'] * len(location_ids))})"
+            params.extend(location_ids)
+        return clause, params
+
+    @classmethod
+    def time_in_state(cls, since, until, location_ids=None):
+        """
+        Average time orders spend in each status, per location.
+
+        Returns:
+            list: Dicts with business_location_id, status, transitions and
+                average_seconds
+        """
+        where, params = cls._where(since, until, location_ids)
+        sql = TIME_IN_STATE_SQL.format(
+            events=OrderStatusEvent._meta.db_table,
+            where=where,
+            seconds=cls._seconds_between('entered_at', 'left_at')
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return [
+            {
+                'business_location_id': location_id,
+                'status': status,
+                'transitions': count,
+                'average_seconds': round(float(seconds or 0), 1),
+            }
+            for location_id, status, count, seconds in rows
+        ]
+
+    @classmethod
+    def cancellation_by_hour(cls, since, until, location_ids=None):
+        """
+        Cancellation rate of orders per location and local hour of placement.
+
+        Returns:
+            list: Dicts with business_location_id, hour, orders, cancelled
+                and cancellation_rate
+        """
+        where, params = cls._where(since, until, location_ids)
+        sql = CANCELLATION_BY_HOUR_SQL.format(
+            events=OrderStatusEvent._meta.db_table,
+            where=where,
+            hour=cls._local_hour('created_at')
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        return [
+            {
+                'business_location_id': location_id,
+                'hour': int(hour_value),
+                'orders': orders,
+                'cancelled': int(cancelled or 0),
+                'cancellation_rate': round(int(cancelled or 0) / orders, 4) if orders else 0.0,
+            }
+            for location_id, hour_value, orders, cancelled in rows
+        ]
+
+    @classmethod
+    def report(cls, days=30, location_ids=None):
+        """
+        Build the funnel report of the last ``days`` days.
+
+        Args:
+            days: Length of the period, ending now
+            location_ids: Optionally restrict the report to these locations
+
+        Returns:
+            dict: ``time_in_state`` and ``cancellation_by_hour`` lists
+        """
+        until = timezone.now()
+        since = until - timedelta(days=days)
+        return {
+            'since': since,
+            'until': until,
+            'time_in_state': cls.time_in_state(since, until, location_ids),
+            'cancellation_by_hour': cls.cancellation_by_hour(since, until, location_ids),
+        }
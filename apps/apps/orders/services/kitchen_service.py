@@ -0,0 +1,204 @@
+"""
+Live order queue for kitchen display screens.
+
+Order changes are published once per process to an in-process broker which
+fans them out to every connected screen of the location, so screens never
+poll the database. The broker only reaches screens connected to the same
+process: the stream must be served by the ASGI application
+(``config/asgi.py``) running the views that change orders.
+"""
+import asyncio
+import threading
+from collections import defaultdict, deque
+
+from django.db import transaction
+
+from ..models import RestaurantOrder
+
+
+class KitchenSubscription:
+    """One connected screen: a bounded queue fed from any thread."""
+
+    MAX_PENDING = 200
+
+    def __init__(self, location_id):
+        self.location_id = location_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize=self.MAX_PENDING)
+        self.overflowed = False
+
+    def _put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled screen must not hold events forever; it resyncs
+            # from a fresh snapshot instead.
+            self.overflowed = True
+
+    def push(self, event):
+        """Queue an event from any thread."""
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    async def get(self, timeout):
+        """Wait for the next event, or return None after ``timeout`` seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class KitchenBroker:
+    """
+    In-process publish/subscribe of order events, keyed by business location.
+
+    Event ids are sequential per location and the last events are kept, so a
+    screen reconnecting with ``Last-Event-ID`` only receives what it missed.
+    """
+
+    HISTORY_SIZE = 100
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+        self._history = defaultdict(lambda: deque(maxlen=self.HISTORY_SIZE))
+        self._last_ids = defaultdict(int)
+
+    def subscribe(self, location_id):
+        """Register a screen; must be called from the event loop serving it."""
+        subscription = KitchenSubscription(location_id)
+        with self._lock:
+            self._subscribers[location_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Forget a disconnected screen."""
+        with self._lock:
+            self._subscribers[subscription.location_id].discard(subscription)
+
+    def has_subscribers(self, location_id):
+        """Check whether any screen of a location is connected."""
+        with self._lock:
+            return bool(self._subscribers[location_id])
+
+    def skip(self, location_id):
+        """
+        Record a change nobody was listening to without building its event.
+
+        Reconnecting screens then fall back to a full snapshot.
+        """
+        with self._lock:
+            self._last_ids[location_id] += 1
+            self._history[location_id].clear()
+
+    def publish(self, location_id, event_type, data):
+        """
+        Send an event to every screen of a location.
+
+        Returns:
+            dict: The published event
+        """
+        with self._lock:
+            self._last_ids[location_id] += 1
+            event = {'id': self._last_ids[location_id], 'type': event_type, 'data': data}
+            self._history[location_id].append(event)
+            subscribers = list(self._subscribers[location_id])
+        for subscription in subscribers:
+            subscription.push(event)
+        return event
+
+    def events_since(self, location_id, last_event_id):
+        """
+        Get the events of a location published after ``last_event_id``.
+
+        Returns:
+            list: The missed events, or None if some are no longer kept
+        """
+        with self._lock:
+            history = list(self._history[location_id])
+            last_id = self._last_ids[location_id]
+        # Ids restart with the process: an unknown id means a fresh snapshot
+        if last_event_id > last_id:
+            return None
+        oldest_id = history[0]['id'] if history else last_id + 1
+        if last_event_id < last_id and oldest_id > last_event_id + 1:
+            return None
+        return [event for event in history if event['id'] > last_event_id]
+
+
+broker = KitchenBroker()
+
+
+class KitchenService:
+    """Service class for the kitchen display order queue."""
+
+    ACTIVE_STATUSES = ['PENDING', 'CONFIRMED', 'PREPARING', 'READY']
+
+    @staticmethod
+    def serialize_order(order):
+        """Build the screen payload of an order."""
+        return {
+            'id': order.pk,
+            'order_number': order.order_number,
+            'status': order.status,
+            'order_type': order.order_type,
+            'table_number': order.table_number,
+            'special_instructions': order.special_instructions,
+            'estimated_preparation_time': order.estimated_preparation_time,
+            'created_at': order.created_at.isoformat() if order.created_at else None,
+            'items': [
+                {
+                    'name': item.menu_item.name,
+                    'quantity': item.quantity,
+                    'special_instructions': item.special_instructions,
+                }
+                for item in order.items.all()
+            ],
+        }
+
+    @classmethod
+    def get_queue(cls, business_location_id):
+        """
+        Get the active orders of a location, oldest first, in two queries.
+
+        Returns:
+            list: Serialized orders
+        """
+        orders = RestaurantOrder.objects.filter(
+            business_location_id=business_location_id,
+            status__in=cls.ACTIVE_STATUSES
+        ).prefetch_related('items__menu_item').order_by('created_at')
+        return [cls.serialize_order(order) for order in orders]
+
+    @classmethod
+    def publish_order(cls, order_id, event_type, previous_status=None):
+        """
+        Load an order once and publish it to the screens of its location.
+
+        Args:
+            order_id: Primary key of the changed order
+            event_type: ``order_created`` or ``order_status``
+            previous_status: Status before the change, if any
+        """
+        order = RestaurantOrder.objects.filter(pk=order_id).prefetch_related(
+            'items__menu_item'
+        ).first()
+        if order is None:
+            return None
+        data = cls.serialize_order(order)
+        data['previous_status'] = previous_status
+        return broker.publish(order.business_location_id, event_type, data)
+
+    @classmethod
+    def publish_on_commit(cls, location_id, order_id, event_type, previous_status=None):
+        """
+        Publish an order event once the current transaction is committed.
+
+        The order is only loaded when a screen of its location is connected.
+        """
+        def publish():
+            if broker.has_subscribers(location_id):
+                cls.publish_order(order_id, event_type, previous_status)
+            else:
+                broker.skip(location_id)
+
+        transaction.on_commit(publish)
@@ -0,0 +1,155 @@
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Prefetch
+
+from ..models import FoodCategory, MenuItem, MenuItemImage
+
+
+class MenuCacheService:
+    """
+    Versioned cache of menu snapshots, one per business location.
+
+    A snapshot holds every item of a location with its category, price,
+    availability and primary image, serialized once. It is stored under a
+    key built from two version counters: a global one bumped by category
+    changes and one per location bumped by item and image changes. Bumping a
+    counter makes old snapshots unreachable, so nothing has to be deleted.
+    The ``None`` scope holds the menu of every location.
+    """
+
+    SNAPSHOT_TIMEOUT = 60 * 60 * 24
+    GLOBAL_VERSION_KEY = 'menu:version:global'
+    ALL_LOCATIONS = 'all'
+
+    @classmethod
+    def _version_key(cls, location_id):
+        return f'menu:version:{location_id or cls.ALL_LOCATIONS}'
+
+    @staticmethod
+    def _initial_version():
+        # Start from the clock so a counter evicted from the cache never
+        # points back at snapshots that are still stored
+        return time.time_ns()
+
+    @classmethod
+    def get_versions(cls, location_id=None):
+        """
+        Get the (global, location) version pair of a menu.
+
+        Returns:
+            tuple: Two integers identifying the current snapshot
+        """
+        keys = [cls.GLOBAL_VERSION_KEY, cls._version_key(location_id)]
+        versions = cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                cache.add(key, cls._initial_version(), None)
+                versions[key] = cache.get(key) or cls._initial_version()
+        return versions[keys[0]], versions[keys[1]]
+
+    @classmethod
+    def _etag(cls, location_id, global_version, location_version):
+        return f'"menu-{location_id or cls.ALL_LOCATIONS}-{global_version}-{location_version}"'
+
+    @classmethod
+    def get_etag(cls, location_id=None):
+        """Get the ETag of a menu without loading its snapshot."""
+        return cls._etag(location_id, *cls.get_versions(location_id))
+
+    @classmethod
+    def _bump(cls, key):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, cls._initial_version(), None)
+
+    @classmethod
+    def invalidate(cls, location_id=None):
+        """
+        Invalidate the menu of a location, or every menu without a location.
+
+        The version is bumped once the current transaction is committed so a
+        snapshot is never rebuilt from uncommitted data.
+        """
+        def bump():
+            if location_id is None:
+                cls._bump(cls.GLOBAL_VERSION_KEY)
+            else:
+                cls._bump(cls._version_key(location_id))
+                cls._bump(cls._version_key(None))
+
+        transaction.on_commit(bump)
+
+    @staticmethod
+    def serialize_item(item):
+        """Serialize a menu item with its category and primary image."""
+        image_url = None
+        if item.main_image:
+            image_url = item.main_image.url
+        elif item.images.all():
+            image_url = item.images.all()[0].image.url
+
+        return {
+            'id': item.pk,
+            'pk': item.pk,
+            'business_location_id': item.business_location_id,
+            'name': item.name,
+            'slug': item.slug,
+            'description': item.description,
+            'price': item.price,
+            'preparation_time_minutes': item.preparation_time_minutes,
+            'dietary_info': item.dietary_info,
+            'is_available': item.is_available,
+            'is_featured': item.is_featured,
+            'stock_quantity': item.stock_quantity,
+            'food_category': {
+                'id': item.food_category_id,
+                'name': item.food_category.name,
+            },
+            'main_image': {'url': image_url} if image_url else None,
+            'image_url': image_url,
+        }
+
+    @classmethod
+    def build_snapshot(cls, location_id=None):
+        """
+        Build a menu snapshot with three queries, whatever the number of items.
+
+        Returns:
+            dict: ``categories`` and ``items`` lists
+        """
+        items = MenuItem.objects.select_related('food_category').prefetch_related(
+            Prefetch('images', queryset=MenuItemImage.objects.order_by('order', 'pk'))
+        )
+        if location_id is not None:
+            items = items.filter(business_location_id=location_id)
+
+        return {
+            'categories': [
+                {'id': category.pk, 'name': category.name}
+                for category in FoodCategory.objects.all()
+            ],
+            'items': [cls.serialize_item(item) for item in items],
+        }
+
+    @classmethod
+    def get_snapshot(cls, location_id=None):
+        """
+        Get the menu snapshot of a location from the cache, building it if needed.
+
+        Args:
+            location_id: Business location id, or None for every location
+
+        Returns:
+            dict: ``etag``, ``categories`` and ``items``
+        """
+        global_version, location_version = cls.get_versions(location_id)
+        key = f'menu:snapshot:{location_id or cls.ALL_LOCATIONS}:{global_version}:{location_version}'
+        snapshot = cache.get(key)
+        if snapshot is None:
+            snapshot = cls.build_snapshot(location_id)
+            snapshot['etag'] = cls._etag(location_id, global_version, location_version)
+            cache.set(key, snapshot, cls.SNAPSHOT_TIMEOUT)
+        return snapshot
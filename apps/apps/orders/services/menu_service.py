@@ -1,8 +1,14 @@
+from decimal import Decimal
+
 from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Q, QuerySet, Value
+from django.db.models.functions import Round
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 
 from ..models import MenuItem, MenuItemImage
+from .menu_cache_service import MenuCacheService
 
 
 class MenuService:
@@ -87,32 +93,92 @@ class MenuService:
         menu_item.save()
         return menu_item
 
+    @staticmethod
+    def _price_expression(price_change, change_type, rounding):
+        """Build the SQL expression of the new price, rounded to ``rounding``."""
+        price_field = MenuItem._meta.get_field('price')
+        output_field = DecimalField(
+            max_digits=price_field.max_digits,
+            decimal_places=price_field.decimal_places
+        )
+        change = Decimal(str(price_change))
+        if change_type == 'fixed':
+            new_price = F('price') + Value(change, output_field=output_field)
+        else:
+            factor = Decimal('1') + change / Decimal('100')
+            new_price = F('price') * Value(factor, output_field=DecimalField())
+        return ExpressionWrapper(
+            Round(new_price / Value(rounding, output_field=DecimalField())) *
+            Value(rounding, output_field=output_field),
+            output_field=output_field
+        )
+
     @classmethod
-    def bulk_update_prices(cls, menu_items, price_change, change_type='fixed'):
+    @transaction.atomic
+    def bulk_update_prices(cls, menu_items, price_change, change_type='fixed',
+                           rounding=Decimal('0.01'), preview=False):
         """
-        Update prices for multiple menu items.
-        
+        Update prices for multiple menu items with a single UPDATE.
+
+        The new prices are checked up front with one aggregate query, so
+        nothing is written if any of them would be negative or too large.
+        The UPDATE repeats the check in its WHERE clause and the whole change
+        is rolled back if a price moved in between and left some item out.
+
         Args:
-            menu_items: QuerySet of MenuItem instances
+            menu_items: QuerySet (or list) of MenuItem instances
             price_change: Amount to change (positive or negative)
             change_type: 'fixed' for absolute change or 'percentage' for relative
+            rounding: Increment new prices are rounded to (e.g. 0.01, 5, 50)
+            preview: Return the before/after diff without writing anything
+
+        Returns:
+            list: The diff (``id``, ``name``, ``price``, ``new_price``) in
+                preview mode, otherwise the updated QuerySet
         """
         if change_type not in ['fixed', 'percentage']:
             raise ValidationError(_("Invalid price change type"))
+        rounding = Decimal(str(rounding))
+        if rounding <= 0:
+            raise ValidationError(_("Rounding increment must be positive"))
+
+        if not isinstance(menu_items, QuerySet):
+            menu_items = MenuItem.objects.filter(pk__in=[item.pk for item in menu_items])
+        new_price = cls._price_expression(price_change, change_type, rounding)
+
+        price_field = MenuItem._meta.get_field('price')
+        limit = Decimal(10) ** (price_field.max_digits - price_field.decimal_places)
+        checks = menu_items.annotate(new_price=new_price).aggregate(
+            total=Count('pk'),
+            negative=Count('pk', filter=Q(new_price__lt=0)),
+            too_large=Count('pk', filter=Q(new_price__gte=limit))
+        )
+        if checks['negative']:
+            raise ValidationError(
+                _("Price cannot be negative for %(count)d item(s)") % {'count': checks['negative']}
+            )
+        if checks['too_large']:
+            raise ValidationError(
+                _("Price is too large for %(count)d item(s)") % {'count': checks['too_large']}
+            )
+
+        if preview:
+            return list(
+                menu_items.annotate(new_price=new_price).order_by('pk').values(
+                    'id', 'name', 'price', 'new_price'
+                )
+            )
+
+        location_ids = set(
+            menu_items.order_by().values_list('business_location_id', flat=True).distinct()
+        )
+        updated = menu_items.alias(new_price=new_price).filter(
+            new_price__gte=0, new_price__lt=limit
+        ).update(price=new_price, updated_at=timezone.now())
+        if updated != checks['total']:
+            raise ValidationError(_("Prices changed during the update, please try again"))
+        # update() sends no signals, so the cached menus are invalidated here
+        for location_id in location_ids:
+            MenuCacheService.invalidate(location_id)
 
-        with transaction.atomic():
-            for item in menu_items:
-                if change_type == 'fixed':
-                    item.price += price_change
-                else:
-                    item.price *= (1 + price_change / 100)
-                
-                if item.price < 0:
-                    raise ValidationError(
-                        _("Price cannot be negative for item: %(item)s") % 
-                        {'item': item.name}
-                    )
-                
-                item.save()
-
-        return menu_items 
\ No newline at end of file
+        return menu_items
@@ -1,25 +1,19 @@
-import uuid
 from decimal import Decimal
 from django.utils import timezone
 from django.db import transaction
+from django.db.models import BooleanField, Case, F, IntegerField, Q, Sum, Value, When
 from django.utils.translation import gettext_lazy as _
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
-from django.utils.crypto import get_random_string
 
 from ..models import RestaurantOrder, OrderItem, MenuItem
+from .cart_service import Cart
+from .delivery_service import DeliveryZoneService
+from .stock_hold_service import StockHoldService
+from .menu_cache_service import MenuCacheService
+from .preparation_service import PreparationTimeService
 from apps.wallets.models.wallet import UserWallet, BusinessLocationWallet
-from apps.wallets.models.transaction import UserTransaction, BusinessTransaction
-from apps.users.models import User
-from django.utils import timezone
-import uuid
-
-
-def generate_order_number():
-    while True:
-        order_number = f"ORD{get_random_string(8).upper()}"
-        if not RestaurantOrder.objects.filter(order_number=order_number).exists():
-            return order_number
+from apps.wallets.services.ledger_service import LedgerService
 
 
 class OrderService:
@@ -40,14 +34,10 @@ class OrderService:
             RestaurantOrder: The created order
         """
         with transaction.atomic():
-            # Generate order number
-            order_number = OrderService._generate_order_number()
-            
-            # Create the order
+            # Create the order, the model assigns the order number
             order = RestaurantOrder.objects.create(
                 business_location=business_location,
                 customer=customer,
-                order_number=order_number,
                 order_type=order_type,
                 payment_status='PAID',
                 **kwargs
@@ -74,14 +64,8 @@ class OrderService:
             if not menu_item.is_available:
                 raise ValidationError(_('This menu item is not available.'))
             
-            # Décrémenter le stock du menu_item
-            if menu_item.stock_quantity is not None:
-                if menu_item.stock_quantity < quantity:
-                    raise ValidationError(_('Stock insuffisant pour ce plat.'))
-                menu_item.stock_quantity -= quantity
-                if menu_item.stock_quantity == 0:
-                    menu_item.is_available = False
-                menu_item.save()
+            # Décrémenter le stock du menu_item (sans prendre le stock réservé)
+            OrderService.reserve_stock({menu_item.pk: menu_item}, {menu_item.pk: quantity}, order.customer)
             
             # Create the order item
             order_item = OrderItem.objects.create(
@@ -152,14 +136,6 @@ class OrderService:
             order.save()
             return order
 
-    @staticmethod
-    def _generate_order_number():
-        """Generate a unique order number."""
-        while True:
-            order_number = f"ORD{get_random_string(8).upper()}"
-            if not RestaurantOrder.objects.filter(order_number=order_number).exists():
-                return order_number
-
     @staticmethod
     def _is_valid_status_transition(current_status, new_status):
         """Check if the status transition is valid."""
@@ -185,144 +161,325 @@ class OrderService:
         }
         return new_status in valid_transitions.get(current_status, [])
 
+    @staticmethod
+    def items_from_form_data(data):
+        """
+        Read the selected menu items of an order form.
+
+        Args:
+            data: POST data with a ``menu_items`` list and ``quantity_<id>`` fields
+
+        Returns:
+            list: Dicts with menu_item_id and quantity
+        """
+        items = []
+        for item_id in data.getlist('menu_items'):
+            try:
+                items.append({
+                    'menu_item_id': int(item_id),
+                    'quantity': int(data.get(f'quantity_{item_id}', 1)),
+                })
+            except (TypeError, ValueError):
+                raise ValidationError(_('Invalid menu item or quantity.'))
+        return items
+
+    @staticmethod
+    def _merge_items(items_data):
+        """Sum the quantities of each menu item, keeping the first instructions seen."""
+        merged = {}
+        for item_data in items_data:
+            menu_item = item_data.get('menu_item')
+            menu_item_id = menu_item.pk if menu_item is not None else item_data.get('menu_item_id')
+            quantity = int(item_data.get('quantity', 1))
+            if menu_item_id is None or quantity <= 0:
+                raise ValidationError(_('Invalid menu item or quantity.'))
+            entry = merged.setdefault(menu_item_id, {
+                'quantity': 0,
+                'unit_price': item_data.get('unit_price'),
+                'special_instructions': item_data.get('special_instructions') or '',
+            })
+            entry['quantity'] += quantity
+        return merged
+
+    @staticmethod
+    def reserve_stock(menu_items, quantities, customer=None):
+        """
+        Decrement the stock of several menu items with a single UPDATE.
+
+        Each row is only updated if it still has enough stock once the
+        active checkout holds of other customers are set aside, and items
+        reaching zero are marked unavailable in the same statement.
+
+        Args:
+            menu_items: Dict of locked MenuItem instances keyed by id
+            quantities: Dict of quantities keyed by menu item id
+            customer: Customer whose own holds the order may use
+
+        Raises:
+            ValidationError: If an item does not have enough stock left
+        """
+        sells_out = Q()
+        for menu_item_id, quantity in quantities.items():
+            sells_out |= Q(pk=menu_item_id, stock_quantity=quantity)
+        requested = Case(
+            *[When(pk=pk, then=Value(qty)) for pk, qty in quantities.items()],
+            output_field=IntegerField()
+        )
+
+        updated = MenuItem.objects.filter(
+            pk__in=list(quantities),
+            stock_quantity__gte=requested + StockHoldService.held_by_others_expression(customer)
+        ).update(
+            stock_quantity=F('stock_quantity') - requested,
+            is_available=Case(
+                When(sells_out, then=Value(False)),
+                default=F('is_available'),
+                output_field=BooleanField()
+            ),
+            updated_at=timezone.now()
+        )
+        if updated != len(quantities):
+            raise ValidationError(_('Stock insuffisant pour ce plat.'))
+        # update() sends no signals, so the cached menus are invalidated here
+        for location_id in {menu_items[pk].business_location_id for pk in quantities}:
+            MenuCacheService.invalidate(location_id)
+
+        for menu_item_id, quantity in quantities.items():
+            menu_item = menu_items[menu_item_id]
+            menu_item.stock_quantity -= quantity
+            if menu_item.stock_quantity == 0:
+                menu_item.is_available = False
+
+    @staticmethod
+    def restore_stock(business_location_id, quantities):
+        """
+        Give stock back to several menu items of a location with a single UPDATE.
+
+        Items that had sold out are made available again.
+
+        Args:
+            business_location_id: Location of the items
+            quantities: Dict of quantities keyed by menu item id
+        """
+        if not quantities:
+            return
+        MenuItem.objects.filter(pk__in=list(quantities)).update(
+            is_available=Case(
+                When(stock_quantity=0, then=Value(True)),
+                default=F('is_available'),
+                output_field=BooleanField()
+            ),
+            stock_quantity=F('stock_quantity') + Case(
+                *[When(pk=pk, then=Value(qty)) for pk, qty in quantities.items()],
+                output_field=IntegerField()
+            ),
+            updated_at=timezone.now()
+        )
+        MenuCacheService.invalidate(business_location_id)
+
+    @classmethod
+    def restore_order_stock(cls, order):
+        """Put the items of a cancelled order back in stock."""
+        quantities = dict(
+            order.items.values('menu_item_id').annotate(total=Sum('quantity')).order_by().values_list(
+                'menu_item_id', 'total'
+            )
+        )
+        cls.restore_stock(order.business_location_id, quantities)
+
+    @staticmethod
+    def apply_delivery_quote(order):
+        """
+        Set the delivery fee and time of an order from its location's zones.
+
+        Locations without delivery zones keep the fee entered on the order.
+
+        Raises:
+            ValidationError: If the address is outside every zone
+        """
+        address = order.delivery_address
+        if address is None or not address.has_coordinates():
+            return
+        if not DeliveryZoneService.get_index(order.business_location_id):
+            return
+        quote = DeliveryZoneService.quote(order.business_location_id, address.latitude, address.longitude)
+        if quote is None:
+            raise ValidationError(_('The delivery address is outside the delivery zones of this restaurant.'))
+        order.delivery_fee = quote['fee']
+        order.estimated_delivery_time = (order.estimated_preparation_time or 0) + quote['eta_minutes']
+
     @classmethod
     @transaction.atomic
-    def create_order(cls, business_location, customer, items_data, **kwargs):
+    def place_order(cls, business_location, customer, items_data, order=None, **kwargs):
         """
-        Create a new restaurant order.
-        
+        Create an order and its items with a constant number of queries.
+
+        Every referenced menu item is locked with one query, stock is
+        decremented with one conditional UPDATE, the items are inserted with
+        one bulk insert and the totals are computed once in Python, whatever
+        the number of lines.
+
         Args:
             business_location: BusinessLocation instance
             customer: User instance
-            items_data: List of dicts with menu_item_id and quantity
-            **kwargs: Additional order data (order_type, table_number, etc.)
+            items_data: List of dicts with menu_item (or menu_item_id), quantity
+                and optional unit_price and special_instructions
+            order: Optional unsaved RestaurantOrder (e.g. from a ModelForm)
+            **kwargs: Additional order fields (order_type, status, etc.)
+
+        Returns:
+            RestaurantOrder: The created order
+
+        Raises:
+            ValidationError: If an item is unknown, unavailable or out of stock
         """
-        # Validate items data
         if not items_data:
             raise ValidationError(_("Order must contain at least one item"))
 
-        # Create order
-        order = RestaurantOrder.objects.create(
-            business_location=business_location,
-            customer=customer,
-            order_number=cls.generate_order_number(),
-            payment_status='PAID',
-            **kwargs
-        )
+        lines = cls._merge_items(items_data)
+        menu_items = MenuItem.objects.select_for_update().filter(
+            business_location=business_location
+        ).in_bulk(list(lines))
 
-        # Create order items
-        for item_data in items_data:
-            menu_item = item_data['menu_item']
-            quantity = item_data['quantity']
-            
+        for menu_item_id, line in lines.items():
+            menu_item = menu_items.get(menu_item_id)
+            if menu_item is None:
+                raise ValidationError(_("This menu item is not available."))
             if not menu_item.is_available:
                 raise ValidationError(
                     _("Menu item '%(item)s' is not available") % {'item': menu_item.name}
                 )
+            if menu_item.stock_quantity < line['quantity']:
+                raise ValidationError(
+                    _("Stock insuffisant pour %(item)s.") % {'item': menu_item.name}
+                )
+            if line['unit_price'] is None:
+                line['unit_price'] = menu_item.price
+            line['unit_price'] = Decimal(str(line['unit_price']))
+
+        cls.reserve_stock(menu_items, {pk: line['quantity'] for pk, line in lines.items()}, customer)
 
-            # Décrémenter le stock du menu_item
-            if menu_item.stock_quantity is not None:
-                if menu_item.stock_quantity < quantity:
-                    raise ValidationError(_('Stock insuffisant pour ce plat.'))
-                menu_item.stock_quantity -= quantity
-                if menu_item.stock_quantity == 0:
-                    menu_item.is_available = False
-                menu_item.save()
+        if order is None:
+            order = RestaurantOrder(**kwargs)
+        else:
+            for field, value in kwargs.items():
+                setattr(order, field, value)
+        order.business_location = business_location
+        order.customer = customer
+        if order.estimated_preparation_time is None:
+            order.estimated_preparation_time = PreparationTimeService.estimate(
+                business_location.pk, list(menu_items.values())
+            )
+        if order.order_type == 'DELIVERY':
+            cls.apply_delivery_quote(order)
+        order.subtotal = sum(line['unit_price'] * line['quantity'] for line in lines.values())
+        order.tax_amount = Decimal(order.tax_amount or 0)
+        order.delivery_fee = Decimal(order.delivery_fee or 0)
+        order.total_amount = order.subtotal + order.tax_amount + order.delivery_fee
+        order.save()
 
-            OrderItem.objects.create(
+        # bulk_create skips OrderItem.save, which would recompute the order
+        # total once per line.
+        OrderItem.objects.bulk_create([
+            OrderItem(
                 restaurant_order=order,
-                menu_item=menu_item,
-                quantity=quantity,
-                unit_price=menu_item.price,
-                total_price=menu_item.price * quantity,
-                special_instructions=item_data.get('special_instructions', '')
+                menu_item=menu_items[menu_item_id],
+                quantity=line['quantity'],
+                unit_price=line['unit_price'],
+                total_price=line['unit_price'] * line['quantity'],
+                special_instructions=line['special_instructions']
             )
+            for menu_item_id, line in lines.items()
+        ])
+        # The stock the customer held during checkout is now sold
+        StockHoldService.convert(customer, list(lines), order)
+        return order
 
-        # Calculate commission
-        commission_amount = business_location.business.calculate_commission(order.total_amount)
-        order.commission_amount = commission_amount
-        
-        # Calculate net amount for business (total - commission)
-        net_amount = order.total_amount - commission_amount
-        
-        # Get business location wallet
-        business_wallet = BusinessLocationWallet.objects.select_for_update().get(business_location=business_location)
-        
-        # Get super admin wallet (first user or specific admin)
-        super_admin = User.objects.filter(is_superuser=True).first()
-        if not super_admin:
-            super_admin = User.objects.order_by('id').first()
-        
-        super_admin_wallet = getattr(super_admin, 'wallet', None)
-        
-        # Credit business location with net amount (total - commission)
-        if not business_wallet.deposit(net_amount):
-            raise ValidationError(f"Erreur lors du crédit du wallet business pour {business_location.name}.")
+    @classmethod
+    @transaction.atomic
+    def create_order(cls, business_location, customer, items_data, **kwargs):
+        """
+        Create a new restaurant order.
         
-        # Create transaction for business location
-        UserTransaction.objects.create(
-            wallet=business_wallet,
-            transaction_type='PAYMENT',
-            amount=net_amount,
-            status='COMPLETED',
-            reference=str(uuid.uuid4()),
-            description=f"Paiement net reçu pour commande {order.order_number} (après commission)",
-            content_object=order,
-            created_at=timezone.now()
+        Args:
+            business_location: BusinessLocation instance
+            customer: User instance
+            items_data: List of dicts with menu_item_id and quantity
+            **kwargs: Additional order data (order_type, table_number, etc.)
+        """
+        order = cls.place_order(business_location, customer, items_data, **kwargs)
+        return cls.record_cash_payment(order)
+
+    @classmethod
+    @transaction.atomic
+    def record_cash_payment(cls, order):
+        """
+        Record the payment of an order received in cash.
+
+        Payment received at the counter or on delivery: one entry crediting
+        the location net of the commission and the platform with the
+        commission, the cash itself being a leg without wallet.
+
+        Args:
+            order: RestaurantOrder instance
+
+        Returns:
+            RestaurantOrder: The paid order
+        """
+        entry = LedgerService.post_payment(
+            None,
+            order.business_location,
+            order.total_amount,
+            order,
+            description=f"Paiement commande {order.order_number}",
+            payer_transaction_type='CASH_PAYMENT'
         )
-        
-        # Credit super admin with commission
-        if commission_amount > 0 and super_admin_wallet:
-            if not super_admin_wallet.deposit(commission_amount):
-                raise ValidationError("Erreur lors du crédit de la commission au wallet admin.")
-            
-            # Create commission transaction
-            UserTransaction.objects.create(
-                wallet=super_admin_wallet,
-                transaction_type='COMMISSION',
-                amount=commission_amount,
-                status='COMPLETED',
-                reference=str(uuid.uuid4()),
-                description=f"Commission commande {order.order_number} - {business_location.name}",
-                content_object=order,
-                created_at=timezone.now()
-            )
-        
+        order.commission_amount = entry.commission_amount
+        order.payment_status = 'PAID'
         order.save()
 
         return order
 
     @classmethod
-    def update_order_status(cls, order, new_status, notes=None):
+    @transaction.atomic
+    def update_order_status(cls, order, new_status, notes=None, changed_by=None,
+                            cancellation_reason=None):
         """
         Update the status of an order.
-        
+
+        The order row is locked and its status read again first, so the
+        stock of a cancelled order is restored once and only together with
+        the cancellation. The transition is recorded in the order status
+        event table, in the same transaction, with its notes and author.
+
         Args:
             order: RestaurantOrder instance
             new_status: New status value
             notes: Optional notes about the status change
+            changed_by: Optional user making the change
+            cancellation_reason: Optional reason when cancelling
         """
         if new_status not in dict(RestaurantOrder.STATUS_CHOICES):
             raise ValidationError(_("Invalid order status"))
 
+        # Statut relu sous verrou : deux annulations concurrentes ne restituent le stock qu'une fois
+        order.status = order._loaded_status = RestaurantOrder.objects.select_for_update().values_list(
+            'status', flat=True
+        ).get(pk=order.pk)
+
         if new_status == 'CANCELLED' and order.status not in ['PENDING', 'CONFIRMED']:
             raise ValidationError(_("Cannot cancel order in current status"))
 
-        old_status = order.status
         order.status = new_status
 
         if new_status == 'CANCELLED':
             order.cancelled_at = timezone.now()
-            if notes:
-                order.cancellation_reason = notes
-
-        if notes:
-            order.restaurant_notes = (
-                f"{order.restaurant_notes}\n"
-                f"{timezone.now()}: Status changed from {old_status} to {new_status}.\n"
-                f"Notes: {notes}"
-            ).strip()
+            if cancellation_reason or notes:
+                order.cancellation_reason = cancellation_reason or notes
+            cls.restore_order_stock(order)
 
+        order._status_notes = notes or cancellation_reason or ''
+        order._status_changed_by = changed_by
         order.save()
         return order
 
@@ -346,99 +503,79 @@ def validate_cart_checkout(user, cart):
     """
     Valide le panier utilisateur, débite le wallet utilisateur, crédite les wallets business,
     crée les commandes par business location, et trace toutes les transactions.
+
+    Toutes les lignes sont revalidées (prix, disponibilité, stock) avec une seule requête ;
+    si le menu a changé depuis l'affichage du panier, rien n'est débité et le panier est
+    mis à jour pour que le client confirme les nouveaux montants.
+
     Args:
         user: instance de User
-        cart: dict {item_id: {name, price, quantity, image, stock_quantity, ...}}
+        cart: instance de Cart
     Returns:
-        dict: {'success': bool, 'errors': list, 'orders': list}
+        dict: {'success': bool, 'errors': list, 'orders': list, 'changes': list}
     """
+    if not cart:
+        return {'success': False, 'errors': ['Panier vide ou montant invalide.'], 'orders': [], 'changes': []}
+
+    # 1. Revalidation de toutes les lignes (une seule requête), hors stock réservé par d'autres
+    held = StockHoldService.held_by_others(list(cart.quantities()), user)
+    menu_items, changes = cart.revalidate(held=held)
+    if changes:
+        return {
+            'success': False,
+            'errors': [str(Cart.describe_change(change)) for change in changes],
+            'orders': [],
+            'changes': changes,
+        }
+
+    # 2. Regroupement par business location et total aux prix actuels
+    items_by_location = {}
+    total = Decimal('0')
+    for item_id, (quantity, _price) in cart.lines.items():
+        menu_item = menu_items[int(item_id)]
+        location = menu_item.business_location
+        if location.pk not in items_by_location:
+            items_by_location[location.pk] = {'location': location, 'items': []}
+        items_by_location[location.pk]['items'].append({
+            'menu_item_id': menu_item.pk,
+            'quantity': quantity,
+            'unit_price': menu_item.price,
+        })
+        total += menu_item.price * quantity
+    if total <= 0:
+        return {'success': False, 'errors': ['Panier vide ou montant invalide.'], 'orders': [], 'changes': []}
+
     errors = []
     orders = []
-    User = get_user_model()
     try:
-        # Conversion stricte de tous les prix en Decimal AVANT tout calcul
-        cart_decimal = {}
-        for item_id, item in cart.items():
-            cart_decimal[item_id] = item.copy()
-            cart_decimal[item_id]['price'] = Decimal(str(item['price']))
-        # 1. Calcul du total
-        total = sum(item['price'] * int(item['quantity']) for item in cart_decimal.values())
-        if total <= 0:
-            return {'success': False, 'errors': ['Panier vide ou montant invalide.'], 'orders': []}
-        # 2. Vérification du solde
-        user_wallet = UserWallet.objects.select_for_update().get(user=user)
-        if not user_wallet.has_sufficient_funds(total):
-            return {'success': False, 'errors': ["Solde insuffisant dans le wallet."], 'orders': []}
-        # 3. Regroupement par business location
-        items_by_location = {}
-        for item_id, item in cart_decimal.items():
-            menu_item = MenuItem.objects.get(pk=item_id)
-            location = menu_item.business_location
-            if location.pk not in items_by_location:
-                items_by_location[location.pk] = {'location': location, 'items': []}
-            menu_item_price = Decimal(str(menu_item.price))
-            items_by_location[location.pk]['items'].append((menu_item, int(item['quantity']), menu_item_price))
-        # 4. Transaction atomique
+        # 3. Transaction atomique
         with transaction.atomic():
-            # Débit utilisateur
-            if not user_wallet.withdraw(total):
-                raise ValidationError("Erreur lors du débit du wallet utilisateur.")
-            user_tx = UserTransaction.objects.create(
-                wallet=user_wallet,
-                transaction_type='PAYMENT',
-                amount=total,
-                status='COMPLETED',
-                reference=str(uuid.uuid4()),
-                description="Paiement commande groupée du panier.",
-                created_at=timezone.now()
-            )
+            # Vérification du solde (le débit reste conditionné au solde dans l'écriture)
+            user_wallet = UserWallet.objects.get(user=user)
+            if not user_wallet.has_sufficient_funds(total):
+                return {'success': False, 'errors': ["Solde insuffisant dans le wallet."], 'orders': [], 'changes': []}
+            legs = [LedgerService.debit(user_wallet, total, 'PAYMENT', "Paiement commande groupée du panier.")]
             # Pour chaque business location
             for loc_pk, data in items_by_location.items():
                 location = data['location']
-                loc_items = data['items']
-                loc_total = sum(price * qty for _, qty, price in loc_items)
-                # Créer la commande (RestaurantOrder)
-                order = RestaurantOrder.objects.create(
-                    customer=user,
-                    business_location=location,
-                    total_amount=loc_total,
-                    subtotal=loc_total,
+                # Commande, déstockage et lignes en un nombre constant de requêtes
+                order = OrderService.place_order(
+                    location,
+                    user,
+                    data['items'],
                     status='PREPARING',
                     payment_status='PAID',
-                    order_number=generate_order_number(),
-                )
-                for menu_item, qty, price in loc_items:
-                    # Déstockage : on décrémente le stock_quantity
-                    if menu_item.stock_quantity is not None:
-                        if menu_item.stock_quantity < qty:
-                            raise ValidationError(f"Stock insuffisant pour {menu_item.name}.")
-                        menu_item.stock_quantity -= qty
-                        if menu_item.stock_quantity == 0:
-                            menu_item.is_available = False
-                        menu_item.save()
-                    OrderItem.objects.create(
-                        restaurant_order=order,
-                        menu_item=menu_item,
-                        quantity=qty,
-                        unit_price=price,
-                        total_price=price * int(qty)
-                    )
-                # Créditer le wallet du business location
-                business_wallet = BusinessLocationWallet.objects.select_for_update().get(business_location=location)
-                if not business_wallet.deposit(loc_total):
-                    raise ValidationError(f"Erreur lors du crédit du wallet pour {location.name}.")
-                UserTransaction.objects.create(
-                    wallet=business_wallet,
-                    transaction_type='PAYMENT',
-                    amount=loc_total,
-                    status='COMPLETED',
-                    reference=str(uuid.uuid4()),
-                    description=f"Paiement reçu pour commande {order.pk}.",
-                    created_at=timezone.now()
                 )
+                business_wallet, created = BusinessLocationWallet.objects.get_or_create(business_location=location)
+                legs.append(LedgerService.credit(
+                    business_wallet, order.total_amount, 'PAYMENT',
+                    f"Paiement reçu pour commande {order.order_number}.", content_object=order
+                ))
                 orders.append(order)
-            return {'success': True, 'errors': [], 'orders': orders}
+            # Une seule écriture : débit client, crédit de chaque établissement
+            LedgerService.post(legs, description="Paiement commande groupée du panier.")
+            return {'success': True, 'errors': [], 'orders': orders, 'changes': []}
     except Exception as e:
         errors.append(str(e))
         # Rollback automatique par transaction.atomic
-        return {'success': False, 'errors': errors, 'orders': []} 
\ No newline at end of file
+        return {'success': False, 'errors': errors, 'orders': [], 'changes': []} 
\ No newline at end of file
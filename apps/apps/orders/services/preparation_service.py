@@ -0,0 +1,196 @@
+import math
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from statistics import median
+
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from ..models import OrderItem, PreparationEstimate, RestaurantOrder
+
+
+def fit_queue_effect(samples):
+    """
+    Fit ``minutes = base + slope * queue`` on (queue, minutes) samples.
+
+    The slope comes from least squares and is kept non-negative; the base is
+    the median residual, which is robust to the odd forgotten order.
+
+    Returns:
+        tuple: (base, slope)
+    """
+    count = len(samples)
+    mean_queue = sum(q for q, _m in samples) / count
+    mean_minutes = sum(m for _q, m in samples) / count
+    variance = sum((q - mean_queue) ** 2 for q, _m in samples)
+    slope = 0.0
+    if variance:
+        covariance = sum((q - mean_queue) * (m - mean_minutes) for q, m in samples)
+        slope = max(covariance / variance, 0.0)
+    base = median(m - slope * q for q, m in samples)
+    return max(base, 0.0), slope
+
+
+class PreparationTimeService:
+    """Service class for learning and serving order preparation times."""
+
+    QUEUE_STATUSES = ['CONFIRMED', 'PREPARING']
+    HISTORY_DAYS = 90
+    MIN_SAMPLES = 5
+    # Transitions longer than this are orders nobody marked ready in time
+    MAX_MINUTES = 240
+
+    @classmethod
+    def _load_history(cls, since, location_ids=None):
+        """Load the kitchen intervals and the items of every order since ``since``."""
+        orders = RestaurantOrder.objects.filter(confirmed_at__gte=since)
+        if location_ids:
+            orders = orders.filter(business_location_id__in=location_ids)
+
+        intervals = defaultdict(list)
+        now = timezone.now()
+        for row in orders.order_by().values(
+            'id', 'business_location_id', 'confirmed_at', 'ready_at', 'cancelled_at'
+        ).iterator(chunk_size=2000):
+            end = row['ready_at'] or row['cancelled_at'] or now
+            intervals[row['business_location_id']].append(
+                (row['id'], row['confirmed_at'], end, row['ready_at'] is not None)
+            )
+
+        items = defaultdict(set)
+        order_items = OrderItem.objects.filter(restaurant_order__in=orders)
+        for order_id, menu_item_id in order_items.values_list(
+            'restaurant_order_id', 'menu_item_id'
+        ).iterator(chunk_size=2000):
+            items[order_id].add(menu_item_id)
+        return intervals, items
+
+    @classmethod
+    def _location_estimates(cls, location_id, intervals, items):
+        """Compute the location row and item rows from one location's history."""
+        starts = sorted(start for _id, start, _end, _ready in intervals)
+        ends = sorted(end for _id, _start, end, _ready in intervals)
+
+        samples = []
+        for order_id, start, end, ready in intervals:
+            minutes = (end - start).total_seconds() / 60
+            if not ready or minutes <= 0 or minutes > cls.MAX_MINUTES:
+                continue
+            # Orders confirmed before this one and not finished yet
+            queue = bisect_left(starts, start) - bisect_right(ends, start)
+            samples.append((order_id, max(queue, 0), minutes))
+
+        if len(samples) < cls.MIN_SAMPLES:
+            return []
+
+        base, slope = fit_queue_effect([(q, m) for _id, q, m in samples])
+        rows = [PreparationEstimate(
+            business_location_id=location_id,
+            minutes=Decimal(str(round(base, 2))),
+            minutes_per_queued_order=Decimal(str(round(slope, 2))),
+            sample_size=len(samples)
+        )]
+
+        residuals = defaultdict(list)
+        for order_id, queue, minutes in samples:
+            for menu_item_id in items.get(order_id, ()):
+                residuals[menu_item_id].append(max(minutes - slope * queue, 0.0))
+        for menu_item_id, values in residuals.items():
+            if len(values) >= cls.MIN_SAMPLES:
+                rows.append(PreparationEstimate(
+                    business_location_id=location_id,
+                    menu_item_id=menu_item_id,
+                    minutes=Decimal(str(round(median(values), 2))),
+                    sample_size=len(values)
+                ))
+        return rows
+
+    @classmethod
+    def rebuild(cls, days=None, location_ids=None, dry_run=False):
+        """
+        Recompute the lookup table from recent CONFIRMED to READY transitions.
+
+        For each order the kitchen queue length at confirmation is rebuilt
+        from the other orders' intervals, the queue effect is fitted per
+        location, and each item gets the median time of its orders once the
+        queue effect is removed.
+
+        Args:
+            days: Number of days of history to learn from
+            location_ids: Optionally restrict the rebuild to these locations
+            dry_run: Compute without writing
+
+        Returns:
+            list: The computed PreparationEstimate rows
+        """
+        since = timezone.now() - timedelta(days=days or cls.HISTORY_DAYS)
+        intervals, items = cls._load_history(since, location_ids)
+
+        rows = []
+        for location_id, location_intervals in intervals.items():
+            rows.extend(cls._location_estimates(location_id, location_intervals, items))
+
+        if not dry_run:
+            with transaction.atomic():
+                stale = PreparationEstimate.objects.all()
+                if location_ids:
+                    stale = stale.filter(business_location_id__in=location_ids)
+                stale.delete()
+                PreparationEstimate.objects.bulk_create(rows, batch_size=1000)
+        return rows
+
+    @classmethod
+    def estimate(cls, business_location_id, menu_items):
+        """
+        Estimate the preparation time of an order in minutes.
+
+        The learned rows and the current queue length come from one indexed
+        read. Items without a learned time fall back to their static
+        ``preparation_time_minutes``, then to the location's base time.
+
+        Args:
+            business_location_id: The location preparing the order
+            menu_items: The MenuItem instances of the order
+
+        Returns:
+            int: Minutes, or None if nothing is known about the order
+        """
+        menu_item_ids = [item.pk for item in menu_items]
+        queue = RestaurantOrder.objects.filter(
+            business_location_id=OuterRef('business_location_id'),
+            status__in=cls.QUEUE_STATUSES
+        ).order_by().values('business_location_id').annotate(total=Count('pk')).values('total')
+        rows = PreparationEstimate.objects.filter(
+            Q(menu_item__isnull=True) | Q(menu_item_id__in=menu_item_ids),
+            business_location_id=business_location_id
+        ).annotate(
+            queue_length=Coalesce(Subquery(queue), 0)
+        ).values('menu_item_id', 'minutes', 'minutes_per_queued_order', 'queue_length')
+
+        learned = {}
+        location = None
+        for row in rows:
+            if row['menu_item_id'] is None:
+                location = row
+            else:
+                learned[row['menu_item_id']] = float(row['minutes'])
+
+        times = []
+        for item in menu_items:
+            if item.pk in learned:
+                times.append(learned[item.pk])
+            elif item.preparation_time_minutes:
+                times.append(float(item.preparation_time_minutes))
+            elif location is not None:
+                times.append(float(location['minutes']))
+        if not times:
+            return None
+
+        minutes = max(times)
+        if location is not None:
+            minutes += float(location['minutes_per_queued_order']) * location['queue_length']
+        return math.ceil(minutes)
@@ -0,0 +1,239 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, IntegerField, Q, Sum, Value, When
+from django.db.models.functions import Coalesce, ExtractHour, ExtractIsoWeekDay, TruncDate
+from django.utils import timezone
+
+from ..models import MenuItem, MenuItemSalesRollup, OrderItem
+
+
+class SalesRollupService:
+    """
+    Service class maintaining the per-item, per-hour sales rollups.
+
+    An order counts as sold while it is READY or DELIVERED, so the rollups
+    only move when an order enters or leaves those statuses; entering
+    CANCELLED also adds its items to the cancelled quantity.
+    """
+
+    SOLD_STATUSES = ('READY', 'DELIVERED')
+
+    @classmethod
+    def deltas(cls, previous_status, new_status):
+        """
+        Sold and cancelled multipliers of a status transition.
+
+        Returns:
+            tuple: (sold, cancelled), each -1, 0 or 1
+        """
+        sold = int(new_status in cls.SOLD_STATUSES) - int(previous_status in cls.SOLD_STATUSES)
+        cancelled = int(new_status == 'CANCELLED' and previous_status != 'CANCELLED')
+        return sold, cancelled
+
+    @classmethod
+    def record_transition(cls, order, previous_status):
+        """
+        Schedule the rollup update of an order status change.
+
+        The update runs once the transaction commits, when the order items
+        written after the order itself are visible. A failing update is
+        logged without failing the committed order; ``rebuild`` repairs it.
+        """
+        sold, cancelled = cls.deltas(previous_status, order.status)
+        if not sold and not cancelled:
+            return
+        order_id, location_id, created_at = order.pk, order.business_location_id, order.created_at
+        transaction.on_commit(lambda: cls.apply(order_id, location_id, created_at, sold, cancelled), robust=True)
+
+    @classmethod
+    @transaction.atomic
+    def apply(cls, order_id, location_id, created_at, sold, cancelled):
+        """
+        Add (or remove) the items of one order to the rollup of its hour.
+
+        Missing rows are inserted with one conflict-ignoring bulk insert and
+        every row of the order is adjusted with one UPDATE.
+        """
+        lines = list(
+            OrderItem.objects.filter(restaurant_order_id=order_id)
+            .values('menu_item_id')
+            .annotate(quantity=Sum('quantity'), revenue=Sum('total_price'))
+            .order_by()
+        )
+        if not lines:
+            return
+
+        local = timezone.localtime(created_at)
+        slot = {'business_location_id': location_id, 'date': local.date(), 'hour': local.hour}
+        MenuItemSalesRollup.objects.bulk_create(
+            [MenuItemSalesRollup(menu_item_id=line['menu_item_id'], **slot) for line in lines],
+            ignore_conflicts=True
+        )
+
+        def per_item(field, output_field):
+            return Case(
+                *[When(menu_item_id=line['menu_item_id'], then=Value(line[field])) for line in lines],
+                default=Value(0),
+                output_field=output_field
+            )
+
+        changes = {}
+        if sold:
+            changes['quantity'] = F('quantity') + sold * per_item('quantity', IntegerField())
+            changes['revenue'] = F('revenue') + sold * per_item(
+                'revenue', DecimalField(max_digits=12, decimal_places=2)
+            )
+        if cancelled:
+            changes['cancelled_quantity'] = F('cancelled_quantity') + per_item('quantity', IntegerField())
+        MenuItemSalesRollup.objects.filter(
+            menu_item_id__in=[line['menu_item_id'] for line in lines], **slot
+        ).update(updated_at=timezone.now(), **changes)
+
+    @classmethod
+    def rebuild(cls, days=None, location_ids=None, dry_run=False):
+        """
+        Recompute the rollups from the order items, for a backfill or repair.
+
+        Args:
+            days: Only rebuild the last ``days`` local days (default: all)
+            location_ids: Optionally restrict the rebuild to these locations
+            dry_run: Compute without writing
+
+        Returns:
+            list: The computed MenuItemSalesRollup rows
+        """
+        items = OrderItem.objects.filter(
+            restaurant_order__status__in=cls.SOLD_STATUSES + ('CANCELLED',)
+        )
+        rollups = MenuItemSalesRollup.objects.all()
+        if days:
+            since = timezone.localdate() - timedelta(days=days - 1)
+            start = timezone.make_aware(datetime.combine(since, time.min))
+            items = items.filter(restaurant_order__created_at__gte=start)
+            rollups = rollups.filter(date__gte=since)
+        if location_ids:
+            items = items.filter(restaurant_order__business_location_id__in=location_ids)
+            rollups = rollups.filter(business_location_id__in=location_ids)
+
+        sold = Q(restaurant_order__status__in=cls.SOLD_STATUSES)
+        grouped = items.annotate(
+            day=TruncDate('restaurant_order__created_at'),
+            hour=ExtractHour('restaurant_order__created_at')
+        ).values(
+            'restaurant_order__business_location_id', 'menu_item_id', 'day', 'hour'
+        ).annotate(
+            sold_quantity=Coalesce(Sum('quantity', filter=sold), 0),
+            sold_revenue=Coalesce(Sum('total_price', filter=sold), Decimal('0')),
+            cancelled=Coalesce(Sum('quantity', filter=Q(restaurant_order__status='CANCELLED')), 0)
+        ).order_by()
+
+        rows = [
+            MenuItemSalesRollup(
+                business_location_id=row['restaurant_order__business_location_id'],
+                menu_item_id=row['menu_item_id'],
+                date=row['day'],
+                hour=row['hour'],
+                quantity=row['sold_quantity'],
+                revenue=row['sold_revenue'],
+                cancelled_quantity=row['cancelled']
+            )
+            for row in grouped.iterator(chunk_size=2000)
+        ]
+        if not dry_run:
+            with transaction.atomic():
+                rollups.delete()
+                MenuItemSalesRollup.objects.bulk_create(rows, batch_size=1000)
+        return rows
+
+
+class SalesReportService:
+    """Service class for restaurant sales reports, read from the rollups only."""
+
+    @staticmethod
+    def _rollups(location_id, since):
+        return MenuItemSalesRollup.objects.filter(business_location_id=location_id, date__gte=since)
+
+    @staticmethod
+    def _since(days):
+        return timezone.localdate() - timedelta(days=days - 1)
+
+    @classmethod
+    def top_sellers(cls, location_id, days=30, limit=10):
+        """
+        Best selling items of a location by quantity.
+
+        Returns:
+            list: Dicts with menu_item_id, name, quantity and revenue
+        """
+        rows = cls._rollups(location_id, cls._since(days)).values(
+            'menu_item_id', name=F('menu_item__name')
+        ).annotate(
+            total_quantity=Sum('quantity'), total_revenue=Sum('revenue')
+        ).filter(total_quantity__gt=0).order_by('-total_quantity', '-total_revenue')[:limit]
+        return [
+            {
+                'menu_item_id': row['menu_item_id'],
+                'name': row['name'],
+                'quantity': row['total_quantity'],
+                'revenue': float(row['total_revenue']),
+            }
+            for row in rows
+        ]
+
+    @classmethod
+    def hourly_heatmap(cls, location_id, days=30):
+        """
+        Quantity sold per ISO weekday and local hour.
+
+        Returns:
+            list: Seven rows (Monday first) of 24 quantities
+        """
+        heatmap = [[0] * 24 for _day in range(7)]
+        rows = cls._rollups(location_id, cls._since(days)).annotate(
+            weekday=ExtractIsoWeekDay('date')
+        ).values('weekday', 'hour').annotate(total_quantity=Sum('quantity')).order_by()
+        for row in rows:
+            heatmap[row['weekday'] - 1][row['hour']] = row['total_quantity']
+        return heatmap
+
+    @classmethod
+    def slow_movers(cls, location_id, days=30, limit=10):
+        """
+        Available items of a location that sold the least, unsold ones first.
+
+        Returns:
+            list: Dicts with menu_item_id, name, quantity and cancelled
+        """
+        in_period = Q(sales_rollups__date__gte=cls._since(days))
+        rows = MenuItem.objects.filter(
+            business_location_id=location_id, is_available=True
+        ).annotate(
+            total_quantity=Coalesce(Sum('sales_rollups__quantity', filter=in_period), 0),
+            total_cancelled=Coalesce(Sum('sales_rollups__cancelled_quantity', filter=in_period), 0)
+        ).values('pk', 'name', 'total_quantity', 'total_cancelled').order_by('total_quantity', 'name')[:limit]
+        return [
+            {
+                'menu_item_id': row['pk'],
+                'name': row['name'],
+                'quantity': row['total_quantity'],
+                'cancelled': row['total_cancelled'],
+            }
+            for row in rows
+        ]
+
+    @classmethod
+    def report(cls, location_id, days=30, limit=10):
+        """
+        Build the sales report of a location for the last ``days`` days.
+
+        Returns:
+            dict: ``top_sellers``, ``hourly_heatmap`` and ``slow_movers``
+        """
+        return {
+            'since': cls._since(days),
+            'top_sellers': cls.top_sellers(location_id, days, limit),
+            'hourly_heatmap': cls.hourly_heatmap(location_id, days),
+            'slow_movers': cls.slow_movers(location_id, days, limit),
+        }
@@ -0,0 +1,149 @@
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import IntegerField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from ..models import MenuItem, StockHold
+
+
+class StockHoldService:
+    """Service class for the stock reserved by checkouts in progress."""
+
+    TTL = timedelta(minutes=10)
+    SWEEP_CHUNK = 1000
+
+    @staticmethod
+    def _active(now=None):
+        return StockHold.objects.filter(status='ACTIVE', expires_at__gt=now or timezone.now())
+
+    @classmethod
+    def held_by_others(cls, menu_item_ids, customer=None):
+        """
+        Quantities held by the active checkouts of other customers.
+
+        Returns:
+            dict: Held quantity keyed by menu item id
+        """
+        holds = cls._active().filter(menu_item_id__in=menu_item_ids)
+        if customer is not None and customer.is_authenticated:
+            holds = holds.exclude(customer=customer)
+        return dict(
+            holds.values('menu_item_id').annotate(total=Sum('quantity')).order_by().values_list(
+                'menu_item_id', 'total'
+            )
+        )
+
+    @classmethod
+    def held_by_others_expression(cls, customer=None):
+        """
+        Subquery of the quantity held by other customers on ``OuterRef('pk')``.
+
+        Used in the guard of the stock UPDATE so that a paid order never
+        takes stock promised to another checkout.
+        """
+        holds = cls._active().filter(menu_item_id=OuterRef('pk'))
+        if customer is not None:
+            holds = holds.exclude(customer=customer)
+        total = holds.order_by().values('menu_item_id').annotate(total=Sum('quantity')).values('total')
+        return Coalesce(Subquery(total, output_field=IntegerField()), 0)
+
+    @classmethod
+    @transaction.atomic
+    def hold(cls, customer, quantities):
+        """
+        Reserve stock for the checkout of a customer.
+
+        The customer's active holds are replaced by ``quantities``; each item
+        must have enough stock once the other customers' holds are removed.
+
+        Args:
+            customer: The customer checking out
+            quantities: Dict of quantities keyed by menu item id
+
+        Returns:
+            datetime: Expiry of the holds
+
+        Raises:
+            ValidationError: If an item does not have enough free stock
+        """
+        now = timezone.now()
+        expires_at = now + cls.TTL
+        # Locking the items serializes concurrent holds on the same dishes
+        menu_items = MenuItem.objects.select_for_update().in_bulk(list(quantities))
+        held = cls.held_by_others(list(menu_items), customer)
+        for menu_item_id, quantity in quantities.items():
+            menu_item = menu_items.get(menu_item_id)
+            if menu_item is None or menu_item.stock_quantity - held.get(menu_item_id, 0) < quantity:
+                raise ValidationError(_('Stock insuffisant pour ce plat.'))
+
+        existing = {
+            hold.menu_item_id: hold
+            for hold in StockHold.objects.select_for_update().filter(customer=customer, status='ACTIVE')
+        }
+        released = [hold.pk for pk, hold in existing.items() if pk not in quantities]
+        updated = []
+        created = []
+        for menu_item_id, quantity in quantities.items():
+            hold = existing.get(menu_item_id)
+            if hold is None:
+                created.append(StockHold(
+                    customer=customer, menu_item_id=menu_item_id, quantity=quantity, expires_at=expires_at
+                ))
+            else:
+                hold.quantity = quantity
+                hold.expires_at = expires_at
+                hold.updated_at = now
+                updated.append(hold)
+
+        if released:
+            StockHold.objects.filter(pk__in=released).update(status='RELEASED', updated_at=now)
+        if updated:
+            StockHold.objects.bulk_update(updated, ['quantity', 'expires_at', 'updated_at'])
+        if created:
+            StockHold.objects.bulk_create(created)
+        return expires_at
+
+    @staticmethod
+    def convert(customer, menu_item_ids, order):
+        """Mark the customer's holds on these items as used by a paid order."""
+        return StockHold.objects.filter(
+            customer=customer, status='ACTIVE', menu_item_id__in=menu_item_ids
+        ).update(status='CONVERTED', restaurant_order=order, updated_at=timezone.now())
+
+    @staticmethod
+    def release(customer, menu_item_ids=None):
+        """Give back the stock held by a customer, e.g. when the cart is emptied."""
+        holds = StockHold.objects.filter(customer=customer, status='ACTIVE')
+        if menu_item_ids is not None:
+            holds = holds.filter(menu_item_id__in=menu_item_ids)
+        return holds.update(status='RELEASED', updated_at=timezone.now())
+
+    @classmethod
+    def expire(cls, now=None, dry_run=False):
+        """
+        Mark the expired holds in bulk, one chunk per transaction.
+
+        Expired holds already stopped counting against the stock; the sweep
+        keeps the active set small so the hold lookups stay cheap.
+
+        Returns:
+            int: Number of holds expired
+        """
+        now = now or timezone.now()
+        stale = StockHold.objects.filter(status='ACTIVE', expires_at__lte=now)
+        if dry_run:
+            return stale.count()
+
+        total = 0
+        while True:
+            with transaction.atomic():
+                ids = list(stale.order_by('pk').values_list('pk', flat=True)[:cls.SWEEP_CHUNK])
+                if not ids:
+                    return total
+                total += StockHold.objects.filter(pk__in=ids, status='ACTIVE').update(
+                    status='EXPIRED', updated_at=now
+                )
@@ -0,0 +1,89 @@
+from django.db.models.signals import post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.business.models import BusinessLocation
+from .models import DeliveryZone, FoodCategory, MenuItem, MenuItemImage, OrderStatusEvent, RestaurantOrder
+from .services.delivery_service import DeliveryZoneService
+from .services.kitchen_service import KitchenService
+from .services.menu_cache_service import MenuCacheService
+from .services.sales_service import SalesRollupService
+
+
+@receiver(post_init, sender=RestaurantOrder)
+def restaurant_order_post_init(sender, instance, **kwargs):
+    """Remember the loaded status so transitions can be detected on save."""
+    # Read through __dict__ so a deferred status is not fetched
+    instance._loaded_status = instance.__dict__.get('status')
+
+
+@receiver(pre_save, sender=RestaurantOrder)
+def restaurant_order_pre_save(sender, instance, **kwargs):
+    """Stamp the transitions the preparation time estimator learns from."""
+    if instance.status == instance._loaded_status:
+        return
+    if instance.status == 'CONFIRMED' and not instance.confirmed_at:
+        instance.confirmed_at = timezone.now()
+    elif instance.status == 'READY' and not instance.ready_at:
+        instance.ready_at = timezone.now()
+
+
+@receiver(post_save, sender=RestaurantOrder)
+def restaurant_order_post_save(sender, instance, created, **kwargs):
+    """Record status transitions, update the sales rollups and push them to the kitchen screens."""
+    previous_status = instance._loaded_status
+    instance._loaded_status = instance.status
+    if not created and previous_status == instance.status:
+        return
+
+    # RestaurantOrder.save is atomic, so the event commits with the change
+    OrderStatusEvent.objects.create(
+        restaurant_order=instance,
+        business_location_id=instance.business_location_id,
+        from_status='' if created else previous_status,
+        to_status=instance.status,
+        notes=getattr(instance, '_status_notes', '') or '',
+        changed_by=getattr(instance, '_status_changed_by', None)
+    )
+    instance._status_notes = ''
+    instance._status_changed_by = None
+    SalesRollupService.record_transition(instance, None if created else previous_status)
+
+    if created:
+        KitchenService.publish_on_commit(instance.business_location_id, instance.pk, 'order_created')
+    else:
+        KitchenService.publish_on_commit(instance.business_location_id, instance.pk, 'order_status', previous_status)
+
+
+@receiver([post_save, post_delete], sender=MenuItem)
+def menu_item_changed(sender, instance, **kwargs):
+    """Invalidate the cached menu of the item's location."""
+    MenuCacheService.invalidate(instance.business_location_id)
+
+
+@receiver([post_save, post_delete], sender=MenuItemImage)
+def menu_item_image_changed(sender, instance, **kwargs):
+    """Invalidate the cached menu of the image's location."""
+    location_id = MenuItem.objects.filter(pk=instance.menu_item_id).values_list(
+        'business_location_id', flat=True
+    ).first()
+    if location_id is not None:
+        MenuCacheService.invalidate(location_id)
+
+
+@receiver([post_save, post_delete], sender=FoodCategory)
+def food_category_changed(sender, instance, **kwargs):
+    """Categories are shared, so every cached menu is invalidated."""
+    MenuCacheService.invalidate()
+
+
+@receiver([post_save, post_delete], sender=DeliveryZone)
+def delivery_zone_changed(sender, instance, **kwargs):
+    """Rebuild the zone index of the zone's location on next use."""
+    DeliveryZoneService.invalidate(instance.business_location_id)
+
+
+@receiver(post_save, sender=BusinessLocation)
+def business_location_moved(sender, instance, **kwargs):
+    """Radius zones are centered on the location."""
+    DeliveryZoneService.invalidate(instance.pk)
@@ -0,0 +1,81 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.business.models import Business, BusinessLocation
+from apps.orders.models import FoodCategory, MenuItem, RestaurantOrder
+from apps.orders.services import Cart
+from apps.wallets.models import UserWallet
+from apps.wallets.models.wallet import BusinessLocationWallet
+
+User = get_user_model()
+
+
+class CartTest(TestCase):
+    """Test cases for the compact session cart and checkout revalidation."""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.customer, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        location = BusinessLocation.objects.create(
+            business=business, owner=self.customer, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+        BusinessLocationWallet.objects.get_or_create(business_location=location)
+        wallet = UserWallet.objects.get_or_create(user=self.customer)[0]
+        wallet.balance = Decimal('10000.00')
+        wallet.save()
+        category = FoodCategory.objects.create(name='Plats')
+        self.item = MenuItem.objects.create(
+            business_location=location, food_category=category,
+            name='Ndolé', description='d', price=Decimal('2500.00'), stock_quantity=3
+        )
+        self.client.force_login(self.customer)
+
+    def add(self, times=1):
+        for _ in range(times):
+            self.client.post(reverse('orders:add_to_cart', args=[self.item.pk]))
+
+    def test_session_stores_quantity_and_price(self):
+        self.add(times=4)
+        self.assertEqual(self.client.session['cart'], {str(self.item.pk): [3, '2500.00']})
+
+    def test_price_change_is_confirmed_before_payment(self):
+        """Test that a changed price blocks the first checkout and returns a diff."""
+        self.add(times=2)
+        MenuItem.objects.filter(pk=self.item.pk).update(price=Decimal('3000.00'))
+
+        cart = Cart(self.client.session)
+        with self.assertNumQueries(1):
+            _items, changes = cart.revalidate()
+        self.assertEqual(changes, [{
+            'menu_item_id': self.item.pk, 'name': 'Ndolé',
+            'old_price': Decimal('2500.00'), 'new_price': Decimal('3000.00'),
+            'old_quantity': 2, 'new_quantity': 2,
+        }])
+
+        self.client.post(reverse('orders:valider_commande'))
+        self.assertFalse(RestaurantOrder.objects.exists())
+        self.assertEqual(self.client.session['cart'], {str(self.item.pk): [2, '3000.00']})
+
+        self.client.post(reverse('orders:valider_commande'))
+        order = RestaurantOrder.objects.get()
+        self.assertEqual(order.total_amount, Decimal('6000.00'))
+        self.assertEqual(UserWallet.objects.get(user=self.customer).balance, Decimal('4000.00'))
+        self.assertEqual(self.client.session['cart'], {})
+
+    def test_legacy_session_format(self):
+        session = {'cart': {str(self.item.pk): {'name': 'Ndolé', 'price': 2500.0, 'quantity': 2}}}
+        self.assertEqual(Cart(session).lines, {str(self.item.pk): [2, '2500.0']})
+
+    def test_detail_renders_current_prices(self):
+        self.add()
+        MenuItem.objects.filter(pk=self.item.pk).update(price=Decimal('2000.00'))
+        response = self.client.get(reverse('orders:cart_detail'))
+        self.assertEqual(response.context['total'], Decimal('2000.00'))
+        self.assertContains(response, 'Ndolé')
@@ -0,0 +1,111 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+
+from apps.business.models import Business, BusinessLocation
+from apps.core.models import PhysicalAddress
+from apps.orders.models import DeliveryZone, FoodCategory, MenuItem, RestaurantOrder
+from apps.orders.services import DeliveryDispatchService, DeliveryZoneService, OrderService
+from apps.orders.services.delivery_service import ZoneIndex
+
+User = get_user_model()
+
+CENTER = (4.05, 9.70)
+
+
+class ZoneIndexTest(SimpleTestCase):
+    """Test cases for the point-in-zone lookup."""
+
+    def setUp(self):
+        self.index = ZoneIndex(CENTER, [
+            DeliveryZone(pk=1, name='Centre', zone_type='RADIUS', radius_km=Decimal('2'),
+                         fee=Decimal('500'), eta_minutes=10, priority=0),
+            DeliveryZone(pk=2, name='Ville', zone_type='RADIUS', radius_km=Decimal('8'),
+                         fee=Decimal('1000'), eta_minutes=25, priority=1),
+            DeliveryZone(pk=3, name='Aéroport', zone_type='POLYGON', fee=Decimal('2000'),
+                         eta_minutes=40, priority=2,
+                         polygon=[[3.98, 9.70], [4.02, 9.70], [4.02, 9.76], [3.98, 9.76]]),
+        ])
+
+    def test_innermost_ring_wins(self):
+        self.assertEqual(self.index.lookup(4.06, 9.70)['name'], 'Centre')
+        self.assertEqual(self.index.lookup(4.10, 9.70)['name'], 'Ville')
+
+    def test_polygon_and_outside(self):
+        self.assertEqual(self.index.lookup(3.99, 9.75)['name'], 'Aéroport')
+        self.assertIsNone(self.index.lookup(4.50, 9.70))
+
+
+class DeliveryTest(TestCase):
+    """Test cases for zone-based fees and direction batching."""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.customer, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.location = BusinessLocation.objects.create(
+                business=business, owner=self.customer, name='Test Restaurant',
+                city='Douala', region='Littoral', business_location_type='restaurant',
+                latitude=Decimal(CENTER[0]), longitude=Decimal(CENTER[1])
+            )
+            DeliveryZone.objects.create(
+                business_location=self.location, name='Ville', radius_km=Decimal('10'),
+                fee=Decimal('1000'), eta_minutes=25
+            )
+        category = FoodCategory.objects.create(name='Plats')
+        self.item = MenuItem.objects.create(
+            business_location=self.location, food_category=category, name='Ndolé',
+            description='d', price=Decimal('2500'), stock_quantity=100, preparation_time_minutes=15
+        )
+
+    def address(self, latitude, longitude):
+        return PhysicalAddress.objects.create(
+            city='Douala', region='Littoral', latitude=Decimal(latitude), longitude=Decimal(longitude)
+        )
+
+    def place(self, latitude, longitude, **kwargs):
+        return OrderService.place_order(
+            self.location, self.customer, [{'menu_item_id': self.item.pk, 'quantity': 1}],
+            order_type='DELIVERY', delivery_address=self.address(latitude, longitude), **kwargs
+        )
+
+    def test_fee_and_eta_from_zone(self):
+        order = self.place('4.08', '9.70')
+        self.assertEqual(order.delivery_fee, Decimal('1000'))
+        self.assertEqual(order.total_amount, Decimal('3500'))
+        self.assertEqual(order.estimated_delivery_time, 40)
+
+    def test_address_outside_zones(self):
+        with self.assertRaises(ValidationError):
+            self.place('4.50', '9.70')
+
+    def test_index_follows_zone_changes(self):
+        self.assertIsNone(DeliveryZoneService.quote(self.location.pk, 4.20, 9.70))
+        with self.captureOnCommitCallbacks(execute=True):
+            DeliveryZone.objects.create(
+                business_location=self.location, name='Banlieue', radius_km=Decimal('25'),
+                fee=Decimal('2000'), eta_minutes=45, priority=1
+            )
+        self.assertEqual(DeliveryZoneService.quote(self.location.pk, 4.20, 9.70)['fee'], Decimal('2000'))
+
+    def test_batches_by_direction(self):
+        """Test that orders on both sides of north share a batch, nearest first."""
+        north_west = self.place('4.09', '9.695', status='READY')
+        north_east = self.place('4.07', '9.703', status='READY')
+        south = self.place('4.00', '9.70', status='READY')
+
+        batches, unplaced = DeliveryDispatchService.plan(self.location)
+
+        self.assertEqual(unplaced, [])
+        self.assertEqual(
+            sorted([order.pk for order in orders] for _batch, orders in batches),
+            sorted([[north_east.pk, north_west.pk], [south.pk]])
+        )
+        north_east.refresh_from_db()
+        self.assertEqual(north_east.delivery_sequence, 1)
+        self.assertEqual(RestaurantOrder.objects.filter(delivery_batch__isnull=True).count(), 0)
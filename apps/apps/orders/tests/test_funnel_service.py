@@ -0,0 +1,76 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.business.models import Business, BusinessLocation
+from apps.orders.models import OrderStatusEvent, RestaurantOrder
+from apps.orders.services import OrderFunnelService, OrderService
+
+User = get_user_model()
+
+
+class OrderStatusEventTest(TestCase):
+    """Test cases for the order status history and funnel report."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass', email='o@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.owner, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.owner, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+
+    def create_order(self, number):
+        return RestaurantOrder.objects.create(
+            business_location=self.location, customer=self.owner,
+            order_number=number, order_type='DINE_IN',
+            subtotal=Decimal('0'), total_amount=Decimal('0')
+        )
+
+    def test_transitions_are_recorded(self):
+        order = self.create_order('ORDEVT1')
+        OrderService.update_order_status(order, 'CONFIRMED', notes='ok', changed_by=self.owner)
+        order.restaurant_notes = 'no status change'
+        order.save()
+
+        events = list(order.status_events.values_list('from_status', 'to_status', 'notes', 'changed_by'))
+        self.assertEqual(events, [
+            ('', 'PENDING', '', None),
+            ('PENDING', 'CONFIRMED', 'ok', self.owner.pk),
+        ])
+        with self.assertRaises(ValueError):
+            order.status_events.first().save()
+
+    def test_funnel_report(self):
+        """Test time in state and cancellation rate from the event table."""
+        start = timezone.now() - timedelta(hours=2)
+        for number, cancel in [('ORDEVT2', False), ('ORDEVT3', True)]:
+            order = self.create_order(number)
+            if cancel:
+                OrderService.update_order_status(order, 'CANCELLED', notes='client parti')
+            else:
+                OrderService.update_order_status(order, 'CONFIRMED')
+            first, second = order.status_events.order_by('id')
+            OrderStatusEvent.objects.filter(pk=first.pk).update(created_at=start)
+            OrderStatusEvent.objects.filter(pk=second.pk).update(
+                created_at=start + timedelta(minutes=4 if cancel else 6)
+            )
+
+        report = OrderFunnelService.report(days=1, location_ids=[self.location.pk])
+
+        self.assertEqual(report['time_in_state'], [{
+            'business_location_id': self.location.pk,
+            'status': 'PENDING',
+            'transitions': 2,
+            'average_seconds': 300.0,
+        }])
+        self.assertEqual(len(report['cancellation_by_hour']), 1)
+        row = report['cancellation_by_hour'][0]
+        self.assertEqual(row['hour'], timezone.localtime(start).hour)
+        self.assertEqual((row['orders'], row['cancelled'], row['cancellation_rate']), (2, 1, 0.5))
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from apps.business.models import Business, BusinessLocation
+from apps.orders.models import RestaurantOrder
+from apps.orders.services import KitchenService
+from apps.orders.services.kitchen_service import KitchenBroker
+
+User = get_user_model()
+
+
+class KitchenBrokerTest(SimpleTestCase):
+    """Test cases for the in-process kitchen event broker."""
+
+    def test_fan_out_from_another_thread(self):
+        """Test that one publish reaches every screen of the location only."""
+        broker = KitchenBroker()
+
+        async def scenario():
+            screens = [broker.subscribe(1) for _ in range(3)]
+            other = broker.subscribe(2)
+            publisher = threading.Thread(target=broker.publish, args=(1, 'order_created', {'id': 7}))
+            publisher.start()
+            publisher.join()
+            received = [await screen.get(1) for screen in screens]
+            return received, await other.get(0.05)
+
+        received, other = asyncio.run(scenario())
+        self.assertEqual([event['data'] for event in received], [{'id': 7}] * 3)
+        self.assertIsNone(other)
+
+    def test_events_since_replays_or_requires_snapshot(self):
+        """Test reconnect replay, and the snapshot fallback when events are lost."""
+        broker = KitchenBroker()
+        for order_id in range(3):
+            broker.publish(1, 'order_status', {'id': order_id})
+
+        self.assertEqual([event['id'] for event in broker.events_since(1, 1)], [2, 3])
+        self.assertEqual(broker.events_since(1, 3), [])
+        self.assertIsNone(broker.events_since(1, 10))
+
+        broker.skip(1)
+        self.assertIsNone(broker.events_since(1, 3))
+
+
+class KitchenSignalTest(TestCase):
+    """Test cases for publishing order changes to kitchen screens."""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.customer, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.customer, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+
+    def test_creation_and_transitions_are_published_after_commit(self):
+        """Test that creation and status changes are published, other saves are not."""
+        with mock.patch('apps.orders.services.kitchen_service.broker.has_subscribers', return_value=True), \
+                mock.patch.object(KitchenService, 'publish_order') as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                order = RestaurantOrder.objects.create(
+                    business_location=self.location, customer=self.customer,
+                    order_number='ORDKITCHEN', order_type='DINE_IN',
+                    subtotal=Decimal('0'), total_amount=Decimal('0')
+                )
+            with self.captureOnCommitCallbacks(execute=True):
+                order.restaurant_notes = 'note'
+                order.save()
+            with self.captureOnCommitCallbacks(execute=True):
+                order.status = 'CONFIRMED'
+                order.save()
+
+        self.assertEqual(publish.call_args_list, [
+            mock.call(order.pk, 'order_created', None),
+            mock.call(order.pk, 'order_status', 'PENDING'),
+        ])
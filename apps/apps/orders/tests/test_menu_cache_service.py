@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.business.models import Business, BusinessLocation
+from apps.orders.models import FoodCategory, MenuItem
+from apps.orders.services import MenuCacheService
+
+User = get_user_model()
+
+
+class MenuCacheServiceTest(TestCase):
+    """Test cases for the versioned menu snapshot cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create_user(username='owner', password='pass', email='o@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.owner, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.owner, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+        self.category = FoodCategory.objects.create(name='Plats')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item = MenuItem.objects.create(
+                business_location=self.location, food_category=self.category,
+                name='Ndolé', description='d', price=Decimal('2500.00'), stock_quantity=4
+            )
+
+    def test_snapshot_is_built_once(self):
+        """Test that a cached snapshot is served without reading the menu tables."""
+        snapshot = MenuCacheService.get_snapshot(self.location.pk)
+        self.assertEqual(snapshot['items'][0]['food_category']['name'], 'Plats')
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(MenuCacheService.get_snapshot(self.location.pk), snapshot)
+        # Only the shared cache is read: its versions, then the snapshot
+        self.assertLessEqual(len(queries), 2)
+        self.assertFalse([query for query in queries if 'menu_item' in query['sql']])
+
+    def test_saves_invalidate_after_commit(self):
+        """Test that item and category saves change the snapshot and its ETag."""
+        etag = MenuCacheService.get_snapshot(self.location.pk)['etag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.item.price = Decimal('3000.00')
+            self.item.save()
+        snapshot = MenuCacheService.get_snapshot(self.location.pk)
+        self.assertEqual(snapshot['items'][0]['price'], Decimal('3000.00'))
+        self.assertNotEqual(snapshot['etag'], etag)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Plats chauds'
+            self.category.save()
+        snapshot = MenuCacheService.get_snapshot(self.location.pk)
+        self.assertEqual(snapshot['items'][0]['food_category']['name'], 'Plats chauds')
+
+    def test_api_revalidates_with_etag(self):
+        """Test that a matching If-None-Match returns 304."""
+        self.client.force_login(self.owner)
+        url = reverse('orders:api_menu_items') + f'?location={self.location.pk}'
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['items'][0]['name'], 'Ndolé')
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+        response = self.client.get(reverse('orders:api_menu_items') + '?location=abc')
+        self.assertEqual(response.status_code, 400)
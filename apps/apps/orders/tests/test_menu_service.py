@@ -0,0 +1,67 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+
+from apps.business.models import Business, BusinessLocation
+from apps.orders.models import FoodCategory, MenuItem
+from apps.orders.services import MenuService
+
+User = get_user_model()
+
+
+class BulkUpdatePricesTest(TestCase):
+    """Test cases for set-based menu price changes."""
+
+    def setUp(self):
+        owner = User.objects.create_user(username='owner', password='pass', email='o@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=owner, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        location = BusinessLocation.objects.create(
+            business=business, owner=owner, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+        category = FoodCategory.objects.create(name='Plats')
+        for name, price in [('Ndolé', '2500.00'), ('Poulet DG', '4990.00'), ('Beignets', '120.00')]:
+            MenuItem.objects.create(
+                business_location=location, food_category=category,
+                name=name, description='d', price=Decimal(price), stock_quantity=1
+            )
+        self.items = MenuItem.objects.filter(business_location=location)
+
+    def prices(self):
+        return dict(self.items.values_list('name', 'price'))
+
+    def test_percentage_with_rounding_in_one_update(self):
+        """Test a percentage change rounded to 50 XAF in a constant number of queries."""
+        # Savepoint, guard aggregate, affected locations, UPDATE, release
+        with self.assertNumQueries(5):
+            MenuService.bulk_update_prices(self.items, 10, 'percentage', rounding=50)
+        self.assertEqual(self.prices(), {
+            'Ndolé': Decimal('2750.00'),
+            'Poulet DG': Decimal('5500.00'),
+            'Beignets': Decimal('150.00'),
+        })
+
+    def test_preview_does_not_write(self):
+        """Test that preview returns the diff and leaves prices untouched."""
+        diff = MenuService.bulk_update_prices(self.items, Decimal('-100'), preview=True)
+        self.assertEqual(
+            [(row['name'], row['price'], row['new_price']) for row in diff],
+            [
+                ('Ndolé', Decimal('2500.00'), Decimal('2400.00')),
+                ('Poulet DG', Decimal('4990.00'), Decimal('4890.00')),
+                ('Beignets', Decimal('120.00'), Decimal('20.00')),
+            ]
+        )
+        self.assertEqual(self.prices()['Ndolé'], Decimal('2500.00'))
+
+    def test_negative_price_rejects_whole_batch(self):
+        """Test that one negative result leaves every price untouched."""
+        before = self.prices()
+        with self.assertRaises(ValidationError):
+            MenuService.bulk_update_prices(self.items, Decimal('-200'))
+        self.assertEqual(self.prices(), before)
@@ -0,0 +1,166 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from apps.business.models import Business, BusinessLocation
+from apps.orders.models import FoodCategory, MenuItem, OrderItem, RestaurantOrder
+from apps.orders.services import OrderService
+from apps.wallets.models import UserTransaction, UserWallet
+from apps.wallets.models.wallet import BusinessLocationWallet
+from apps.wallets.services import LedgerService, ReconciliationService, WalletService
+
+User = get_user_model()
+
+
+class PlaceOrderTest(TestCase):
+    """Test cases for set-based order placement."""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.customer, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.customer, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+        category = FoodCategory.objects.create(name='Plats')
+        self.items = [
+            MenuItem.objects.create(
+                business_location=self.location, food_category=category,
+                name=f'Plat {i}', description='d', price=Decimal('1000.00'), stock_quantity=5
+            )
+            for i in range(30)
+        ]
+
+    def _place(self, quantities):
+        return OrderService.place_order(
+            self.location,
+            self.customer,
+            [{'menu_item_id': item.pk, 'quantity': qty} for item, qty in quantities],
+            order_type='TAKEAWAY'
+        )
+
+    def test_totals_and_stock(self):
+        """Test that items, totals and stock are written once."""
+        order = self._place([(self.items[0], 2), (self.items[1], 5)])
+
+        self.assertEqual(order.subtotal, Decimal('7000.00'))
+        self.assertEqual(order.total_amount, Decimal('7000.00'))
+        self.assertEqual(OrderItem.objects.filter(restaurant_order=order).count(), 2)
+        first, second = MenuItem.objects.filter(pk__in=[self.items[0].pk, self.items[1].pk]).order_by('pk')
+        self.assertEqual(first.stock_quantity, 3)
+        self.assertTrue(first.is_available)
+        self.assertEqual(second.stock_quantity, 0)
+        self.assertFalse(second.is_available)
+
+    def test_query_count_does_not_grow_with_items(self):
+        """Test that a large order costs as many queries as a small one."""
+        with CaptureQueriesContext(connection) as small:
+            self._place([(self.items[0], 1)])
+        with CaptureQueriesContext(connection) as large:
+            self._place([(item, 1) for item in self.items[1:]])
+        self.assertEqual(len(small), len(large))
+
+    def test_insufficient_stock_rolls_back(self):
+        """Test that one short item leaves every stock untouched."""
+        with self.assertRaises(ValidationError):
+            self._place([(self.items[0], 1), (self.items[1], 6)])
+        self.assertEqual(MenuItem.objects.get(pk=self.items[0].pk).stock_quantity, 5)
+        self.assertFalse(OrderItem.objects.exists())
+
+    def test_stale_cancellation_restores_stock_once(self):
+        """Test that cancelling an order already cancelled elsewhere is refused."""
+        order = self._place([(self.items[0], 2)])
+        stale = RestaurantOrder.objects.get(pk=order.pk)
+
+        OrderService.update_order_status(order, 'CANCELLED')
+        with self.assertRaises(ValidationError):
+            OrderService.update_order_status(stale, 'CANCELLED')
+
+        self.assertEqual(MenuItem.objects.get(pk=self.items[0].pk).stock_quantity, 5)
+        self.assertEqual(order.status_events.filter(to_status='CANCELLED').count(), 1)
+
+
+class OrderPaymentTest(TestCase):
+    """Test cases for the payment of orders received in cash or in the wallet."""
+
+    def setUp(self):
+        admin = User.objects.create_superuser(username='admin', password='pass', email='admin@example.com')
+        UserWallet.objects.create(user=admin)
+        self.owner = User.objects.create_user(username='owner', password='pass', email='o@example.com')
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.owner, email='b@example.com',
+            phone='600000000', description='Test', commission_rate=Decimal('10.00')
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.owner, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+        self.item = MenuItem.objects.create(
+            business_location=self.location, food_category=FoodCategory.objects.create(name='Plats'),
+            name='Plat', description='d', price=Decimal('1000.00'), stock_quantity=10
+        )
+        self.location_wallet = BusinessLocationWallet.objects.get(business_location=self.location)
+
+    def order(self, **kwargs):
+        return OrderService.place_order(
+            self.location, self.customer, [{'menu_item_id': self.item.pk, 'quantity': 2}],
+            order_type='TAKEAWAY', **kwargs
+        )
+
+    def assertBalances(self, location, platform):
+        self.location_wallet.refresh_from_db()
+        platform_wallet = WalletService.get_platform_wallet()
+        platform_wallet.refresh_from_db()
+        self.assertEqual(
+            (self.location_wallet.balance, platform_wallet.available_balance),
+            (Decimal(location), Decimal(platform))
+        )
+        self.assertFalse(UserTransaction.objects.filter(journal_entry__isnull=True).exists())
+        self.assertEqual(ReconciliationService.reconcile(), [])
+
+    def test_counter_order_posts_a_cash_leg_without_wallet(self):
+        order = OrderService.create_order(
+            self.location, self.customer, [{'menu_item_id': self.item.pk, 'quantity': 2}],
+            order_type='TAKEAWAY', status='READY', payment_method='CASH'
+        )
+
+        self.assertEqual((order.payment_status, order.commission_amount), ('PAID', Decimal('200.00')))
+        cash = UserTransaction.objects.get(transaction_type='CASH_PAYMENT', object_id=order.pk)
+        self.assertEqual((cash.wallet_object_id, cash.amount), (None, Decimal('2000.00')))
+        self.assertBalances('1800.00', '200.00')
+
+    def test_validating_an_order_paid_in_the_wallet_moves_no_money(self):
+        wallet = UserWallet.objects.create(user=self.customer)
+        LedgerService.post([
+            LedgerService.debit(None, 5000, 'DEPOSIT'),
+            LedgerService.credit(wallet, 5000, 'DEPOSIT'),
+        ])
+        order = self.order(status='PREPARING', payment_status='PAID')
+        LedgerService.post_payment(wallet, self.location, order.total_amount, order)
+        self.client.force_login(self.owner)
+
+        self.client.post(reverse('orders:validate_order', args=[order.order_number]))
+
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'DELIVERED')
+        self.assertBalances('1800.00', '200.00')
+
+    def test_validating_an_unpaid_order_records_the_cash_received(self):
+        order = self.order(status='PREPARING')
+        self.client.force_login(self.owner)
+
+        self.client.post(reverse('orders:validate_order', args=[order.order_number]))
+
+        order.refresh_from_db()
+        self.assertEqual((order.status, order.payment_status), ('DELIVERED', 'PAID'))
+        self.assertEqual(UserTransaction.objects.filter(transaction_type='CASH_PAYMENT', object_id=order.pk).count(), 1)
+        self.assertBalances('1800.00', '200.00')
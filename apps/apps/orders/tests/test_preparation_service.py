@@ -0,0 +1,106 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.business.models import Business, BusinessLocation
+from apps.orders.models import FoodCategory, MenuItem, OrderItem, PreparationEstimate, RestaurantOrder
+from apps.orders.services import PreparationTimeService
+from apps.orders.services.preparation_service import fit_queue_effect
+
+User = get_user_model()
+
+
+class FitQueueEffectTest(SimpleTestCase):
+    """Test cases for the queue effect regression."""
+
+    def test_recovers_base_and_slope(self):
+        samples = [(queue, 10 + 3 * queue) for queue in range(6)]
+        base, slope = fit_queue_effect(samples)
+        self.assertAlmostEqual(base, 10)
+        self.assertAlmostEqual(slope, 3)
+
+
+class PreparationTimeServiceTest(TestCase):
+    """Test cases for learning and serving preparation times."""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.customer, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.customer, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+        category = FoodCategory.objects.create(name='Plats')
+        self.fast = MenuItem.objects.create(
+            business_location=self.location, food_category=category, name='Beignets',
+            description='d', price=Decimal('500'), stock_quantity=100
+        )
+        self.slow = MenuItem.objects.create(
+            business_location=self.location, food_category=category, name='Ndolé',
+            description='d', price=Decimal('2500'), stock_quantity=100,
+            preparation_time_minutes=15
+        )
+
+        # Orders one after another (empty queue): beignets take 8 minutes,
+        # orders with ndolé take 25 minutes
+        start = timezone.now() - timedelta(days=2)
+        for index in range(12):
+            slow = index % 2 == 1
+            confirmed_at = start + timedelta(hours=index)
+            order = RestaurantOrder.objects.create(
+                business_location=self.location, customer=self.customer,
+                order_number=f'ORDHIST{index}', order_type='DINE_IN',
+                subtotal=Decimal('0'), total_amount=Decimal('0'), status='DELIVERED'
+            )
+            RestaurantOrder.objects.filter(pk=order.pk).update(
+                confirmed_at=confirmed_at,
+                ready_at=confirmed_at + timedelta(minutes=25 if slow else 8)
+            )
+            OrderItem.objects.bulk_create([OrderItem(
+                restaurant_order=order, menu_item=self.slow if slow else self.fast,
+                quantity=1, unit_price=Decimal('1'), total_price=Decimal('1')
+            )])
+
+    def test_rebuild_learns_item_times(self):
+        PreparationTimeService.rebuild()
+        estimates = {
+            row.menu_item_id: row.minutes
+            for row in PreparationEstimate.objects.filter(business_location=self.location)
+        }
+        self.assertEqual(estimates[self.fast.pk], Decimal('8.00'))
+        self.assertEqual(estimates[self.slow.pk], Decimal('25.00'))
+        self.assertIn(None, estimates)
+
+    def test_estimate_is_one_query(self):
+        """Test that the ETA uses the slowest learned item with one read."""
+        PreparationTimeService.rebuild()
+        with self.assertNumQueries(1):
+            minutes = PreparationTimeService.estimate(self.location.pk, [self.fast, self.slow])
+        self.assertEqual(minutes, 25)
+
+    def test_static_time_before_any_history(self):
+        """Test the fallback to the item's static preparation time."""
+        self.assertEqual(PreparationTimeService.estimate(self.location.pk, [self.slow]), 15)
+        self.assertIsNone(PreparationTimeService.estimate(self.location.pk, [self.fast]))
+
+    def test_transitions_are_stamped(self):
+        order = RestaurantOrder.objects.create(
+            business_location=self.location, customer=self.customer,
+            order_number='ORDSTAMP', order_type='DINE_IN',
+            subtotal=Decimal('0'), total_amount=Decimal('0')
+        )
+        order.status = 'CONFIRMED'
+        order.save()
+        order.status = 'PREPARING'
+        order.save()
+        order.status = 'READY'
+        order.save()
+        order.refresh_from_db()
+        self.assertIsNotNone(order.confirmed_at)
+        self.assertGreaterEqual(order.ready_at, order.confirmed_at)
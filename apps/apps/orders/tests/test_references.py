@@ -0,0 +1,70 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.business.models import Business, BusinessLocation
+from apps.core.utils import new_ulid
+from apps.orders.models import RestaurantOrder
+from apps.wallets.models import UserTransaction, UserWallet
+
+User = get_user_model()
+
+
+class NewUlidTest(SimpleTestCase):
+    """Test cases for the time-ordered identifiers."""
+
+    def test_sorted_by_time(self):
+        ulids = [new_ulid(timestamp_ms) for timestamp_ms in (1, 2 ** 40, 2 ** 47)]
+        self.assertEqual(ulids, sorted(ulids))
+        self.assertTrue(all(len(value) == 26 for value in ulids))
+        self.assertEqual(new_ulid(0)[:10], '0000000000')
+
+
+class ReferenceAssignmentTest(TestCase):
+    """Test cases for references assigned on insert."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass', email='o@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.owner, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.owner, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+
+    def create_order(self, **kwargs):
+        return RestaurantOrder.objects.create(
+            business_location=self.location, customer=self.owner, order_type='DINE_IN',
+            subtotal=Decimal('0'), total_amount=Decimal('0'), **kwargs
+        )
+
+    def test_order_number_without_lookup(self):
+        """Test that the order number is assigned without checking existing rows."""
+        with CaptureQueriesContext(connection) as queries:
+            order = self.create_order()
+        self.assertFalse([q for q in queries if 'order_number' in q['sql'] and 'SELECT' in q['sql']])
+        self.assertTrue(order.order_number.startswith('ORD'))
+        self.assertEqual(len(order.order_number), 29)
+
+    def test_collision_is_retried(self):
+        """Test that a taken order number is replaced after the IntegrityError."""
+        self.create_order(order_number='ORDTAKEN')
+        with mock.patch.object(
+            RestaurantOrder, 'generate_order_number', side_effect=['ORDTAKEN', 'ORDFREE']
+        ):
+            order = self.create_order()
+        self.assertEqual(order.order_number, 'ORDFREE')
+        self.assertEqual(RestaurantOrder.objects.count(), 2)
+
+    def test_transaction_reference(self):
+        wallet = UserWallet.objects.get_or_create(user=self.owner)[0]
+        transaction = UserTransaction.objects.create(
+            wallet=wallet, transaction_type='DEPOSIT', amount=Decimal('100'), status='COMPLETED'
+        )
+        self.assertTrue(transaction.reference.startswith('TXN-'))
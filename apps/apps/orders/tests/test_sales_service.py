@@ -0,0 +1,111 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.business.models import Business, BusinessLocation
+from apps.orders.models import FoodCategory, MenuItem, MenuItemSalesRollup
+from apps.orders.services import OrderService, SalesReportService, SalesRollupService
+
+User = get_user_model()
+
+
+class SalesRollupTest(TestCase):
+    """Test cases for the incremental sales rollups and the sales report."""
+
+    def setUp(self):
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.customer, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.customer, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+        category = FoodCategory.objects.create(name='Plats')
+        self.ndole, self.poulet, self.beignets = [
+            MenuItem.objects.create(
+                business_location=self.location, food_category=category, name=name,
+                description='d', price=Decimal(price), stock_quantity=100
+            )
+            for name, price in [('Ndolé', '2500'), ('Poulet DG', '5000'), ('Beignets', '500')]
+        ]
+
+    def place(self, quantities):
+        with self.captureOnCommitCallbacks(execute=True):
+            return OrderService.place_order(
+                self.location, self.customer,
+                [{'menu_item_id': item.pk, 'quantity': quantity} for item, quantity in quantities],
+                order_type='TAKEAWAY'
+            )
+
+    def move(self, order, *statuses):
+        for status in statuses:
+            with self.captureOnCommitCallbacks(execute=True):
+                OrderService.update_order_status(order, status)
+
+    def rollups(self):
+        return {
+            row.menu_item_id: (row.quantity, row.revenue, row.cancelled_quantity)
+            for row in MenuItemSalesRollup.objects.all()
+        }
+
+    def test_completion_and_cancellation(self):
+        sold = self.place([(self.ndole, 2), (self.poulet, 1)])
+        self.move(sold, 'CONFIRMED', 'PREPARING')
+        self.assertFalse(MenuItemSalesRollup.objects.exists())
+        self.move(sold, 'READY', 'DELIVERED')
+        cancelled = self.place([(self.ndole, 1)])
+        self.move(cancelled, 'CANCELLED')
+
+        self.assertEqual(self.rollups(), {
+            self.ndole.pk: (2, Decimal('5000.00'), 1),
+            self.poulet.pk: (1, Decimal('5000.00'), 0),
+        })
+        local = timezone.localtime(sold.created_at)
+        self.assertEqual(
+            set(MenuItemSalesRollup.objects.values_list('date', 'hour')), {(local.date(), local.hour)}
+        )
+
+        self.move(sold, 'REFUNDED')
+        self.assertEqual(self.rollups()[self.poulet.pk], (0, Decimal('0.00'), 0))
+
+    def test_rebuild_matches_incremental(self):
+        order = self.place([(self.ndole, 3), (self.beignets, 4)])
+        self.move(order, 'CONFIRMED', 'PREPARING', 'READY')
+        incremental = self.rollups()
+        self.assertEqual(len(SalesRollupService.rebuild()), 2)
+        self.assertEqual(self.rollups(), incremental)
+
+    def test_failed_rollup_does_not_fail_the_order(self):
+        order = self.place([(self.ndole, 1)])
+        self.move(order, 'CONFIRMED', 'PREPARING')
+        with mock.patch.object(SalesRollupService, 'apply', side_effect=RuntimeError), \
+                self.assertLogs(level='ERROR'):
+            self.move(order, 'READY')
+        order.refresh_from_db()
+        self.assertEqual(order.status, 'READY')
+        self.assertFalse(MenuItemSalesRollup.objects.exists())
+
+        SalesRollupService.rebuild()
+        self.assertEqual(self.rollups(), {self.ndole.pk: (1, Decimal('2500.00'), 0)})
+
+    def test_report_reads_rollups_only(self):
+        order = self.place([(self.ndole, 3), (self.beignets, 1)])
+        self.move(order, 'CONFIRMED', 'PREPARING', 'READY')
+
+        with CaptureQueriesContext(connection) as queries:
+            report = SalesReportService.report(self.location.pk, days=7)
+        self.assertEqual(len(queries), 3)
+        self.assertFalse([query for query in queries if 'order_item' in query['sql']])
+
+        self.assertEqual([row['name'] for row in report['top_sellers']], ['Ndolé', 'Beignets'])
+        local = timezone.localtime(order.created_at)
+        self.assertEqual(report['hourly_heatmap'][local.isoweekday() - 1][local.hour], 4)
+        self.assertEqual(report['slow_movers'][0]['name'], 'Poulet DG')
+        self.assertEqual(report['slow_movers'][0]['quantity'], 0)
@@ -0,0 +1,83 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.business.models import Business, BusinessLocation
+from apps.orders.models import FoodCategory, MenuItem, StockHold
+from apps.orders.services import OrderService, StockHoldService
+
+User = get_user_model()
+
+
+class StockHoldTest(TestCase):
+    """Test cases for checkout stock holds."""
+
+    def setUp(self):
+        self.alice = User.objects.create_user(username='alice', password='pass', email='a@example.com')
+        self.bob = User.objects.create_user(username='bob', password='pass', email='b@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.alice, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.alice, name='Test Restaurant',
+            city='Douala', region='Littoral', business_location_type='restaurant'
+        )
+        category = FoodCategory.objects.create(name='Plats')
+        self.item = MenuItem.objects.create(
+            business_location=self.location, food_category=category, name='Ndolé',
+            description='d', price=Decimal('2500'), stock_quantity=4
+        )
+
+    def place(self, customer, quantity):
+        return OrderService.place_order(
+            self.location, customer, [{'menu_item_id': self.item.pk, 'quantity': quantity}],
+            order_type='TAKEAWAY'
+        )
+
+    def stock(self):
+        return MenuItem.objects.get(pk=self.item.pk).stock_quantity
+
+    def test_hold_protects_stock_until_converted(self):
+        StockHoldService.hold(self.alice, {self.item.pk: 3})
+        self.assertEqual(self.stock(), 4)
+
+        with self.assertRaises(ValidationError):
+            self.place(self.bob, 2)
+        with self.assertRaises(ValidationError):
+            StockHoldService.hold(self.bob, {self.item.pk: 2})
+        self.place(self.bob, 1)
+
+        order = self.place(self.alice, 3)
+        self.assertEqual(self.stock(), 0)
+        hold = StockHold.objects.get(customer=self.alice)
+        self.assertEqual((hold.status, hold.restaurant_order_id), ('CONVERTED', order.pk))
+
+    def test_expired_hold_frees_stock_and_is_swept(self):
+        StockHoldService.hold(self.alice, {self.item.pk: 4})
+        StockHold.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        self.place(self.bob, 2)
+        self.assertEqual(StockHoldService.expire(), 1)
+        self.assertEqual(StockHold.objects.get().status, 'EXPIRED')
+
+    def test_hold_replaces_previous_checkout(self):
+        StockHoldService.hold(self.alice, {self.item.pk: 2})
+        StockHoldService.hold(self.alice, {self.item.pk: 4})
+        self.assertEqual(StockHold.objects.filter(status='ACTIVE').get().quantity, 4)
+        StockHoldService.release(self.alice)
+        self.assertFalse(StockHold.objects.filter(status='ACTIVE').exists())
+
+    def test_cancellation_restores_stock(self):
+        order = self.place(self.bob, 4)
+        self.assertFalse(MenuItem.objects.get(pk=self.item.pk).is_available)
+
+        OrderService.update_order_status(order, 'CANCELLED', notes='client parti')
+
+        item = MenuItem.objects.get(pk=self.item.pk)
+        self.assertEqual(item.stock_quantity, 4)
+        self.assertTrue(item.is_available)
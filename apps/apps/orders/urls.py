@@ -29,6 +29,10 @@ urlpatterns = [
     path('cart/remove/<int:pk>/', cart_remove_item, name='cart_remove_item'),
     path('cart/valider/', valider_commande, name='valider_commande'),
 
+    # Kitchen display
+    path('kitchen/<int:location_pk>/', views.kitchen_display, name='kitchen_display'),
+    path('kitchen/<int:location_pk>/stream/', views.kitchen_stream, name='kitchen_stream'),
+
     # Orders
     path('', views.order_list, name='order_list'),
     path('create/', views.order_create, name='order_create'),
@@ -44,6 +48,9 @@ urlpatterns = [
 
     # API endpoints for AJAX requests
     path('api/menu-items/', views.api_menu_items, name='api_menu_items'),
+    path('api/delivery-quote/', views.api_delivery_quote, name='api_delivery_quote'),
+    path('api/sales-report/', views.api_sales_report, name='api_sales_report'),
+    path('api/funnel/', views.api_order_funnel, name='api_order_funnel'),
     path('api/order-items/', views.api_order_items, name='api_order_items'),
     path('api/order-total/', views.api_order_total, name='api_order_total'),
 ] 
\ No newline at end of file
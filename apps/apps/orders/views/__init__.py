@@ -30,6 +30,11 @@ from .web import (
     
     # API views
     api_menu_items,
+    api_delivery_quote,
+    api_order_funnel,
+    api_sales_report,
     api_order_items,
     api_order_total,
 )
+
+from .kitchen import kitchen_display, kitchen_stream
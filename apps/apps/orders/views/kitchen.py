@@ -0,0 +1,93 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.http import HttpResponseForbidden, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.utils.translation import gettext_lazy as _
+
+from apps.business.models import BusinessLocation
+from apps.business.views.permissions import has_any_permission
+from ..services.kitchen_service import KitchenService, broker
+
+# Seconds between keep-alive comments on an idle stream
+HEARTBEAT_INTERVAL = 15
+
+
+def _can_view_kitchen(user, location):
+    return location.business.owner == user or has_any_permission(user, location)
+
+
+def _format_event(event_type, data, event_id=None):
+    lines = []
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'event: {event_type}')
+    lines.append(f'data: {json.dumps(data, default=str)}')
+    return '\n'.join(lines) + '\n\n'
+
+
+@login_required
+def kitchen_display(request, location_pk):
+    """Kitchen screen showing the live order queue of a restaurant."""
+    location = get_object_or_404(BusinessLocation.objects.select_related('business'), pk=location_pk)
+    if not _can_view_kitchen(request.user, location):
+        return HttpResponseForbidden(_("Vous n'avez pas les permissions pour accéder à cet écran."))
+    return render(request, 'orders/kitchen_display.html', {
+        'location': location,
+        'statuses': KitchenService.ACTIVE_STATUSES,
+    })
+
+
+@login_required
+async def kitchen_stream(request, location_pk):
+    """
+    Server-sent events stream of a restaurant's order queue.
+
+    The stream opens with a ``snapshot`` of the active orders (or only the
+    missed events when the browser reconnects with ``Last-Event-ID``), then
+    relays ``order_created`` and ``order_status`` events from the in-process
+    broker. It must be served through the ASGI application.
+    """
+    location = await BusinessLocation.objects.select_related('business').filter(pk=location_pk).afirst()
+    if location is None:
+        return HttpResponseForbidden()
+    user = await request.auser()
+    if not await sync_to_async(_can_view_kitchen)(user, location):
+        return HttpResponseForbidden()
+
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+
+    # Subscribe before loading the snapshot so no change falls in between
+    subscription = broker.subscribe(location.pk)
+    missed = broker.events_since(location.pk, last_event_id) if last_event_id is not None else None
+    snapshot = None if missed is not None else await sync_to_async(KitchenService.get_queue)(location.pk)
+
+    async def events():
+        sent_id = last_event_id if missed is not None else 0
+        try:
+            if snapshot is not None:
+                yield _format_event('snapshot', snapshot)
+            for event in missed or []:
+                sent_id = event['id']
+                yield _format_event(event['type'], event['data'], event['id'])
+            while True:
+                if subscription.overflowed:
+                    yield _format_event('resync', {})
+                    return
+                event = await subscription.get(HEARTBEAT_INTERVAL)
+                if event is None:
+                    yield ': keep-alive\n\n'
+                elif event['id'] > sent_id:
+                    sent_id = event['id']
+                    yield _format_event(event['type'], event['data'], event['id'])
+        finally:
+            broker.unsubscribe(subscription)
+
+    response = StreamingHttpResponse(events(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
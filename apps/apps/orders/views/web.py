@@ -7,10 +7,12 @@ from django.utils.translation import gettext_lazy as _
 from django.views.generic import (
     ListView, DetailView, CreateView, UpdateView, DeleteView
 )
+from django.db import transaction
 from django.db.models import Q
 from django.contrib.auth.decorators import login_required
 from django.http import JsonResponse
-from django.views.decorators.http import require_POST
+from django.core.exceptions import BadRequest, ValidationError
+from django.views.decorators.http import condition, require_POST
 
 from ..models import FoodCategory, MenuItem, RestaurantOrder, OrderItem, MenuItemImage
 from ..forms import (
@@ -18,10 +20,11 @@ from ..forms import (
     OrderItemForm, OrderStatusForm, OrderPaymentForm, OrderCancellationForm,
     CustomRestaurantOrderForm, OrderCustomerForm
 )
-from ..services import OrderService, MenuService
+from ..services import OrderService, MenuService, MenuCacheService, OrderFunnelService, DeliveryZoneService, SalesReportService
 from apps.orders.services.order_service import validate_cart_checkout
+from apps.orders.services.cart_service import Cart
+from apps.orders.services.stock_hold_service import StockHoldService
 from apps.business.templatetags.business_tags import is_owner
-from apps.wallets.services.wallet_service import WalletService
 from apps.users.models.user import User
 
 
@@ -227,7 +230,8 @@ def update_order_status(request, pk):
                 OrderService.update_order_status(
                     order,
                     form.cleaned_data['status'],
-                    notes=form.cleaned_data.get('restaurant_notes')
+                    notes=form.cleaned_data.get('restaurant_notes'),
+                    changed_by=request.user
                 )
                 messages.success(request, _("Order status updated successfully"))
             except Exception as e:
@@ -305,15 +309,25 @@ def food_category_delete(request, pk):
     })
 
 
+def _menu_location(request):
+    """Location id of the ``location`` query parameter, None for every location."""
+    location = request.GET.get('location')
+    if not location:
+        return None
+    try:
+        return int(location)
+    except ValueError:
+        raise BadRequest(_('location must be an integer.'))
+
+
 # Menu Item Views
 @login_required
 def menu_item_list(request):
-    """List all menu items."""
-    menu_items = MenuItem.objects.all()
-    categories = FoodCategory.objects.all()
+    """List all menu items, or those of one location, from the cached menu."""
+    snapshot = MenuCacheService.get_snapshot(_menu_location(request))
     return render(request, 'orders/menu_item/list.html', {
-        'menu_items': menu_items,
-        'categories': categories
+        'menu_items': snapshot['items'],
+        'categories': snapshot['categories']
     })
 
 
@@ -465,36 +479,15 @@ def order_create(request):
                         phone_number=phone,
                         username=email or phone or f'user_{User.objects.count()+1}'
                     )
-                # Créer la commande principale
-                order = form.save(commit=False)
-                order.customer = customer
-                order.business_location = business_location
-                order.status = 'READY'
-                order.payment_status = 'PAID'
-                order.payment_method = 'CASH'
-                order.save()
-                # Créer les OrderItem à partir des plats sélectionnés
-                menu_item_ids = request.POST.getlist('menu_items')
-                for item_id in menu_item_ids:
-                    try:
-                        menu_item = menu_items_in_stock.get(id=item_id)
-                        quantity = int(request.POST.get(f'quantity_{item_id}', 1))
-                        if quantity > 0 and quantity <= menu_item.stock_quantity:
-                            OrderItem.objects.create(
-                                restaurant_order=order,
-                                menu_item=menu_item,
-                                quantity=quantity,
-                                unit_price=menu_item.price,
-                                total_price=menu_item.price * quantity
-                            )
-                            menu_item.stock_quantity -= quantity
-                            if menu_item.stock_quantity == 0:
-                                menu_item.is_available = False
-                            menu_item.save()
-                    except MenuItem.DoesNotExist:
-                        continue
-                order.calculate_total()
-                order.save()
+                # Créer la commande, ses lignes et le paiement espèces à partir des plats sélectionnés
+                order = OrderService.create_order(
+                    business_location,
+                    customer,
+                    OrderService.items_from_form_data(request.POST),
+                    order=form.save(commit=False),
+                    status='READY',
+                    payment_method='CASH',
+                )
                 messages.success(request, _('Order created successfully.'))
                 return redirect('orders:order_detail', order_number=order.order_number)
             except Exception as e:
@@ -564,7 +557,8 @@ def order_cancel(request, order_number):
                 OrderService.update_order_status(
                     order,
                     'CANCELLED',
-                    cancellation_reason=form.cleaned_data['cancellation_reason']
+                    cancellation_reason=form.cleaned_data['cancellation_reason'],
+                    changed_by=request.user
                 )
                 messages.success(request, _('Order cancelled successfully.'))
                 return redirect('orders:order_detail', order_number=order_number)
@@ -590,7 +584,8 @@ def order_status_update(request, order_number):
                 OrderService.update_order_status(
                     order,
                     form.cleaned_data['status'],
-                    notes=form.cleaned_data.get('restaurant_notes')
+                    notes=form.cleaned_data.get('restaurant_notes'),
+                    changed_by=request.user
                 )
                 messages.success(request, _('Order status updated successfully.'))
                 return redirect('orders:order_detail', order_number=order_number)
@@ -709,34 +704,116 @@ def order_item_delete(request, order_number, item_id):
 
 
 # API Views
+def _menu_etag(request):
+    return MenuCacheService.get_etag(_menu_location(request))
+
+
 @login_required
+@condition(etag_func=_menu_etag)
 def api_menu_items(request):
-    """API endpoint for menu items."""
-    query = request.GET.get('q', '')
+    """
+    API endpoint for menu items.
+
+    Items come from the cached menu snapshot of ``location`` (or of every
+    location); the ETag only depends on the menu version, so clients
+    revalidating with If-None-Match get a 304 without the menu being loaded.
+    """
+    query = request.GET.get('q', '').lower()
     category_id = request.GET.get('category')
-    
-    menu_items = MenuItem.objects.filter(is_available=True)
-    
+
+    snapshot = MenuCacheService.get_snapshot(_menu_location(request))
+    menu_items = [item for item in snapshot['items'] if item['is_available']]
+
     if query:
-        menu_items = menu_items.filter(
-            Q(name__icontains=query) |
-            Q(description__icontains=query)
-        )
-    
+        menu_items = [
+            item for item in menu_items
+            if query in item['name'].lower() or query in item['description'].lower()
+        ]
+
     if category_id:
-        menu_items = menu_items.filter(food_category_id=category_id)
-    
+        menu_items = [item for item in menu_items if str(item['food_category']['id']) == category_id]
+
     data = [{
-        'id': item.id,
-        'name': item.name,
-        'price': float(item.price),
-        'description': item.description,
-        'image_url': item.main_image.url if item.main_image else None,
+        'id': item['id'],
+        'name': item['name'],
+        'price': float(item['price']),
+        'description': item['description'],
+        'image_url': item['image_url'],
     } for item in menu_items]
-    
+
     return JsonResponse({'items': data})
 
 
+@login_required
+def api_delivery_quote(request):
+    """API endpoint for the delivery fee and time to a point."""
+    try:
+        location_id = int(request.GET['location'])
+        latitude = float(request.GET['lat'])
+        longitude = float(request.GET['lng'])
+    except (KeyError, ValueError):
+        return JsonResponse({'error': _('location, lat and lng are required.')}, status=400)
+
+    quote = DeliveryZoneService.quote(location_id, latitude, longitude)
+    if quote is None:
+        return JsonResponse({'deliverable': False})
+    return JsonResponse({
+        'deliverable': True,
+        'zone': quote['zone_name'],
+        'fee': float(quote['fee']),
+        'eta_minutes': quote['eta_minutes'],
+    })
+
+
+@login_required
+def api_order_funnel(request):
+    """
+    API endpoint for the order funnel report of a location.
+
+    Staff may omit ``location`` to get every location.
+    """
+    from apps.business.models import BusinessLocation
+    from apps.business.views.permissions import has_any_permission
+
+    try:
+        days = min(max(int(request.GET.get('days', 30)), 1), 366)
+    except ValueError:
+        return JsonResponse({'error': _('Invalid number of days.')}, status=400)
+
+    location_ids = None
+    location_id = request.GET.get('location')
+    if location_id:
+        location = get_object_or_404(BusinessLocation.objects.select_related('business'), pk=location_id)
+        if not (request.user.is_staff or has_any_permission(request.user, location)):
+            return JsonResponse({'error': _("You don't have permission to view this report")}, status=403)
+        location_ids = [location.pk]
+    elif not request.user.is_staff:
+        return JsonResponse({'error': _('A location is required.')}, status=400)
+
+    return JsonResponse(OrderFunnelService.report(days=days, location_ids=location_ids))
+
+
+@login_required
+def api_sales_report(request):
+    """API endpoint for the top sellers, hourly heatmap and slow movers of a location."""
+    from apps.business.models import BusinessLocation
+    from apps.business.views.permissions import has_any_permission
+
+    try:
+        days = min(max(int(request.GET.get('days', 30)), 1), 366)
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 100)
+    except ValueError:
+        return JsonResponse({'error': _('Invalid parameters.')}, status=400)
+
+    location = get_object_or_404(
+        BusinessLocation.objects.select_related('business'), pk=request.GET.get('location') or 0
+    )
+    if not (request.user.is_staff or has_any_permission(request.user, location)):
+        return JsonResponse({'error': _("You don't have permission to view this report")}, status=403)
+
+    return JsonResponse(SalesReportService.report(location.pk, days=days, limit=limit))
+
+
 @login_required
 def api_order_items(request, order_number):
     """API endpoint for order items."""
@@ -779,25 +856,11 @@ def api_order_total(request, order_number):
 def add_to_cart(request, pk):
     """Ajoute un plat au panier (session)."""
     menu_item = get_object_or_404(MenuItem, pk=pk, is_available=True, stock_quantity__gt=0)
-    cart = request.session.get('cart', {})
-    item_id = str(menu_item.pk)
-    if item_id in cart:
-        cart[item_id]['quantity'] += 1
-    else:
-        cart[item_id] = {
-            'name': menu_item.name,
-            'price': float(menu_item.price),
-            'quantity': 1,
-            'image': menu_item.main_image.url if menu_item.main_image else '',
-            'stock_quantity': menu_item.stock_quantity
-        }
     # Limiter la quantité au stock disponible
-    if cart[item_id]['quantity'] > menu_item.stock_quantity:
-        cart[item_id]['quantity'] = menu_item.stock_quantity
-        messages.warning(request, _("Stock maximum atteint pour ce plat."))
-    else:
+    if Cart(request.session).add(menu_item):
         messages.success(request, _(f"{menu_item.name} ajouté au panier."))
-    request.session['cart'] = cart
+    else:
+        messages.warning(request, _("Stock maximum atteint pour ce plat."))
     next_url = request.POST.get('next')
     if next_url:
         return redirect(next_url)
@@ -816,51 +879,65 @@ def restaurant_order_create(request):
 
 
 def cart_detail(request):
-    cart = request.session.get('cart', {})
-    total = sum(item['price'] * item['quantity'] for item in cart.values())
-    return render(request, 'orders/cart/detail.html', {'cart': cart, 'total': total})
+    cart = Cart(request.session)
+    held = None
+    if request.user.is_authenticated:
+        held = StockHoldService.held_by_others(list(cart.quantities()), request.user)
+    # Prix et stock actuels de toutes les lignes en une requête
+    menu_items, changes = cart.revalidate(held=held)
+    for change in changes:
+        messages.warning(request, Cart.describe_change(change))
+    if request.user.is_authenticated and cart:
+        # Réserve le stock le temps de valider la commande
+        try:
+            StockHoldService.hold(request.user, cart.quantities())
+        except ValidationError as e:
+            messages.warning(request, e.messages[0])
+    lines, total = cart.detail(menu_items)
+    return render(request, 'orders/cart/detail.html', {'cart': lines, 'total': total})
 
 
 @require_POST
 def cart_clear(request):
-    request.session['cart'] = {}
+    Cart(request.session).clear()
+    if request.user.is_authenticated:
+        StockHoldService.release(request.user)
     return redirect('orders:cart_detail')
 
 
 @require_POST
 def cart_update_quantity(request, pk):
-    cart = request.session.get('cart', {})
-    item_id = str(pk)
     try:
         quantity = int(request.POST.get('quantity', 1))
-        if quantity < 1:
-            cart.pop(item_id, None)
-        else:
-            if item_id in cart:
-                cart[item_id]['quantity'] = quantity
-        request.session['cart'] = cart
-        return JsonResponse({'success': True, 'quantity': quantity})
-    except Exception:
+    except (TypeError, ValueError):
         return JsonResponse({'success': False}, status=400)
+    cart = Cart(request.session)
+    if request.user.is_authenticated and quantity >= 1 and str(pk) in cart.lines:
+        quantities = cart.quantities()
+        quantities[pk] = quantity
+        try:
+            StockHoldService.hold(request.user, quantities)
+        except ValidationError as e:
+            return JsonResponse({'success': False, 'error': e.messages[0]}, status=409)
+    cart.set_quantity(pk, quantity)
+    return JsonResponse({'success': True, 'quantity': quantity})
 
 
 @require_POST
 def cart_remove_item(request, pk):
-    cart = request.session.get('cart', {})
-    item_id = str(pk)
-    if item_id in cart:
-        cart.pop(item_id)
-        request.session['cart'] = cart
+    Cart(request.session).remove(pk)
+    if request.user.is_authenticated:
+        StockHoldService.release(request.user, [pk])
     return redirect('orders:cart_detail')
 
 
 @require_POST
 @login_required
 def valider_commande(request):
-    cart = request.session.get('cart', {})
+    cart = Cart(request.session)
     result = validate_cart_checkout(request.user, cart)
     if result['success']:
-        request.session['cart'] = {}
+        cart.clear()
         messages.success(request, "Commande validée et payée avec succès !")
         return redirect('orders:order_list')
     else:
@@ -880,11 +957,13 @@ def validate_order(request, order_number):
         return redirect('orders:order_detail', order_number=order_number)
     if request.method == 'POST':
         try:
-            # Passe le statut à DELIVERED
-            OrderService.update_order_status(order, 'DELIVERED')
-            # Créditer le wallet business
-            wallet, created = WalletService.get_or_create_business_wallet(order.business_location.business)
-            WalletService.update_wallet_balance(wallet, order.total_amount, 'add')
+            with transaction.atomic():
+                # Passe le statut à DELIVERED
+                OrderService.update_order_status(order, 'DELIVERED', changed_by=request.user)
+                # Une commande payée en ligne a déjà crédité l'établissement ;
+                # sinon le paiement est encaissé à la livraison
+                if order.payment_status != 'PAID':
+                    OrderService.record_cash_payment(order)
             messages.success(request, _("Commande validée et wallet crédité."))
         except Exception as e:
             messages.error(request, _(f"Erreur lors de la validation : {e}"))
@@ -9,6 +9,7 @@ class RoomBooking(Booking):
     """
     Model for room bookings, inheriting from Booking base class.
     """
+    REFERENCE_PREFIX = 'RB'
     STATUS_CHOICES = Booking.STATUS_CHOICES + [
         ('CHECKED_IN', _('Checked In')),
         ('CHECKED_OUT', _('Checked Out')),
@@ -47,11 +48,6 @@ class RoomBooking(Booking):
     def __str__(self):
         return f"Room Booking {self.booking_reference} - {self.room}"
 
-    def generate_booking_reference(self):
-        """Generate room booking specific reference"""
-        from django.utils.crypto import get_random_string
-        return f"RB{get_random_string(8).upper()}"
-
     @property
     def duration_nights(self) -> int:
         """Calculate number of nights"""
@@ -0,0 +1,114 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.business.models import Business, BusinessLocation
+from apps.rooms.models import Room, RoomBooking, RoomType
+from apps.wallets.models import UserTransaction, UserWallet
+from apps.wallets.models.wallet import BusinessLocationWallet
+from apps.wallets.services import LedgerService, ReconciliationService, WalletService
+
+User = get_user_model()
+
+
+class RoomBookingPaymentTest(TestCase):
+    """Test cases for the payment, approval and cancellation of room bookings."""
+
+    def setUp(self):
+        admin = User.objects.create_superuser(username='admin', password='pass', email='admin@example.com')
+        UserWallet.objects.create(user=admin)
+        self.owner = User.objects.create_user(username='owner', password='pass', email='o@example.com')
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.owner, email='b@example.com',
+            phone='600000000', description='Test', commission_rate=Decimal('10.00')
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.owner, name='Test Hotel',
+            city='Douala', region='Littoral', business_location_type='hotel'
+        )
+        room_type = RoomType.objects.create(
+            name='Standard', code='STD', max_occupancy=2, base_price=Decimal('10000.00')
+        )
+        self.room = Room.objects.create(
+            business_location=self.location, room_type=room_type, room_number='101',
+            price_per_night=Decimal('10000.00'), max_occupancy=2
+        )
+        self.wallet = UserWallet.objects.create(user=self.customer)
+        LedgerService.post([
+            LedgerService.debit(None, 50000, 'DEPOSIT'),
+            LedgerService.credit(self.wallet, 50000, 'DEPOSIT'),
+        ])
+        self.location_wallet = BusinessLocationWallet.objects.get(business_location=self.location)
+
+    def book(self, amount_paid):
+        """Book two nights and pay ``amount_paid`` as room_booking_create does."""
+        commission_amount, net_amount = LedgerService.split_commission(self.location, amount_paid)
+        today = timezone.now().date()
+        booking = RoomBooking.objects.create(
+            room=self.room, customer=self.customer, business_location=self.location,
+            check_in_date=today + timedelta(days=5), check_out_date=today + timedelta(days=7),
+            total_amount=Decimal('20000.00'), commission_amount=commission_amount
+        )
+        LedgerService.post_payment(
+            self.wallet, self.location, amount_paid, booking, transaction_type='HOLD'
+        )
+        return booking
+
+    def assertBalances(self, customer, location, platform):
+        self.wallet.refresh_from_db()
+        self.location_wallet.refresh_from_db()
+        platform_wallet = WalletService.get_platform_wallet()
+        platform_wallet.refresh_from_db()
+        self.assertEqual(
+            (self.wallet.balance, self.location_wallet.balance, platform_wallet.available_balance),
+            (Decimal(customer), Decimal(location), Decimal(platform))
+        )
+        self.assertFalse(UserTransaction.objects.filter(journal_entry__isnull=True).exists())
+        self.assertEqual(ReconciliationService.reconcile(), [])
+
+    def test_cash_payment_posts_the_rest_without_wallet(self):
+        booking = self.book(Decimal('10000'))
+        self.client.force_login(self.owner)
+        self.client.post(reverse('rooms:process_cash_payment', args=[booking.booking_reference]))
+
+        booking.refresh_from_db()
+        self.assertEqual((booking.status, booking.commission_amount), ('CONFIRMED', Decimal('2000.00')))
+        self.assertBalances('40000.00', '18000.00', '2000.00')
+        cash = booking.transactions.get(transaction_type='CASH_PAYMENT')
+        self.assertEqual((cash.wallet_object_id, cash.direction, cash.amount), (None, 'DEBIT', Decimal('10000.00')))
+
+    def test_approval_moves_no_money(self):
+        booking = self.book(Decimal('20000'))
+        self.client.force_login(self.owner)
+        self.client.post(reverse('rooms:approve_booking', args=[booking.booking_reference]))
+
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, 'CONFIRMED')
+        self.assertBalances('30000.00', '18000.00', '2000.00')
+
+    def test_customer_pays_the_rest_from_the_wallet(self):
+        booking = self.book(Decimal('4000'))
+        self.client.force_login(self.customer)
+        self.client.post(reverse('rooms:finalize_payment', args=[booking.booking_reference]))
+
+        booking.refresh_from_db()
+        self.assertEqual((booking.status, booking.commission_amount), ('CONFIRMED', Decimal('2000.00')))
+        self.assertBalances('30000.00', '18000.00', '2000.00')
+
+    def test_cancellation_refunds_what_was_paid_once(self):
+        booking = self.book(Decimal('10000'))
+        self.client.force_login(self.customer)
+        url = reverse('rooms:cancel_booking', args=[booking.booking_reference])
+        self.client.post(url, {'reason': 'Changement de programme'})
+
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, 'CANCELLED')
+        self.assertBalances('50000.00', '0.00', '0.00')
+
+        self.client.post(url, {'reason': 'Encore'})
+        self.assertBalances('50000.00', '0.00', '0.00')
@@ -17,7 +17,6 @@ from datetime import date
 from django.db import transaction
 from django.utils import timezone
 from datetime import timedelta
-import uuid
 
 from ..models import Room, RoomBooking, RoomType, RoomImage
 from ..forms import RoomSearchForm, RoomBookingForm
@@ -26,9 +25,9 @@ from ..services.reservation_service import ReservationService
 from apps.business.models import BusinessLocation
 from apps.business.models.business_amenity import BusinessAmenityCategory
 from apps.wallets.services.wallet_service import WalletService
-from apps.wallets.services.transaction_service import TransactionService
+from apps.wallets.services.ledger_service import LedgerService
+from apps.wallets.services.commission_service import CommissionService
 from apps.wallets.models.wallet import UserWallet, BusinessWallet, BusinessLocationWallet
-from apps.wallets.models.transaction import UserTransaction
 from apps.users.models import User
 from django.contrib.contenttypes.models import ContentType
 
@@ -605,46 +604,15 @@ def room_booking_create(request, room_id):
             if not WalletService.check_sufficient_funds(wallet, amount_to_pay):
                 messages.error(request, _(f"Votre solde est insuffisant pour payer {amount_to_pay:.0f} XAF. Veuillez recharger votre wallet."))
                 return redirect(request.path)
-            # Débit du wallet et création de la transaction HOLD
+            # Réservation et écriture de paiement (débit client, net établissement, commission)
             try:
                 with transaction.atomic():
-                    # Débiter le wallet
-                    WalletService.update_wallet_balance(wallet, amount_to_pay, 'subtract')
-                    
-                    # Calculate commission
                     business_location = room.business_location
-                    commission_amount = business_location.business.calculate_commission(amount_to_pay)
-                    
-                    # Calculate net amount for business (amount_paid - commission)
-                    net_amount = amount_to_pay - commission_amount
-                    
-                    # Get business location wallet
-                    business_wallet = BusinessLocationWallet.objects.select_for_update().get(business_location=business_location)
-                    
-                    # Get super admin wallet
-                    super_admin = User.objects.filter(is_superuser=True).first()
-                    if not super_admin:
-                        super_admin = User.objects.order_by('id').first()
-                    
-                    super_admin_wallet = getattr(super_admin, 'wallet', None)
-                    
-                    # Credit business location with net amount
-                    if not business_wallet.deposit(net_amount):
-                        raise ValidationError(f"Erreur lors du crédit du wallet business pour {business_location.name}.")
-                    
-                    # Credit super admin with commission
-                    if commission_amount > 0 and super_admin_wallet:
-                        if not super_admin_wallet.deposit(commission_amount):
-                            raise ValidationError("Erreur lors du crédit de la commission au wallet admin.")
-                    
-                    # Créer la réservation directement (statut PENDING) avec commission
-                    nights = (check_out_date - check_in_date).days
-                    total_amount = room.price_per_night * nights
-                    
+                    commission_amount, net_amount = LedgerService.split_commission(business_location, amount_to_pay)
                     booking = RoomBooking.objects.create(
                         room=room,
                         customer=request.user,
-                        business_location=room.business_location,
+                        business_location=business_location,
                         check_in_date=check_in_date,
                         check_out_date=check_out_date,
                         adults_count=form.cleaned_data['adults_count'],
@@ -656,46 +624,13 @@ def room_booking_create(request, room_id):
                         commission_amount=commission_amount,
                         total_amount=total_amount
                     )
-                    
-                    # Create transaction for business location
-                    UserTransaction.objects.create(
-                        wallet=business_wallet,
-                        transaction_type='HOLD',
-                        amount=net_amount,
-                        status='COMPLETED',
-                        reference=str(uuid.uuid4()),
-                        description=f"Paiement partiel chambre {room.room_number} (après commission)",
-                        content_type=ContentType.objects.get_for_model(booking),
-                        object_id=booking.id,
-                        created_at=timezone.now()
-                    )
-                    
-                    # Create commission transaction
-                    if commission_amount > 0 and super_admin_wallet:
-                        UserTransaction.objects.create(
-                            wallet=super_admin_wallet,
-                            transaction_type='COMMISSION',
-                            amount=commission_amount,
-                            status='COMPLETED',
-                            reference=str(uuid.uuid4()),
-                            description=f"Commission réservation chambre {room.room_number}",
-                            content_type=ContentType.objects.get_for_model(booking),
-                            object_id=booking.id,
-                            created_at=timezone.now()
-                        )
-                    
-                    # Créer la transaction HOLD pour l'utilisateur
-                    description = f"Réservation chambre {room.room_number} ({payment_percentage}% du montant total)"
-                    user_transaction = UserTransaction.objects.create(
-                        wallet=wallet,
-                        transaction_type='HOLD',
-                        amount=amount_to_pay,
-                        status='COMPLETED',
-                        reference=str(uuid.uuid4()),
-                        description=description,
-                        content_type=ContentType.objects.get_for_model(booking),
-                        object_id=booking.id,
-                        created_at=timezone.now()
+                    LedgerService.post_payment(
+                        wallet,
+                        business_location,
+                        amount_to_pay,
+                        booking,
+                        description=f"Réservation chambre {room.room_number} ({payment_percentage}% du montant total)",
+                        transaction_type='HOLD'
                     )
                     
                     messages.success(request, _(f"Réservation créée avec succès ! {amount_to_pay:.0f} XAF ont été débités de votre wallet."))
@@ -745,9 +680,7 @@ def booking_detail(request, reference):
     total_amount = booking.room.price_per_night * nights
 
     # Montant déjà payé (somme des transactions HOLD/COMPLETED)
-    already_paid = sum(
-        t.amount for t in booking.transactions.filter(status='COMPLETED')
-    )
+    already_paid = CommissionService.get_paid_amount(booking)
     remaining_amount = total_amount - already_paid
 
     context = {
@@ -770,9 +703,7 @@ def finalize_payment(request, reference):
     )
     nights = (booking.check_out_date - booking.check_in_date).days
     total_amount = booking.room.price_per_night * nights
-    already_paid = sum(
-        t.amount for t in booking.transactions.filter(status='COMPLETED')
-    )
+    already_paid = CommissionService.get_paid_amount(booking)
     remaining_amount = total_amount - already_paid
 
     if remaining_amount <= 0:
@@ -790,16 +721,15 @@ def finalize_payment(request, reference):
 
     try:
         with transaction.atomic():
-            WalletService.update_wallet_balance(wallet, remaining_amount, 'subtract')
-            # Créer la transaction
-            transaction_obj = TransactionService.create_user_transaction(
-                wallet=wallet,
-                transaction_type='PAYMENT',
-                amount=remaining_amount,
-                description=f"Solde réservation chambre {booking.room.room_number}",
-                status='COMPLETED'
+            # Écriture de paiement : débit client, net établissement, commission plateforme
+            entry = LedgerService.post_payment(
+                wallet,
+                booking.business_location,
+                remaining_amount,
+                booking,
+                description=f"Solde réservation chambre {booking.room.room_number}"
             )
-            booking.transactions.add(transaction_obj)
+            booking.commission_amount += entry.commission_amount
             # Mettre à jour le statut si tout est payé
             booking.status = 'CONFIRMED'
             booking.save()
@@ -826,7 +756,9 @@ def finalize_payment_admin(request, reference):
         return redirect('rooms:booking_list', business_location_id=booking.business_location.id)
     
     # Récupérer la transaction HOLD originale
-    hold_transaction = booking.transactions.filter(transaction_type='HOLD', status='COMPLETED').first()
+    hold_transaction = booking.transactions.filter(
+        transaction_type='HOLD', status='COMPLETED', direction='DEBIT'
+    ).first()
     if not hold_transaction:
         messages.error(request, "Aucune transaction HOLD trouvée pour cette réservation.")
         return redirect('rooms:booking_list', business_location_id=booking.business_location.id)
@@ -865,7 +797,9 @@ def process_cash_payment(request, reference):
         return redirect('rooms:booking_list', business_location_id=booking.business_location.id)
     
     # Récupérer la transaction HOLD originale
-    hold_transaction = booking.transactions.filter(transaction_type='HOLD', status='COMPLETED').first()
+    hold_transaction = booking.transactions.filter(
+        transaction_type='HOLD', status='COMPLETED', direction='DEBIT'
+    ).first()
     if not hold_transaction:
         messages.error(request, "Aucune transaction HOLD trouvée pour cette réservation.")
         return redirect('rooms:booking_list', business_location_id=booking.business_location.id)
@@ -876,100 +810,20 @@ def process_cash_payment(request, reference):
 
     try:
         with transaction.atomic():
-            # 1. Rembourser le montant HOLD au wallet utilisateur
-            customer_wallet = WalletService.get_user_wallet(booking.customer)
-            if customer_wallet and customer_wallet.is_active:
-                customer_wallet.deposit(hold_amount)
-                
-                # Créer une transaction de remboursement pour le HOLD
-                refund_transaction = UserTransaction.objects.create(
-                    wallet=customer_wallet,
-                    transaction_type='REFUND',
-                    amount=hold_amount,
-                    description=f"Remboursement transaction HOLD - Réservation chambre {booking.room.room_number}",
-                    status='COMPLETED',
-                    reference=f"REFUND-HOLD-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    content_object=booking
-                )
-                booking.transactions.add(refund_transaction)
-            
-            # 2. Créer une nouvelle transaction PAYMENT avec le montant HOLD
-            payment_transaction = UserTransaction.objects.create(
-                wallet=customer_wallet,
-                transaction_type='PAYMENT',
-                amount=hold_amount,
-                description=f"Paiement finalisé - Réservation chambre {booking.room.room_number} (montant HOLD)",
-                status='COMPLETED',
-                reference=f"PAY-HOLD-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                content_object=booking
-            )
-            booking.transactions.add(payment_transaction)
-            
-            # 3. Créer une transaction CASH_PAYMENT pour le reste du montant
+            # Le montant HOLD a été versé à l'établissement à la réservation ;
+            # le reste, reçu en espèces, est posté avec une jambe sans wallet
             if remaining_amount > 0:
-                cash_payment_transaction = UserTransaction.objects.create(
-                    wallet=customer_wallet,
-                    transaction_type='CASH_PAYMENT',
-                    amount=remaining_amount,
+                entry = LedgerService.post_payment(
+                    None,
+                    booking.business_location,
+                    remaining_amount,
+                    booking,
                     description=f"Paiement en espèces - Réservation chambre {booking.room.room_number} (reste)",
-                    status='COMPLETED',
-                    reference=f"PAY-CASH-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    content_object=booking
-                )
-                booking.transactions.add(cash_payment_transaction)
-            
-            # 4. Calculate commission and update business location wallet
-            business_location = booking.business_location
-            commission_amount = business_location.business.calculate_commission(total_amount)
-            booking.commission_amount = commission_amount
-            
-            # Calculate net amount for business (total - commission)
-            net_amount = total_amount - commission_amount
-            
-            business_location_wallet = getattr(booking.business_location, 'wallet', None)
-            if business_location_wallet:
-                # Credit business location with net amount
-                business_location_wallet.deposit(net_amount)
-                
-                # Create transaction for business location
-                business_transaction = UserTransaction.objects.create(
-                    wallet=business_location_wallet,
-                    transaction_type='PAYMENT',
-                    amount=net_amount,
-                    description=f"Paiement net reçu - Réservation chambre {booking.room.room_number} (après commission)",
-                    status='COMPLETED',
-                    reference=f"PAY-BUSINESS-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    content_object=booking
-                )
-                booking.transactions.add(business_transaction)
-            
-            # 5. Credit super admin with commission
-            from apps.users.models import User
-            super_admin = User.objects.filter(is_superuser=True).first()
-            if not super_admin:
-                super_admin = User.objects.order_by('id').first()
-            
-            super_admin_wallet = getattr(super_admin, 'wallet', None)
-            
-            if commission_amount > 0 and super_admin_wallet:
-                super_admin_wallet.deposit(commission_amount)
-                
-                # Create commission transaction
-                UserTransaction.objects.create(
-                    wallet=super_admin_wallet,
-                    transaction_type='COMMISSION',
-                    amount=commission_amount,
-                    status='COMPLETED',
-                    reference=f"COM-ROOM-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    description=f"Commission réservation chambre {booking.room.room_number} - {business_location.name}",
-                    content_object=booking
+                    payer_transaction_type='CASH_PAYMENT'
                 )
+                booking.commission_amount += entry.commission_amount
             
-            # 5. Marquer la transaction HOLD comme CANCELLED
-            hold_transaction.status = 'CANCELLED'
-            hold_transaction.save()
-            
-            # 6. Mettre à jour le statut de la réservation
+            # Mettre à jour le statut de la réservation
             booking.status = 'CONFIRMED'
             booking.save()
             
@@ -998,7 +852,9 @@ def approve_booking(request, reference):
         return redirect('rooms:booking_list', business_location_id=booking.business_location.id)
     
     # Récupérer la transaction HOLD originale
-    hold_transaction = booking.transactions.filter(transaction_type='HOLD', status='COMPLETED').first()
+    hold_transaction = booking.transactions.filter(
+        transaction_type='HOLD', status='COMPLETED', direction='DEBIT'
+    ).first()
     if not hold_transaction:
         messages.error(request, "Aucune transaction HOLD trouvée pour cette réservation.")
         return redirect('rooms:booking_list', business_location_id=booking.business_location.id)
@@ -1010,68 +866,11 @@ def approve_booking(request, reference):
     if hold_amount < total_amount:
         return redirect('rooms:finalize_payment_admin', reference=reference)
     
-    # Sinon, approuver directement la réservation avec la nouvelle logique
-    try:
-        with transaction.atomic():
-            # 1. Rembourser le montant HOLD au wallet utilisateur
-            customer_wallet = WalletService.get_user_wallet(booking.customer)
-            if customer_wallet and customer_wallet.is_active:
-                customer_wallet.deposit(hold_amount)
-                
-                # Créer une transaction de remboursement pour le HOLD
-                refund_transaction = UserTransaction.objects.create(
-                    wallet=customer_wallet,
-                    transaction_type='REFUND',
-                    amount=hold_amount,
-                    description=f"Remboursement transaction HOLD - Réservation chambre {booking.room.room_number}",
-                    status='COMPLETED',
-                    reference=f"REFUND-HOLD-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    content_object=booking
-                )
-                booking.transactions.add(refund_transaction)
-            
-            # 2. Créer une nouvelle transaction PAYMENT avec le montant HOLD
-            payment_transaction = UserTransaction.objects.create(
-                wallet=customer_wallet,
-                transaction_type='PAYMENT',
-                amount=hold_amount,
-                description=f"Paiement finalisé - Réservation chambre {booking.room.room_number} (montant HOLD)",
-                status='COMPLETED',
-                reference=f"PAY-HOLD-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                content_object=booking
-            )
-            booking.transactions.add(payment_transaction)
-            
-            # 3. Mettre à jour le wallet de l'établissement
-            business_location_wallet = getattr(booking.business_location, 'wallet', None)
-            if business_location_wallet:
-                # Ajouter le montant total au wallet de l'établissement
-                business_location_wallet.deposit(total_amount)
-                
-                # Créer la transaction pour l'établissement
-                business_transaction = UserTransaction.objects.create(
-                    wallet=business_location_wallet,
-                    transaction_type='PAYMENT',
-                    amount=total_amount,
-                    description=f"Paiement total reçu - Réservation chambre {booking.room.room_number} - Client: {booking.customer.get_full_name()} (Total: {total_amount:.0f} XAF)",
-                    status='COMPLETED',
-                    reference=f"PAY-BUSINESS-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    content_object=booking
-                )
-                booking.transactions.add(business_transaction)
-                    
-            # 4. Marquer la transaction HOLD comme CANCELLED
-            hold_transaction.status = 'CANCELLED'
-            hold_transaction.save()
-            
-            # 5. Mettre à jour le statut de la réservation
-            booking.status = 'CONFIRMED'
-            booking.save()
-            
-            messages.success(request, f"Réservation {booking.booking_reference} approuvée avec succès. Montant HOLD: {hold_amount:.0f} XAF, Total: {total_amount:.0f} XAF.")
-                
-    except Exception as e:
-        messages.error(request, f"Erreur lors de l'approbation : {str(e)}")
+    # Sinon, approuver directement la réservation : le montant HOLD a été versé
+    # à l'établissement à la réservation (LedgerService.post_payment)
+    booking.status = 'CONFIRMED'
+    booking.save()
+    messages.success(request, f"Réservation {booking.booking_reference} approuvée avec succès. Montant HOLD: {hold_amount:.0f} XAF, Total: {total_amount:.0f} XAF.")
     
     return redirect('rooms:booking_list', business_location_id=booking.business_location.id)
 
@@ -1089,67 +888,33 @@ def cancel_booking(request, reference):
     if not reason:
         messages.error(request, "Veuillez fournir une raison d'annulation.")
         return redirect('users:user_booking_list')
-    already_paid = sum(t.amount for t in booking.transactions.filter(status='COMPLETED'))
+    if not booking.is_cancellable:
+        messages.error(request, "Cette réservation ne peut plus être annulée.")
+        return redirect('users:user_booking_list')
+    already_paid = CommissionService.get_paid_amount(booking)
     # Calcul du délai
     delta = booking.check_in_date - now
-    refund_amount = already_paid
-    commission_business = 0
-    commission_admin = 0
-    # Trouver le wallet business location
-    business_location_wallet = getattr(booking.business_location, 'wallet', None)
-    # Trouver le wallet super admin (premier user)
-    from apps.users.models import User
-    super_admin = User.objects.order_by('id').first()
-    super_admin_wallet = getattr(super_admin, 'wallet', None)
-    # Trouver le wallet utilisateur
-    user_wallet = UserWallet.objects.filter(user=request.user).first()
-    # Si annulation < 24h, appliquer commissions
-    if delta < timedelta(days=1):
-        commission_business = already_paid * 0.09
-        commission_admin = already_paid * 0.01
-        refund_amount = already_paid - commission_business - commission_admin
-    # Remboursement utilisateur
-    if refund_amount > 0 and user_wallet:
-        user_wallet.deposit(refund_amount)
-        UserTransaction.objects.create(
-            wallet=user_wallet,
-            transaction_type='REFUND',
-            amount=refund_amount,
-            status='COMPLETED',
-            description=f"Remboursement annulation réservation {booking.booking_reference}",
-            content_object=booking,
-            reference=f"REFUND-{booking.booking_reference}-{uuid.uuid4().hex[:8]}"
+    user_wallet, created = UserWallet.objects.get_or_create(user=request.user)
+    with transaction.atomic():
+        # Remboursement en une écriture ; si annulation < 24h, les commissions sont retenues
+        result = CommissionService.process_cancellation_commission(
+            booking,
+            booking.business_location,
+            already_paid,
+            user_wallet,
+            apply_fees=delta < timedelta(days=1)
         )
-    # Commission business location
-    if commission_business > 0 and business_location_wallet:
-        business_location_wallet.deposit(commission_business)
-        UserTransaction.objects.create(
-            wallet=business_location_wallet,
-            transaction_type='COMMISSION',
-            amount=commission_business,
-            status='COMPLETED',
-            description=f"Commission annulation réservation {booking.booking_reference}",
-            content_object=booking,
-            reference=f"COM-BUSINESSLOC-{booking.booking_reference}-{uuid.uuid4().hex[:8]}"
-        )
-    # Commission super admin
-    if commission_admin > 0 and super_admin_wallet:
-        super_admin_wallet.deposit(commission_admin)
-        UserTransaction.objects.create(
-            wallet=super_admin_wallet,
-            transaction_type='COMMISSION',
-            amount=commission_admin,
-            status='COMPLETED',
-            description=f"Commission admin annulation réservation {booking.booking_reference}",
-            content_object=booking,
-            reference=f"COM-ADMIN-{booking.booking_reference}-{uuid.uuid4().hex[:8]}"
-        )
-    # Statut et raison
-    booking.status = 'CANCELLED'
-    booking.cancellation_reason = reason
-    booking.cancelled_at = timezone.now()
-    booking.save()
-    messages.success(request, f"Votre réservation a été annulée. Remboursement : {refund_amount:.0f} XAF.{' Commissions prélevées.' if commission_business or commission_admin else ''}")
+        if not result['success']:
+            messages.error(request, f"Erreur lors du remboursement : {result['error']}")
+            return redirect('users:user_booking_list')
+        # Statut et raison
+        booking.status = 'CANCELLED'
+        booking.cancellation_reason = reason
+        booking.cancelled_at = timezone.now()
+        booking.save()
+    refund_amount = result['refund_amount']
+    fees = result['commission_business'] or result['commission_admin']
+    messages.success(request, f"Votre réservation a été annulée. Remboursement : {refund_amount:.0f} XAF.{' Commissions prélevées.' if fees else ''}")
     return redirect('users:user_booking_list')
 
 
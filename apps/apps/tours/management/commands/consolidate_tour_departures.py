@@ -0,0 +1,82 @@
+from django.core.management.base import BaseCommand
+from apps.tours.services.departure_service import DepartureService
+
+
+class Command(BaseCommand):
+    help = 'Prévoit le remplissage des départs à venir et regroupe les départs sous-remplis'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--horizon-days',
+            type=int,
+            default=30,
+            help='Nombre de jours de départs à analyser (défaut: 30)'
+        )
+        parser.add_argument(
+            '--velocity-days',
+            type=int,
+            default=14,
+            help='Fenêtre de calcul du rythme de réservation en jours (défaut: 14)'
+        )
+        parser.add_argument(
+            '--max-shift-hours',
+            type=int,
+            default=48,
+            help='Écart maximal entre deux départs regroupés en heures (défaut: 48)'
+        )
+        parser.add_argument(
+            '--cancel-within-hours',
+            type=int,
+            default=48,
+            help='Annuler les départs sous le minimum qui partent dans ce délai (défaut: 48)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Nombre de départs lus par requête (défaut: 500)'
+        )
+        parser.add_argument(
+            '--auto-cancel',
+            action='store_true',
+            help='Annule automatiquement les départs qui ne peuvent pas être regroupés'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Affiche le plan sans modifier la base'
+        )
+
+    def handle(self, *args, **options):
+        plan = DepartureService.plan(
+            horizon_days=options['horizon_days'],
+            velocity_window_days=options['velocity_days'],
+            max_shift_hours=options['max_shift_hours'],
+            cancel_within_hours=options['cancel_within_hours'],
+            chunk_size=options['chunk_size'],
+        )
+
+        self.stdout.write(f"{plan['scanned']} départ(s) analysé(s).")
+        for merge in plan['merges']:
+            self.stdout.write(
+                f"  - Départ #{merge['source_id']} → #{merge['target_id']} "
+                f"({merge['participants']} participant(s))"
+            )
+        if plan['cancellations']:
+            self.stdout.write(
+                f"  {len(plan['cancellations'])} départ(s) sous le minimum à annuler : "
+                + ', '.join(f"#{pk}" for pk in plan['cancellations'])
+            )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('DRY RUN: aucune modification effectuée.'))
+            return
+
+        result = DepartureService.apply_plan(plan, auto_cancel=options['auto_cancel'])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result['merged']} départ(s) regroupé(s), "
+                f"{result['moved_bookings']} réservation(s) déplacée(s), "
+                f"{result['cancelled_bookings']} réservation(s) annulée(s)."
+            )
+        )
@@ -0,0 +1,58 @@
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from apps.tours.services.import_service import ImportSource, ItineraryImportService
+
+
+class Command(BaseCommand):
+    help = "Importe l'itinéraire complet d'un tour (destinations et images) depuis un zip ou un dossier"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            help='Chemin du fichier zip ou du dossier contenant itinerary.json et les images'
+        )
+        parser.add_argument(
+            '--tour',
+            help='Slug du tour si le manifeste ne le précise pas'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help="Nombre de threads pour le traitement des images (défaut: 4)"
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help="Valide l'import sans rien enregistrer"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            source = ImportSource(path=options['path'])
+        except ValidationError as e:
+            raise CommandError(' '.join(e.messages))
+
+        try:
+            results = ItineraryImportService.run(
+                source,
+                default_tour=options['tour'],
+                workers=options['workers'],
+                dry_run=options['dry_run']
+            )
+        except ValidationError as e:
+            for message in e.messages:
+                self.stdout.write(self.style.ERROR(f'  - {message}'))
+            raise CommandError("Import annulé : le manifeste contient des erreurs.")
+        finally:
+            source.close()
+
+        for result in results:
+            self.stdout.write(
+                f"  {result['tour']}: {result['destinations']} destination(s), "
+                f"{result['images']} image(s)"
+            )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('DRY RUN: aucune modification effectuée.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Import terminé avec succès.'))
@@ -1,7 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from apps.business.models import BusinessLocation
-from django.utils.text import slugify
+from apps.core.utils import save_with_unique_slug
 import datetime
 
 class Tour(models.Model):
@@ -39,5 +39,6 @@ class Tour(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.slug and self.nom_balade:
-            self.slug = slugify(self.nom_balade)
-        super().save(*args, **kwargs) 
\ No newline at end of file
+            save_with_unique_slug(self, self.nom_balade, super().save, *args, **kwargs)
+        else:
+            super().save(*args, **kwargs) 
\ No newline at end of file
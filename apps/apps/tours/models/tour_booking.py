@@ -10,6 +10,7 @@ class TourBooking(Booking):
     """
     Model for tour bookings, inheriting from Booking base class.
     """
+    REFERENCE_PREFIX = 'TB'
     tour = models.ForeignKey(
         Tour,
         on_delete=models.PROTECT,
@@ -66,9 +67,4 @@ class TourBooking(Booking):
         ordering = ['-created_at']
 
     def __str__(self):
-        return f"Tour Booking {self.booking_reference} - {self.customer.get_full_name()}"
-
-    def generate_booking_reference(self):
-        """Generate tour booking specific reference"""
-        from django.utils.crypto import get_random_string
-        return f"TB{get_random_string(8).upper()}"
\ No newline at end of file
+        return f"Tour Booking {self.booking_reference} - {self.customer.get_full_name()}"
\ No newline at end of file
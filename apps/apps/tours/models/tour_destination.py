@@ -1,6 +1,7 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import Address, TimeStampedModel
+from apps.core.utils import save_with_unique_slug
 from .tour import Tour
 
 class TourDestination(Address):
@@ -90,21 +91,11 @@ class TourDestination(Address):
         return reverse('tours:destination_detail', kwargs={'slug': self.slug})
 
     def save(self, *args, **kwargs):
-        """Override save method to automatically generate slug if not provided."""
+        """Override save method to automatically generate a unique slug if not provided."""
         if not self.slug:
-            from django.utils.text import slugify
-            base_slug = slugify(self.name)
-            slug = base_slug
-            counter = 1
-            
-            # Ensure slug uniqueness
-            while TourDestination.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            
-            self.slug = slug
-        
-        super().save(*args, **kwargs)
+            save_with_unique_slug(self, self.name, super().save, *args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
 
     def get_nearby_destinations(self, distance_km=50):
         """Returns destinations within the specified distance."""
@@ -50,4 +50,40 @@ class TourScheduleSerializer(serializers.ModelSerializer):
 class TourReviewSerializer(serializers.ModelSerializer):
     class Meta:
         model = TourReview
-        fields = '__all__' 
\ No newline at end of file
+        fields = '__all__' 
+
+class TourDestinationImportImageSerializer(serializers.Serializer):
+    """Image entry of an itinerary import manifest."""
+    file = serializers.CharField(max_length=255)
+    caption = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+    order = serializers.IntegerField(required=False, allow_null=True, default=None)
+
+
+class TourDestinationImportSerializer(serializers.ModelSerializer):
+    """Destination entry of an itinerary import manifest."""
+    images = TourDestinationImportImageSerializer(many=True, required=False, default=list)
+
+    class Meta:
+        model = TourDestination
+        fields = [
+            'name',
+            'description',
+            'street_address',
+            'neighborhood',
+            'city',
+            'region',
+            'country',
+            'postal_code',
+            'latitude',
+            'longitude',
+            'day_number',
+            'duration',
+            'highlights',
+            'features',
+            'best_time_to_visit',
+            'climate',
+            'how_to_get_there',
+            'is_active',
+            'is_featured',
+            'images'
+        ]
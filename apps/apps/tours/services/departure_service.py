@@ -0,0 +1,308 @@
+from collections import defaultdict
+from datetime import timedelta
+from itertools import groupby
+from typing import Dict, Iterator, List
+
+from django.db import transaction
+from django.db.models import F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.guides.services.assignment_services import cancel_schedule_assignments
+from apps.wallets.models import UserWallet
+from apps.wallets.services.ledger_service import LedgerService
+
+from ..models import TourBooking, TourSchedule
+
+ACTIVE_BOOKING_STATUSES = ['PENDING', 'CONFIRMED']
+OPEN_SCHEDULE_STATUSES = ['SCHEDULED', 'CONFIRMED']
+
+
+class DepartureService:
+    """Service class for forecasting and consolidating tour departures."""
+
+    @staticmethod
+    def iter_forecasts(horizon_days: int = 30, velocity_window_days: int = 14,
+                       chunk_size: int = 500, now=None) -> Iterator[Dict]:
+        """
+        Stream fill-rate forecasts for upcoming departures.
+
+        Booked participants and recent booking velocity are computed by the
+        database for every departure; rows are streamed ordered by tour so
+        callers can consolidate one tour at a time.
+
+        Args:
+            horizon_days: How far ahead to scan departures
+            velocity_window_days: Window used to measure booking velocity
+            chunk_size: Number of rows fetched per database round trip
+            now: Reference time (defaults to timezone.now())
+
+        Yields:
+            dict: Forecast for one departure
+        """
+        now = now or timezone.now()
+        velocity_since = now - timedelta(days=velocity_window_days)
+        active = Q(bookings__status__in=ACTIVE_BOOKING_STATUSES)
+
+        schedules = TourSchedule.objects.filter(
+            status__in=OPEN_SCHEDULE_STATUSES,
+            start_datetime__gte=now,
+            start_datetime__lt=now + timedelta(days=horizon_days)
+        ).annotate(
+            booked=Coalesce(Sum('bookings__number_of_participants', filter=active), Value(0)),
+            recent=Coalesce(
+                Sum(
+                    'bookings__number_of_participants',
+                    filter=active & Q(bookings__created_at__gte=velocity_since)
+                ),
+                Value(0)
+            ),
+        ).values(
+            'pk', 'tour_id', 'start_datetime', 'available_spots', 'booked', 'recent',
+            'tour__nombre_participant_min', 'tour__nombre_participant_max'
+        ).order_by('tour_id', 'start_datetime')
+
+        for row in schedules.iterator(chunk_size=chunk_size):
+            capacity = max(row['tour__nombre_participant_max'], 1)
+            minimum = row['tour__nombre_participant_min']
+            days_left = max((row['start_datetime'] - now).total_seconds() / 86400, 0)
+            velocity = row['recent'] / velocity_window_days if velocity_window_days else 0
+            forecast = min(row['booked'] + velocity * days_left, capacity)
+
+            yield {
+                'schedule_id': row['pk'],
+                'tour_id': row['tour_id'],
+                'start_datetime': row['start_datetime'],
+                'booked': row['booked'],
+                'capacity': capacity,
+                'available_spots': max(row['available_spots'], 0),
+                'minimum': minimum,
+                'velocity_per_day': round(velocity, 3),
+                'forecast': round(forecast, 1),
+                'fill_rate': round(forecast / capacity, 3),
+                'under_filled': forecast < minimum,
+            }
+
+    @staticmethod
+    def suggest_merges(forecasts: List[Dict], max_shift_hours: int = 48) -> List[Dict]:
+        """
+        Suggest merging under-filled departures of a single tour.
+
+        Departures are considered from the least booked; each one is moved
+        into the fullest departure within ``max_shift_hours`` that still has
+        room for its participants, both under the tour capacity and within
+        the departure's remaining ``available_spots``.
+
+        Args:
+            forecasts: Forecasts of one tour, as yielded by iter_forecasts
+            max_shift_hours: Maximum time difference between merged departures
+
+        Returns:
+            list: Suggested merges (source_id, target_id, participants)
+        """
+        seats = {f['schedule_id']: f['booked'] for f in forecasts}
+        spots = {f['schedule_id']: f['available_spots'] for f in forecasts}
+        merged = set()
+        suggestions = []
+        max_shift = timedelta(hours=max_shift_hours)
+
+        for source in sorted(forecasts, key=lambda f: (f['booked'], f['start_datetime'])):
+            if not source['under_filled'] or source['schedule_id'] in merged:
+                continue
+            if seats[source['schedule_id']] == 0:
+                continue
+
+            candidates = [
+                f for f in forecasts
+                if f['schedule_id'] != source['schedule_id']
+                and f['schedule_id'] not in merged
+                and abs(f['start_datetime'] - source['start_datetime']) <= max_shift
+                and seats[f['schedule_id']] + seats[source['schedule_id']] <= f['capacity']
+                and seats[source['schedule_id']] <= spots[f['schedule_id']]
+            ]
+            if not candidates:
+                continue
+
+            target = max(candidates, key=lambda f: (seats[f['schedule_id']], -f['schedule_id']))
+            suggestions.append({
+                'source_id': source['schedule_id'],
+                'target_id': target['schedule_id'],
+                'tour_id': source['tour_id'],
+                'participants': seats[source['schedule_id']],
+            })
+            seats[target['schedule_id']] += seats[source['schedule_id']]
+            spots[target['schedule_id']] -= seats[source['schedule_id']]
+            seats[source['schedule_id']] = 0
+            merged.add(source['schedule_id'])
+
+        return suggestions
+
+    @staticmethod
+    def plan(horizon_days: int = 30, velocity_window_days: int = 14,
+             max_shift_hours: int = 48, cancel_within_hours: int = 48,
+             chunk_size: int = 500, now=None) -> Dict:
+        """
+        Scan all upcoming departures and build a consolidation plan.
+
+        Departures still under the minimum after merging and starting within
+        ``cancel_within_hours`` are proposed for cancellation.
+
+        Returns:
+            dict: ``scanned`` count, ``merges`` and ``cancellations`` lists
+        """
+        now = now or timezone.now()
+        cancel_before = now + timedelta(hours=cancel_within_hours)
+        plan = {'scanned': 0, 'merges': [], 'cancellations': []}
+
+        forecasts = DepartureService.iter_forecasts(
+            horizon_days=horizon_days,
+            velocity_window_days=velocity_window_days,
+            chunk_size=chunk_size,
+            now=now
+        )
+        for _, tour_forecasts in groupby(forecasts, key=lambda f: f['tour_id']):
+            tour_forecasts = list(tour_forecasts)
+            plan['scanned'] += len(tour_forecasts)
+
+            merges = DepartureService.suggest_merges(tour_forecasts, max_shift_hours)
+            plan['merges'].extend(merges)
+
+            merged_ids = {m['source_id'] for m in merges}
+            received = defaultdict(int)
+            for merge in merges:
+                received[merge['target_id']] += merge['participants']
+
+            for forecast in tour_forecasts:
+                if forecast['schedule_id'] in merged_ids:
+                    continue
+                if forecast['start_datetime'] > cancel_before:
+                    continue
+                if forecast['booked'] + received[forecast['schedule_id']] < forecast['minimum']:
+                    plan['cancellations'].append(forecast['schedule_id'])
+
+        return plan
+
+    @staticmethod
+    @transaction.atomic
+    def apply_plan(plan: Dict, auto_cancel: bool = False) -> Dict:
+        """
+        Apply a consolidation plan and notify customers.
+
+        The departures of the plan are locked first, then each merge is
+        checked again: bookings made or cancelled since the plan was built
+        are the ones moved, and a merge is skipped when the target has no
+        longer the spots for them. The guides of cancelled departures are
+        released. Paid bookings of cancelled departures
+        are refunded in full through the ledger (see LedgerService.post_refund).
+
+        Args:
+            plan: Plan returned by plan()
+            auto_cancel: Also cancel departures listed in ``cancellations``
+
+        Returns:
+            dict: Number of merged departures, moved and cancelled bookings
+
+        Raises:
+            ValidationError: If a business location cannot cover a refund
+        """
+        from apps.tourist_sites.models import Notification
+
+        now = timezone.now()
+        notifications = []
+        result = {'merged': 0, 'moved_bookings': 0, 'cancelled_bookings': 0}
+
+        schedule_ids = {m['source_id'] for m in plan['merges']} | {m['target_id'] for m in plan['merges']}
+        if auto_cancel:
+            schedule_ids.update(plan['cancellations'])
+        # Verrou dans un ordre fixe : deux plans appliqués en même temps ne s'interbloquent pas
+        schedules = {
+            schedule.pk: schedule
+            for schedule in TourSchedule.objects.select_for_update().filter(
+                pk__in=schedule_ids, status__in=OPEN_SCHEDULE_STATUSES
+            ).order_by('pk')
+        }
+
+        for merge in plan['merges']:
+            source = schedules.get(merge['source_id'])
+            target = schedules.get(merge['target_id'])
+            if source is None or target is None:
+                continue
+            bookings = TourBooking.objects.select_for_update().filter(
+                tour_schedule=source, status__in=ACTIVE_BOOKING_STATUSES
+            )
+            moved = list(bookings.values_list('pk', 'customer_id', 'booking_reference', 'number_of_participants'))
+            participants = sum(row[3] for row in moved)
+            if participants > target.available_spots:
+                continue
+
+            result['moved_bookings'] += bookings.update(tour_schedule=target, updated_at=now)
+            target.available_spots -= participants
+            TourSchedule.objects.filter(pk=target.pk).update(
+                available_spots=F('available_spots') - participants,
+                updated_at=now
+            )
+            result['merged'] += TourSchedule.objects.filter(pk=source.pk).update(
+                status='CANCELLED',
+                cancellation_reason='Départ regroupé avec un autre départ du même tour.',
+                updated_at=now
+            )
+            # update() n'envoie pas post_save : le guide du départ regroupé est libéré ici
+            cancel_schedule_assignments([source.pk])
+            del schedules[source.pk]
+            notifications.extend(
+                Notification(
+                    destinataire_id=customer_id,
+                    message=f"Votre réservation {reference} a été regroupée sur un autre départ.",
+                    url=reverse('tours:booking_detail', args=[pk])
+                )
+                for pk, customer_id, reference, _ in moved
+            )
+
+        cancellations = [pk for pk in plan['cancellations'] if pk in schedules] if auto_cancel else []
+        if cancellations:
+            reason = 'Nombre minimum de participants non atteint.'
+            bookings = TourBooking.objects.select_for_update().filter(
+                tour_schedule_id__in=cancellations,
+                status__in=ACTIVE_BOOKING_STATUSES
+            ).select_related('tour__business_location__business')
+            cancelled = list(bookings)
+            for booking in cancelled:
+                if booking.amount_paid > 0:
+                    # Annulation à l'initiative de l'opérateur : remboursement intégral, commission comprise
+                    wallet, created = UserWallet.objects.get_or_create(user_id=booking.customer_id)
+                    LedgerService.post_refund(
+                        wallet,
+                        booking.tour.business_location,
+                        booking.amount_paid,
+                        booking.commission_amount,
+                        booking,
+                        description=f"Remboursement réservation {booking.booking_reference} : {reason}"
+                    )
+            result['cancelled_bookings'] = TourBooking.objects.filter(
+                pk__in=[booking.pk for booking in cancelled]
+            ).update(
+                status='CANCELLED',
+                cancellation_reason=reason,
+                cancelled_at=now,
+                updated_at=now
+            )
+            TourSchedule.objects.filter(pk__in=cancellations).update(
+                status='CANCELLED',
+                cancellation_reason=reason,
+                updated_at=now
+            )
+            cancel_schedule_assignments(cancellations)
+            notifications.extend(
+                Notification(
+                    destinataire_id=booking.customer_id,
+                    message=f"Votre réservation {booking.booking_reference} est annulée : {reason}"
+                            + (f" Le montant de {booking.amount_paid} FCFA vous a été remboursé."
+                               if booking.amount_paid > 0 else ''),
+                    url=reverse('tours:booking_detail', args=[booking.pk])
+                )
+                for booking in cancelled
+            )
+
+        Notification.objects.bulk_create(notifications, batch_size=500)
+        return result
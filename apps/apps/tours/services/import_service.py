@@ -0,0 +1,316 @@
+import io
+import json
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from typing import Dict, List
+
+from PIL import Image, UnidentifiedImageError
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.utils import SlugAllocator
+from ..models import Tour, TourDestination, TourDestinationImage
+from ..serializers import TourDestinationImportSerializer
+
+MANIFEST_NAME = 'itinerary.json'
+
+
+class ImportSource:
+    """Read-only access to the files of an itinerary import (zip or folder)."""
+
+    def __init__(self, path=None, fileobj=None):
+        self._zip = None
+        self._root = None
+        if fileobj is not None or zipfile.is_zipfile(path):
+            try:
+                self._zip = zipfile.ZipFile(fileobj if fileobj is not None else path)
+            except zipfile.BadZipFile:
+                raise ValidationError(_('The uploaded file is not a valid zip archive.'))
+            self._names = set(self._zip.namelist())
+        elif path and os.path.isdir(path):
+            self._root = Path(path).resolve()
+        else:
+            raise ValidationError(_('Import source must be a zip archive or a folder.'))
+
+    def _normalize(self, name: str) -> str:
+        normalized = PurePosixPath(name.replace('\\', '/'))
+        if normalized.is_absolute() or '..' in normalized.parts:
+            raise ValidationError(_('Invalid file path in manifest: %(name)s') % {'name': name})
+        return str(normalized)
+
+    def exists(self, name: str) -> bool:
+        name = self._normalize(name)
+        if self._zip is not None:
+            return name in self._names
+        return (self._root / name).is_file()
+
+    def read(self, name: str) -> bytes:
+        name = self._normalize(name)
+        if self._zip is not None:
+            return self._zip.read(name)
+        return (self._root / name).read_bytes()
+
+    def close(self):
+        if self._zip is not None:
+            self._zip.close()
+
+
+def process_image(data: bytes, max_size: int) -> bytes:
+    """
+    Verify an uploaded image and re-encode it as a bounded JPEG.
+
+    Raises:
+        ValueError: If the data is not a readable image
+    """
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.draft('RGB', (max_size, max_size))
+        image.load()
+    except (UnidentifiedImageError, OSError, SyntaxError) as e:
+        raise ValueError(str(e))
+
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    image.thumbnail((max_size, max_size))
+
+    output = io.BytesIO()
+    image.save(output, format='JPEG', quality=85)
+    return output.getvalue()
+
+
+class ItineraryImportService:
+    """Service class for importing a tour's full itinerary in bulk."""
+
+    MAX_IMAGE_SIZE = 1920
+
+    @staticmethod
+    def load_manifest(source: ImportSource, default_tour: str = None) -> List[Dict]:
+        """
+        Read the manifest and return one entry per tour.
+
+        The manifest is either ``{"tour": "<slug>", "destinations": [...]}``
+        or ``{"tours": [{"tour": "<slug>", "destinations": [...]}, ...]}``.
+        """
+        if not source.exists(MANIFEST_NAME):
+            raise ValidationError(_('%(name)s not found in import source.') % {'name': MANIFEST_NAME})
+        try:
+            manifest = json.loads(source.read(MANIFEST_NAME))
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValidationError(_('Invalid manifest: %(error)s') % {'error': e})
+
+        entries = manifest.get('tours') if isinstance(manifest, dict) else None
+        if entries is None:
+            entries = [manifest]
+        if not isinstance(entries, list) or not entries:
+            raise ValidationError(_('Invalid manifest: no tour to import.'))
+        for entry in entries:
+            if not isinstance(entry, dict):
+                raise ValidationError(_('Invalid manifest: each tour must be an object.'))
+            entry.setdefault('tour', default_tour)
+        return entries
+
+    @staticmethod
+    def validate(source: ImportSource, entries: List[Dict]) -> List[Dict]:
+        """
+        Validate every tour, destination and image reference before any write.
+
+        Returns:
+            list: One dict per tour with the tour and validated destinations
+
+        Raises:
+            ValidationError: With every error found, prefixed by its location
+        """
+        errors = []
+        slugs = [entry.get('tour') for entry in entries]
+        tours = Tour.objects.in_bulk([s for s in slugs if s], field_name='slug')
+
+        plans = []
+        for index, entry in enumerate(entries):
+            tour = tours.get(entry.get('tour'))
+            if tour is None:
+                errors.append(_('Tour %(index)d: unknown tour "%(slug)s".') % {
+                    'index': index + 1, 'slug': entry.get('tour')
+                })
+                continue
+
+            serializer = TourDestinationImportSerializer(data=entry.get('destinations') or [], many=True)
+            if not serializer.is_valid():
+                # Errors are keyed by position, or by field when the destinations are not a list
+                item_errors = serializer.errors
+                if not isinstance(item_errors, dict):
+                    item_errors = dict(enumerate(item_errors))
+                for position, messages_by_field in item_errors.items():
+                    if not isinstance(position, int):
+                        errors.append(f'{tour.slug} destinations: {messages_by_field}')
+                        continue
+                    for field, messages in messages_by_field.items():
+                        errors.append(f'{tour.slug} #{position + 1} {field}: {messages}')
+                continue
+            if not serializer.validated_data:
+                errors.append(_('%(slug)s: no destinations to import.') % {'slug': tour.slug})
+                continue
+
+            for position, destination in enumerate(serializer.validated_data):
+                for image in destination['images']:
+                    try:
+                        found = source.exists(image['file'])
+                    except ValidationError as e:
+                        errors.extend(e.messages)
+                        continue
+                    if not found:
+                        errors.append(f"{tour.slug} #{position + 1}: image not found: {image['file']}")
+
+            plans.append({'tour': tour, 'destinations': serializer.validated_data})
+
+        if errors:
+            raise ValidationError(errors)
+        return plans
+
+    @staticmethod
+    def process_images(source: ImportSource, plans: List[Dict], workers: int = 4) -> Dict[str, bytes]:
+        """
+        Decode, verify and resize every referenced image in a thread pool.
+
+        Each worker reads its image just before processing it, so at most
+        ``workers`` original images are held in memory at once.
+
+        Returns:
+            dict: Processed JPEG bytes keyed by manifest file name
+        """
+        names = sorted({
+            image['file']
+            for plan in plans
+            for destination in plan['destinations']
+            for image in destination['images']
+        })
+
+        def work(name):
+            try:
+                return name, process_image(source.read(name), ItineraryImportService.MAX_IMAGE_SIZE), None
+            except ValueError as e:
+                return name, None, e
+
+        processed, errors = {}, []
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for name, data, error in pool.map(work, names):
+                if error is not None:
+                    errors.append(f'{name}: {error}')
+                else:
+                    processed[name] = data
+
+        if errors:
+            raise ValidationError(errors)
+        return processed
+
+    @staticmethod
+    def import_tour(plan: Dict, images: Dict[str, bytes], workers: int = 4) -> Dict:
+        """
+        Insert one tour's destinations and images in a single transaction.
+
+        Image files written to storage are removed if the transaction fails.
+        """
+        tour = plan['tour']
+        allocator = SlugAllocator(TourDestination.objects.all())
+        stored = []
+
+        try:
+            with transaction.atomic():
+                destinations = []
+                for data in plan['destinations']:
+                    fields = {k: v for k, v in data.items() if k != 'images'}
+                    destinations.append(TourDestination(
+                        tour=tour,
+                        slug=allocator.allocate(fields['name']),
+                        **fields
+                    ))
+                destinations = TourDestination.objects.bulk_create(destinations)
+
+                uploads = []
+                for destination, data in zip(destinations, plan['destinations']):
+                    for position, image in enumerate(data['images']):
+                        stem = PurePosixPath(image['file']).stem
+                        uploads.append((
+                            destination,
+                            image,
+                            f'destinations/{destination.slug}-{stem}.jpg',
+                            position
+                        ))
+
+                def save_file(upload):
+                    image, name = upload[1], upload[2]
+                    return default_storage.save(name, ContentFile(images[image['file']]))
+
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    for saved_name in pool.map(save_file, uploads):
+                        stored.append(saved_name)
+
+                TourDestinationImage.objects.bulk_create([
+                    TourDestinationImage(
+                        destination=destination,
+                        image=saved_name,
+                        caption=image['caption'],
+                        order=image['order'] if image.get('order') is not None else position
+                    )
+                    for (destination, image, name, position), saved_name in zip(uploads, stored)
+                ])
+        except Exception:
+            for name in stored:
+                default_storage.delete(name)
+            raise
+
+        return {
+            'tour': tour.slug,
+            'destinations': len(destinations),
+            'images': len(stored),
+        }
+
+    @staticmethod
+    def run(source: ImportSource, default_tour: str = None, workers: int = 4,
+            dry_run: bool = False, allowed_tours=None) -> List[Dict]:
+        """
+        Validate and import every tour of an import source.
+
+        Everything is validated and every image processed before the first
+        write; each tour is then imported in its own transaction.
+
+        Args:
+            source: The zip archive or folder to import
+            default_tour: Tour slug used when the manifest does not name one
+            workers: Number of threads used for image processing
+            dry_run: Validate and process without writing anything
+            allowed_tours: Optional slugs the manifest is restricted to
+
+        Returns:
+            list: Per-tour import counts
+        """
+        entries = ItineraryImportService.load_manifest(source, default_tour)
+        if allowed_tours is not None:
+            forbidden = {e['tour'] for e in entries if e['tour'] not in allowed_tours}
+            if forbidden:
+                raise ValidationError(
+                    _('The manifest references other tours: %(slugs)s') % {
+                        'slugs': ', '.join(str(slug) for slug in forbidden)
+                    }
+                )
+        plans = ItineraryImportService.validate(source, entries)
+        images = ItineraryImportService.process_images(source, plans, workers)
+
+        if dry_run:
+            return [
+                {
+                    'tour': plan['tour'].slug,
+                    'destinations': len(plan['destinations']),
+                    'images': sum(len(d['images']) for d in plan['destinations']),
+                }
+                for plan in plans
+            ]
+
+        return [
+            ItineraryImportService.import_tour(plan, images, workers)
+            for plan in plans
+        ]
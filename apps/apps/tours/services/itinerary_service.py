@@ -0,0 +1,295 @@
+import math
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+
+from ..models import Tour, TourDestination
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine_matrix(latitudes, longitudes) -> np.ndarray:
+    """
+    Compute the pairwise great-circle distance matrix (in km) between points.
+
+    Args:
+        latitudes: Sequence of latitudes in degrees
+        longitudes: Sequence of longitudes in degrees
+
+    Returns:
+        np.ndarray: Symmetric (n, n) matrix of distances in kilometers
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    dlat = lat[:, None] - lat[None, :]
+    dlon = lon[:, None] - lon[None, :]
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def danger_penalty_matrix(latitudes, longitudes, zone_latitudes, zone_longitudes,
+                          radius_km: float, penalty_km: float) -> np.ndarray:
+    """
+    Compute a penalty for every leg passing within ``radius_km`` of a danger zone.
+
+    Points are projected on a local equirectangular plane, which is accurate
+    enough at the scale of a tour day, and the distance from every zone to
+    every segment is computed in one vectorized pass.
+
+    Returns:
+        np.ndarray: (n, n) matrix, ``penalty_km`` per zone close to the leg
+    """
+    n = len(latitudes)
+    if n == 0 or len(zone_latitudes) == 0:
+        return np.zeros((n, n))
+
+    lat = np.asarray(latitudes, dtype=float)
+    lon = np.asarray(longitudes, dtype=float)
+    zlat = np.asarray(zone_latitudes, dtype=float)
+    zlon = np.asarray(zone_longitudes, dtype=float)
+
+    ref_lat = np.radians(lat.mean())
+    km_per_deg = np.pi * EARTH_RADIUS_KM / 180
+
+    # Only zones inside the bounding box of the stops can touch a leg
+    margin_lat = radius_km / km_per_deg
+    margin_lon = margin_lat / max(np.cos(ref_lat), 1e-6)
+    inside = (
+        (zlat >= lat.min() - margin_lat) & (zlat <= lat.max() + margin_lat)
+        & (zlon >= lon.min() - margin_lon) & (zlon <= lon.max() + margin_lon)
+    )
+    zlat, zlon = zlat[inside], zlon[inside]
+    if len(zlat) == 0:
+        return np.zeros((n, n))
+
+    px = lon * km_per_deg * np.cos(ref_lat)
+    py = lat * km_per_deg
+    zx = zlon * km_per_deg * np.cos(ref_lat)
+    zy = zlat * km_per_deg
+
+    # Segment vectors for every (i, j) pair: shape (n, n)
+    sx = px[None, :] - px[:, None]
+    sy = py[None, :] - py[:, None]
+    seg_len2 = sx ** 2 + sy ** 2
+
+    # Zone offsets from every segment start: shape (n, 1, z)
+    wx = zx[None, None, :] - px[:, None, None]
+    wy = zy[None, None, :] - py[:, None, None]
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = (wx * sx[:, :, None] + wy * sy[:, :, None]) / seg_len2[:, :, None]
+    t = np.clip(np.nan_to_num(t), 0.0, 1.0)
+
+    dx = wx - t * sx[:, :, None]
+    dy = wy - t * sy[:, :, None]
+    near = (dx ** 2 + dy ** 2) <= radius_km ** 2
+
+    penalty = near.sum(axis=2) * penalty_km
+    np.fill_diagonal(penalty, 0.0)
+    return penalty
+
+
+def nearest_neighbour_route(cost: np.ndarray, start: int = 0) -> List[int]:
+    """Build an open route visiting every node once, greedily from ``start``."""
+    n = cost.shape[0]
+    visited = np.zeros(n, dtype=bool)
+    route = [start]
+    visited[start] = True
+    current = start
+    for _ in range(n - 1):
+        candidates = np.where(visited, np.inf, cost[current])
+        current = int(np.argmin(candidates))
+        route.append(current)
+        visited[current] = True
+    return route
+
+
+def two_opt(route: List[int], cost: np.ndarray, max_passes: int = 50) -> List[int]:
+    """
+    Improve an open route with 2-opt moves, keeping the first node fixed.
+
+    The open path is handled as a closed tour through a zero-cost dummy node
+    appended after the last stop, so a single delta formula covers every move.
+    For each ``i`` all candidate ``j`` are evaluated at once with numpy.
+    """
+    n = cost.shape[0]
+    if len(route) < 4:
+        return list(route)
+
+    padded = np.zeros((n + 1, n + 1))
+    padded[:n, :n] = cost
+    r = np.array(list(route) + [n])
+    m = len(r)
+
+    for _ in range(max_passes):
+        improved = False
+        for i in range(1, m - 2):
+            a, b = r[i - 1], r[i]
+            js = np.arange(i + 1, m - 1)
+            c, d = r[js], r[js + 1]
+            delta = padded[a, c] + padded[b, d] - padded[a, b] - padded[c, d]
+            best = int(np.argmin(delta))
+            if delta[best] < -1e-9:
+                j = js[best]
+                r[i:j + 1] = r[i:j + 1][::-1]
+                improved = True
+        if not improved:
+            break
+
+    return [int(node) for node in r[:-1]]
+
+
+def route_length(route: List[int], cost: np.ndarray) -> float:
+    """Total cost of an open route."""
+    if len(route) < 2:
+        return 0.0
+    idx = np.asarray(route)
+    return float(cost[idx[:-1], idx[1:]].sum())
+
+
+class ItineraryService:
+    """Service class for ordering tour destinations into efficient daily routes."""
+
+    DEFAULT_SPEED_KMH = 40
+    DANGER_RADIUS_KM = 2.0
+    DANGER_PENALTY_KM = 25.0
+
+    @staticmethod
+    def get_danger_zones():
+        """Return (latitudes, longitudes) of verified danger zones."""
+        from apps.tourist_sites.models import ZoneDangereuse
+
+        rows = ZoneDangereuse.objects.filter(
+            statut=ZoneDangereuse.Statut.VERIFIEE,
+            latitude__isnull=False,
+            longitude__isnull=False
+        ).values_list('latitude', 'longitude')
+        rows = list(rows)
+        return [float(r[0]) for r in rows], [float(r[1]) for r in rows]
+
+    @staticmethod
+    def optimize_day(points: List[Dict], start: Optional[Dict] = None,
+                     zones=None, danger_radius_km: float = DANGER_RADIUS_KM,
+                     danger_penalty_km: float = DANGER_PENALTY_KM) -> Dict:
+        """
+        Order the stops of a single day.
+
+        Args:
+            points: Dicts with at least ``latitude`` and ``longitude`` keys
+            start: Optional fixed starting point (meeting point or previous stop)
+            zones: Optional (latitudes, longitudes) of zones to avoid
+            danger_radius_km: Distance under which a leg is considered exposed
+            danger_penalty_km: Extra cost added per exposed zone
+
+        Returns:
+            dict: Ordered points, per-leg distances and total distance in km
+        """
+        if not points:
+            return {'stops': [], 'legs_km': [], 'distance_km': 0.0}
+
+        nodes = ([start] if start else []) + list(points)
+        lats = [float(p['latitude']) for p in nodes]
+        lons = [float(p['longitude']) for p in nodes]
+
+        distances = haversine_matrix(lats, lons)
+        cost = distances
+        if zones and len(zones[0]):
+            cost = distances + danger_penalty_matrix(
+                lats, lons, zones[0], zones[1],
+                danger_radius_km, danger_penalty_km
+            )
+
+        if not start:
+            # Free starting point: route from a virtual node at zero cost to every stop
+            free = np.zeros((len(nodes) + 1, len(nodes) + 1))
+            free[1:, 1:] = cost
+            cost = free
+            distances = np.pad(distances, ((1, 0), (1, 0)))
+            nodes = [None] + nodes
+
+        route = two_opt(nearest_neighbour_route(cost, start=0), cost)
+        legs = [float(distances[a, b]) for a, b in zip(route[:-1], route[1:])]
+        ordered = [nodes[i] for i in route[1:]]
+
+        return {
+            'stops': ordered,
+            'legs_km': legs,
+            'distance_km': float(sum(legs)),
+        }
+
+    @staticmethod
+    def optimize_tour(tour: Tour, avoid_danger_zones: bool = False,
+                      speed_kmh: float = DEFAULT_SPEED_KMH) -> List[Dict]:
+        """
+        Build an optimized itinerary for every day of a tour.
+
+        Day 1 starts from the tour meeting point when one is set; each
+        following day starts from the last stop of the previous day.
+        Destinations without coordinates are appended at the end of their day.
+
+        Args:
+            tour: The tour to optimize
+            avoid_danger_zones: Penalize legs passing near verified danger zones
+            speed_kmh: Average travel speed used for time estimates
+
+        Returns:
+            list: One dict per day with ordered destinations, distance and times
+
+        Raises:
+            ValidationError: If speed_kmh is not a positive finite number
+        """
+        if not (math.isfinite(speed_kmh) and speed_kmh > 0):
+            raise ValidationError(_('speed_kmh must be a positive number.'))
+
+        destinations = TourDestination.objects.filter(
+            tour=tour,
+            is_active=True
+        ).order_by('day_number', 'pk')
+
+        by_day = defaultdict(list)
+        for destination in destinations:
+            by_day[destination.day_number].append(destination)
+
+        zones = ItineraryService.get_danger_zones() if avoid_danger_zones else None
+
+        start = None
+        if tour.point_rencontre_latitude is not None and tour.point_rencontre_longitude is not None:
+            start = {
+                'latitude': tour.point_rencontre_latitude,
+                'longitude': tour.point_rencontre_longitude,
+            }
+
+        itinerary = []
+        for day in sorted(by_day):
+            located = [
+                {'latitude': d.latitude, 'longitude': d.longitude, 'destination': d}
+                for d in by_day[day] if d.has_coordinates()
+            ]
+            unlocated = [d for d in by_day[day] if not d.has_coordinates()]
+
+            result = ItineraryService.optimize_day(located, start=start, zones=zones)
+            ordered = [stop['destination'] for stop in result['stops']]
+            if ordered:
+                start = result['stops'][-1]
+
+            travel_minutes = result['distance_km'] / speed_kmh * 60
+            visit_minutes = sum(
+                d.duration.total_seconds() / 60 for d in by_day[day] if d.duration
+            )
+
+            itinerary.append({
+                'day': day,
+                'destinations': ordered + unlocated,
+                'legs_km': result['legs_km'] + [None] * len(unlocated),
+                'distance_km': round(result['distance_km'], 2),
+                'travel_minutes': round(travel_minutes),
+                'total_minutes': round(travel_minutes + visit_minutes),
+            })
+
+        return itinerary
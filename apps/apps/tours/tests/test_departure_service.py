@@ -0,0 +1,165 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from apps.business.models import Business, BusinessLocation
+from apps.guides.models import GuideAssignment, GuideProfile
+from apps.tourist_sites.models import Notification
+from apps.tours.models import Tour, TourBooking, TourSchedule
+from apps.tours.services.departure_service import DepartureService
+from apps.wallets.models import UserWallet
+from apps.wallets.models.wallet import BusinessLocationWallet
+from apps.wallets.services import LedgerService, ReconciliationService, WalletService
+
+User = get_user_model()
+
+
+def forecast(schedule_id, hours, booked, available_spots, capacity=10, minimum=4):
+    start = timezone.now() + timedelta(hours=hours)
+    return {
+        'schedule_id': schedule_id, 'tour_id': 1, 'start_datetime': start, 'booked': booked,
+        'capacity': capacity, 'available_spots': available_spots, 'minimum': minimum,
+        'under_filled': booked < minimum,
+    }
+
+
+class SuggestMergesTest(SimpleTestCase):
+    """Test cases for the merge suggestions of one tour."""
+
+    def test_target_without_spots_is_skipped(self):
+        forecasts = [forecast(1, 20, 2, 8), forecast(2, 24, 3, 0), forecast(3, 30, 1, 9)]
+        merges = DepartureService.suggest_merges(forecasts)
+        self.assertEqual(
+            [(m['source_id'], m['target_id'], m['participants']) for m in merges],
+            [(3, 1, 1), (2, 1, 3)]
+        )
+
+    def test_spots_are_consumed_by_earlier_merges(self):
+        forecasts = [forecast(1, 20, 2, 2), forecast(2, 24, 1, 9), forecast(3, 26, 1, 9)]
+        merges = DepartureService.suggest_merges(forecasts)
+        self.assertEqual([(m['source_id'], m['target_id']) for m in merges], [(2, 1), (3, 1)])
+        forecasts[0]['available_spots'] = 1
+        merges = DepartureService.suggest_merges(forecasts)
+        self.assertEqual([(m['source_id'], m['target_id']) for m in merges], [(2, 1), (1, 3)])
+
+
+class ApplyPlanTest(TestCase):
+    """Test cases for the application of a consolidation plan."""
+
+    def setUp(self):
+        admin = User.objects.create_superuser(username='admin', password='pass', email='admin@example.com')
+        UserWallet.objects.create(user=admin)
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.customer, email='b@example.com',
+            phone='600000000', description='Test', commission_rate=Decimal('10.00')
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.customer, name='Kribi Tours',
+            city='Kribi', region='Sud', business_location_type='tour'
+        )
+        self.tour = Tour.objects.create(
+            business_location=self.location, nom_balade='Circuit', description='d',
+            nombre_participant_min=4, nombre_participant_max=10
+        )
+        self.wallet = UserWallet.objects.create(user=self.customer)
+        LedgerService.post([
+            LedgerService.debit(None, 5000, 'DEPOSIT'),
+            LedgerService.credit(self.wallet, 5000, 'DEPOSIT'),
+        ])
+
+    def schedule(self, hours, available_spots=10):
+        return TourSchedule.objects.create(
+            tour=self.tour, start_datetime=timezone.now() + timedelta(hours=hours),
+            available_spots=available_spots
+        )
+
+    def book(self, schedule, participants, amount_paid=Decimal('0')):
+        commission_amount, net_amount = LedgerService.split_commission(self.location, amount_paid)
+        booking = TourBooking.objects.create(
+            customer=self.customer, tour=self.tour, tour_schedule=schedule,
+            number_of_participants=participants, total_amount=amount_paid,
+            amount_paid=amount_paid, commission_amount=commission_amount
+        )
+        if amount_paid:
+            LedgerService.post_payment(self.wallet, self.location, amount_paid, booking)
+        return booking
+
+    def assign(self, schedule):
+        guide, created = GuideProfile.objects.get_or_create(
+            user=self.customer, defaults={'business_location': self.location, 'is_verified': True}
+        )
+        return GuideAssignment.objects.create(
+            guide=guide, tour_schedule=schedule, business_location=self.location,
+            start_datetime=schedule.start_datetime, end_datetime=schedule.start_datetime + timedelta(hours=1)
+        )
+
+    def test_decrement_counts_the_bookings_moved(self):
+        source, target = self.schedule(20), self.schedule(24, available_spots=7)
+        self.book(source, 1)
+        self.book(target, 3)
+        plan = DepartureService.plan(now=timezone.now())
+        self.assertEqual([(m['source_id'], m['target_id'], m['participants']) for m in plan['merges']],
+                         [(source.pk, target.pk, 1)])
+        # Réservation arrivée entre le calcul et l'application du plan
+        self.book(source, 2)
+        assignment = self.assign(source)
+
+        result = DepartureService.apply_plan(plan)
+
+        self.assertEqual(result, {'merged': 1, 'moved_bookings': 2, 'cancelled_bookings': 0})
+        target.refresh_from_db()
+        source.refresh_from_db()
+        self.assertEqual(target.available_spots, 4)
+        self.assertEqual(source.status, 'CANCELLED')
+        self.assertEqual(target.bookings.count(), 3)
+        self.assertEqual(Notification.objects.filter(destinataire=self.customer).count(), 2)
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.status, 'CANCELLED')
+
+    def test_merge_is_skipped_when_the_target_filled_up(self):
+        source, target = self.schedule(20), self.schedule(24, available_spots=3)
+        self.book(source, 1)
+        self.book(target, 2)
+        plan = DepartureService.plan(now=timezone.now())
+        self.assertEqual(len(plan['merges']), 1)
+        self.book(source, 3)
+
+        result = DepartureService.apply_plan(plan)
+
+        self.assertEqual(result, {'merged': 0, 'moved_bookings': 0, 'cancelled_bookings': 0})
+        source.refresh_from_db()
+        target.refresh_from_db()
+        self.assertEqual((source.status, target.available_spots), ('SCHEDULED', 3))
+
+    def test_auto_cancel_refunds_paid_bookings(self):
+        schedule = self.schedule(20)
+        paid = self.book(schedule, 1, Decimal('1000'))
+        unpaid = self.book(schedule, 1)
+        assignment = self.assign(schedule)
+        location_wallet = BusinessLocationWallet.objects.get(business_location=self.location)
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('4000.00'))
+
+        plan = DepartureService.plan(now=timezone.now())
+        self.assertEqual(plan['cancellations'], [schedule.pk])
+        result = DepartureService.apply_plan(plan, auto_cancel=True)
+
+        self.assertEqual(result['cancelled_bookings'], 2)
+        assignment.refresh_from_db()
+        self.assertEqual(assignment.status, 'CANCELLED')
+        for booking in (paid, unpaid):
+            booking.refresh_from_db()
+            self.assertEqual(booking.status, 'CANCELLED')
+        self.wallet.refresh_from_db()
+        location_wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('5000.00'))
+        self.assertEqual(location_wallet.balance, Decimal('0.00'))
+        platform_wallet = WalletService.get_platform_wallet()
+        platform_wallet.refresh_from_db()
+        self.assertEqual(platform_wallet.available_balance, Decimal('0.00'))
+        self.assertEqual(paid.transactions.filter(transaction_type='REFUND').count(), 3)
+        self.assertEqual(ReconciliationService.reconcile(), [])
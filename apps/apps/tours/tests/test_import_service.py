@@ -0,0 +1,97 @@
+import io
+import json
+import shutil
+import tempfile
+import zipfile
+
+from PIL import Image
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.business.models import Business, BusinessLocation
+from apps.tours.models import Tour, TourDestinationImage
+from apps.tours.services.import_service import ImportSource, ItineraryImportService
+
+User = get_user_model()
+
+
+def make_archive(manifest, images=()):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('itinerary.json', json.dumps(manifest))
+        for name in images:
+            image = io.BytesIO()
+            Image.new('RGB', (40, 30), 'green').save(image, format='PNG')
+            archive.writestr(name, image.getvalue())
+    buffer.seek(0)
+    buffer.name = 'itinerary.zip'
+    return buffer
+
+
+class ItineraryImportServiceTest(TestCase):
+    """Test cases for the bulk itinerary importer."""
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.owner = User.objects.create_user(username='owner', password='pass', email='o@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.owner, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        location = BusinessLocation.objects.create(
+            business=business, owner=self.owner, name='Test Agency',
+            city='Douala', region='Littoral', business_location_type='tour'
+        )
+        self.tour = Tour.objects.create(business_location=location, nom_balade='Circuit Ouest', description='d')
+
+    def _destination(self, name, images):
+        return {
+            'name': name, 'city': 'Bafoussam', 'region': 'Ouest', 'country': 'Cameroun',
+            'street_address': 'Centre', 'latitude': 5.47, 'longitude': 10.42, 'day_number': 1,
+            'description': 'Visite', 'duration': 90, 'images': images,
+        }
+
+    def test_image_order_zero_is_kept(self):
+        manifest = {'destinations': [self._destination('Chefferie', [
+            {'file': 'a.png', 'order': 0},
+            {'file': 'b.png', 'order': 5},
+            {'file': 'c.png'},
+        ])]}
+        source = ImportSource(fileobj=make_archive(manifest, ['a.png', 'b.png', 'c.png']))
+        results = ItineraryImportService.run(source, default_tour=self.tour.slug, workers=2)
+        source.close()
+
+        self.assertEqual(results, [{'tour': self.tour.slug, 'destinations': 1, 'images': 3}])
+        self.assertEqual(
+            sorted(TourDestinationImage.objects.values_list('order', flat=True)),
+            [0, 2, 5]
+        )
+
+    def test_invalid_destination_is_reported(self):
+        destination = self._destination('Chefferie', [])
+        del destination['description']
+        source = ImportSource(fileobj=make_archive({'destinations': [destination]}))
+        with self.assertRaises(ValidationError) as raised:
+            ItineraryImportService.run(source, default_tour=self.tour.slug)
+        source.close()
+        self.assertIn(f'{self.tour.slug} #1 description', raised.exception.messages[0])
+
+    def test_empty_manifest_is_rejected(self):
+        source = ImportSource(fileobj=make_archive({'tours': []}))
+        with self.assertRaises(ValidationError):
+            ItineraryImportService.run(source, default_tour=self.tour.slug)
+        source.close()
+
+        self.client.force_login(self.owner)
+        response = self.client.post(
+            reverse('tours:tour-import-itinerary', args=[self.tour.slug]),
+            {'archive': make_archive({'tours': []})}
+        )
+        self.assertEqual(response.status_code, 400)
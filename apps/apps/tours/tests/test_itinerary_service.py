@@ -0,0 +1,117 @@
+import math
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase, TestCase
+
+from apps.business.models import Business, BusinessLocation
+from apps.tours.models import Tour, TourDestination
+from apps.tours.services.itinerary_service import (
+    ItineraryService, danger_penalty_matrix, haversine_matrix,
+    nearest_neighbour_route, route_length, two_opt
+)
+
+
+class HaversineMatrixTest(SimpleTestCase):
+    """Test cases for the vectorized distance matrix."""
+
+    def test_known_distance(self):
+        """Yaoundé to Douala is roughly 200 km as the crow flies."""
+        matrix = haversine_matrix([3.848, 4.0511], [11.5021, 9.7679])
+        self.assertAlmostEqual(matrix[0, 1], 194, delta=5)
+        self.assertEqual(matrix[0, 0], 0)
+        self.assertEqual(matrix[0, 1], matrix[1, 0])
+
+
+class RouteOptimizationTest(SimpleTestCase):
+    """Test cases for nearest-neighbour and 2-opt ordering."""
+
+    def setUp(self):
+        rng = np.random.default_rng(42)
+        self.lats = 3.5 + rng.random(300)
+        self.lons = 11.0 + rng.random(300)
+        self.cost = haversine_matrix(self.lats, self.lons)
+
+    def test_route_visits_every_stop_once(self):
+        route = two_opt(nearest_neighbour_route(self.cost), self.cost)
+        self.assertEqual(route[0], 0)
+        self.assertEqual(sorted(route), list(range(300)))
+
+    def test_two_opt_never_worsens_route(self):
+        greedy = nearest_neighbour_route(self.cost)
+        improved = two_opt(greedy, self.cost)
+        self.assertLessEqual(
+            route_length(improved, self.cost),
+            route_length(greedy, self.cost)
+        )
+
+    def test_collinear_stops_are_ordered(self):
+        points = [{'latitude': 4.0, 'longitude': lon} for lon in (11.3, 11.0, 11.2, 11.1)]
+        result = ItineraryService.optimize_day(points)
+        self.assertIn(
+            [p['longitude'] for p in result['stops']],
+            ([11.0, 11.1, 11.2, 11.3], [11.3, 11.2, 11.1, 11.0])
+        )
+        self.assertAlmostEqual(result['distance_km'], 33.3, delta=0.5)
+
+    def test_few_hundred_stops_under_a_second(self):
+        points = [
+            {'latitude': lat, 'longitude': lon}
+            for lat, lon in zip(self.lats, self.lons)
+        ]
+        started = time.perf_counter()
+        ItineraryService.optimize_day(points)
+        self.assertLess(time.perf_counter() - started, 1.0)
+
+
+class DangerPenaltyTest(SimpleTestCase):
+    """Test cases for danger zone penalties."""
+
+    def test_leg_near_zone_is_penalized(self):
+        penalty = danger_penalty_matrix(
+            [4.0, 4.0, 4.5], [11.0, 11.2, 11.0],
+            [4.0], [11.1],
+            radius_km=2.0, penalty_km=25.0
+        )
+        self.assertEqual(penalty[0, 1], 25.0)
+        self.assertEqual(penalty[1, 0], 25.0)
+        self.assertEqual(penalty[0, 2], 0.0)
+
+
+class OptimizeTourTest(TestCase):
+    """Test cases for the per-day itinerary of a tour."""
+
+    def setUp(self):
+        owner = get_user_model().objects.create_user(username='owner', password='pass', email='o@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=owner, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        location = BusinessLocation.objects.create(
+            business=business, owner=owner, name='Test Agency',
+            city='Douala', region='Littoral', business_location_type='tour'
+        )
+        # Meeting point on the equator and the prime meridian: both coordinates are 0
+        self.tour = Tour.objects.create(
+            business_location=location, nom_balade='Circuit', description='d',
+            point_rencontre_latitude=0.0, point_rencontre_longitude=0.0
+        )
+        for name, latitude in (('Far', 0.3), ('Near', 0.1)):
+            TourDestination.objects.create(
+                tour=self.tour, name=name, description='d', street_address='Centre', city='Kribi',
+                region='Sud', country='Cameroun', latitude=latitude, longitude=0.0, day_number=1,
+                duration=timedelta(minutes=30)
+            )
+
+    def test_zero_meeting_point_is_the_start(self):
+        day = ItineraryService.optimize_tour(self.tour)[0]
+        self.assertEqual([d.name for d in day['destinations']], ['Near', 'Far'])
+        self.assertAlmostEqual(day['distance_km'], 33.4, delta=0.5)
+
+    def test_speed_must_be_positive_and_finite(self):
+        for speed in (0, -10, math.inf, math.nan):
+            with self.assertRaises(ValidationError):
+                ItineraryService.optimize_tour(self.tour, speed_kmh=speed)
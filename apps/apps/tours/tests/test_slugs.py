@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.business.models import Business, BusinessLocation
+from apps.core.utils import SlugAllocator
+from apps.tours.models import Tour, TourDestination
+
+User = get_user_model()
+
+
+class UniqueSlugTest(TestCase):
+    """Test cases for unique slug generation on tours and destinations."""
+
+    def setUp(self):
+        owner = User.objects.create_user(username='owner', password='pass', email='owner@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=owner, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=owner, name='Test Location',
+            city='Yaoundé', region='Centre', business_location_type='tour'
+        )
+
+    def test_duplicate_tour_names_get_suffixes(self):
+        """Test that tours with the same name no longer hit the unique constraint."""
+        slugs = [
+            Tour.objects.create(
+                business_location=self.location, nom_balade='Mont Cameroun', description='d'
+            ).slug
+            for _ in range(3)
+        ]
+        self.assertEqual(slugs, ['mont-cameroun', 'mont-cameroun-1', 'mont-cameroun-2'])
+
+    def test_existing_slug_is_kept(self):
+        """Test that an explicit slug is not replaced."""
+        tour = Tour.objects.create(
+            business_location=self.location, nom_balade='Chutes', description='d', slug='custom'
+        )
+        tour.save()
+        self.assertEqual(tour.slug, 'custom')
+
+    def test_allocation_for_similar_destinations_is_one_query(self):
+        """Test that allocating many colliding slugs queries the database once."""
+        tour = Tour.objects.create(business_location=self.location, nom_balade='Ouest', description='d')
+        TourDestination.objects.create(
+            tour=tour, name='Chefferie', description='d', day_number=1,
+            duration=timedelta(hours=1), city='Bandjoun', region='Ouest'
+        )
+        allocator = SlugAllocator(TourDestination.objects.all())
+        with self.assertNumQueries(1):
+            slugs = [allocator.allocate('Chefferie') for _ in range(200)]
+        self.assertEqual(len(set(slugs)), 200)
+        self.assertNotIn('chefferie', slugs)
+        self.assertEqual(slugs[0], 'chefferie-1')
@@ -17,6 +17,8 @@ from ..serializers import (
     TourBookingSerializer, TourScheduleSerializer, TourReviewSerializer
 )
 from ..services.tour_service import TourService
+from ..services.itinerary_service import ItineraryService
+from ..services.import_service import ImportSource, ItineraryImportService
 
 class TourViewSet(viewsets.ModelViewSet):
     """API endpoint for managing tours."""
@@ -93,6 +95,85 @@ class TourViewSet(viewsets.ModelViewSet):
         serializer = TourScheduleSerializer(available_dates, many=True)
         return Response(serializer.data)
 
+    @action(detail=True, methods=['post'])
+    def import_itinerary(self, request, slug=None):
+        """Import destinations and images for a tour from an uploaded zip archive."""
+        tour = self.get_object()
+        if request.user != tour.business_location.business.owner:
+            return Response(
+                {'error': _('You do not have permission to import destinations for this tour.')},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        archive = request.FILES.get('archive')
+        if not archive:
+            return Response(
+                {'error': _('A zip archive is required.')},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        dry_run = request.data.get('dry_run') in ('1', 'true', 'True', True)
+        try:
+            source = ImportSource(fileobj=archive)
+        except ValidationError as e:
+            return Response({'errors': e.messages}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            results = ItineraryImportService.run(
+                source,
+                default_tour=tour.slug,
+                dry_run=dry_run,
+                allowed_tours=[tour.slug]
+            )
+        except ValidationError as e:
+            return Response({'errors': e.messages}, status=status.HTTP_400_BAD_REQUEST)
+        finally:
+            source.close()
+
+        return Response(results[0], status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'])
+    def optimized_itinerary(self, request, slug=None):
+        """Get the tour destinations ordered per day to minimize travel distance."""
+        tour = self.get_object()
+        avoid_danger_zones = request.query_params.get('avoid_danger_zones') in ('1', 'true', 'True')
+        try:
+            speed_kmh = float(request.query_params.get('speed_kmh', ItineraryService.DEFAULT_SPEED_KMH))
+        except ValueError:
+            return Response(
+                {'error': _('speed_kmh must be a number.')},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            itinerary = ItineraryService.optimize_tour(
+                tour,
+                avoid_danger_zones=avoid_danger_zones,
+                speed_kmh=speed_kmh
+            )
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+        return Response([
+            {
+                'day': day['day'],
+                'distance_km': day['distance_km'],
+                'travel_minutes': day['travel_minutes'],
+                'total_minutes': day['total_minutes'],
+                'destinations': [
+                    {
+                        'id': destination.pk,
+                        'slug': destination.slug,
+                        'name': destination.name,
+                        'latitude': destination.latitude,
+                        'longitude': destination.longitude,
+                        'leg_km': round(leg, 2) if leg is not None else None,
+                    }
+                    for destination, leg in zip(day['destinations'], day['legs_km'])
+                ],
+            }
+            for day in itinerary
+        ])
+
 class TourDestinationViewSet(viewsets.ModelViewSet):
     """API endpoint for managing tour destinations."""
     queryset = TourDestination.objects.filter(is_active=True)
@@ -15,6 +15,8 @@ from ..forms import (
 )
 from apps.wallets.services.wallet_service import WalletService
 from apps.wallets.services.transaction_service import TransactionService
+from apps.wallets.services.ledger_service import LedgerService
+from apps.wallets.services.commission_service import CommissionService
 from apps.wallets.models import UserWallet, UserTransaction
 from apps.wallets.models.wallet import BusinessLocationWallet
 from decimal import Decimal
@@ -247,20 +249,6 @@ def tour_booking_create(request, slug):
                     total_amount = tour.price_per_person * num_participants
                     amount_to_pay = (total_amount * payment_percentage) / 100
                     
-                    # Créer la réservation
-                    booking = TourBooking.objects.create(
-                        customer=request.user,
-                        tour=tour,  # Assigner le tour
-                        tour_schedule=None,  # Pour l'instant, pas de schedule spécifique
-                        number_of_participants=num_participants,
-                        total_amount=total_amount,
-                        amount_paid=amount_to_pay,
-                        payment_percentage=payment_percentage,
-                        special_requests=special_requirements,
-                        guide_notes=guide_notes,
-                        status='PENDING'
-                    )
-                    
                     # Créer ou récupérer le wallet de l'utilisateur
                     user_wallet, created = UserWallet.objects.get_or_create(
                         user=request.user,
@@ -272,86 +260,36 @@ def tour_booking_create(request, slug):
                         messages.error(request, _("Solde insuffisant pour effectuer cette réservation. Veuillez recharger votre wallet."))
                         return redirect(request.path)
                     
-                    # Créer la transaction de paiement
-                    transaction_description = f"Paiement réservation tour '{tour.nom_balade}' - {num_participants} participant(s) - {payment_percentage}%"
-                    
-                    user_transaction = UserTransaction.objects.create(
-                        wallet=user_wallet,
-                        transaction_type='PAYMENT',
-                        amount=amount_to_pay,
-                        status='COMPLETED',
-                        reference=TransactionService.generate_reference(),
-                        description=transaction_description,
-                        content_type=ContentType.objects.get_for_model(TourBooking),
-                        object_id=booking.pk
-                    )
-                    
-                    # Mettre à jour le solde du wallet (déduire le montant payé)
-                    user_wallet.withdraw(amount_to_pay)
-                    
-                    # Calculate commission
-                    from apps.users.models import User
-                    import uuid
-                    
                     business_location = tour.business_location
-                    commission_amount = business_location.business.calculate_commission(amount_to_pay)
-                    booking.commission_amount = commission_amount
-                    
-                    # Calculate net amount for business (amount_paid - commission)
-                    net_amount = amount_to_pay - commission_amount
+                    commission_amount, net_amount = LedgerService.split_commission(business_location, amount_to_pay)
                     
-                    # Get business location wallet
-                    business_location_wallet = BusinessLocationWallet.objects.select_for_update().get(business_location=business_location)
-                    
-                    # Get super admin wallet
-                    super_admin = User.objects.filter(is_superuser=True).first()
-                    if not super_admin:
-                        super_admin = User.objects.order_by('id').first()
-                    
-                    super_admin_wallet = getattr(super_admin, 'wallet', None)
-                    
-                    # Credit business location with net amount
-                    if not business_location_wallet.deposit(net_amount):
-                        raise ValidationError(f"Erreur lors du crédit du wallet business pour {business_location.name}.")
-                    
-                    # Create transaction for business location
-                    business_transaction = UserTransaction.objects.create(
-                        wallet=business_location_wallet,
-                        transaction_type='PAYMENT',
-                        amount=net_amount,
-                        status='COMPLETED',
-                        reference=str(uuid.uuid4()),
-                        description=f"Paiement net tour '{tour.nom_balade}' (après commission)",
-                        content_type=ContentType.objects.get_for_model(TourBooking),
-                        object_id=booking.pk,
-                        related_transaction=user_transaction
+                    # Créer la réservation
+                    booking = TourBooking.objects.create(
+                        customer=request.user,
+                        tour=tour,  # Assigner le tour
+                        tour_schedule=None,  # Pour l'instant, pas de schedule spécifique
+                        number_of_participants=num_participants,
+                        total_amount=total_amount,
+                        amount_paid=amount_to_pay,
+                        payment_percentage=payment_percentage,
+                        commission_amount=commission_amount,
+                        special_requests=special_requirements,
+                        guide_notes=guide_notes,
+                        status='PENDING'
                     )
                     
-                    # Credit super admin with commission
-                    if commission_amount > 0 and super_admin_wallet:
-                        if not super_admin_wallet.deposit(commission_amount):
-                            raise ValidationError("Erreur lors du crédit de la commission au wallet admin.")
-                        
-                        # Create commission transaction
-                        UserTransaction.objects.create(
-                            wallet=super_admin_wallet,
-                            transaction_type='COMMISSION',
-                            amount=commission_amount,
-                            status='COMPLETED',
-                            reference=str(uuid.uuid4()),
-                            description=f"Commission tour '{tour.nom_balade}' - {business_location.name}",
-                            content_type=ContentType.objects.get_for_model(TourBooking),
-                            object_id=booking.pk,
-                            created_at=timezone.now()
-                        )
-                    
-                    # Lier les transactions
-                    user_transaction.related_transaction = business_transaction
-                    user_transaction.save()
+                    # Écriture de paiement : débit client, net établissement, commission plateforme
+                    entry = LedgerService.post_payment(
+                        user_wallet,
+                        business_location,
+                        amount_to_pay,
+                        booking,
+                        description=f"Paiement réservation tour '{tour.nom_balade}' - {num_participants} participant(s) - {payment_percentage}%"
+                    )
                     
                     messages.success(request, _("Réservation créée avec succès ! Le paiement de {amount} FCFA a été traité (référence: {reference}). Nous vous contacterons bientôt pour confirmer les détails.").format(
                         amount=amount_to_pay,
-                        reference=user_transaction.reference
+                        reference=entry.reference
                     ))
                     return redirect('tours:booking_detail', pk=booking.pk)
                 
@@ -725,9 +663,7 @@ def tour_booking_detail(request, pk):
     total_amount = booking.total_amount
     
     # Montant déjà payé (somme des transactions COMPLETED)
-    already_paid = sum(
-        t.amount for t in booking.transactions.filter(status='COMPLETED')
-    )
+    already_paid = CommissionService.get_paid_amount(booking)
     remaining_amount = total_amount - already_paid
 
     context = {
@@ -749,9 +685,7 @@ def tour_booking_payment(request, pk):
     )
     
     total_amount = booking.total_amount
-    already_paid = sum(
-        t.amount for t in booking.transactions.filter(status='COMPLETED')
-    )
+    already_paid = CommissionService.get_paid_amount(booking)
     remaining_amount = total_amount - already_paid
 
     if remaining_amount <= 0:
@@ -769,16 +703,16 @@ def tour_booking_payment(request, pk):
 
     try:
         with db_transaction.atomic():
-            WalletService.update_wallet_balance(wallet, remaining_amount, 'subtract')
-            # Créer la transaction
-            transaction_obj = TransactionService.create_user_transaction(
-                wallet=wallet,
-                transaction_type='PAYMENT',
-                amount=remaining_amount,
-                description=f"Paiement réservation tour {booking.tour.nom_balade}",
-                status='COMPLETED'
+            # Écriture de paiement : débit client, net établissement, commission plateforme
+            entry = LedgerService.post_payment(
+                wallet,
+                booking.tour.business_location,
+                remaining_amount,
+                booking,
+                description=f"Paiement réservation tour {booking.tour.nom_balade}"
             )
-            booking.transactions.add(transaction_obj)
+            booking.amount_paid += remaining_amount
+            booking.commission_amount += entry.commission_amount
             # Mettre à jour le statut si tout est payé
             booking.status = 'CONFIRMED'
             booking.save()
@@ -7,6 +7,7 @@ from django.contrib.messages.views import SuccessMessageMixin
 from apps.rooms.models.room_booking import RoomBooking
 from apps.vehicles.models.vehicle_booking import VehicleBooking
 from apps.tours.models.tour_booking import TourBooking
+from apps.wallets.services.commission_service import CommissionService
 from django.core.paginator import Paginator
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
@@ -70,9 +71,7 @@ def user_booking_list(request):
     if tab == 'room':
         bookings = RoomBooking.objects.filter(customer=user).order_by('-created_at')
         for booking in bookings:
-            already_paid = sum(
-                t.amount for t in booking.transactions.filter(status='COMPLETED')
-            )
+            already_paid = CommissionService.get_paid_amount(booking)
             remaining_amount = booking.total_amount - already_paid
             booking.already_paid = already_paid
             booking.remaining_amount = remaining_amount
@@ -10,6 +10,7 @@ class VehicleBooking(Booking):
     """
     Model representing a vehicle booking transaction.
     """
+    REFERENCE_PREFIX = 'VB'
     STATUS_CHOICES = Booking.STATUS_CHOICES + [
         ('PICKED_UP', _('Picked Up')),
         ('RETURNED', _('Returned')),
@@ -136,11 +137,6 @@ class VehicleBooking(Booking):
     def __str__(self):
         return f"Vehicle Booking {self.booking_reference} - {self.vehicle}"
 
-    def generate_booking_reference(self):
-        """Generate vehicle booking specific reference"""
-        from django.utils.crypto import get_random_string
-        return f"VB{get_random_string(8).upper()}"
-
     @property
     def balance_due(self):
         """Calculate the remaining balance to be paid"""
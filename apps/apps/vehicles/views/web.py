@@ -26,12 +26,10 @@ from decimal import Decimal, InvalidOperation
 from django.core.exceptions import ValidationError
 from apps.wallets.services.wallet_service import WalletService
 from apps.wallets.services.transaction_service import TransactionService
+from apps.wallets.services.ledger_service import LedgerService
 from django.db import transaction as db_transaction
 from apps.wallets.models.wallet import BusinessLocationWallet
-from apps.wallets.models.transaction import UserTransaction
 from apps.users.models import User
-from django.contrib.contenttypes.models import ContentType
-import uuid
 from django.views.decorators.http import require_POST
 
 # Create your views here.
@@ -244,32 +242,11 @@ def vehicle_booking_create(request, vehicle_id):
                 messages.error(request, _(f"Votre solde est insuffisant pour payer {amount_to_pay:.0f} XAF. Veuillez recharger votre wallet."))
                 return redirect(request.path)
             
-            # Débit du wallet et création de la transaction HOLD
+            # Réservation et écriture de paiement (débit client, net établissement, commission)
             try:
                 with db_transaction.atomic():
-                    # Débiter le wallet
-                    WalletService.update_wallet_balance(wallet, amount_to_pay, 'subtract')
-                    
-                    # Calculate commission
                     business_location = vehicle.business_location
-                    commission_amount = business_location.business.calculate_commission(amount_to_pay)
-                    
-                    # Calculate net amount for business (amount_paid - commission)
-                    net_amount = amount_to_pay - commission_amount
-                    
-                    # Get business location wallet
-                    business_wallet = BusinessLocationWallet.objects.select_for_update().get(business_location=business_location)
-                    
-                    # Get super admin wallet
-                    super_admin = User.objects.filter(is_superuser=True).first()
-                    if not super_admin:
-                        super_admin = User.objects.order_by('id').first()
-                    
-                    super_admin_wallet = getattr(super_admin, 'wallet', None)
-                    
-                    # Credit business location with net amount
-                    if not business_wallet.deposit(net_amount):
-                        raise ValidationError(f"Erreur lors du crédit du wallet business pour {business_location.name}.")
+                    commission_amount, net_amount = LedgerService.split_commission(business_location, amount_to_pay)
                     
                     # Créer la réservation (statut PENDING)
                     booking = form.save(commit=False)
@@ -281,53 +258,16 @@ def vehicle_booking_create(request, vehicle_id):
                     booking.total_amount = total_amount
                     booking.amount_paid = amount_to_pay
                     booking.commission_amount = commission_amount
-                    
-                    # Sauvegarder la réservation AVANT de créer les transactions
                     booking.save()
                     
-                    # Create transaction for business location
-                    UserTransaction.objects.create(
-                        wallet=business_wallet,
+                    LedgerService.post_payment(
+                        wallet,
+                        business_location,
+                        amount_to_pay,
+                        booking,
+                        description=f"Réservation véhicule {vehicle.make} {vehicle.model} ({payment_percentage}% du montant total)",
                         transaction_type='PAYMENT',
-                        amount=net_amount,
-                        status='COMPLETED',
-                        reference=str(uuid.uuid4()),
-                        description=f"Paiement partiel véhicule {vehicle.make} {vehicle.model} (après commission)",
-                        content_type=ContentType.objects.get_for_model(booking),
-                        object_id=booking.pk,
-                        created_at=timezone.now()
-                    )
-                    
-                    # Credit super admin with commission
-                    if commission_amount > 0 and super_admin_wallet:
-                        if not super_admin_wallet.deposit(commission_amount):
-                            raise ValidationError("Erreur lors du crédit de la commission au wallet admin.")
-                        
-                        # Create commission transaction
-                        UserTransaction.objects.create(
-                            wallet=super_admin_wallet,
-                            transaction_type='COMMISSION',
-                            amount=commission_amount,
-                            status='COMPLETED',
-                            reference=str(uuid.uuid4()),
-                            description=f"Commission réservation véhicule {vehicle.make} {vehicle.model}",
-                            content_type=ContentType.objects.get_for_model(booking),
-                            object_id=booking.pk,
-                            created_at=timezone.now()
-                        )
-                    
-                    # Créer la transaction HOLD pour l'utilisateur
-                    description = f"Réservation véhicule {vehicle.make} {vehicle.model} ({payment_percentage}% du montant total)"
-                    user_transaction = UserTransaction.objects.create(
-                        wallet=wallet,
-                        transaction_type='HOLD',
-                        amount=amount_to_pay,
-                        status='COMPLETED',
-                        reference=str(uuid.uuid4()),
-                        description=description,
-                        content_type=ContentType.objects.get_for_model(booking),
-                        object_id=booking.pk,
-                        created_at=timezone.now()
+                        payer_transaction_type='HOLD'
                     )
                     
                     messages.success(request, _(f"Réservation créée avec succès ! {amount_to_pay:.0f} XAF ont été débités de votre wallet."))
@@ -448,7 +388,9 @@ def finalize_payment_admin(request, pk):
         return redirect('vehicles:booking_list')
     
     # Récupérer la transaction HOLD originale
-    hold_transaction = booking.transactions.filter(transaction_type='HOLD', status='COMPLETED').first()
+    hold_transaction = booking.transactions.filter(
+        transaction_type='HOLD', status='COMPLETED', direction='DEBIT'
+    ).first()
     if not hold_transaction:
         messages.error(request, "Aucune transaction HOLD trouvée pour cette réservation.")
         return redirect('vehicles:booking_list')
@@ -487,7 +429,9 @@ def process_cash_payment(request, pk):
         return redirect('vehicles:booking_list')
     
     # Récupérer la transaction HOLD originale
-    hold_transaction = booking.transactions.filter(transaction_type='HOLD', status='COMPLETED').first()
+    hold_transaction = booking.transactions.filter(
+        transaction_type='HOLD', status='COMPLETED', direction='DEBIT'
+    ).first()
     if not hold_transaction:
         messages.error(request, "Aucune transaction HOLD trouvée pour cette réservation.")
         return redirect('vehicles:booking_list')
@@ -498,109 +442,20 @@ def process_cash_payment(request, pk):
 
     try:
         with db_transaction.atomic():
-            # 1. Rembourser le montant HOLD au wallet utilisateur
-            customer_wallet = WalletService.get_user_wallet(booking.customer)
-            if customer_wallet and customer_wallet.is_active:
-                customer_wallet.deposit(hold_amount)
-                
-                # Créer une transaction de remboursement pour le HOLD
-                refund_transaction = UserTransaction.objects.create(
-                    wallet=customer_wallet,
-                    transaction_type='REFUND',
-                    amount=hold_amount,
-                    description=f"Remboursement transaction HOLD - Réservation véhicule {booking.vehicle.make} {booking.vehicle.model}",
-                    status='COMPLETED',
-                    reference=f"REFUND-HOLD-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    content_type=ContentType.objects.get_for_model(booking),
-                    object_id=booking.pk,
-                    created_at=timezone.now()
-                )
-                booking.transactions.add(refund_transaction)
-            
-            # 2. Créer une nouvelle transaction PAYMENT avec le montant HOLD
-            payment_transaction = UserTransaction.objects.create(
-                wallet=customer_wallet,
-                transaction_type='PAYMENT',
-                amount=hold_amount,
-                description=f"Paiement finalisé - Réservation véhicule {booking.vehicle.make} {booking.vehicle.model} (montant HOLD)",
-                status='COMPLETED',
-                reference=f"PAY-HOLD-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                content_type=ContentType.objects.get_for_model(booking),
-                object_id=booking.pk,
-                created_at=timezone.now()
-            )
-            booking.transactions.add(payment_transaction)
-            
-            # 3. Créer une transaction CASH_PAYMENT pour le reste du montant
+            # Le montant HOLD a été versé à l'établissement à la réservation ;
+            # le reste, reçu en espèces, est posté avec une jambe sans wallet
             if remaining_amount > 0:
-                cash_payment_transaction = UserTransaction.objects.create(
-                    wallet=customer_wallet,
-                    transaction_type='CASH_PAYMENT',
-                    amount=remaining_amount,
+                entry = LedgerService.post_payment(
+                    None,
+                    booking.vehicle.business_location,
+                    remaining_amount,
+                    booking,
                     description=f"Paiement en espèces - Réservation véhicule {booking.vehicle.make} {booking.vehicle.model} (reste)",
-                    status='COMPLETED',
-                    reference=f"PAY-CASH-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    content_type=ContentType.objects.get_for_model(booking),
-                    object_id=booking.pk,
-                    created_at=timezone.now()
-                )
-                booking.transactions.add(cash_payment_transaction)
-            
-            # 4. Calculate commission and update business location wallet
-            business_location = booking.vehicle.business_location
-            commission_amount = business_location.business.calculate_commission(total_amount)
-            booking.commission_amount = commission_amount
-            
-            # Calculate net amount for business (total - commission)
-            net_amount = total_amount - commission_amount
-            
-            business_location_wallet = getattr(business_location, 'wallet', None)
-            if business_location_wallet:
-                # Credit business location with net amount
-                business_location_wallet.deposit(net_amount)
-                
-                # Create transaction for business location
-                business_transaction = UserTransaction.objects.create(
-                    wallet=business_location_wallet,
-                    transaction_type='PAYMENT',
-                    amount=net_amount,
-                    description=f"Paiement net reçu - Réservation véhicule {booking.vehicle.make} {booking.vehicle.model} (après commission)",
-                    status='COMPLETED',
-                    reference=f"PAY-BUSINESS-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    content_type=ContentType.objects.get_for_model(booking),
-                    object_id=booking.pk,
-                    created_at=timezone.now()
-                )
-                booking.transactions.add(business_transaction)
-            
-            # 5. Credit super admin with commission
-            super_admin = User.objects.filter(is_superuser=True).first()
-            if not super_admin:
-                super_admin = User.objects.order_by('id').first()
-            
-            super_admin_wallet = getattr(super_admin, 'wallet', None)
-            
-            if commission_amount > 0 and super_admin_wallet:
-                super_admin_wallet.deposit(commission_amount)
-                
-                # Create commission transaction
-                UserTransaction.objects.create(
-                    wallet=super_admin_wallet,
-                    transaction_type='COMMISSION',
-                    amount=commission_amount,
-                    status='COMPLETED',
-                    reference=f"COM-VEHICLE-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    description=f"Commission réservation véhicule {booking.vehicle.make} {booking.vehicle.model} - {business_location.name}",
-                    content_type=ContentType.objects.get_for_model(booking),
-                    object_id=booking.pk,
-                    created_at=timezone.now()
+                    payer_transaction_type='CASH_PAYMENT'
                 )
+                booking.commission_amount += entry.commission_amount
             
-            # 6. Marquer la transaction HOLD comme CANCELLED
-            hold_transaction.status = 'CANCELLED'
-            hold_transaction.save()
-            
-            # 7. Mettre à jour le statut de la réservation
+            # Mettre à jour le statut de la réservation
             booking.status = 'CONFIRMED'
             booking.save()
             
@@ -629,7 +484,9 @@ def approve_booking(request, pk):
         return redirect('vehicles:booking_list')
     
     # Récupérer la transaction HOLD originale
-    hold_transaction = booking.transactions.filter(transaction_type='HOLD', status='COMPLETED').first()
+    hold_transaction = booking.transactions.filter(
+        transaction_type='HOLD', status='COMPLETED', direction='DEBIT'
+    ).first()
     if not hold_transaction:
         messages.error(request, "Aucune transaction HOLD trouvée pour cette réservation.")
         return redirect('vehicles:booking_list')
@@ -641,73 +498,10 @@ def approve_booking(request, pk):
     if hold_amount < total_amount:
         return redirect('vehicles:finalize_payment_admin', pk=pk)
     
-    # Sinon, approuver directement la réservation avec la nouvelle logique
-    try:
-        with db_transaction.atomic():
-            # 1. Rembourser le montant HOLD au wallet utilisateur
-            customer_wallet = WalletService.get_user_wallet(booking.customer)
-            if customer_wallet and customer_wallet.is_active:
-                customer_wallet.deposit(hold_amount)
-                
-                # Créer une transaction de remboursement pour le HOLD
-                refund_transaction = UserTransaction.objects.create(
-                    wallet=customer_wallet,
-                    transaction_type='REFUND',
-                    amount=hold_amount,
-                    description=f"Remboursement transaction HOLD - Réservation véhicule {booking.vehicle.make} {booking.vehicle.model}",
-                    status='COMPLETED',
-                    reference=f"REFUND-HOLD-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    content_type=ContentType.objects.get_for_model(booking),
-                    object_id=booking.pk,
-                    created_at=timezone.now()
-                )
-                booking.transactions.add(refund_transaction)
-            
-            # 2. Créer une nouvelle transaction PAYMENT avec le montant HOLD
-            payment_transaction = UserTransaction.objects.create(
-                wallet=customer_wallet,
-                transaction_type='PAYMENT',
-                amount=hold_amount,
-                description=f"Paiement finalisé - Réservation véhicule {booking.vehicle.make} {booking.vehicle.model} (montant HOLD)",
-                status='COMPLETED',
-                reference=f"PAY-HOLD-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                content_type=ContentType.objects.get_for_model(booking),
-                object_id=booking.pk,
-                created_at=timezone.now()
-            )
-            booking.transactions.add(payment_transaction)
-            
-            # 3. Mettre à jour le wallet de l'établissement
-            business_location_wallet = getattr(booking.vehicle.business_location, 'wallet', None)
-            if business_location_wallet:
-                # Ajouter le montant total au wallet de l'établissement
-                business_location_wallet.deposit(total_amount)
-                
-                # Créer la transaction pour l'établissement
-                business_transaction = UserTransaction.objects.create(
-                    wallet=business_location_wallet,
-                    transaction_type='PAYMENT',
-                    amount=total_amount,
-                    description=f"Paiement total reçu - Réservation véhicule {booking.vehicle.make} {booking.vehicle.model} - Client: {booking.customer.get_full_name()} (Total: {total_amount:.0f} XAF)",
-                    status='COMPLETED',
-                    reference=f"PAY-BUSINESS-{booking.booking_reference}-{uuid.uuid4().hex[:8]}",
-                    content_type=ContentType.objects.get_for_model(booking),
-                    object_id=booking.pk,
-                    created_at=timezone.now()
-                )
-                booking.transactions.add(business_transaction)
-                    
-            # 4. Marquer la transaction HOLD comme CANCELLED
-            hold_transaction.status = 'CANCELLED'
-            hold_transaction.save()
-            
-            # 5. Mettre à jour le statut de la réservation
-            booking.status = 'CONFIRMED'
-            booking.save()
-            
-            messages.success(request, f"Réservation {booking.booking_reference} approuvée avec succès. Montant HOLD: {hold_amount:.0f} XAF, Total: {total_amount:.0f} XAF.")
-                
-    except Exception as e:
-        messages.error(request, f"Erreur lors de l'approbation : {str(e)}")
+    # Sinon, approuver directement la réservation : le montant HOLD a été versé
+    # à l'établissement à la réservation (LedgerService.post_payment)
+    booking.status = 'CONFIRMED'
+    booking.save()
+    messages.success(request, f"Réservation {booking.booking_reference} approuvée avec succès. Montant HOLD: {hold_amount:.0f} XAF, Total: {total_amount:.0f} XAF.")
     
     return redirect('vehicles:booking_list')
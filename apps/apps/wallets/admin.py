@@ -1,11 +1,37 @@
 from django.contrib import admin
 from django.utils.translation import gettext_lazy as _
-from .models import UserWallet, BusinessWallet, UserTransaction, BusinessTransaction
+from .models import UserWallet, BusinessWallet, UserTransaction, BusinessTransaction, JournalEntry, WalletBalanceShard, WalletRollup
+from .services.wallet_service import WalletService
+
+
+class WalletStatisticsAdminMixin:
+    """Colonnes de statistiques calculées pour toute la page en une requête groupée."""
+
+    def get_changelist_instance(self, request):
+        changelist = super().get_changelist_instance(request)
+        statistics = WalletService.get_statistics_for_wallets(changelist.result_list)
+        for wallet in changelist.result_list:
+            wallet._statistics = statistics[wallet]
+        return changelist
+
+    def _wallet_statistics(self, obj):
+        if not hasattr(obj, '_statistics'):
+            obj._statistics = WalletService.get_statistics(obj)
+        return obj._statistics
+
+    @admin.display(description=_('Transactions'))
+    def transactions_count(self, obj):
+        return self._wallet_statistics(obj)[0]['total_transactions']
+
+    @admin.display(description=_('Pending'))
+    def pending_count(self, obj):
+        return self._wallet_statistics(obj)[0]['pending_transactions']
 
 
 @admin.register(UserWallet)
-class UserWalletAdmin(admin.ModelAdmin):
-    list_display = ('user', 'balance', 'currency', 'is_active', 'created_at', 'updated_at')
+class UserWalletAdmin(WalletStatisticsAdminMixin, admin.ModelAdmin):
+    list_display = ('user', 'balance', 'currency', 'is_active', 'transactions_count', 'pending_count',
+                    'created_at', 'updated_at')
     list_filter = ('is_active', 'currency', 'created_at')
     search_fields = ('user__username', 'user__email', 'user__first_name', 'user__last_name')
     readonly_fields = ('balance', 'created_at', 'updated_at')
@@ -26,8 +52,9 @@ class UserWalletAdmin(admin.ModelAdmin):
 
 
 @admin.register(BusinessWallet)
-class BusinessWalletAdmin(admin.ModelAdmin):
-    list_display = ('business', 'balance', 'currency', 'is_active', 'created_at', 'updated_at')
+class BusinessWalletAdmin(WalletStatisticsAdminMixin, admin.ModelAdmin):
+    list_display = ('business', 'balance', 'currency', 'is_active', 'transactions_count', 'pending_count',
+                    'created_at', 'updated_at')
     list_filter = ('is_active', 'currency', 'created_at')
     search_fields = ('business__name', 'business__description')
     readonly_fields = ('balance', 'created_at', 'updated_at')
@@ -95,3 +122,59 @@ class BusinessTransactionAdmin(admin.ModelAdmin):
 
     def has_delete_permission(self, request, obj=None):
         return False  # Prevent transaction deletion for security
+
+
+class JournalEntryLegInline(admin.TabularInline):
+    model = UserTransaction
+    fk_name = 'journal_entry'
+    fields = ('reference', 'wallet_content_type', 'wallet_object_id', 'transaction_type', 'direction', 'amount')
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(JournalEntry)
+class JournalEntryAdmin(admin.ModelAdmin):
+    list_display = ('reference', 'description', 'content_type', 'object_id', 'created_at')
+    search_fields = ('reference', 'description')
+    readonly_fields = ('reference', 'description', 'content_type', 'object_id', 'created_at', 'updated_at')
+    inlines = [JournalEntryLegInline]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WalletBalanceShard)
+class WalletBalanceShardAdmin(admin.ModelAdmin):
+    list_display = ('wallet_content_type', 'wallet_object_id', 'shard', 'balance', 'updated_at')
+    list_filter = ('wallet_content_type',)
+    readonly_fields = ('wallet_content_type', 'wallet_object_id', 'shard', 'balance', 'updated_at')
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(WalletRollup)
+class WalletRollupAdmin(admin.ModelAdmin):
+    list_display = ('wallet_content_type', 'wallet_object_id', 'period', 'period_start',
+                    'transaction_type', 'direction', 'amount', 'count')
+    list_filter = ('period', 'transaction_type', 'wallet_content_type')
+    date_hierarchy = 'period_start'
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from apps.wallets.services.sharded_balance_service import ShardedBalanceService
+
+
+class Command(BaseCommand):
+    help = 'Reporte les sous-soldes des wallets très sollicités sur leur solde (tâche périodique)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Affiche les montants à reporter sans les modifier'
+        )
+
+    def handle(self, *args, **options):
+        results = ShardedBalanceService.compact_all(dry_run=options['dry_run'])
+        for wallet, amount in results:
+            self.stdout.write(f"{wallet.owner_repr}: {amount} {wallet.currency}")
+        summary = f"{len(results)} wallet(s) compacté(s)."
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"Simulation : {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
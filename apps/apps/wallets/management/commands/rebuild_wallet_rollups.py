@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from apps.wallets.services.rollup_service import WalletRollupService
+
+
+class Command(BaseCommand):
+    help = 'Recalcule les cumuls journaliers et mensuels des wallets à partir des transactions complétées'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Nombre de transactions lues par lot (défaut: 2000)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Calcule les cumuls sans modifier la base'
+        )
+
+    def handle(self, *args, **options):
+        rows = WalletRollupService.rebuild(
+            chunk_size=options['chunk_size'],
+            dry_run=options['dry_run'],
+        )
+
+        monthly = [row for row in rows if row.period == 'MONTH']
+        summary = (
+            f"{len(rows)} cumul(s), {sum(row.count for row in monthly)} transaction(s) "
+            f"sur {len({(row.wallet_content_type_id, row.wallet_object_id) for row in monthly})} wallet(s)."
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f"Simulation : {summary}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
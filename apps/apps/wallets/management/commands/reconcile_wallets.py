@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from apps.wallets.services.reconciliation_service import ReconciliationService
+
+
+class Command(BaseCommand):
+    help = 'Compare le solde de chaque wallet à son journal et signale les écarts (tâche nocturne)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Nombre de wallets vérifiés par lot (défaut: 1000)'
+        )
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Enregistre une écriture de régularisation pour chaque écart, sans modifier les soldes'
+        )
+
+    def handle(self, *args, **options):
+        def progress(model, checked, total):
+            self.stdout.write(f"{model._meta.verbose_name_plural} : {checked}/{total}")
+
+        drifts = ReconciliationService.reconcile(
+            chunk_size=options['chunk_size'],
+            fix=options['fix'],
+            progress=progress,
+            description='Régularisation du rapprochement des soldes',
+        )
+
+        for drift in drifts:
+            wallet = drift.wallet
+            self.stdout.write(
+                f"{wallet._meta.verbose_name} #{wallet.pk} ({wallet.owner_repr}) : solde {drift.balance}"
+                f" + sous-soldes {drift.pending}, journal {drift.ledger}, écart {drift.difference} {wallet.currency}"
+            )
+        if not drifts:
+            self.stdout.write(self.style.SUCCESS("Aucun écart entre les soldes et le journal."))
+        elif options['fix']:
+            self.stdout.write(self.style.SUCCESS(f"{len(drifts)} écart(s) régularisé(s)."))
+        else:
+            self.stdout.write(self.style.WARNING(f"{len(drifts)} écart(s) détecté(s), relancer avec --fix pour les régulariser."))
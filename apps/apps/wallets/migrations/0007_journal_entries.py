@@ -0,0 +1,71 @@
+# Generated by Django 5.2.2 on 2026-10-19 03:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Sens des transactions antérieures au journal, déduit du type et du wallet
+CREDIT_TYPES = ('DEPOSIT', 'REFUND', 'COMMISSION')
+DEBIT_TYPES = ('WITHDRAWAL',)
+
+
+def backfill_direction(apps, schema_editor):
+    ContentType = apps.get_model('contenttypes', 'ContentType')
+    UserTransaction = apps.get_model('wallets', 'UserTransaction')
+    user_wallet_type = ContentType.objects.filter(app_label='wallets', model='userwallet').first()
+
+    legacy = UserTransaction.objects.filter(direction='')
+    legacy.filter(transaction_type__in=CREDIT_TYPES).update(direction='CREDIT')
+    legacy.filter(transaction_type__in=DEBIT_TYPES).update(direction='DEBIT')
+    # Paiements et blocages : débit côté client, crédit côté établissement
+    if user_wallet_type is not None:
+        legacy.filter(wallet_content_type=user_wallet_type).update(direction='DEBIT')
+    legacy.update(direction='CREDIT')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wallets', '0006_alter_businesstransaction_transaction_type_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usertransaction',
+            name='direction',
+            field=models.CharField(blank=True, choices=[('CREDIT', 'Credit'), ('DEBIT', 'Debit')], max_length=6, verbose_name='Direction'),
+        ),
+        migrations.AlterField(
+            model_name='businesstransaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('DEPOSIT', 'Deposit'), ('WITHDRAWAL', 'Withdrawal'), ('TRANSFER', 'Transfer'), ('PAYMENT', 'Payment'), ('CASH_PAYMENT', 'Cash Payment'), ('HOLD', 'Hold'), ('REFUND', 'Refund'), ('COMMISSION', 'Commission')], max_length=20, verbose_name='Transaction Type'),
+        ),
+        migrations.AlterField(
+            model_name='usertransaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('DEPOSIT', 'Deposit'), ('WITHDRAWAL', 'Withdrawal'), ('TRANSFER', 'Transfer'), ('PAYMENT', 'Payment'), ('CASH_PAYMENT', 'Cash Payment'), ('HOLD', 'Hold'), ('REFUND', 'Refund'), ('COMMISSION', 'Commission')], max_length=20, verbose_name='Transaction Type'),
+        ),
+        migrations.CreateModel(
+            name='JournalEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Date and time when this record was created', verbose_name='Created At')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Date and time when this record was last updated', verbose_name='Updated At')),
+                ('reference', models.CharField(help_text='Unique journal entry reference', max_length=100, unique=True, verbose_name='Reference')),
+                ('description', models.TextField(blank=True, verbose_name='Description')),
+                ('object_id', models.PositiveIntegerField(blank=True, null=True)),
+                ('content_type', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Journal Entry',
+                'verbose_name_plural': 'Journal Entries',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='usertransaction',
+            name='journal_entry',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='legs', to='wallets.journalentry', verbose_name='Journal Entry'),
+        ),
+        migrations.RunPython(backfill_direction, migrations.RunPython.noop),
+    ]
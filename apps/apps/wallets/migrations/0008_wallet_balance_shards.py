@@ -0,0 +1,31 @@
+# Generated by Django 5.2.2 on 2026-10-19 03:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wallets', '0007_journal_entries'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletBalanceShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('wallet_object_id', models.PositiveIntegerField()),
+                ('shard', models.PositiveSmallIntegerField(verbose_name='Shard')),
+                ('balance', models.DecimalField(decimal_places=2, default=0, max_digits=12, verbose_name='Balance')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('wallet_content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Wallet Balance Shard',
+                'verbose_name_plural': 'Wallet Balance Shards',
+                'constraints': [models.UniqueConstraint(fields=('wallet_content_type', 'wallet_object_id', 'shard'), name='unique_wallet_balance_shard')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.2 on 2026-10-19 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wallets', '0008_wallet_balance_shards'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usertransaction',
+            index=models.Index(fields=['wallet_content_type', 'wallet_object_id', 'transaction_type', 'status', 'created_at'], name='wallets_use_wallet__985fb5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usertransaction',
+            index=models.Index(fields=['content_type', 'object_id'], name='wallets_use_content_c8f4eb_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.2 on 2026-10-19 03:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wallets', '0009_user_transaction_lookup_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('wallet_object_id', models.PositiveIntegerField()),
+                ('period', models.CharField(choices=[('DAY', 'Day'), ('MONTH', 'Month')], max_length=5, verbose_name='Period')),
+                ('period_start', models.DateField(help_text='Local date, first day of the month for monthly rows', verbose_name='Period Start')),
+                ('transaction_type', models.CharField(choices=[('DEPOSIT', 'Deposit'), ('WITHDRAWAL', 'Withdrawal'), ('TRANSFER', 'Transfer'), ('PAYMENT', 'Payment'), ('CASH_PAYMENT', 'Cash Payment'), ('HOLD', 'Hold'), ('REFUND', 'Refund'), ('COMMISSION', 'Commission')], max_length=20, verbose_name='Transaction Type')),
+                ('direction', models.CharField(blank=True, choices=[('CREDIT', 'Credit'), ('DEBIT', 'Debit')], max_length=6, verbose_name='Direction')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Amount')),
+                ('count', models.IntegerField(default=0, verbose_name='Count')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Updated At')),
+                ('wallet_content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='contenttypes.contenttype')),
+            ],
+            options={
+                'verbose_name': 'Wallet Rollup',
+                'verbose_name_plural': 'Wallet Rollups',
+                'indexes': [models.Index(fields=['wallet_content_type', 'period', 'period_start'], name='wallets_wal_wallet__1f509a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('wallet_content_type', 'wallet_object_id', 'period', 'period_start', 'transaction_type', 'direction'), name='unique_wallet_rollup_slot')],
+            },
+        ),
+    ]
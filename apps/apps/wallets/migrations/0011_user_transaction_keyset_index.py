@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-19 03:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('wallets', '0010_wallet_rollups'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usertransaction',
+            index=models.Index(fields=['wallet_content_type', 'wallet_object_id', 'created_at', 'id'], name='wallets_use_wallet__2bba0b_idx'),
+        ),
+    ]
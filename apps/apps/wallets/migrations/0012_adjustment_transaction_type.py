@@ -0,0 +1,28 @@
+# Generated by Django 5.2.2 on 2026-10-19 03:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('wallets', '0011_user_transaction_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='businesstransaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('DEPOSIT', 'Deposit'), ('WITHDRAWAL', 'Withdrawal'), ('TRANSFER', 'Transfer'), ('PAYMENT', 'Payment'), ('CASH_PAYMENT', 'Cash Payment'), ('HOLD', 'Hold'), ('REFUND', 'Refund'), ('COMMISSION', 'Commission'), ('ADJUSTMENT', 'Adjustment')], max_length=20, verbose_name='Transaction Type'),
+        ),
+        migrations.AlterField(
+            model_name='usertransaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('DEPOSIT', 'Deposit'), ('WITHDRAWAL', 'Withdrawal'), ('TRANSFER', 'Transfer'), ('PAYMENT', 'Payment'), ('CASH_PAYMENT', 'Cash Payment'), ('HOLD', 'Hold'), ('REFUND', 'Refund'), ('COMMISSION', 'Commission'), ('ADJUSTMENT', 'Adjustment')], max_length=20, verbose_name='Transaction Type'),
+        ),
+        migrations.AlterField(
+            model_name='walletrollup',
+            name='transaction_type',
+            field=models.CharField(choices=[('DEPOSIT', 'Deposit'), ('WITHDRAWAL', 'Withdrawal'), ('TRANSFER', 'Transfer'), ('PAYMENT', 'Payment'), ('CASH_PAYMENT', 'Cash Payment'), ('HOLD', 'Hold'), ('REFUND', 'Refund'), ('COMMISSION', 'Commission'), ('ADJUSTMENT', 'Adjustment')], max_length=20, verbose_name='Transaction Type'),
+        ),
+    ]
@@ -1,10 +1,16 @@
 from django.db import models
 from .wallet import UserWallet, BusinessWallet
 from .transaction import UserTransaction, BusinessTransaction
+from .ledger import JournalEntry
+from .balance_shard import WalletBalanceShard
+from .rollup import WalletRollup
 
 __all__ = [
     'UserWallet',
     'BusinessWallet',
     'UserTransaction',
     'BusinessTransaction',
+    'JournalEntry',
+    'WalletBalanceShard',
+    'WalletRollup',
 ]
@@ -0,0 +1,42 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+
+
+class WalletBalanceShard(models.Model):
+    """
+    Sous-solde d'un wallet très sollicité (wallet des commissions de la plateforme).
+
+    Les crédits sont répartis au hasard sur plusieurs lignes pour ne pas
+    sérialiser les paiements sur un seul verrou ; le solde réel du wallet est
+    ``balance`` + la somme de ses sous-soldes, reportés périodiquement sur le
+    wallet (voir ShardedBalanceService.compact).
+    """
+    wallet_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    wallet_object_id = models.PositiveIntegerField()
+    wallet = GenericForeignKey('wallet_content_type', 'wallet_object_id')
+    shard = models.PositiveSmallIntegerField(_('Shard'))
+    balance = models.DecimalField(
+        _('Balance'),
+        max_digits=12,
+        decimal_places=2,
+        default=0
+    )
+    updated_at = models.DateTimeField(
+        _('Updated At'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('Wallet Balance Shard')
+        verbose_name_plural = _('Wallet Balance Shards')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['wallet_content_type', 'wallet_object_id', 'shard'],
+                name='unique_wallet_balance_shard'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.wallet_content_type_id}:{self.wallet_object_id} #{self.shard} ({self.balance})"
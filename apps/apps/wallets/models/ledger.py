@@ -0,0 +1,48 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+from apps.core.models import TimeStampedModel
+from apps.core.utils import new_reference, save_with_reference
+
+
+class JournalEntry(TimeStampedModel):
+    """
+    Écriture comptable regroupant les mouvements (legs) d'une même opération.
+
+    Chaque mouvement est une UserTransaction liée à l'écriture ; la somme des
+    crédits est toujours égale à la somme des débits.
+    """
+    reference = models.CharField(
+        _('Reference'),
+        max_length=100,
+        unique=True,
+        help_text=_('Unique journal entry reference')
+    )
+    description = models.TextField(
+        _('Description'),
+        blank=True
+    )
+    # Objet à l'origine de l'écriture (réservation, commande...)
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    object_id = models.PositiveIntegerField(null=True, blank=True)
+    content_object = GenericForeignKey('content_type', 'object_id')
+
+    class Meta:
+        verbose_name = _('Journal Entry')
+        verbose_name_plural = _('Journal Entries')
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return self.reference
+
+    def save(self, *args, **kwargs):
+        if self.reference:
+            super().save(*args, **kwargs)
+        else:
+            save_with_reference(self, self.generate_reference, super().save, *args, **kwargs)
+
+    @staticmethod
+    def generate_reference():
+        """Génère une référence d'écriture ordonnée dans le temps."""
+        return new_reference('JE-')
@@ -0,0 +1,75 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
+
+from .transaction import AbstractTransaction, UserTransaction
+
+
+class WalletRollup(models.Model):
+    """
+    Cumul des transactions complétées d'un wallet sur un jour ou un mois local.
+
+    Les lignes sont ajustées à chaque transaction qui devient (ou cesse
+    d'être) complétée, les tableaux de bord financiers ne parcourent donc
+    jamais les transactions (voir WalletRollupService).
+    """
+    PERIOD_CHOICES = (
+        ('DAY',   _('Day')),
+        ('MONTH', _('Month')),
+    )
+
+    wallet_content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, related_name='+')
+    wallet_object_id = models.PositiveIntegerField()
+    wallet = GenericForeignKey('wallet_content_type', 'wallet_object_id')
+    period = models.CharField(
+        _('Period'),
+        max_length=5,
+        choices=PERIOD_CHOICES
+    )
+    period_start = models.DateField(
+        _('Period Start'),
+        help_text=_('Local date, first day of the month for monthly rows')
+    )
+    transaction_type = models.CharField(
+        _('Transaction Type'),
+        max_length=20,
+        choices=AbstractTransaction.TRANSACTION_TYPES
+    )
+    direction = models.CharField(
+        _('Direction'),
+        max_length=6,
+        choices=UserTransaction.DIRECTION_CHOICES,
+        blank=True
+    )
+    amount = models.DecimalField(
+        _('Amount'),
+        max_digits=14,
+        decimal_places=2,
+        default=0
+    )
+    count = models.IntegerField(
+        _('Count'),
+        default=0
+    )
+    updated_at = models.DateTimeField(
+        _('Updated At'),
+        auto_now=True
+    )
+
+    class Meta:
+        verbose_name = _('Wallet Rollup')
+        verbose_name_plural = _('Wallet Rollups')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['wallet_content_type', 'wallet_object_id', 'period', 'period_start',
+                        'transaction_type', 'direction'],
+                name='unique_wallet_rollup_slot'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['wallet_content_type', 'period', 'period_start']),
+        ]
+
+    def __str__(self):
+        return f"{self.wallet_content_type_id}:{self.wallet_object_id} {self.period_start} {self.transaction_type}: {self.amount}"
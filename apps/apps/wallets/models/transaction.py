@@ -2,6 +2,7 @@ from django.db import models
 from django.utils.translation import gettext_lazy as _
 from django.core.validators import MinValueValidator
 from apps.core.models import TimeStampedModel
+from apps.core.utils import new_reference, save_with_reference
 from .wallet import UserWallet, BusinessWallet
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
@@ -19,6 +20,8 @@ class AbstractTransaction(TimeStampedModel):
         ('CASH_PAYMENT', _('Cash Payment')),
         ('HOLD',       _('Hold')),
         ('REFUND',     _('Refund')),
+        ('COMMISSION', _('Commission')),
+        ('ADJUSTMENT', _('Adjustment')),
     )
     
     STATUS_CHOICES = (
@@ -75,17 +78,28 @@ class AbstractTransaction(TimeStampedModel):
     def __str__(self):
         return f"{self.get_transaction_type_display()} - {self.amount} ({self.reference})"
 
+    def save(self, *args, **kwargs):
+        if self.reference:
+            super().save(*args, **kwargs)
+        else:
+            save_with_reference(self, self.generate_reference, super().save, *args, **kwargs)
+
+    @staticmethod
+    def generate_reference():
+        """Génère une référence de transaction ordonnée dans le temps."""
+        return new_reference('TXN-')
+
     def mark_as_completed(self):
         self.status = 'COMPLETED'
-        self.save()
+        self.save(update_fields=['status', 'updated_at'])
 
     def mark_as_failed(self):
         self.status = 'FAILED'
-        self.save()
+        self.save(update_fields=['status', 'updated_at'])
 
     def mark_as_cancelled(self):
         self.status = 'CANCELLED'
-        self.save()
+        self.save(update_fields=['status', 'updated_at'])
 
 
 class UserTransaction(AbstractTransaction):
@@ -96,11 +110,33 @@ class UserTransaction(AbstractTransaction):
     content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
     object_id = models.PositiveIntegerField(null=True, blank=True)
     content_object = GenericForeignKey('content_type', 'object_id')
+    # Mouvement d'une écriture comptable (voir LedgerService)
+    DIRECTION_CHOICES = (
+        ('CREDIT', _('Credit')),
+        ('DEBIT',  _('Debit')),
+    )
+    direction = models.CharField(
+        _('Direction'),
+        max_length=6,
+        choices=DIRECTION_CHOICES,
+        blank=True
+    )
+    journal_entry = models.ForeignKey(
+        'wallets.JournalEntry',
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name='legs',
+        verbose_name=_('Journal Entry')
+    )
 
     class Meta(AbstractTransaction.Meta):
         verbose_name = _('User Transaction')
         verbose_name_plural = _('User Transactions')
         indexes = AbstractTransaction.Meta.indexes + [
+            models.Index(fields=['wallet_content_type', 'wallet_object_id', 'transaction_type', 'status', 'created_at']),
+            models.Index(fields=['content_type', 'object_id']),
+            models.Index(fields=['wallet_content_type', 'wallet_object_id', 'created_at', 'id']),
         ]
 
 
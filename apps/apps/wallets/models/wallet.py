@@ -1,9 +1,14 @@
-from django.db import models
+from decimal import Decimal
+from django.db import models, transaction
+from django.db.models import Case, DecimalField, F, Sum, Value, When
+from django.utils import timezone
 from django.conf import settings
 from django.core.validators import MinValueValidator
 from django.utils.translation import gettext_lazy as _
 from apps.core.models import TimeStampedModel
+from apps.core.utils import ContentTypeRegistry
 from apps.business.models import Business
+from .balance_shard import WalletBalanceShard
 from django.contrib.contenttypes.fields import GenericRelation
 
 # 1. Modèle abstrait
@@ -34,22 +39,87 @@ class AbstractWallet(TimeStampedModel):
         # Cette méthode sera appelée dans les sous-classes
         return f"{self.owner_repr} ({self.balance} {self.currency})"
 
+    @classmethod
+    def shards(cls, pk):
+        """Sub-balances of a wallet (see ShardedBalanceService)."""
+        return WalletBalanceShard.objects.filter(
+            wallet_content_type_id=ContentTypeRegistry.id_for(cls),
+            wallet_object_id=pk
+        )
+
+    @classmethod
+    @transaction.atomic
+    def compact_shards(cls, pk):
+        """
+        Move the sub-balances of a wallet into its balance.
+
+        Each shard is decreased by the amount read rather than reset, so a
+        credit landing during the compaction stays on its shard.
+
+        Returns:
+            Decimal: Amount moved into the wallet
+        """
+        shards = dict(cls.shards(pk).exclude(balance=0).values_list('pk', 'balance'))
+        total = sum(shards.values(), Decimal('0'))
+        if not shards:
+            return total
+        WalletBalanceShard.objects.filter(pk__in=list(shards)).update(
+            balance=F('balance') - Case(
+                *[When(pk=pk, then=Value(amount)) for pk, amount in shards.items()],
+                output_field=DecimalField(max_digits=12, decimal_places=2)
+            ),
+            updated_at=timezone.now()
+        )
+        cls.adjust_balance(pk, total)
+        return total
+
+    @classmethod
+    def adjust_balance(cls, pk, delta, require_active=False):
+        """
+        Move the balance of a wallet with one conditional UPDATE.
+
+        Runs ``UPDATE ... SET balance = balance + delta WHERE balance >= -delta``
+        so concurrent movements never overwrite each other and a debit never
+        takes the balance below zero. A debit the wallet row alone cannot
+        cover is retried once the sub-balances are compacted into it.
+
+        Args:
+            pk: Primary key of the wallet
+            delta: Amount to add, negative for a debit
+            require_active: Only move the balance of an active wallet
+
+        Returns:
+            bool: False if the wallet is missing, inactive or short of funds
+        """
+        wallets = cls.objects.filter(pk=pk)
+        if delta < 0:
+            wallets = wallets.filter(balance__gte=-delta)
+        if require_active:
+            wallets = wallets.filter(is_active=True)
+        changes = {'balance': F('balance') + delta, 'updated_at': timezone.now()}
+        if wallets.update(**changes):
+            return True
+        return bool(delta < 0 and cls.compact_shards(pk) and wallets.update(**changes))
+
+    @property
+    def available_balance(self):
+        """Balance including the sub-balances not yet compacted into it."""
+        return self.balance + (self.shards(self.pk).aggregate(total=Sum('balance'))['total'] or 0)
+
     def deposit(self, amount):
-        if amount > 0:
-            self.balance += amount
-            self.save()
+        if amount > 0 and self.adjust_balance(self.pk, amount):
+            self.refresh_from_db(fields=['balance', 'updated_at'])
             return True
         return False
 
     def withdraw(self, amount):
-        if 0 < amount <= self.balance:
-            self.balance -= amount
-            self.save()
+        if amount > 0 and self.adjust_balance(self.pk, -amount):
+            self.refresh_from_db(fields=['balance', 'updated_at'])
             return True
         return False
 
     def has_sufficient_funds(self, amount):
-        return self.balance >= amount
+        return self.available_balance >= amount
 
     @property
     def owner_repr(self):
@@ -12,6 +12,8 @@ class UserWalletSerializer(serializers.ModelSerializer):
     user_username = serializers.CharField(source='user.username', read_only=True)
     user_email = serializers.CharField(source='user.email', read_only=True)
     user_full_name = serializers.SerializerMethodField()
+    # Solde, sous-soldes pas encore reportés compris
+    balance = serializers.DecimalField(source='available_balance', max_digits=12, decimal_places=2, read_only=True)
     
     class Meta:
         model = UserWallet
@@ -30,6 +32,8 @@ class BusinessWalletSerializer(serializers.ModelSerializer):
     
     business_name = serializers.CharField(source='business.name', read_only=True)
     business_description = serializers.CharField(source='business.description', read_only=True)
+    # Solde, sous-soldes pas encore reportés compris
+    balance = serializers.DecimalField(source='available_balance', max_digits=12, decimal_places=2, read_only=True)
     
     class Meta:
         model = BusinessWallet
@@ -43,6 +47,8 @@ class BusinessWalletSerializer(serializers.ModelSerializer):
 class UserTransactionSerializer(serializers.ModelSerializer):
     """Serializer pour les transactions utilisateur."""
     
+    # Clé générique : le wallet est exposé par son identifiant
+    wallet = serializers.IntegerField(source='wallet_object_id', read_only=True)
     wallet_owner = serializers.CharField(source='wallet.user.username', read_only=True)
     transaction_type_display = serializers.CharField(source='get_transaction_type_display', read_only=True)
     status_display = serializers.CharField(source='get_status_display', read_only=True)
@@ -51,10 +57,10 @@ class UserTransactionSerializer(serializers.ModelSerializer):
         model = UserTransaction
         fields = [
             'id', 'wallet', 'wallet_owner', 'transaction_type', 'transaction_type_display',
-            'amount', 'status', 'status_display', 'reference', 'description',
+            'direction', 'amount', 'status', 'status_display', 'reference', 'description',
             'related_transaction', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['reference', 'created_at', 'updated_at']
+        read_only_fields = ['reference', 'direction', 'created_at', 'updated_at']
 
 
 class BusinessTransactionSerializer(serializers.ModelSerializer):
@@ -161,6 +167,8 @@ class WalletDetailSerializer(serializers.ModelSerializer):
     
     recent_transactions = serializers.SerializerMethodField()
     statistics = serializers.SerializerMethodField()
+    # Solde, sous-soldes pas encore reportés compris
+    balance = serializers.DecimalField(source='available_balance', max_digits=12, decimal_places=2, read_only=True)
     
     class Meta:
         model = UserWallet
@@ -184,6 +192,8 @@ class BusinessWalletDetailSerializer(serializers.ModelSerializer):
     
     recent_transactions = serializers.SerializerMethodField()
     statistics = serializers.SerializerMethodField()
+    # Solde, sous-soldes pas encore reportés compris
+    balance = serializers.DecimalField(source='available_balance', max_digits=12, decimal_places=2, read_only=True)
     
     class Meta:
         model = BusinessWallet
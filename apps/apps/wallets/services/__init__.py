@@ -1,7 +1,20 @@
 from .wallet_service import WalletService
 from .transaction_service import TransactionService
+from .ledger_service import LedgerService, Leg
+from .sharded_balance_service import ShardedBalanceService
+from .rollup_service import WalletRollupService, FinancialReportService
+from .statement_service import StatementService
+from .reconciliation_service import ReconciliationService, Drift
 
 __all__ = [
     'WalletService',
     'TransactionService',
-] 
\ No newline at end of file
+    'LedgerService',
+    'Leg',
+    'ShardedBalanceService',
+    'WalletRollupService',
+    'FinancialReportService',
+    'StatementService',
+    'ReconciliationService',
+    'Drift',
+]
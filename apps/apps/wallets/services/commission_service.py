@@ -1,10 +1,9 @@
 from decimal import Decimal
+from django.db import transaction
+from django.db.models import Q, Sum
 from django.utils import timezone
-from django.core.exceptions import ValidationError
-from apps.wallets.models.wallet import BusinessLocationWallet, UserWallet
 from apps.wallets.models.transaction import UserTransaction
-from apps.users.models import User
-import uuid
+from .ledger_service import LedgerService, to_amount
 
 
 class CommissionService:
@@ -20,7 +19,8 @@ class CommissionService:
         return business_location.business.calculate_commission(amount)
     
     @staticmethod
-    def process_commission_payment(business_location, amount, booking_object, transaction_type='PAYMENT'):
+    def process_commission_payment(business_location, amount, booking_object, transaction_type='PAYMENT',
+                                   payer_wallet=None):
         """
         Traite le paiement avec commission pour une réservation
         
@@ -29,69 +29,29 @@ class CommissionService:
             amount: Montant total de la transaction
             booking_object: Objet de réservation (RoomBooking, VehicleBooking, etc.)
             transaction_type: Type de transaction (PAYMENT, REFUND, etc.)
+            payer_wallet: Wallet débité, ou None pour un paiement reçu hors plateforme
         
         Returns:
             dict: {'success': bool, 'commission_amount': Decimal, 'net_amount': Decimal, 'error': str}
         """
         try:
-            # Calculer la commission
-            commission_amount = business_location.business.calculate_commission(amount)
-            net_amount = amount - commission_amount
-            
-            # Mettre à jour l'objet de réservation
-            booking_object.commission_amount = commission_amount
-            booking_object.save()
-            
-            # Obtenir le wallet business location
-            business_wallet = BusinessLocationWallet.objects.select_for_update().get(
-                business_location=business_location
-            )
-            
-            # Obtenir le wallet super admin
-            super_admin = User.objects.filter(is_superuser=True).first()
-            if not super_admin:
-                super_admin = User.objects.order_by('id').first()
-            
-            super_admin_wallet = getattr(super_admin, 'wallet', None)
-            
-            # Créditer le business location avec le montant net
-            if not business_wallet.deposit(net_amount):
-                raise ValidationError(f"Erreur lors du crédit du wallet business pour {business_location.name}.")
-            
-            # Créer la transaction pour le business location
-            business_transaction = UserTransaction.objects.create(
-                wallet=business_wallet,
-                transaction_type=transaction_type,
-                amount=net_amount,
-                status='COMPLETED',
-                reference=str(uuid.uuid4()),
-                description=f"Paiement net reçu (après commission {commission_amount:.0f} XAF)",
-                content_object=booking_object,
-                created_at=timezone.now()
-            )
-            
-            # Créditer le super admin avec la commission
-            if commission_amount > 0 and super_admin_wallet:
-                if not super_admin_wallet.deposit(commission_amount):
-                    raise ValidationError("Erreur lors du crédit de la commission au wallet admin.")
-                
-                # Créer la transaction de commission
-                UserTransaction.objects.create(
-                    wallet=super_admin_wallet,
-                    transaction_type='COMMISSION',
-                    amount=commission_amount,
-                    status='COMPLETED',
-                    reference=str(uuid.uuid4()),
-                    description=f"Commission {business_location.name}",
-                    content_object=booking_object,
-                    created_at=timezone.now()
+            with transaction.atomic():
+                entry = LedgerService.post_payment(
+                    payer_wallet,
+                    business_location,
+                    amount,
+                    booking_object,
+                    description=f"Paiement {booking_object}",
+                    transaction_type=transaction_type
                 )
+                booking_object.commission_amount = entry.commission_amount
+                booking_object.save()
             
             return {
                 'success': True,
-                'commission_amount': commission_amount,
-                'net_amount': net_amount,
-                'business_transaction': business_transaction
+                'commission_amount': entry.commission_amount,
+                'net_amount': entry.net_amount,
+                'business_transaction': entry.posted_legs[1]
             }
             
         except Exception as e:
@@ -102,56 +62,61 @@ class CommissionService:
                 'error': str(e)
             }
     
+    # Mouvements par lesquels le client règle une réservation (wallet ou espèces)
+    PAYER_TRANSACTION_TYPES = ('HOLD', 'PAYMENT', 'CASH_PAYMENT')
+
+    @classmethod
+    def get_paid_amount(cls, booking):
+        """
+        Montant réglé par le client pour une réservation, remboursements déduits
+        
+        Seuls les débits du payeur et les remboursements qu'il a reçus sont
+        comptés, pas les crédits de l'établissement ni la commission.
+        """
+        totals = booking.transactions.filter(status='COMPLETED').aggregate(
+            paid=Sum('amount', filter=Q(direction='DEBIT', transaction_type__in=cls.PAYER_TRANSACTION_TYPES)),
+            refunded=Sum('amount', filter=Q(direction='CREDIT', transaction_type='REFUND')),
+        )
+        return (totals['paid'] or Decimal('0')) - (totals['refunded'] or Decimal('0'))
+
     @staticmethod
-    def process_cancellation_commission(booking, refund_amount):
+    def process_cancellation_commission(booking, business_location, refund_amount, payee_wallet, apply_fees=True):
         """
-        Traite les commissions lors d'une annulation
+        Rembourse le client d'une réservation annulée
+        
+        Le remboursement est posté en une écriture (LedgerService.post_refund) :
+        la plateforme rend sa commission et l'établissement le reste. Avec
+        ``apply_fees`` (annulation tardive), l'établissement conserve 9% et la
+        plateforme 1% du montant réglé.
         
         Args:
             booking: Objet de réservation
-            refund_amount: Montant à rembourser
+            business_location: Établissement payé pour la réservation
+            refund_amount: Montant réglé par le client
+            payee_wallet: Wallet du client remboursé
+            apply_fees: Retenir les frais d'annulation
         
         Returns:
             dict: {'success': bool, 'commission_business': Decimal, 'commission_admin': Decimal, 'refund_amount': Decimal}
         """
         try:
-            # Calculer les commissions d'annulation (9% business + 1% admin)
-            commission_business = refund_amount * Decimal('0.09')
-            commission_admin = refund_amount * Decimal('0.01')
-            final_refund = refund_amount - commission_business - commission_admin
-            
-            # Obtenir les wallets
-            business_location_wallet = getattr(booking.business_location, 'wallet', None)
-            
-            super_admin = User.objects.filter(is_superuser=True).first()
-            if not super_admin:
-                super_admin = User.objects.order_by('id').first()
-            super_admin_wallet = getattr(super_admin, 'wallet', None)
-            
-            # Créditer le business location avec sa commission
-            if commission_business > 0 and business_location_wallet:
-                business_location_wallet.deposit(commission_business)
-                UserTransaction.objects.create(
-                    wallet=business_location_wallet,
-                    transaction_type='COMMISSION',
-                    amount=commission_business,
-                    status='COMPLETED',
-                    description=f"Commission annulation {booking.booking_reference}",
-                    content_object=booking,
-                    reference=f"COM-BUSINESSLOC-{booking.booking_reference}-{uuid.uuid4().hex[:8]}"
-                )
+            commission_business = commission_admin = Decimal('0')
+            if apply_fees:
+                # Calculer les commissions d'annulation (9% business + 1% admin)
+                commission_business = to_amount(refund_amount * Decimal('0.09'))
+                commission_admin = to_amount(refund_amount * Decimal('0.01'))
+            final_refund = to_amount(refund_amount) - commission_business - commission_admin
             
-            # Créditer le super admin avec sa commission
-            if commission_admin > 0 and super_admin_wallet:
-                super_admin_wallet.deposit(commission_admin)
-                UserTransaction.objects.create(
-                    wallet=super_admin_wallet,
-                    transaction_type='COMMISSION',
-                    amount=commission_admin,
-                    status='COMPLETED',
-                    description=f"Commission admin annulation {booking.booking_reference}",
-                    content_object=booking,
-                    reference=f"COM-ADMIN-{booking.booking_reference}-{uuid.uuid4().hex[:8]}"
+            if final_refund > 0:
+                # La plateforme conserve au plus la commission perçue
+                platform_refund = max(to_amount(booking.commission_amount) - commission_admin, Decimal('0'))
+                LedgerService.post_refund(
+                    payee_wallet,
+                    business_location,
+                    final_refund,
+                    platform_refund,
+                    booking,
+                    description=f"Remboursement annulation réservation {booking.booking_reference}"
                 )
             
             return {
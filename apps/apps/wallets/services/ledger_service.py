@@ -0,0 +1,264 @@
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, NamedTuple, Optional
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.utils import ContentTypeRegistry
+
+from ..models import JournalEntry, UserTransaction
+from ..models.transaction import AbstractTransaction
+from ..models.wallet import BusinessLocationWallet
+from .rollup_service import WalletRollupService
+from .sharded_balance_service import ShardedBalanceService
+from .wallet_service import WalletService
+
+CENT = Decimal('0.01')
+
+
+def to_amount(value):
+    """Round an amount to the cent, as stored by the wallets."""
+    return Decimal(str(value)).quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class Leg(NamedTuple):
+    """
+    One movement of a journal entry.
+
+    ``amount`` is positive for a credit and negative for a debit. A leg
+    without wallet records money entering or leaving the platform (cash
+    received at the counter, for instance) and moves no balance. A
+    ``sharded`` credit goes to the sub-balances of a hot wallet.
+    """
+    wallet: Any
+    amount: Decimal
+    transaction_type: str
+    description: str = ''
+    content_object: Optional[Any] = None
+    sharded: bool = False
+
+
+class LedgerService:
+    """
+    Service de comptabilité en partie double pour tous les mouvements de wallets.
+
+    Une opération est postée comme une écriture (JournalEntry) dont les
+    mouvements s'équilibrent. L'écriture, ses mouvements et les soldes sont
+    écrits dans une seule transaction : un INSERT pour l'écriture, un
+    ``bulk_create`` pour les mouvements et un UPDATE ``F()`` par wallet,
+    conditionné au solde pour les débits.
+    """
+
+    @staticmethod
+    def credit(wallet, amount, transaction_type, description='', content_object=None, sharded=False):
+        return Leg(wallet, to_amount(amount), transaction_type, description, content_object, sharded)
+
+    @staticmethod
+    def debit(wallet, amount, transaction_type, description='', content_object=None):
+        return Leg(wallet, -to_amount(amount), transaction_type, description, content_object)
+
+    @staticmethod
+    def _apply_balances(legs):
+        """
+        Apply the net movement of each wallet with one UPDATE per wallet.
+
+        Wallets are updated in a fixed order so that concurrent postings
+        touching the same wallets cannot deadlock. Sharded credits update a
+        random sub-balance instead; a debit that the wallet row alone cannot
+        cover compacts its sub-balances (see AbstractWallet.adjust_balance).
+
+        Raises:
+            ValidationError: If a debited wallet is inactive or short of funds
+        """
+        deltas = defaultdict(Decimal)
+        for leg in legs:
+            if leg.wallet is None:
+                continue
+            if leg.sharded and leg.amount > 0:
+                ShardedBalanceService.credit(leg.wallet, leg.amount)
+                continue
+            deltas[(type(leg.wallet), leg.wallet.pk)] += leg.amount
+
+        for (model, pk), delta in sorted(deltas.items(), key=lambda item: (item[0][0]._meta.label, item[0][1])):
+            if not model.adjust_balance(pk, delta, require_active=delta < 0):
+                raise ValidationError(_('Solde insuffisant ou wallet inactif.'))
+
+        for leg in legs:
+            if leg.wallet is not None and not leg.sharded:
+                leg.wallet.balance = to_amount(leg.wallet.balance) + leg.amount
+
+    @classmethod
+    @transaction.atomic
+    def post(cls, legs, description='', content_object=None, move_balances=True):
+        """
+        Post a balanced journal entry.
+
+        Args:
+            legs: Movements of the entry, see ``credit`` and ``debit``
+            description: Description of the entry, used for legs without one
+            content_object: Booking or order the entry pays for
+            move_balances: False to only record movements the balances
+                already include, see ``post_adjustment``
+
+        Returns:
+            JournalEntry: The entry, with its saved transactions in ``posted_legs``
+
+        Raises:
+            ValidationError: If the legs do not balance or a debit cannot be covered
+        """
+        legs = [leg for leg in legs if leg.amount]
+        if not legs:
+            raise ValidationError(_('Une écriture doit contenir au moins un mouvement.'))
+        if sum(leg.amount for leg in legs) != 0:
+            raise ValidationError(_('Écriture déséquilibrée : les débits et les crédits diffèrent.'))
+
+        entry = JournalEntry(description=description, content_object=content_object)
+        entry.save()
+        if move_balances:
+            cls._apply_balances(legs)
+
+        rows = []
+        for leg in legs:
+            target = leg.content_object or content_object
+            rows.append(UserTransaction(
+                wallet=leg.wallet,
+                journal_entry=entry,
+                transaction_type=leg.transaction_type,
+                direction='CREDIT' if leg.amount > 0 else 'DEBIT',
+                amount=abs(leg.amount),
+                status='COMPLETED',
+                reference=AbstractTransaction.generate_reference(),
+                description=leg.description or description,
+                content_type_id=ContentTypeRegistry.id_for(target) if target is not None else None,
+                object_id=target.pk if target is not None else None,
+            ))
+        entry.posted_legs = UserTransaction.objects.bulk_create(rows)
+        # bulk_create sends no post_save, the rollups are fed here
+        WalletRollupService.record(entry.posted_legs)
+        return entry
+
+    @classmethod
+    def post_adjustment(cls, wallet, amount, description=''):
+        """
+        Journal a movement a wallet balance went through without a record.
+
+        The wallet leg is balanced by a leg without wallet and no balance
+        moves: the stored balance already includes the amount, only its
+        entry in the ledger was missing (see ReconciliationService).
+
+        Args:
+            amount: Positive when the balance exceeds the ledger, negative otherwise
+        """
+        if amount > 0:
+            legs = [cls.credit(wallet, amount, 'ADJUSTMENT'), cls.debit(None, amount, 'ADJUSTMENT')]
+        else:
+            legs = [cls.debit(wallet, -amount, 'ADJUSTMENT'), cls.credit(None, -amount, 'ADJUSTMENT')]
+        return cls.post(legs, description, content_object=wallet, move_balances=False)
+
+    @staticmethod
+    def platform_wallet():
+        """Wallet receiving the platform commissions, see WalletService.get_platform_wallet."""
+        return WalletService.get_platform_wallet()
+
+    @staticmethod
+    def split_commission(business_location, amount):
+        """
+        Split a payment between the platform commission and the business.
+
+        Returns:
+            tuple: (commission_amount, net_amount), rounded to the cent
+        """
+        amount = to_amount(amount)
+        commission_amount = to_amount(business_location.business.calculate_commission(amount))
+        return commission_amount, amount - commission_amount
+
+    @classmethod
+    def post_payment(cls, payer_wallet, business_location, amount, content_object, description='',
+                     transaction_type='PAYMENT', payer_transaction_type=None):
+        """
+        Post the payment of a booking or an order to a business location.
+
+        The payer is debited of ``amount``; the location receives the amount
+        net of the commission, which goes to the platform wallet.
+
+        Args:
+            payer_wallet: Wallet paying, or None for money received outside
+                the platform (cash at the counter)
+            business_location: BusinessLocation paid
+            amount: Amount paid
+            content_object: Booking or order paid
+            description: Description of the payment
+            transaction_type: Type of the business location movement
+            payer_transaction_type: Type of the payer movement (default:
+                ``transaction_type``)
+
+        Returns:
+            JournalEntry: The posted entry, with ``commission_amount`` and
+                ``net_amount`` set
+
+        Raises:
+            ValidationError: If the payer cannot cover the amount
+        """
+        commission_amount, net_amount = cls.split_commission(business_location, amount)
+        location_wallet, created = BusinessLocationWallet.objects.get_or_create(
+            business_location=business_location
+        )
+        legs = [
+            cls.debit(payer_wallet, net_amount + commission_amount, payer_transaction_type or transaction_type),
+            cls.credit(
+                location_wallet, net_amount, transaction_type,
+                _('%(description)s (après commission)') % {'description': description}
+            ),
+        ]
+        if commission_amount:
+            legs.append(cls.credit(
+                cls.platform_wallet(), commission_amount, 'COMMISSION',
+                _('Commission %(location)s') % {'location': business_location.name},
+                sharded=True
+            ))
+
+        entry = cls.post(legs, description=description, content_object=content_object)
+        entry.commission_amount = commission_amount
+        entry.net_amount = net_amount
+        return entry
+
+    @classmethod
+    def post_refund(cls, payee_wallet, business_location, amount, commission_amount, content_object,
+                    description=''):
+        """
+        Post the full refund of a payment posted with ``post_payment``.
+
+        The payee is credited of ``amount``: the business location gives
+        back the net amount and the platform wallet its commission.
+
+        Args:
+            payee_wallet: Wallet refunded
+            business_location: BusinessLocation that was paid
+            amount: Amount refunded
+            commission_amount: Commission taken on the payment
+            content_object: Booking or order refunded
+            description: Description of the refund
+
+        Returns:
+            JournalEntry: The posted entry
+
+        Raises:
+            ValidationError: If the business location cannot cover the refund
+        """
+        amount = to_amount(amount)
+        commission_amount = min(to_amount(commission_amount), amount)
+        location_wallet, created = BusinessLocationWallet.objects.get_or_create(
+            business_location=business_location
+        )
+        legs = [
+            cls.debit(location_wallet, amount - commission_amount, 'REFUND'),
+            cls.credit(payee_wallet, amount, 'REFUND'),
+        ]
+        if commission_amount:
+            legs.append(cls.debit(
+                cls.platform_wallet(), commission_amount, 'REFUND',
+                _('Commission remboursée %(location)s') % {'location': business_location.name}
+            ))
+        return cls.post(legs, description=description, content_object=content_object)
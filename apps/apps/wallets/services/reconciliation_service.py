@@ -0,0 +1,177 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, NamedTuple
+
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, OuterRef, Subquery, Sum, When
+from django.db.models.functions import Coalesce
+
+from apps.core.utils import ContentTypeRegistry
+
+from ..models import BusinessTransaction, BusinessWallet, UserTransaction, UserWallet, WalletBalanceShard
+from ..models.wallet import BusinessLocationWallet
+from .ledger_service import LedgerService, to_amount
+
+AMOUNT = DecimalField(max_digits=14, decimal_places=2)
+
+
+class Drift(NamedTuple):
+    """Stored balance of a wallet that disagrees with its ledger."""
+    wallet: Any
+    balance: Decimal
+    pending: Decimal
+    ledger: Decimal
+
+    @property
+    def difference(self):
+        """Amount the stored balance (sub-balances included) exceeds the ledger by."""
+        return to_amount(self.balance + self.pending - self.ledger)
+
+
+class ReconciliationService:
+    """
+    Service class checking the stored wallet balances against the ledger.
+
+    The ledger balance of a wallet is its completed credits minus its
+    completed debits; the stored balance plus the wallet's sub-balances
+    must equal it. Rows written without a direction are read the way
+    migration 0007 classified the older ones. Business wallets also count
+    their BusinessTransaction rows (deposits, withdrawals and transfers
+    received through TransactionService).
+
+    Wallets are read in chunks of primary keys, each chunk costing one
+    grouped aggregate of the ledger and one of the sub-balances per wallet
+    type. Candidates are then checked again with a single statement, so a
+    payment committing between two reads is not reported as a drift.
+    """
+
+    WALLET_MODELS = (UserWallet, BusinessWallet, BusinessLocationWallet)
+    CREDIT_TYPES = ('DEPOSIT', 'REFUND', 'COMMISSION')
+    DEBIT_TYPES = ('WITHDRAWAL',)
+
+    @classmethod
+    def _signed_amount(cls, model):
+        # Sans sens : paiements et blocages débitent le client et créditent l'établissement
+        default = -F('amount') if model is UserWallet else F('amount')
+        return Case(
+            When(direction='CREDIT', then=F('amount')),
+            When(direction='DEBIT', then=-F('amount')),
+            When(transaction_type__in=cls.CREDIT_TYPES, then=F('amount')),
+            When(transaction_type__in=cls.DEBIT_TYPES, then=-F('amount')),
+            default=default,
+            output_field=AMOUNT
+        )
+
+    @classmethod
+    def _ledger_totals(cls, model, **filters):
+        """Grouped ledger totals of a wallet type, one queryset per transaction table."""
+        totals = [
+            UserTransaction.objects.filter(
+                wallet_content_type_id=ContentTypeRegistry.id_for(model), status='COMPLETED', **filters
+            ).values(wallet_pk=F('wallet_object_id')).annotate(total=Sum(cls._signed_amount(model))).order_by()
+        ]
+        if model is BusinessWallet:
+            # Un wallet entreprise ne fait que recevoir les virements : seuls les retraits le débitent
+            filters = {key.replace('wallet_object_id', 'wallet_id'): value for key, value in filters.items()}
+            totals.append(
+                BusinessTransaction.objects.filter(
+                    status='COMPLETED', **filters
+                ).values(wallet_pk=F('wallet_id')).annotate(total=Sum(Case(
+                    When(transaction_type__in=cls.DEBIT_TYPES, then=-F('amount')),
+                    default=F('amount'),
+                    output_field=AMOUNT
+                ))).order_by()
+            )
+        return totals
+
+    @staticmethod
+    def _pending_totals(model, **filters):
+        return WalletBalanceShard.objects.filter(
+            wallet_content_type_id=ContentTypeRegistry.id_for(model), **filters
+        ).values('wallet_object_id').annotate(total=Sum('balance')).order_by()
+
+    @classmethod
+    def check(cls, model, pk, lock=False):
+        """
+        Compare one wallet with its ledger in a single statement.
+
+        Args:
+            lock: Lock the wallet row, to correct it in the same transaction
+
+        Returns:
+            Drift: The comparison, whether or not the wallet drifted
+        """
+        wallets = model.objects.filter(pk=pk)
+        if lock:
+            wallets = wallets.select_for_update()
+        ledger_total, *others = [
+            Coalesce(Subquery(totals.values('total')), Decimal('0'), output_field=AMOUNT)
+            for totals in cls._ledger_totals(model, wallet_object_id=OuterRef('pk'))
+        ]
+        for other in others:
+            ledger_total += other
+        wallet = wallets.annotate(
+            ledger_total=ledger_total,
+            pending_total=Coalesce(
+                Subquery(cls._pending_totals(model, wallet_object_id=OuterRef('pk')).values('total')),
+                Decimal('0'), output_field=AMOUNT
+            )
+        ).get()
+        return Drift(wallet, wallet.balance, wallet.pending_total, wallet.ledger_total)
+
+    @classmethod
+    def correct(cls, model, pk, description=''):
+        """
+        Journal the drift of a wallet, if it is still there once the wallet is locked.
+
+        Returns:
+            Drift: The corrected drift, None when the wallet agrees with its ledger
+        """
+        with transaction.atomic():
+            drift = cls.check(model, pk, lock=True)
+            if not drift.difference:
+                return None
+            LedgerService.post_adjustment(drift.wallet, drift.difference, description)
+        return drift
+
+    @classmethod
+    def reconcile(cls, chunk_size=1000, fix=False, progress=None, description=''):
+        """
+        Check every wallet against the ledger.
+
+        Args:
+            chunk_size: Wallets read per chunk
+            fix: Journal each drift with an adjustment entry (see LedgerService.post_adjustment)
+            progress: Optional callable(model, checked, total) called after each chunk
+
+        Returns:
+            list: Drift of each wallet that disagreed with its ledger
+        """
+        drifts = []
+        for model in cls.WALLET_MODELS:
+            wallets = model.objects.order_by('pk')
+            total = wallets.count()
+            checked = 0
+            last_pk = 0
+            while True:
+                chunk = list(wallets.filter(pk__gt=last_pk).values_list('pk', 'balance')[:chunk_size])
+                if not chunk:
+                    break
+                bounds = {'wallet_object_id__gte': chunk[0][0], 'wallet_object_id__lte': chunk[-1][0]}
+                ledger = defaultdict(Decimal)
+                for totals in cls._ledger_totals(model, **bounds):
+                    for wallet_pk, amount in totals.values_list('wallet_pk', 'total'):
+                        ledger[wallet_pk] += amount
+                pending = dict(cls._pending_totals(model, **bounds).values_list('wallet_object_id', 'total'))
+
+                for pk, balance in chunk:
+                    if to_amount(balance + pending.get(pk, 0) - ledger.get(pk, 0)):
+                        drift = cls.correct(model, pk, description) if fix else cls.check(model, pk)
+                        if drift is not None and drift.difference:
+                            drifts.append(drift)
+
+                last_pk = chunk[-1][0]
+                checked += len(chunk)
+                if progress:
+                    progress(model, checked, total)
+        return drifts
@@ -0,0 +1,184 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from dateutil.relativedelta import relativedelta
+from django.db import transaction
+from django.db.models import Case, DecimalField, F, IntegerField, Q, Sum, Value, When
+from django.utils import timezone
+
+from apps.core.utils import ContentTypeRegistry
+
+from ..models import UserTransaction, WalletRollup
+
+
+class WalletRollupService:
+    """
+    Service class maintaining the daily and monthly per-wallet rollups.
+
+    A transaction counts while it is COMPLETED, so the rollups only move
+    when a transaction is created completed, enters or leaves that status,
+    or is deleted. Movements without a wallet are not rolled up.
+    """
+
+    KEY_FIELDS = ('wallet_content_type_id', 'wallet_object_id', 'period', 'period_start',
+                  'transaction_type', 'direction')
+
+    @staticmethod
+    def _slots(created_at):
+        """Day and month of a local timestamp."""
+        day = timezone.localdate(created_at)
+        return (('DAY', day), ('MONTH', day.replace(day=1)))
+
+    @classmethod
+    def _accumulate(cls, totals, wallet_content_type_id, wallet_object_id, transaction_type, direction,
+                    amount, created_at, sign=1):
+        for period, period_start in cls._slots(created_at):
+            key = (wallet_content_type_id, wallet_object_id, period, period_start, transaction_type, direction)
+            totals[key][0] += sign * amount
+            totals[key][1] += sign
+
+    @classmethod
+    def record(cls, transactions, sign=1):
+        """
+        Schedule the rollup update of completed (or no longer completed) transactions.
+
+        The update runs once the transaction commits, so the rows of busy
+        wallets are not kept locked for the whole payment. A failing update
+        is logged without failing the committed payment; the rollups are
+        then repaired with ``rebuild_wallet_rollups``.
+
+        Args:
+            transactions: UserTransaction instances
+            sign: 1 when they become completed, -1 when they stop counting
+        """
+        totals = defaultdict(lambda: [Decimal('0'), 0])
+        for txn in transactions:
+            if txn.wallet_object_id is None:
+                continue
+            cls._accumulate(
+                totals, txn.wallet_content_type_id, txn.wallet_object_id, txn.transaction_type,
+                txn.direction, txn.amount, txn.created_at or timezone.now(), sign
+            )
+        if totals:
+            deltas = dict(totals)
+            transaction.on_commit(lambda: cls.apply(deltas), robust=True)
+
+    @classmethod
+    def record_transition(cls, txn, previous_status):
+        """Record a status change of a transaction, ``previous_status`` is None on creation."""
+        sign = int(txn.status == 'COMPLETED') - int(previous_status == 'COMPLETED')
+        if sign:
+            cls.record([txn], sign)
+
+    @classmethod
+    @transaction.atomic
+    def apply(cls, deltas):
+        """
+        Add amounts and counts to their rollup rows.
+
+        Missing rows are inserted with one conflict-ignoring bulk insert and
+        all rows are adjusted with one UPDATE.
+        """
+        WalletRollup.objects.bulk_create(
+            [WalletRollup(**dict(zip(cls.KEY_FIELDS, key))) for key in deltas],
+            ignore_conflicts=True
+        )
+        match = Q()
+        for key in deltas:
+            match |= Q(**dict(zip(cls.KEY_FIELDS, key)))
+        by_pk = {
+            row[0]: deltas[row[1:]]
+            for row in WalletRollup.objects.filter(match).values_list('pk', *cls.KEY_FIELDS)
+        }
+        WalletRollup.objects.filter(pk__in=list(by_pk)).update(
+            amount=F('amount') + Case(
+                *[When(pk=pk, then=Value(delta[0])) for pk, delta in by_pk.items()],
+                output_field=DecimalField(max_digits=14, decimal_places=2)
+            ),
+            count=F('count') + Case(
+                *[When(pk=pk, then=Value(delta[1])) for pk, delta in by_pk.items()],
+                output_field=IntegerField()
+            ),
+            updated_at=timezone.now()
+        )
+
+    @classmethod
+    def rebuild(cls, chunk_size=2000, dry_run=False):
+        """
+        Recompute every rollup by streaming the completed transactions.
+
+        Only the rollup totals are kept in memory, the transactions are read
+        ``chunk_size`` rows at a time.
+
+        Returns:
+            list: The computed WalletRollup rows
+        """
+        totals = defaultdict(lambda: [Decimal('0'), 0])
+        rows = UserTransaction.objects.filter(
+            status='COMPLETED', wallet_object_id__isnull=False
+        ).values_list(
+            'wallet_content_type_id', 'wallet_object_id', 'transaction_type', 'direction', 'amount', 'created_at'
+        ).order_by()
+        for row in rows.iterator(chunk_size=chunk_size):
+            cls._accumulate(totals, *row)
+
+        rollups = [
+            WalletRollup(amount=amount, count=count, **dict(zip(cls.KEY_FIELDS, key)))
+            for key, (amount, count) in totals.items()
+        ]
+        if not dry_run:
+            with transaction.atomic():
+                WalletRollup.objects.all().delete()
+                WalletRollup.objects.bulk_create(rollups, batch_size=1000)
+        return rollups
+
+
+class FinancialReportService:
+    """Service class for the financial dashboards, read from the wallet rollups only."""
+
+    @staticmethod
+    def _rollups(wallet_model, wallet_ids, period, transaction_types):
+        return WalletRollup.objects.filter(
+            wallet_content_type_id=ContentTypeRegistry.id_for(wallet_model),
+            wallet_object_id__in=wallet_ids,
+            period=period,
+            transaction_type__in=transaction_types
+        )
+
+    @classmethod
+    def wallet_totals(cls, wallet_model, wallet_ids, transaction_types, start_date=None, end_date=None):
+        """
+        Amount of each transaction type per wallet, optionally between two local dates.
+
+        Returns:
+            dict: {wallet_id: {transaction_type: amount}}
+        """
+        period = 'DAY' if start_date or end_date else 'MONTH'
+        rows = cls._rollups(wallet_model, wallet_ids, period, transaction_types)
+        if start_date:
+            rows = rows.filter(period_start__gte=start_date)
+        if end_date:
+            rows = rows.filter(period_start__lte=end_date)
+
+        totals = defaultdict(dict)
+        for row in rows.values('wallet_object_id', 'transaction_type').annotate(total=Sum('amount')).order_by():
+            totals[row['wallet_object_id']][row['transaction_type']] = row['total']
+        return totals
+
+    @classmethod
+    def monthly_totals(cls, wallet_model, wallet_ids, transaction_types, months=12):
+        """
+        Amount of each transaction type per month over the last ``months`` months.
+
+        Returns:
+            list: (month_start, {transaction_type: amount}) pairs, oldest first
+        """
+        current = timezone.localdate().replace(day=1)
+        month_starts = [current - relativedelta(months=months - 1 - i) for i in range(months)]
+        totals = defaultdict(dict)
+        rows = cls._rollups(wallet_model, wallet_ids, 'MONTH', transaction_types).filter(
+            period_start__gte=month_starts[0]
+        ).values('period_start', 'transaction_type').annotate(total=Sum('amount')).order_by()
+        for row in rows:
+            totals[row['period_start']][row['transaction_type']] = row['total']
+        return [(month_start, totals[month_start]) for month_start in month_starts]
@@ -0,0 +1,91 @@
+import random
+from decimal import Decimal
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from ..models import WalletBalanceShard
+
+
+class ShardedBalanceService:
+    """
+    Service class for the sub-balances of hot wallets.
+
+    Crediting a hot wallet updates one of ``WALLET_BALANCE_SHARDS`` counter
+    rows picked at random instead of the wallet row, so concurrent payments
+    lock different rows. Reads add the shards to the wallet balance
+    (``available_balance``), ``compact`` periodically moves the shards into
+    the wallet and a debit the wallet row cannot cover compacts them first
+    (see AbstractWallet.adjust_balance).
+    """
+
+    @staticmethod
+    def shard_count():
+        return max(getattr(settings, 'WALLET_BALANCE_SHARDS', 8), 1)
+
+    @staticmethod
+    def _shards(wallet):
+        return type(wallet).shards(wallet.pk)
+
+    @classmethod
+    def credit(cls, wallet, amount):
+        """
+        Credit a hot wallet on one random shard.
+
+        The first credit of a shard inserts its row, ignoring the conflict
+        when another payment created it at the same time.
+        """
+        shard = random.randrange(cls.shard_count())
+        rows = cls._shards(wallet).filter(shard=shard)
+        changes = {'balance': F('balance') + amount, 'updated_at': timezone.now()}
+        if not rows.update(**changes):
+            WalletBalanceShard.objects.bulk_create(
+                [WalletBalanceShard(wallet=wallet, shard=shard)], ignore_conflicts=True
+            )
+            rows.update(**changes)
+        return True
+
+    @classmethod
+    def pending(cls, wallet):
+        """Amount credited to the shards and not yet moved into the wallet."""
+        return cls._shards(wallet).aggregate(total=Sum('balance'))['total'] or Decimal('0')
+
+    @staticmethod
+    def balance(wallet):
+        """Balance of a loaded wallet including its shards."""
+        return wallet.available_balance
+
+    @staticmethod
+    def compact(wallet):
+        """
+        Move the shards of a wallet into its balance (see AbstractWallet.compact_shards).
+
+        Returns:
+            Decimal: Amount moved into the wallet
+        """
+        total = type(wallet).compact_shards(wallet.pk)
+        if total:
+            wallet.refresh_from_db(fields=['balance', 'updated_at'])
+        return total
+
+    @classmethod
+    def compact_all(cls, dry_run=False):
+        """
+        Compact every wallet with a pending shard balance.
+
+        Returns:
+            list: (wallet, amount) pairs
+        """
+        pending = WalletBalanceShard.objects.exclude(balance=0).values(
+            'wallet_content_type', 'wallet_object_id'
+        ).annotate(total=Sum('balance')).order_by()
+        results = []
+        for row in pending:
+            model = ContentType.objects.get_for_id(row['wallet_content_type']).model_class()
+            wallet = model.objects.filter(pk=row['wallet_object_id']).first()
+            if wallet is None:
+                continue
+            results.append((wallet, row['total'] if dry_run else cls.compact(wallet)))
+        return results
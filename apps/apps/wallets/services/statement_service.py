@@ -0,0 +1,162 @@
+import base64
+import binascii
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.translation import gettext_lazy as _
+
+
+class _Echo:
+    """Pseudo-buffer handing each CSV line back to the generator instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+class StatementService:
+    """
+    Service class for wallet transaction histories and statements.
+
+    Histories are paged with a keyset on (created_at, id), newest first: the
+    cursor holds the position of the last row of a page, so reading page
+    1000 costs the same as reading page 1 and concurrent inserts never shift
+    rows between pages. Statements are streamed oldest first, a chunk of
+    rows at a time.
+    """
+
+    DEFAULT_PAGE_SIZE = 20
+    MAX_PAGE_SIZE = 100
+    EXPORT_FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson'}
+    EXPORT_FIELDS = ('reference', 'created_at', 'transaction_type', 'direction', 'status', 'amount', 'description')
+
+    @staticmethod
+    def _parse_date(value, label):
+        if not value or hasattr(value, 'year'):
+            return value
+        try:
+            parsed = parse_date(value)
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError(_('Invalid %(field)s, expected YYYY-MM-DD.') % {'field': label})
+        return parsed
+
+    @classmethod
+    def filter_transactions(cls, transactions, transaction_type=None, status=None, start_date=None, end_date=None):
+        """
+        Restrict transactions by type, status and local date range (inclusive).
+
+        Dates may be ``date`` objects or ``YYYY-MM-DD`` strings; the range is
+        applied on ``created_at`` itself so the wallet indexes stay usable.
+        """
+        if transaction_type:
+            transactions = transactions.filter(transaction_type=transaction_type)
+        if status:
+            transactions = transactions.filter(status=status)
+        start_date = cls._parse_date(start_date, 'start_date')
+        end_date = cls._parse_date(end_date, 'end_date')
+        if start_date:
+            transactions = transactions.filter(
+                created_at__gte=timezone.make_aware(datetime.combine(start_date, time.min))
+            )
+        if end_date:
+            transactions = transactions.filter(
+                created_at__lt=timezone.make_aware(datetime.combine(end_date + timedelta(days=1), time.min))
+            )
+        return transactions
+
+    @staticmethod
+    def encode_cursor(transaction):
+        position = f"{transaction.created_at.isoformat()}|{transaction.pk}"
+        return base64.urlsafe_b64encode(position.encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """
+        Position encoded by ``encode_cursor``.
+
+        Returns:
+            tuple: (created_at, id)
+        """
+        try:
+            created_at, pk = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit('|', 1)
+            created_at = parse_datetime(created_at)
+            pk = int(pk)
+        except (binascii.Error, UnicodeError, ValueError):
+            created_at = None
+        if created_at is None:
+            raise ValidationError(_('Invalid cursor.'))
+        return created_at, pk
+
+    @classmethod
+    def page(cls, transactions, cursor=None, page_size=None):
+        """
+        One page of transactions, newest first.
+
+        Args:
+            cursor: ``next_cursor`` of the previous page, None for the first one
+            page_size: Rows per page, capped at MAX_PAGE_SIZE
+
+        Returns:
+            tuple: (transactions, next_cursor), next_cursor is None on the last page
+        """
+        try:
+            page_size = min(max(int(page_size or cls.DEFAULT_PAGE_SIZE), 1), cls.MAX_PAGE_SIZE)
+        except (TypeError, ValueError):
+            page_size = cls.DEFAULT_PAGE_SIZE
+        transactions = transactions.order_by('-created_at', '-pk')
+        if cursor:
+            created_at, pk = cls.decode_cursor(cursor)
+            transactions = transactions.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, pk__lt=pk))
+
+        rows = list(transactions[:page_size + 1])
+        next_cursor = cls.encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size], next_cursor
+
+    @classmethod
+    def export_fields(cls, model):
+        """EXPORT_FIELDS present on a transaction model, BusinessTransaction has no direction."""
+        fields = []
+        for name in cls.EXPORT_FIELDS:
+            try:
+                model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            fields.append(name)
+        return tuple(fields)
+
+    @classmethod
+    def export(cls, transactions, export_format='csv', chunk_size=2000):
+        """
+        Lines of a statement, oldest first, for a streaming response.
+
+        Rows are read as tuples ``chunk_size`` at a time, so the statement
+        is never held in memory whatever its length.
+
+        Raises:
+            ValidationError: Unknown format, raised before anything is streamed
+        """
+        if export_format not in cls.EXPORT_FORMATS:
+            raise ValidationError(_('Unsupported export format.'))
+        fields = cls.export_fields(transactions.model)
+        rows = transactions.order_by('created_at', 'pk').values_list(*fields)
+        return cls._lines(rows.iterator(chunk_size=chunk_size), fields, export_format)
+
+    @staticmethod
+    def _lines(rows, fields, export_format):
+        if export_format == 'csv':
+            writer = csv.writer(_Echo())
+            yield writer.writerow(fields)
+        for row in rows:
+            values = dict(zip(fields, row))
+            values['created_at'] = timezone.localtime(values['created_at']).isoformat()
+            if export_format == 'csv':
+                yield writer.writerow(values.values())
+            else:
+                yield json.dumps(values, cls=DjangoJSONEncoder) + '\n'
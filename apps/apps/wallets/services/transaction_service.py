@@ -1,8 +1,11 @@
-import uuid
 from decimal import Decimal
 from django.db import transaction as db_transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 from django.contrib.auth import get_user_model
+from apps.core.utils import ContentTypeRegistry
+from ..models.transaction import AbstractTransaction
 from ..models import UserTransaction, BusinessTransaction, UserWallet, BusinessWallet
 from .wallet_service import WalletService
 
@@ -15,7 +18,7 @@ class TransactionService:
     @staticmethod
     def generate_reference():
         """Génère une référence unique pour une transaction."""
-        return f"TXN-{uuid.uuid4().hex[:12].upper()}"
+        return AbstractTransaction.generate_reference()
 
     @staticmethod
     def create_user_transaction(wallet, transaction_type, amount, description='', status='PENDING'):
@@ -180,6 +183,43 @@ class TransactionService:
             transactions = transactions[:limit]
         return transactions
 
+    @staticmethod
+    def get_object_payments(model, object_ids, transaction_type):
+        """
+        Paiements complétés d'un type liés à des réservations ou commandes.
+
+        Seul le côté client est retenu : les jambes créditées au business par
+        le journal (voir LedgerService.post_payment) sont exclues.
+
+        Args:
+            model: Modèle des objets payés (classe ou instance)
+            object_ids: Identifiants ou sous-requête ``values('pk')``
+        """
+        return UserTransaction.objects.filter(
+            content_type_id=ContentTypeRegistry.id_for(model),
+            object_id__in=object_ids,
+            transaction_type=transaction_type,
+            status='COMPLETED'
+        ).exclude(direction='CREDIT').order_by('-created_at')
+
+    @staticmethod
+    def get_object_payment_totals(model, object_ids):
+        """
+        Totaux des paiements wallet et espèces d'objets payés, en une requête.
+
+        Returns:
+            tuple: (total_wallet, total_cash)
+        """
+        totals = UserTransaction.objects.filter(
+            content_type_id=ContentTypeRegistry.id_for(model),
+            object_id__in=object_ids,
+            status='COMPLETED'
+        ).exclude(direction='CREDIT').aggregate(
+            wallet=Coalesce(Sum('amount', filter=Q(transaction_type='PAYMENT')), Decimal('0')),
+            cash=Coalesce(Sum('amount', filter=Q(transaction_type='CASH_PAYMENT')), Decimal('0'))
+        )
+        return totals['wallet'], totals['cash']
+
     @staticmethod
     def cancel_transaction(transaction):
         """Annule une transaction."""
@@ -206,17 +246,4 @@ class TransactionService:
     @staticmethod
     def get_transaction_statistics(wallet):
         """Récupère les statistiques des transactions d'un wallet."""
-        transactions = wallet.transactions.all()
-        
-        stats = {
-            'total_amount_deposited': sum(t.amount for t in transactions.filter(transaction_type='DEPOSIT', status='COMPLETED')),
-            'total_amount_withdrawn': sum(t.amount for t in transactions.filter(transaction_type='WITHDRAWAL', status='COMPLETED')),
-            'total_amount_transferred_out': sum(t.amount for t in transactions.filter(transaction_type='TRANSFER', status='COMPLETED')),
-            'total_amount_transferred_in': sum(t.amount for t in transactions.filter(transaction_type='TRANSFER', status='COMPLETED')),
-            'pending_transactions_count': transactions.filter(status='PENDING').count(),
-            'completed_transactions_count': transactions.filter(status='COMPLETED').count(),
-            'failed_transactions_count': transactions.filter(status='FAILED').count(),
-            'cancelled_transactions_count': transactions.filter(status='CANCELLED').count(),
-        }
-        
-        return stats 
\ No newline at end of file
+        return WalletService.get_statistics(wallet)[1]
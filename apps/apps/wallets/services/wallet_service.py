@@ -1,15 +1,82 @@
+import time
+from collections import defaultdict
 from decimal import Decimal
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from apps.business.models import Business
-from ..models import UserWallet, BusinessWallet
+from apps.core.utils import ContentTypeRegistry
+from ..models import UserWallet, BusinessWallet, UserTransaction, BusinessTransaction
 
 User = get_user_model()
 
 
 class WalletService:
     """Service métier pour la gestion des wallets."""
+
+    PLATFORM_WALLET_VERSION_KEY = 'wallets:platform:version'
+    _platform_wallet = None
+    
+    @classmethod
+    def _platform_version(cls):
+        version = cache.get(cls.PLATFORM_WALLET_VERSION_KEY)
+        if version is None:
+            cache.add(cls.PLATFORM_WALLET_VERSION_KEY, time.time_ns(), None)
+            version = cache.get(cls.PLATFORM_WALLET_VERSION_KEY)
+        return version
+    
+    @classmethod
+    def get_platform_wallet(cls):
+        """
+        Wallet recevant les commissions de la plateforme.
+        
+        Le compte est celui de ``PLATFORM_WALLET_USERNAME`` s'il est configuré,
+        sinon le premier superutilisateur (puis le premier utilisateur). Il est
+        résolu une fois par processus et gardé tant que la version partagée
+        dans le cache ne change pas. Le solde de l'instance renvoyée n'est pas
+        rafraîchi : les mouvements passent par des UPDATE atomiques.
+        
+        Raises:
+            ValidationError: Si aucun compte ne peut recevoir les commissions
+        """
+        version = cls._platform_version()
+        cached = cls._platform_wallet
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        username = getattr(settings, 'PLATFORM_WALLET_USERNAME', '')
+        if username:
+            admin = User.objects.filter(username=username).first()
+        else:
+            admin = (
+                User.objects.filter(is_superuser=True).order_by('id').first()
+                or User.objects.order_by('id').first()
+            )
+        if admin is None:
+            raise ValidationError(_('Aucun compte plateforme pour recevoir la commission.'))
+        wallet, created = UserWallet.objects.get_or_create(user=admin)
+        if not created:
+            # Un wallet créé dans une transaction encore ouverte n'est pas gardé
+            cls._platform_wallet = (version, wallet)
+        return wallet
+    
+    @classmethod
+    def invalidate_platform_wallet(cls):
+        """Force la résolution du wallet plateforme, dans tous les processus après le commit (cache partagé, voir CACHES)."""
+        cls._platform_wallet = None
+        
+        def bump():
+            try:
+                cache.incr(cls.PLATFORM_WALLET_VERSION_KEY)
+            except ValueError:
+                cache.set(cls.PLATFORM_WALLET_VERSION_KEY, time.time_ns(), None)
+        
+        transaction.on_commit(bump)
     
     @staticmethod
     def get_or_create_user_wallet(user):
@@ -56,66 +123,148 @@ class WalletService:
     
     @staticmethod
     def update_wallet_balance(wallet, amount, operation='add'):
-        """Met à jour le solde d'un wallet."""
-        if not isinstance(wallet.balance, Decimal):
-            wallet.balance = Decimal(str(wallet.balance))
+        """Met à jour le solde d'un wallet par un UPDATE atomique conditionné au solde."""
         if not isinstance(amount, Decimal):
             amount = Decimal(str(amount))
         if operation == 'add':
-            wallet.balance += amount
+            delta = amount
         elif operation == 'subtract':
-            if wallet.balance >= amount:
-                wallet.balance -= amount
-            else:
-                raise ValueError(_('Insufficient funds'))
+            delta = -amount
         else:
             raise ValueError(_('Invalid operation'))
-        wallet.save()
+        if not type(wallet).adjust_balance(wallet.pk, delta):
+            raise ValueError(_('Insufficient funds'))
+        wallet.refresh_from_db(fields=['balance', 'updated_at'])
         return wallet
     
     @staticmethod
     def check_sufficient_funds(wallet, amount):
-        """Vérifie si le wallet a suffisamment de fonds."""
-        return wallet.balance >= amount
+        """Vérifie si le wallet a suffisamment de fonds, sous-soldes compris."""
+        return wallet.has_sufficient_funds(amount)
     
     @staticmethod
     def deactivate_wallet(wallet):
         """Désactive un wallet."""
         wallet.is_active = False
-        wallet.save()
+        wallet.save(update_fields=['is_active', 'updated_at'])
         return wallet
     
     @staticmethod
     def activate_wallet(wallet):
         """Active un wallet."""
         wallet.is_active = True
-        wallet.save()
+        wallet.save(update_fields=['is_active', 'updated_at'])
         return wallet
     
     @staticmethod
     def change_currency(wallet, new_currency):
         """Change la devise d'un wallet."""
         wallet.currency = new_currency
-        wallet.save()
+        wallet.save(update_fields=['currency', 'updated_at'])
         return wallet
     
-    @staticmethod
-    def get_wallet_statistics(wallet):
-        """Récupère les statistiques d'un wallet."""
-        transactions = wallet.transactions.all()
-        
-        stats = {
-            'total_transactions': transactions.count(),
-            'total_deposits': transactions.filter(transaction_type='DEPOSIT').count(),
-            'total_withdrawals': transactions.filter(transaction_type='WITHDRAWAL').count(),
-            'total_transfers': transactions.filter(transaction_type='TRANSFER').count(),
-            'total_payments': transactions.filter(transaction_type='PAYMENT').count(),
-            'completed_transactions': transactions.filter(status='COMPLETED').count(),
-            'pending_transactions': transactions.filter(status='PENDING').count(),
-            'failed_transactions': transactions.filter(status='FAILED').count(),
+    # Compteurs de get_wallet_statistics : (clé, filtre)
+    WALLET_COUNTERS = (
+        ('total_transactions', Q()),
+        ('total_deposits', Q(transaction_type='DEPOSIT')),
+        ('total_withdrawals', Q(transaction_type='WITHDRAWAL')),
+        ('total_transfers', Q(transaction_type='TRANSFER')),
+        ('total_payments', Q(transaction_type='PAYMENT')),
+        ('completed_transactions', Q(status='COMPLETED')),
+        ('pending_transactions', Q(status='PENDING')),
+        ('failed_transactions', Q(status='FAILED')),
+    )
+    # Montants complétés de get_transaction_statistics : (clé, type de transaction)
+    TRANSACTION_TOTALS = (
+        ('total_amount_deposited', 'DEPOSIT'),
+        ('total_amount_withdrawn', 'WITHDRAWAL'),
+        ('total_amount_transferred_out', 'TRANSFER'),
+        ('total_amount_transferred_in', 'TRANSFER'),
+    )
+    TRANSACTION_COUNTERS = ('PENDING', 'COMPLETED', 'FAILED', 'CANCELLED')
+
+    @classmethod
+    def _statistics_aggregates(cls):
+        """Agrégats conditionnels de toutes les statistiques, évalués en une requête."""
+        aggregates = {
+            f'{status.lower()}_count': Count('pk', filter=Q(status=status))
+            for status in cls.TRANSACTION_COUNTERS
         }
-        
-        return stats
+        aggregates.update({key: Count('pk', filter=condition) for key, condition in cls.WALLET_COUNTERS})
+        aggregates.update({
+            f'{transaction_type.lower()}_amount': Coalesce(
+                Sum('amount', filter=Q(transaction_type=transaction_type, status='COMPLETED')), Decimal('0')
+            )
+            for _key, transaction_type in cls.TRANSACTION_TOTALS
+        })
+        return aggregates
+
+    @classmethod
+    def _split_statistics(cls, row):
+        """Répartit une ligne d'agrégats en (statistiques wallet, statistiques transactions)."""
+        wallet_stats = {key: row.get(key, 0) for key, _condition in cls.WALLET_COUNTERS}
+        transaction_stats = {
+            key: row.get(f'{transaction_type.lower()}_amount', Decimal('0'))
+            for key, transaction_type in cls.TRANSACTION_TOTALS
+        }
+        transaction_stats.update({
+            f'{status.lower()}_transactions_count': row.get(f'{status.lower()}_count', 0)
+            for status in cls.TRANSACTION_COUNTERS
+        })
+        return wallet_stats, transaction_stats
+
+    @classmethod
+    def get_statistics(cls, wallet):
+        """
+        Statistiques d'un wallet et de ses transactions en une seule requête.
+
+        Returns:
+            tuple: (get_wallet_statistics, get_transaction_statistics)
+        """
+        return cls._split_statistics(wallet.transactions.aggregate(**cls._statistics_aggregates()))
+
+    @classmethod
+    def get_statistics_for_wallets(cls, wallets):
+        """
+        Statistiques de plusieurs wallets, éventuellement de types différents, en une requête groupée.
+
+        Comme ``get_statistics``, les wallets entreprise sont lus dans leurs
+        BusinessTransaction, au prix d'une seconde requête groupée.
+
+        Returns:
+            dict: {wallet: (statistiques wallet, statistiques transactions)}
+        """
+        wallets = list(wallets)
+        by_type = defaultdict(dict)
+        business_wallets = {}
+        for wallet in wallets:
+            if isinstance(wallet, BusinessWallet):
+                business_wallets[wallet.pk] = wallet
+            else:
+                by_type[ContentTypeRegistry.id_for(wallet)][wallet.pk] = wallet
+
+        statistics = {wallet: cls._split_statistics({}) for wallet in wallets}
+        if by_type:
+            match = Q()
+            for content_type_id, wallets_by_pk in by_type.items():
+                match |= Q(wallet_content_type_id=content_type_id, wallet_object_id__in=list(wallets_by_pk))
+            rows = UserTransaction.objects.filter(match).values(
+                'wallet_content_type_id', 'wallet_object_id'
+            ).annotate(**cls._statistics_aggregates()).order_by()
+            for row in rows:
+                statistics[by_type[row['wallet_content_type_id']][row['wallet_object_id']]] = cls._split_statistics(row)
+        if business_wallets:
+            rows = BusinessTransaction.objects.filter(wallet_id__in=list(business_wallets)).values(
+                'wallet_id'
+            ).annotate(**cls._statistics_aggregates()).order_by()
+            for row in rows:
+                statistics[business_wallets[row['wallet_id']]] = cls._split_statistics(row)
+        return statistics
+
+    @classmethod
+    def get_wallet_statistics(cls, wallet):
+        """Récupère les statistiques d'un wallet."""
+        return cls.get_statistics(wallet)[0]
     
     @staticmethod
     def get_user_wallets_with_balance(min_balance=0):
@@ -1,9 +1,13 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 import logging
 
+from django.contrib.auth import get_user_model
+
 from .models import UserWallet, BusinessWallet, UserTransaction, BusinessTransaction
+from .services.rollup_service import WalletRollupService
+from .services.wallet_service import WalletService
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +38,7 @@ def user_wallet_post_delete(sender, instance, **kwargs):
     Actions après suppression d'un wallet utilisateur.
     """
     logger.warning(f"Wallet utilisateur supprimé: {instance.user} (Balance: {instance.balance} {instance.currency})")
+    WalletService.invalidate_platform_wallet()
     # Actions de nettoyage ou de log après suppression
 
 
@@ -65,6 +70,21 @@ def business_wallet_post_delete(sender, instance, **kwargs):
 # SIGNALS POUR LES TRANSACTIONS
 # =============================================================================
 
+@receiver(post_init, sender=UserTransaction)
+def user_transaction_post_init(sender, instance, **kwargs):
+    """Mémorise le statut chargé pour détecter les transitions à l'enregistrement."""
+    # Lecture via __dict__ pour ne pas charger un statut différé
+    instance._loaded_status = instance.__dict__.get('status')
+
+
+@receiver(post_save, sender=UserTransaction)
+def user_transaction_rollup_post_save(sender, instance, created, **kwargs):
+    """Met à jour les cumuls du wallet quand la transaction entre ou sort du statut COMPLETED."""
+    previous_status = None if created else instance._loaded_status
+    instance._loaded_status = instance.status
+    WalletRollupService.record_transition(instance, previous_status)
+
+
 @receiver(post_save, sender=UserTransaction)
 def user_transaction_post_save(sender, instance, created, **kwargs):
     """
@@ -72,7 +92,8 @@ def user_transaction_post_save(sender, instance, created, **kwargs):
     Actions après création ou mise à jour d'une transaction utilisateur.
     """
     if created:
-        logger.info(f"Nouvelle transaction utilisateur créée: {instance.reference} - {instance.amount} {instance.wallet.currency}")
+        # Les mouvements sans wallet (espèces, régularisations) n'ont pas de devise
+        logger.info(f"Nouvelle transaction utilisateur créée: {instance.reference} - {instance.amount} {getattr(instance.wallet, 'currency', '')}")
         # Actions spécifiques à la création d'une transaction
         # Par exemple: mise à jour automatique du solde, notifications, etc.
     else:
@@ -92,7 +113,9 @@ def user_transaction_post_delete(sender, instance, **kwargs):
     Signal post_delete pour UserTransaction.
     Actions après suppression d'une transaction utilisateur.
     """
-    logger.warning(f"Transaction utilisateur supprimée: {instance.reference} - {instance.amount} {instance.wallet.currency}")
+    logger.warning(f"Transaction utilisateur supprimée: {instance.reference} - {instance.amount} {getattr(instance.wallet, 'currency', '')}")
+    if instance.status == 'COMPLETED':
+        WalletRollupService.record([instance], -1)
     # Actions de nettoyage ou de log après suppression
     # Attention: la suppression de transactions peut avoir des implications sur l'audit
 
@@ -128,6 +151,29 @@ def business_transaction_post_delete(sender, instance, **kwargs):
     # Attention: la suppression de transactions peut avoir des implications sur l'audit
 
 
+# =============================================================================
+# SIGNALS POUR LE WALLET DE LA PLATEFORME
+# =============================================================================
+
+def _is_platform_candidate(user):
+    """Un superutilisateur ou le compte actuellement en cache peut changer la résolution."""
+    cached = WalletService._platform_wallet
+    return user.is_superuser or (cached is not None and cached[1].user_id == user.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+def platform_user_post_save(sender, instance, **kwargs):
+    """Le wallet plateforme est résolu à nouveau quand un superutilisateur change."""
+    if _is_platform_candidate(instance):
+        WalletService.invalidate_platform_wallet()
+
+
+@receiver(post_delete, sender=get_user_model())
+def platform_user_post_delete(sender, instance, **kwargs):
+    if _is_platform_candidate(instance):
+        WalletService.invalidate_platform_wallet()
+
+
 # =============================================================================
 # FONCTIONS UTILITAIRES POUR LES SIGNALS
 # =============================================================================
@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.test import TestCase
+
+from apps.business.models import Business, BusinessLocation
+from apps.core.utils import ContentTypeRegistry
+from apps.wallets.models import UserWallet
+from apps.wallets.services import LedgerService, TransactionService
+
+User = get_user_model()
+
+
+class ContentTypeRegistryTest(TestCase):
+    """Test cases for the process-wide content type ids."""
+
+    def setUp(self):
+        ContentTypeRegistry.clear()
+        ContentType.objects.clear_cache()
+        self.user = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.user, email='b@example.com',
+            phone='600000000', description='Test', commission_rate=Decimal('10.00')
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.user, name='Test Hotel',
+            city='Douala', region='Littoral', business_location_type='hotel'
+        )
+
+    def test_registered_models_are_resolved_in_one_query(self):
+        with self.assertNumQueries(1):
+            wallet_id = ContentTypeRegistry.id_for(UserWallet)
+            ContentTypeRegistry.id_for(self.location.wallet)
+        with self.assertNumQueries(0):
+            self.assertEqual(ContentTypeRegistry.id_for(UserWallet(user=self.user)), wallet_id)
+        self.assertEqual(wallet_id, ContentType.objects.get_for_model(UserWallet).pk)
+
+    def test_payment_totals_of_several_objects(self):
+        wallet = UserWallet.objects.create(user=self.user, balance=Decimal('1000.00'))
+        LedgerService.post_payment(wallet, self.location, Decimal('300'), self.location)
+        LedgerService.post_payment(
+            None, self.location, Decimal('200'), self.location, transaction_type='CASH_PAYMENT'
+        )
+
+        ids = BusinessLocation.objects.filter(pk=self.location.pk).values('pk')
+        with self.assertNumQueries(1):
+            totals = TransactionService.get_object_payment_totals(BusinessLocation, ids)
+        # The credit legs of the business do not count twice
+        self.assertEqual(totals, (Decimal('300.00'), Decimal('200.00')))
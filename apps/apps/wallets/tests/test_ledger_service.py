@@ -0,0 +1,92 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.business.models import Business, BusinessLocation
+from apps.wallets.models import JournalEntry, UserTransaction, UserWallet
+from apps.wallets.models.wallet import BusinessLocationWallet
+from apps.wallets.services import LedgerService, ShardedBalanceService
+
+User = get_user_model()
+
+
+class LedgerServiceTest(TestCase):
+    """Test cases for double-entry postings."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='pass', email='admin@example.com')
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        business = Business.objects.create(
+            name='Test Business', owner=self.customer, email='b@example.com',
+            phone='600000000', description='Test', commission_rate=Decimal('10.00')
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.customer, name='Test Hotel',
+            city='Douala', region='Littoral', business_location_type='hotel'
+        )
+        self.location_wallet = BusinessLocationWallet.objects.get(business_location=self.location)
+        self.customer_wallet = UserWallet.objects.create(user=self.customer, balance=Decimal('10000.00'))
+        self.admin_wallet = UserWallet.objects.create(user=self.admin)
+
+    def test_post_payment_splits_commission_in_one_balanced_entry(self):
+        LedgerService.platform_wallet()
+        with CaptureQueriesContext(connection) as queries:
+            entry = LedgerService.post_payment(
+                self.customer_wallet, self.location, Decimal('2500'), self.location, description='Paiement'
+            )
+        # Includes the read of the shared platform wallet version
+        self.assertLessEqual(len(queries), 13)
+
+        self.assertEqual(entry.commission_amount, Decimal('250.00'))
+        self.assertEqual(entry.net_amount, Decimal('2250.00'))
+        legs = {(leg.wallet_object_id, leg.direction): leg.amount for leg in entry.legs.all()}
+        self.assertEqual(legs, {
+            (self.customer_wallet.pk, 'DEBIT'): Decimal('2500.00'),
+            (self.location_wallet.pk, 'CREDIT'): Decimal('2250.00'),
+            (self.admin_wallet.pk, 'CREDIT'): Decimal('250.00'),
+        })
+
+        self.customer_wallet.refresh_from_db()
+        self.location_wallet.refresh_from_db()
+        self.admin_wallet.refresh_from_db()
+        self.assertEqual(self.customer_wallet.balance, Decimal('7500.00'))
+        self.assertEqual(self.location_wallet.balance, Decimal('2250.00'))
+        # The commission lands on a sub-balance of the platform wallet
+        self.assertEqual(self.admin_wallet.balance, Decimal('0.00'))
+        self.assertEqual(ShardedBalanceService.balance(self.admin_wallet), Decimal('250.00'))
+
+    def test_unbalanced_entry_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            LedgerService.post([
+                LedgerService.debit(self.customer_wallet, 100, 'PAYMENT'),
+                LedgerService.credit(self.location_wallet, 90, 'PAYMENT'),
+            ])
+        self.assertFalse(JournalEntry.objects.exists())
+
+    def test_insufficient_funds_rolls_back_the_whole_entry(self):
+        with self.assertRaises(ValidationError):
+            LedgerService.post_payment(self.customer_wallet, self.location, Decimal('20000'), self.location)
+
+        self.assertFalse(JournalEntry.objects.exists())
+        self.assertFalse(UserTransaction.objects.exists())
+        self.location_wallet.refresh_from_db()
+        self.assertEqual(self.location_wallet.balance, Decimal('0.00'))
+
+    def test_payment_received_outside_the_platform(self):
+        entry = LedgerService.post_payment(
+            None, self.location, Decimal('1000'), self.location, payer_transaction_type='CASH_PAYMENT'
+        )
+
+        external = entry.legs.get(direction='DEBIT')
+        self.assertIsNone(external.wallet_object_id)
+        self.assertEqual(external.transaction_type, 'CASH_PAYMENT')
+        self.location_wallet.refresh_from_db()
+        self.assertEqual(self.location_wallet.balance, Decimal('900.00'))
+
+        # A leg without wallet can be deleted (admin, cascade) like any other
+        external.delete()
+        self.assertFalse(entry.legs.filter(direction='DEBIT').exists())
@@ -0,0 +1,43 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from apps.wallets.models import UserWallet
+from apps.wallets.services import WalletService
+
+User = get_user_model()
+
+
+class PlatformWalletTest(TestCase):
+    """Test cases for the cached platform wallet."""
+
+    def setUp(self):
+        self.first = User.objects.create_user(username='first', password='pass', email='f@example.com')
+        self.admin = User.objects.create_superuser(username='admin', password='pass', email='a@example.com')
+        self.wallet = UserWallet.objects.create(user=self.admin)
+
+    def test_resolved_once_per_process(self):
+        self.assertEqual(WalletService.get_platform_wallet(), self.wallet)
+        # Only the version shared through the cache is read
+        with self.assertNumQueries(1):
+            self.assertEqual(WalletService.get_platform_wallet(), self.wallet)
+
+    def test_superuser_change_invalidates(self):
+        WalletService.get_platform_wallet()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.admin.is_superuser = False
+            self.admin.save()
+
+        # Falls back to the first user, whose wallet is created
+        wallet = WalletService.get_platform_wallet()
+        self.assertEqual(wallet.user, self.first)
+
+    @override_settings(PLATFORM_WALLET_USERNAME='first')
+    def test_configured_account(self):
+        WalletService.invalidate_platform_wallet()
+        self.assertEqual(WalletService.get_platform_wallet().user, self.first)
+
+    def test_wallet_created_in_transaction_is_not_cached(self):
+        self.wallet.delete()
+        wallet = WalletService.get_platform_wallet()
+        self.assertEqual(wallet.user, self.admin)
+        self.assertIsNone(WalletService._platform_wallet)
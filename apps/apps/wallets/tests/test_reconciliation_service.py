@@ -0,0 +1,81 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase
+
+from apps.business.models import Business, BusinessLocation
+from apps.wallets.models import BusinessWallet, UserTransaction, UserWallet
+from apps.wallets.services import LedgerService, ReconciliationService, TransactionService
+
+User = get_user_model()
+
+
+class ReconciliationServiceTest(TestCase):
+    """Test cases for the reconciliation of wallet balances with the ledger."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='pass', email='admin@example.com')
+        self.customer = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        self.business = business = Business.objects.create(
+            name='Test Business', owner=self.customer, email='b@example.com',
+            phone='600000000', description='Test', commission_rate=Decimal('10.00')
+        )
+        self.location = BusinessLocation.objects.create(
+            business=business, owner=self.customer, name='Test Hotel',
+            city='Douala', region='Littoral', business_location_type='hotel'
+        )
+        self.customer_wallet = UserWallet.objects.create(user=self.customer)
+        UserWallet.objects.create(user=self.admin)
+        LedgerService.post([
+            LedgerService.debit(None, 5000, 'DEPOSIT'),
+            LedgerService.credit(self.customer_wallet, 5000, 'DEPOSIT'),
+        ])
+        # Commission credited on the sub-balances of the platform wallet
+        LedgerService.post_payment(self.customer_wallet, self.location, Decimal('2000'), self.location)
+
+    def test_consistent_ledger_has_no_drift(self):
+        progress = []
+        drifts = ReconciliationService.reconcile(
+            chunk_size=1, progress=lambda model, checked, total: progress.append((model.__name__, checked, total))
+        )
+        self.assertEqual(drifts, [])
+        self.assertIn(('UserWallet', 2, 2), progress)
+        self.assertIn(('BusinessLocationWallet', 1, 1), progress)
+
+    def test_rows_without_direction_are_read_by_type(self):
+        UserTransaction.objects.create(
+            wallet=self.customer_wallet, transaction_type='WITHDRAWAL', amount=Decimal('300'), status='COMPLETED'
+        )
+        UserWallet.objects.filter(pk=self.customer_wallet.pk).update(balance=F('balance') - 300)
+        self.assertEqual(ReconciliationService.reconcile(), [])
+
+    def test_drift_is_reported_and_journaled(self):
+        UserWallet.objects.filter(pk=self.customer_wallet.pk).update(balance=F('balance') + 50)
+
+        drifts = ReconciliationService.reconcile()
+        self.assertEqual([(drift.wallet.pk, drift.difference) for drift in drifts],
+                         [(self.customer_wallet.pk, Decimal('50.00'))])
+
+        out = StringIO()
+        call_command('reconcile_wallets', fix=True, stdout=out)
+        self.assertIn('1 écart(s) régularisé(s)', out.getvalue())
+
+        adjustment = UserTransaction.objects.get(transaction_type='ADJUSTMENT', wallet_object_id=self.customer_wallet.pk)
+        self.assertEqual((adjustment.direction, adjustment.amount), ('CREDIT', Decimal('50.00')))
+        self.customer_wallet.refresh_from_db()
+        self.assertEqual(self.customer_wallet.balance, Decimal('3050.00'))
+        self.assertEqual(ReconciliationService.reconcile(), [])
+
+    def test_business_wallet_transactions_are_part_of_its_ledger(self):
+        wallet, _ = BusinessWallet.objects.get_or_create(business=self.business)
+        TransactionService.process_deposit(wallet, Decimal('50.00'))
+        TransactionService.process_withdrawal(wallet, Decimal('20.00'))
+
+        self.assertEqual(ReconciliationService.reconcile(), [])
+        self.assertEqual(ReconciliationService.check(BusinessWallet, wallet.pk).ledger, Decimal('30.00'))
+
+        call_command('reconcile_wallets', fix=True, stdout=StringIO())
+        self.assertFalse(UserTransaction.objects.filter(transaction_type='ADJUSTMENT').exists())
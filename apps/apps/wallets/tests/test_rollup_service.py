@@ -0,0 +1,115 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.business.models import Business, BusinessLocation
+from apps.wallets.models import UserTransaction, UserWallet, WalletRollup
+from apps.wallets.models.wallet import BusinessLocationWallet
+from apps.wallets.services import FinancialReportService, LedgerService
+
+User = get_user_model()
+
+
+class WalletRollupServiceTest(TestCase):
+    """Test cases for the incremental wallet rollups."""
+
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner', password='pass', email='o@example.com')
+        self.business = Business.objects.create(
+            name='Test Business', owner=self.owner, email='b@example.com',
+            phone='600000000', description='Test', commission_rate=Decimal('10.00')
+        )
+        self.location = BusinessLocation.objects.create(
+            business=self.business, owner=self.owner, name='Test Hotel',
+            city='Douala', region='Littoral', business_location_type='hotel'
+        )
+        self.location_wallet = BusinessLocationWallet.objects.get(business_location=self.location)
+        self.customer_wallet = UserWallet.objects.create(user=self.owner, balance=Decimal('10000.00'))
+
+    def _pay(self, amount, transaction_type='PAYMENT'):
+        with self.captureOnCommitCallbacks(execute=True):
+            LedgerService.post_payment(
+                None if transaction_type == 'CASH_PAYMENT' else self.customer_wallet,
+                self.location, Decimal(amount), self.location, transaction_type=transaction_type
+            )
+
+    def _rollups(self):
+        return {
+            (row.wallet_object_id, row.period, row.transaction_type, row.direction): (row.amount, row.count)
+            for row in WalletRollup.objects.filter(period_start__gte=timezone.localdate().replace(day=1))
+        }
+
+    def test_ledger_postings_are_rolled_up(self):
+        self._pay('1000')
+        self._pay('500', 'CASH_PAYMENT')
+
+        rollups = self._rollups()
+        for period in ('DAY', 'MONTH'):
+            self.assertEqual(rollups[(self.location_wallet.pk, period, 'PAYMENT', 'CREDIT')], (Decimal('900.00'), 1))
+            self.assertEqual(rollups[(self.location_wallet.pk, period, 'CASH_PAYMENT', 'CREDIT')], (Decimal('450.00'), 1))
+            self.assertEqual(rollups[(self.customer_wallet.pk, period, 'PAYMENT', 'DEBIT')], (Decimal('1000.00'), 1))
+
+    def test_status_transitions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            txn = UserTransaction.objects.create(
+                wallet=self.location_wallet, transaction_type='WITHDRAWAL', amount=Decimal('200'), status='PENDING'
+            )
+        self.assertFalse(WalletRollup.objects.exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            txn.mark_as_completed()
+        key = (self.location_wallet.pk, 'MONTH', 'WITHDRAWAL', '')
+        self.assertEqual(self._rollups()[key], (Decimal('200.00'), 1))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            UserTransaction.objects.get(pk=txn.pk).mark_as_cancelled()
+        self.assertEqual(self._rollups()[key], (Decimal('0.00'), 0))
+
+    def test_rebuild_matches_incremental_rollups(self):
+        self._pay('1000')
+        self._pay('300', 'CASH_PAYMENT')
+        incremental = self._rollups()
+
+        WalletRollup.objects.all().delete()
+        call_command('rebuild_wallet_rollups', chunk_size=1, stdout=StringIO())
+        self.assertEqual(self._rollups(), incremental)
+
+    def test_monthly_totals_in_one_query(self):
+        self._pay('1000')
+        self._pay('300', 'CASH_PAYMENT')
+
+        with self.assertNumQueries(1):
+            months = FinancialReportService.monthly_totals(
+                BusinessLocationWallet, [self.location_wallet.pk], ('PAYMENT', 'CASH_PAYMENT')
+            )
+        self.assertEqual(len(months), 12)
+        self.assertEqual(months[-1], (
+            timezone.localdate().replace(day=1),
+            {'PAYMENT': Decimal('900.00'), 'CASH_PAYMENT': Decimal('270.00')}
+        ))
+
+    def test_financial_dashboard_query_count_does_not_grow_with_locations(self):
+        self._pay('1000')
+
+        def dashboard_queries():
+            self.client.force_login(self.owner)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(reverse('business:financial_dashboard'))
+            self.assertEqual(response.status_code, 200)
+            return len(queries)
+
+        before = dashboard_queries()
+        for index in range(3):
+            BusinessLocation.objects.create(
+                business=self.business, owner=self.owner, name=f'Hotel {index}', registration_number=f'REG-{index}',
+                city='Douala', region='Littoral', business_location_type='hotel'
+            )
+        # Only the withdrawal history still reads per location
+        self.assertLessEqual(dashboard_queries(), before + 3)
@@ -0,0 +1,74 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from apps.wallets.models import UserWallet, WalletBalanceShard
+from apps.wallets.services import LedgerService, ShardedBalanceService, TransactionService, WalletService
+
+User = get_user_model()
+
+
+@override_settings(WALLET_BALANCE_SHARDS=4)
+class ShardedBalanceServiceTest(TestCase):
+    """Test cases for the sub-balances of hot wallets."""
+
+    def setUp(self):
+        admin = User.objects.create_superuser(username='admin', password='pass', email='admin@example.com')
+        self.wallet = UserWallet.objects.create(user=admin, balance=Decimal('100.00'))
+
+    def test_credits_are_spread_and_summed_on_read(self):
+        for _step in range(40):
+            ShardedBalanceService.credit(self.wallet, Decimal('5.00'))
+
+        shards = WalletBalanceShard.objects.filter(wallet_object_id=self.wallet.pk)
+        self.assertLessEqual(shards.count(), 4)
+        self.assertGreater(shards.count(), 1)
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('100.00'))
+        self.assertEqual(ShardedBalanceService.balance(self.wallet), Decimal('300.00'))
+
+    def test_compact_moves_the_shards_into_the_wallet(self):
+        for _step in range(10):
+            ShardedBalanceService.credit(self.wallet, Decimal('2.50'))
+
+        moved = ShardedBalanceService.compact(self.wallet)
+
+        self.assertEqual(moved, Decimal('25.00'))
+        self.assertEqual(self.wallet.balance, Decimal('125.00'))
+        self.assertEqual(ShardedBalanceService.pending(self.wallet), 0)
+        self.assertEqual(ShardedBalanceService.compact(self.wallet), 0)
+
+    def test_debit_beyond_the_wallet_row_compacts_first(self):
+        ShardedBalanceService.credit(self.wallet, Decimal('50.00'))
+
+        LedgerService.post([
+            LedgerService.debit(self.wallet, Decimal('120.00'), 'WITHDRAWAL'),
+            LedgerService.credit(None, Decimal('120.00'), 'WITHDRAWAL'),
+        ])
+
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('30.00'))
+        self.assertEqual(ShardedBalanceService.pending(self.wallet), 0)
+
+    def test_direct_debits_compact_first(self):
+        ShardedBalanceService.credit(self.wallet, Decimal('50.00'))
+        self.assertEqual(self.wallet.available_balance, Decimal('150.00'))
+        self.assertTrue(WalletService.check_sufficient_funds(self.wallet, Decimal('150.00')))
+
+        self.assertTrue(self.wallet.withdraw(Decimal('110.00')))
+        self.assertEqual(self.wallet.balance, Decimal('40.00'))
+        self.assertEqual(ShardedBalanceService.pending(self.wallet), 0)
+
+        ShardedBalanceService.credit(self.wallet, Decimal('20.00'))
+        TransactionService.process_withdrawal(self.wallet, Decimal('60.00'))
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.available_balance, Decimal('0.00'))
+        self.assertFalse(self.wallet.withdraw(Decimal('1.00')))
+
+    def test_api_balance_includes_the_shards(self):
+        ShardedBalanceService.credit(self.wallet, Decimal('25.00'))
+        self.client.force_login(self.wallet.user)
+        response = self.client.get(reverse('wallets:user-wallet-detail', args=[self.wallet.pk]))
+        self.assertEqual(response.json()['balance'], '125.00')
@@ -0,0 +1,123 @@
+import json
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.business.models import Business
+from apps.wallets.models import BusinessWallet, UserTransaction, UserWallet
+from apps.wallets.services import StatementService, TransactionService
+
+User = get_user_model()
+
+
+class StatementServiceTest(TestCase):
+    """Test cases for keyset paging and streamed statements."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        self.wallet = UserWallet.objects.create(user=self.user)
+        base = timezone.now() - timedelta(days=30)
+        for index in range(25):
+            txn = UserTransaction.objects.create(
+                wallet=self.wallet,
+                transaction_type='DEPOSIT' if index % 2 else 'PAYMENT',
+                amount=Decimal(index + 1),
+                status='COMPLETED' if index % 5 else 'PENDING'
+            )
+            # Pairs of rows share a timestamp so the id breaks the tie
+            UserTransaction.objects.filter(pk=txn.pk).update(created_at=base + timedelta(days=index // 2))
+
+    def test_pages_cover_every_transaction_once(self):
+        transactions = self.wallet.transactions.all()
+        seen, cursor = [], None
+        while True:
+            page, cursor = StatementService.page(transactions, cursor=cursor, page_size=7)
+            seen.extend(page)
+            if cursor is None:
+                break
+
+        expected = list(transactions.order_by('-created_at', '-pk'))
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), 25)
+
+    def test_filters(self):
+        start = timezone.localdate() - timedelta(days=20)
+        transactions = StatementService.filter_transactions(
+            self.wallet.transactions.all(), transaction_type='DEPOSIT', status='COMPLETED',
+            start_date=start.isoformat()
+        )
+        for txn in transactions:
+            self.assertEqual((txn.transaction_type, txn.status), ('DEPOSIT', 'COMPLETED'))
+            self.assertGreaterEqual(timezone.localdate(txn.created_at), start)
+        self.assertTrue(transactions.exists())
+
+        with self.assertRaises(ValidationError):
+            StatementService.filter_transactions(self.wallet.transactions.all(), end_date='2024-13-45')
+        with self.assertRaises(ValidationError):
+            StatementService.page(self.wallet.transactions.all(), cursor='not-a-cursor')
+
+    def test_transactions_api_follows_the_next_link(self):
+        self.client.force_login(self.user)
+        url = reverse('wallets:user-wallet-transactions', args=[self.wallet.pk]) + '?page_size=10&type=DEPOSIT'
+        references = []
+        while url:
+            data = self.client.get(url).json()
+            references.extend(row['reference'] for row in data['results'])
+            url = data['next']
+        self.assertEqual(len(references), 12)
+        self.assertEqual(len(set(references)), 12)
+
+        response = self.client.get(reverse('wallets:user-wallet-transactions', args=[self.wallet.pk]) + '?cursor=x')
+        self.assertEqual(response.status_code, 400)
+
+    def test_statement_is_streamed(self):
+        self.client.force_login(self.user)
+        url = reverse('wallets:user-wallet-statement', args=[self.wallet.pk])
+
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], ','.join(StatementService.EXPORT_FIELDS))
+        self.assertEqual(len(lines), 26)
+
+        response = self.client.get(url, {'export_format': 'jsonl', 'status': 'PENDING'})
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['amount'], '1.00')
+        self.assertEqual([row['created_at'] for row in rows], sorted(row['created_at'] for row in rows))
+
+        self.assertEqual(self.client.get(url, {'export_format': 'xml'}).status_code, 400)
+
+    def test_business_wallet_transactions_and_statement(self):
+        business = Business.objects.create(
+            name='Test Business', owner=self.user, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        wallet, _ = BusinessWallet.objects.get_or_create(business=business)
+        for amount in ('10.00', '20.00', '30.00'):
+            TransactionService.process_deposit(wallet, Decimal(amount))
+        self.client.force_login(self.user)
+
+        url = reverse('wallets:business-wallet-transactions', args=[wallet.pk]) + '?page_size=2'
+        data = self.client.get(url).json()
+        self.assertEqual([row['amount'] for row in data['results']], ['30.00', '20.00'])
+        self.assertEqual(len(self.client.get(data['next']).json()['results']), 1)
+
+        response = self.client.get(reverse('wallets:business-wallet-statement', args=[wallet.pk]))
+        self.assertEqual(response.status_code, 200)
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], 'reference,created_at,transaction_type,status,amount,description')
+        self.assertEqual(len(lines), 4)
+
+    def test_transaction_list_view(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('wallets:transaction_list'), {'status': 'PENDING'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['transactions']), 5)
+        self.assertIsNone(response.context['next_cursor'])
@@ -0,0 +1,112 @@
+import threading
+import time
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import OperationalError, connection
+from django.db.models import Q, Sum
+from django.test import TestCase, TransactionTestCase
+
+from apps.wallets.models import UserTransaction, UserWallet
+from apps.wallets.services import LedgerService, WalletService
+
+User = get_user_model()
+
+
+class WalletBalanceTest(TestCase):
+    """Test cases for atomic balance updates."""
+
+    def setUp(self):
+        user = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        self.wallet = UserWallet.objects.create(user=user, balance=Decimal('100.00'))
+
+    def test_stale_instances_do_not_lose_updates(self):
+        first = UserWallet.objects.get(pk=self.wallet.pk)
+        second = UserWallet.objects.get(pk=self.wallet.pk)
+
+        self.assertTrue(first.deposit(Decimal('30')))
+        self.assertTrue(second.deposit(Decimal('20')))
+
+        self.assertEqual(second.balance, Decimal('150.00'))
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('150.00'))
+
+    def test_withdraw_is_conditional_on_the_stored_balance(self):
+        stale = UserWallet.objects.get(pk=self.wallet.pk)
+        self.assertTrue(self.wallet.withdraw(Decimal('80')))
+
+        # The stale instance still believes 100 is available
+        self.assertFalse(stale.withdraw(Decimal('50')))
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('20.00'))
+
+    def test_update_wallet_balance(self):
+        WalletService.update_wallet_balance(self.wallet, 50, 'add')
+        self.assertEqual(self.wallet.balance, Decimal('150.00'))
+        with self.assertRaises(ValueError):
+            WalletService.update_wallet_balance(self.wallet, 500, 'subtract')
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('150.00'))
+
+
+class WalletConcurrencyTest(TransactionTestCase):
+    """Concurrent postings on one wallet must agree with the ledger."""
+
+    THREADS = 8
+    POSTINGS = 15
+
+    def setUp(self):
+        user = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        self.wallet = UserWallet.objects.create(user=user, balance=Decimal('0.00'))
+
+    @staticmethod
+    def _retry(operation):
+        while True:
+            try:
+                return operation()
+            except OperationalError:
+                # SQLite refuses concurrent writers instead of queuing them
+                time.sleep(0.001)
+
+    def _hammer(self, index, errors):
+        try:
+            wallet = self._retry(lambda: UserWallet.objects.get(pk=self.wallet.pk))
+            for step in range(self.POSTINGS):
+                amount = Decimal(index + 1)
+                if step % 3 == 2:
+                    legs = [LedgerService.debit(wallet, amount, 'WITHDRAWAL'),
+                            LedgerService.credit(None, amount, 'WITHDRAWAL')]
+                else:
+                    legs = [LedgerService.debit(None, amount, 'DEPOSIT'),
+                            LedgerService.credit(wallet, amount, 'DEPOSIT')]
+                try:
+                    self._retry(lambda: LedgerService.post(legs))
+                except ValidationError:
+                    # Debits refused for lack of funds are expected
+                    pass
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    def test_final_balance_matches_the_ledger(self):
+        errors = []
+        threads = [threading.Thread(target=self._hammer, args=(index, errors)) for index in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.wallet.refresh_from_db()
+        ledger = UserTransaction.objects.filter(
+            wallet_object_id=self.wallet.pk, wallet_content_type__model='userwallet'
+        ).aggregate(
+            credits=Sum('amount', filter=Q(direction='CREDIT')),
+            debits=Sum('amount', filter=Q(direction='DEBIT')),
+        )
+        self.assertEqual(errors, [])
+        deposits = sum(index + 1 for index in range(self.THREADS)) * (self.POSTINGS - self.POSTINGS // 3)
+        self.assertEqual(ledger['credits'], deposits)
+        self.assertGreaterEqual(self.wallet.balance, 0)
+        self.assertEqual(self.wallet.balance, ledger['credits'] - (ledger['debits'] or 0))
@@ -0,0 +1,106 @@
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.business.models import Business, BusinessLocation
+from apps.wallets.models import BusinessWallet, UserTransaction, UserWallet
+from apps.wallets.models.wallet import BusinessLocationWallet
+from apps.wallets.services import TransactionService, WalletService
+
+User = get_user_model()
+
+
+class WalletStatisticsTest(TestCase):
+    """Test cases for the conditional aggregation of wallet statistics."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='client', password='pass', email='c@example.com')
+        self.wallet = UserWallet.objects.create(user=self.user)
+        for transaction_type, amount, status in (
+            ('DEPOSIT', '500', 'COMPLETED'),
+            ('DEPOSIT', '200', 'PENDING'),
+            ('WITHDRAWAL', '100', 'COMPLETED'),
+            ('TRANSFER', '50', 'COMPLETED'),
+            ('PAYMENT', '75', 'FAILED'),
+            ('PAYMENT', '25', 'CANCELLED'),
+        ):
+            UserTransaction.objects.create(
+                wallet=self.wallet, transaction_type=transaction_type, amount=Decimal(amount), status=status
+            )
+
+    def test_statistics_in_one_query(self):
+        with self.assertNumQueries(1):
+            wallet_stats, transaction_stats = WalletService.get_statistics(self.wallet)
+
+        self.assertEqual(wallet_stats, {
+            'total_transactions': 6,
+            'total_deposits': 2,
+            'total_withdrawals': 1,
+            'total_transfers': 1,
+            'total_payments': 2,
+            'completed_transactions': 3,
+            'pending_transactions': 1,
+            'failed_transactions': 1,
+        })
+        self.assertEqual(transaction_stats, {
+            'total_amount_deposited': Decimal('500.00'),
+            'total_amount_withdrawn': Decimal('100.00'),
+            'total_amount_transferred_out': Decimal('50.00'),
+            'total_amount_transferred_in': Decimal('50.00'),
+            'pending_transactions_count': 1,
+            'completed_transactions_count': 3,
+            'failed_transactions_count': 1,
+            'cancelled_transactions_count': 1,
+        })
+        self.assertEqual(WalletService.get_wallet_statistics(self.wallet), wallet_stats)
+        self.assertEqual(TransactionService.get_transaction_statistics(self.wallet), transaction_stats)
+
+    def test_statistics_for_many_wallets_in_one_query(self):
+        other = User.objects.create_user(username='other', password='pass', email='o@example.com')
+        empty_wallet = UserWallet.objects.create(user=other)
+        business = Business.objects.create(
+            name='Test Business', owner=other, email='b@example.com',
+            phone='600000000', description='Test', commission_rate=Decimal('10.00')
+        )
+        location = BusinessLocation.objects.create(
+            business=business, owner=other, name='Test Hotel',
+            city='Douala', region='Littoral', business_location_type='hotel'
+        )
+        location_wallet = BusinessLocationWallet.objects.get(business_location=location)
+        UserTransaction.objects.create(
+            wallet=location_wallet, transaction_type='PAYMENT', amount=Decimal('300'), status='COMPLETED'
+        )
+
+        wallets = [self.wallet, empty_wallet, location_wallet]
+        WalletService.get_statistics_for_wallets(wallets)
+        with self.assertNumQueries(1):
+            statistics = WalletService.get_statistics_for_wallets(wallets)
+
+        self.assertEqual(statistics[self.wallet], WalletService.get_statistics(self.wallet))
+        self.assertEqual(statistics[empty_wallet][0]['total_transactions'], 0)
+        self.assertEqual(statistics[empty_wallet][1]['total_amount_deposited'], Decimal('0'))
+        self.assertEqual(statistics[location_wallet][0]['total_payments'], 1)
+
+    def test_business_wallet_statistics_read_business_transactions(self):
+        business = Business.objects.create(
+            name='Test Business', owner=self.user, email='b@example.com',
+            phone='600000000', description='Test'
+        )
+        business_wallet, _ = BusinessWallet.objects.get_or_create(business=business)
+        TransactionService.process_deposit(business_wallet, Decimal('80'))
+
+        with self.assertNumQueries(2):
+            statistics = WalletService.get_statistics_for_wallets([self.wallet, business_wallet])
+        self.assertEqual(statistics[business_wallet], WalletService.get_statistics(business_wallet))
+        self.assertEqual(statistics[business_wallet][0]['total_deposits'], 1)
+        self.assertEqual(statistics[business_wallet][1]['total_amount_deposited'], Decimal('80.00'))
+        self.assertEqual(statistics[self.wallet], WalletService.get_statistics(self.wallet))
+
+    def test_admin_changelist(self):
+        admin = User.objects.create_superuser(username='admin', password='pass', email='a@example.com')
+        self.client.force_login(admin)
+        response = self.client.get(reverse('admin:wallets_userwallet_changelist'))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'field-transactions_count')
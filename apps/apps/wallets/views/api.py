@@ -1,8 +1,12 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from ..models import UserWallet, BusinessWallet, UserTransaction, BusinessTransaction
@@ -15,11 +19,64 @@ from ..serializers import (
 )
 from ..services.wallet_service import WalletService
 from ..services.transaction_service import TransactionService
+from ..services.statement_service import StatementService
 
 User = get_user_model()
 
 
-class UserWalletViewSet(viewsets.ModelViewSet):
+class WalletTransactionsMixin:
+    """Historique paginé par curseur et relevé exporté en flux des transactions d'un wallet."""
+
+    transaction_serializer_class = UserTransactionSerializer
+
+    def _filtered_transactions(self, wallet):
+        params = self.request.query_params
+        return StatementService.filter_transactions(
+            wallet.transactions.all(),
+            transaction_type=params.get('type'),
+            status=params.get('status'),
+            start_date=params.get('start_date'),
+            end_date=params.get('end_date'),
+        )
+
+    @action(detail=True, methods=['get'])
+    def transactions(self, request, pk=None):
+        """Récupère les transactions du wallet, les plus récentes d'abord, par pages de ``page_size``."""
+        wallet = self.get_object()
+        try:
+            transactions, next_cursor = StatementService.page(
+                self._filtered_transactions(wallet),
+                cursor=request.query_params.get('cursor'),
+                page_size=request.query_params.get('page_size')
+            )
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Toutes les lignes appartiennent à ce wallet : pas de requête par ligne pour le retrouver
+        for transaction in transactions:
+            transaction.wallet = wallet
+        return Response({
+            'next': replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor) if next_cursor else None,
+            'results': self.transaction_serializer_class(transactions, many=True).data
+        })
+
+    @action(detail=True, methods=['get'])
+    def statement(self, request, pk=None):
+        """Exporte le relevé du wallet (``export_format`` csv ou jsonl), diffusé par lots."""
+        wallet = self.get_object()
+        export_format = request.query_params.get('export_format', 'csv')
+        try:
+            lines = StatementService.export(self._filtered_transactions(wallet), export_format)
+        except ValidationError as e:
+            return Response({'error': e.messages[0]}, status=status.HTTP_400_BAD_REQUEST)
+
+        response = StreamingHttpResponse(lines, content_type=StatementService.EXPORT_FORMATS[export_format])
+        filename = f"statement-{wallet.pk}-{timezone.localdate():%Y%m%d}.{export_format}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class UserWalletViewSet(WalletTransactionsMixin, viewsets.ModelViewSet):
     """ViewSet pour les wallets utilisateur."""
     
     serializer_class = UserWalletSerializer
@@ -119,48 +176,24 @@ class UserWalletViewSet(viewsets.ModelViewSet):
     def statistics(self, request, pk=None):
         """Récupère les statistiques du wallet."""
         wallet = self.get_object()
-        wallet_stats = WalletService.get_wallet_statistics(wallet)
-        transaction_stats = TransactionService.get_transaction_statistics(wallet)
+        wallet_stats, transaction_stats = WalletService.get_statistics(wallet)
         
         return Response({
             'wallet_statistics': WalletStatisticsSerializer(wallet_stats).data,
             'transaction_statistics': TransactionStatisticsSerializer(transaction_stats).data
         })
-    
-    @action(detail=True, methods=['get'])
-    def transactions(self, request, pk=None):
-        """Récupère les transactions du wallet."""
-        wallet = self.get_object()
-        transactions = wallet.transactions.all()
-        
-        # Filtres optionnels
-        transaction_type = request.query_params.get('type')
-        status_filter = request.query_params.get('status')
-        
-        if transaction_type:
-            transactions = transactions.filter(transaction_type=transaction_type)
-        if status_filter:
-            transactions = transactions.filter(status=status_filter)
-        
-        serializer = UserTransactionSerializer(transactions, many=True)
-        return Response(serializer.data)
 
 
-class BusinessWalletViewSet(viewsets.ModelViewSet):
+class BusinessWalletViewSet(WalletTransactionsMixin, viewsets.ModelViewSet):
     """ViewSet pour les wallets entreprise."""
     
     serializer_class = BusinessWalletSerializer
+    transaction_serializer_class = BusinessTransactionSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
         """Retourne uniquement les wallets des entreprises de l'utilisateur connecté."""
-        user = self.request.user
-        # Vérifier si l'utilisateur est propriétaire d'une entreprise
-        try:
-            business = user.business
-            return BusinessWallet.objects.filter(business=business)
-        except:
-            return BusinessWallet.objects.none()
+        return BusinessWallet.objects.filter(business__owner=self.request.user)
     
     def get_serializer_class(self):
         """Retourne le serializer approprié selon l'action."""
@@ -224,31 +257,12 @@ class BusinessWalletViewSet(viewsets.ModelViewSet):
     def statistics(self, request, pk=None):
         """Récupère les statistiques du wallet entreprise."""
         wallet = self.get_object()
-        wallet_stats = WalletService.get_wallet_statistics(wallet)
-        transaction_stats = TransactionService.get_transaction_statistics(wallet)
+        wallet_stats, transaction_stats = WalletService.get_statistics(wallet)
         
         return Response({
             'wallet_statistics': WalletStatisticsSerializer(wallet_stats).data,
             'transaction_statistics': TransactionStatisticsSerializer(transaction_stats).data
         })
-    
-    @action(detail=True, methods=['get'])
-    def transactions(self, request, pk=None):
-        """Récupère les transactions du wallet entreprise."""
-        wallet = self.get_object()
-        transactions = wallet.transactions.all()
-        
-        # Filtres optionnels
-        transaction_type = request.query_params.get('type')
-        status_filter = request.query_params.get('status')
-        
-        if transaction_type:
-            transactions = transactions.filter(transaction_type=transaction_type)
-        if status_filter:
-            transactions = transactions.filter(status=status_filter)
-        
-        serializer = BusinessTransactionSerializer(transactions, many=True)
-        return Response(serializer.data)
 
 
 class UserTransactionViewSet(viewsets.ReadOnlyModelViewSet):
@@ -7,12 +7,14 @@ from django.urls import reverse_lazy
 from django.utils.translation import gettext_lazy as _
 from django.http import Http404
 from django.contrib.auth import get_user_model
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.core.exceptions import ValidationError
+from urllib.parse import urlencode
 
 from ..models import UserWallet, BusinessWallet, UserTransaction, BusinessTransaction
 from ..forms import DepositForm, WithdrawalForm, TransferForm
 from ..services.wallet_service import WalletService
 from ..services.transaction_service import TransactionService
+from ..services.statement_service import StatementService
 
 User = get_user_model()
 
@@ -24,8 +26,7 @@ def wallet_detail_view(request):
     user = request.user
     wallet, created = WalletService.get_or_create_user_wallet(user)
     recent_transactions = TransactionService.get_wallet_transactions(wallet, limit=10)
-    wallet_stats = WalletService.get_wallet_statistics(wallet)
-    transaction_stats = TransactionService.get_transaction_statistics(wallet)
+    wallet_stats, transaction_stats = WalletService.get_statistics(wallet)
     context = {
         'wallet': wallet,
         'recent_transactions': recent_transactions,
@@ -38,20 +39,29 @@ def wallet_detail_view(request):
 def transaction_list_view(request):
     user = request.user
     wallet = WalletService.get_user_wallet(user)
-    if not wallet:
-        transactions = UserTransaction.objects.none()
-    else:
-        transactions = wallet.transactions.all()
-    paginator = Paginator(transactions, 20)
-    page = request.GET.get('page')
-    try:
-        transactions_page = paginator.page(page)
-    except PageNotAnInteger:
-        transactions_page = paginator.page(1)
-    except EmptyPage:
-        transactions_page = paginator.page(paginator.num_pages)
+    filters = {key: request.GET.get(key, '') for key in ('type', 'status', 'start_date', 'end_date')}
+    transactions, next_cursor = [], None
+    if wallet:
+        try:
+            transactions, next_cursor = StatementService.page(
+                StatementService.filter_transactions(
+                    wallet.transactions.all(),
+                    transaction_type=filters['type'],
+                    status=filters['status'],
+                    start_date=filters['start_date'],
+                    end_date=filters['end_date'],
+                ),
+                cursor=request.GET.get('cursor'),
+            )
+        except ValidationError as e:
+            messages.error(request, e.messages[0])
     context = {
-        'transactions': transactions_page,
+        'transactions': transactions,
+        'next_cursor': next_cursor,
+        'filters': filters,
+        'filter_query': urlencode({key: value for key, value in filters.items() if value}),
+        'transaction_types': UserTransaction.TRANSACTION_TYPES,
+        'status_choices': UserTransaction.STATUS_CHOICES,
         'wallet': wallet,
         'wallet_stats': WalletService.get_wallet_statistics(wallet) if wallet else None,
     }
@@ -170,8 +180,7 @@ def business_wallet_detail_view(request):
     except Exception:
         raise Http404("No business found for this user")
     recent_transactions = TransactionService.get_wallet_transactions(wallet, limit=10)
-    wallet_stats = WalletService.get_wallet_statistics(wallet)
-    transaction_stats = TransactionService.get_transaction_statistics(wallet)
+    wallet_stats, transaction_stats = WalletService.get_statistics(wallet)
     context = {
         'wallet': wallet,
         'recent_transactions': recent_transactions,
@@ -2,6 +2,8 @@
 ASGI config for tourisme project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Long-lived responses such as the kitchen display stream
+(``orders:kitchen_stream``) need to be served through this application.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/4.2/howto/deployment/asgi/
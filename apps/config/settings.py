@@ -195,10 +195,27 @@ CORS_ALLOWED_ORIGINS = [
 
 LOGIN_REDIRECT_URL = '/users/profile/'
 
+# Cache partagé par tous les processus : les clés de version des menus, des zones
+# de livraison et du wallet de la plateforme doivent être vues par chaque worker.
+# Par défaut une table de la base (python manage.py createcachetable) ; en production,
+# CACHE_BACKEND=django.core.cache.backends.redis.RedisCache et CACHE_LOCATION=redis://...
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.db.DatabaseCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'django_cache'),
+    }
+}
+
 # Email Configuration
 EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
 EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
 EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
 EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
-EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
\ No newline at end of file
+EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
+
+# Compte recevant les commissions (par défaut : le premier superutilisateur)
+PLATFORM_WALLET_USERNAME = os.getenv('PLATFORM_WALLET_USERNAME', '')
+
+# Nombre de sous-soldes du wallet des commissions (voir ShardedBalanceService)
+WALLET_BALANCE_SHARDS = int(os.getenv('WALLET_BALANCE_SHARDS', 8))